@@ -7,10 +7,12 @@ from core.state import BaseContext
 from core.agent.base import BaseAgent
 from core.agent.config import AgentConfig
 from core.agent.protocol import AgentProtocol, AgentCard, AgentSkill, Task, TaskResult, TaskState, TaskMessage
+from core.middleware.shared_summary import shared_summary_middleware
 from core.middleware.summarization import create_summarization_middleware
 from core.middleware.tool_monitor import tool_monitor_middleware
+from core.middleware.tool_projection import tool_projection_middleware
 from agents.shared.middleware import hiring_manager_personalization
-from agents.candidate_search.prompts import CANDIDATE_SEARCH_SYSTEM_PROMPT, CANDIDATE_SEARCH_WELCOME_ADDENDUM
+from agents.candidate_search.prompts import CANDIDATE_SEARCH_DESCRIPTION, CANDIDATE_SEARCH_SYSTEM_PROMPT, CANDIDATE_SEARCH_WELCOME_ADDENDUM
 from agents.candidate_search.tools import CANDIDATE_SEARCH_TOOLS
 
 
@@ -22,14 +24,16 @@ def create_candidate_search_agent(checkpointer=None) -> BaseAgent:
     """Create and return a configured Candidate Search agent."""
     config = AgentConfig(
         name="candidate_search",
-        description="Helps hiring managers find internal employees by skills, level, location, and department, and view detailed candidate profiles.",
+        description=CANDIDATE_SEARCH_DESCRIPTION,
         llm=get_llm(),
         tools=CANDIDATE_SEARCH_TOOLS,
         system_prompt=CANDIDATE_SEARCH_SYSTEM_PROMPT + CANDIDATE_SEARCH_WELCOME_ADDENDUM,
         middleware=[
-            create_summarization_middleware(),
+            create_summarization_middleware(shared=True),
             hiring_manager_personalization,
+            shared_summary_middleware,
             tool_monitor_middleware,
+            tool_projection_middleware,
         ],
         context_schema=CandidateSearchContext,
         checkpointer=checkpointer,
@@ -2,6 +2,8 @@
 Candidate Search agent prompts.
 """
 
+CANDIDATE_SEARCH_DESCRIPTION = "Helps hiring managers find internal employees by skills, level, location, and department, and view detailed candidate profiles."
+
 CANDIDATE_SEARCH_SYSTEM_PROMPT = """You are a professional candidate search assistant for the HR Assistant application.
 
 **Your Role:**
@@ -1,27 +1,46 @@
 """
 Agent catalog — the single place that wires worker agents into the registry.
 
+Agents are registered by factory: an agent's module (with its tools and
+their imports) is loaded, and its graph built, the first time the
+registry hands it out.  Only the routing descriptions, which live in each
+agent's lightweight ``prompts`` module, are needed up front.
+
 To add a new agent:
-  1. Create agents/<name>/agent.py with a ``create_<name>_agent()`` factory.
-  2. Import it here and call ``registry.register(...)``.
+  1. Create agents/<name>/agent.py with a ``create_<name>_agent()`` factory
+     and put its description in agents/<name>/prompts.py.
+  2. Add a row to ``AGENTS`` below.
 
 No other files need to change.
 """
 
+from importlib import import_module
+
 from core.agent.registry import AgentRegistry
-from agents.profile.agent import create_profile_agent
-from agents.job_discovery.agent import create_job_discovery_agent
-from agents.outreach.agent import create_outreach_agent
-from agents.candidate_search.agent import create_candidate_search_agent
-from agents.jd_generator.agent import create_jd_agent
+from agents.profile.prompts import PROFILE_DESCRIPTION
+from agents.job_discovery.prompts import JOB_DISCOVERY_DESCRIPTION
+from agents.outreach.prompts import OUTREACH_DESCRIPTION
+from agents.candidate_search.prompts import CANDIDATE_SEARCH_DESCRIPTION
+from agents.jd_generator.prompts import JD_GENERATOR_DESCRIPTION
+
+# (name, description, factory as "module:function")
+AGENTS = [
+    ("profile", PROFILE_DESCRIPTION, "agents.profile.agent:create_profile_agent"),
+    ("job_discovery", JOB_DISCOVERY_DESCRIPTION, "agents.job_discovery.agent:create_job_discovery_agent"),
+    ("outreach", OUTREACH_DESCRIPTION, "agents.outreach.agent:create_outreach_agent"),
+    ("candidate_search", CANDIDATE_SEARCH_DESCRIPTION, "agents.candidate_search.agent:create_candidate_search_agent"),
+    ("jd_generator", JD_GENERATOR_DESCRIPTION, "agents.jd_generator.agent:create_jd_agent"),
+]
+
+
+def _factory(target: str, checkpointer):
+    module, function = target.split(":")
+    return lambda: getattr(import_module(module), function)(checkpointer=checkpointer)
 
 
 def build_agent_catalog(checkpointer=None) -> AgentRegistry:
-    """Build and return an ``AgentRegistry`` containing all configured agents."""
+    """Return an ``AgentRegistry`` with every configured agent registered lazily."""
     registry = AgentRegistry()
-    registry.register(create_profile_agent(checkpointer=checkpointer))
-    registry.register(create_job_discovery_agent(checkpointer=checkpointer))
-    registry.register(create_outreach_agent(checkpointer=checkpointer))
-    registry.register(create_candidate_search_agent(checkpointer=checkpointer))
-    registry.register(create_jd_agent(checkpointer=checkpointer))
+    for name, description, target in AGENTS:
+        registry.register_factory(name, description, _factory(target, checkpointer))
     return registry
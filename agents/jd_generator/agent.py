@@ -7,12 +7,14 @@ from core.state import BaseContext
 from core.agent.base import BaseAgent
 from core.agent.config import AgentConfig
 from core.agent.protocol import AgentProtocol, AgentCard, AgentSkill, Task, TaskResult, TaskState, TaskMessage
+from core.middleware.shared_summary import shared_summary_middleware
 from core.middleware.summarization import create_summarization_middleware
 from core.middleware.tool_monitor import tool_monitor_middleware
+from core.middleware.tool_projection import tool_projection_middleware
 from core.skills.base import Skill, SkillRegistry
 from core.skills.loader import create_skill_loader_tool
 from agents.shared.middleware import hiring_manager_personalization
-from agents.jd_generator.prompts import JD_GENERATOR_SYSTEM_PROMPT
+from agents.jd_generator.prompts import JD_GENERATOR_DESCRIPTION, JD_GENERATOR_SYSTEM_PROMPT
 from agents.jd_generator.tools import ALL_TOOLS
 
 
@@ -20,28 +22,34 @@ class JDGeneratorContext(BaseContext):
     """Runtime context for JD Generator agent."""
 
 
+# One skill registry and loader tool per process, so every JD agent has the
+# same tool list and can share a compiled graph (see core/agent/graph_cache.py).
+_skill_registry = SkillRegistry()
+_skill_registry.register(Skill(
+    name="jd_standards",
+    description="Corporate job description standards covering tone, structure, and compliance guidelines.",
+    path="agents/jd_generator/skills/jd_standards.md",
+    tags=["standards", "compliance", "guidelines"],
+))
+_load_skill = create_skill_loader_tool(_skill_registry)
+
+
 def create_jd_agent(checkpointer=None) -> BaseAgent:
     """Create and return a configured JD Generator agent."""
-    skill_registry = SkillRegistry()
-    skill_registry.register(Skill(
-        name="jd_standards",
-        description="Corporate job description standards covering tone, structure, and compliance guidelines.",
-        path="agents/jd_generator/skills/jd_standards.md",
-        tags=["standards", "compliance", "guidelines"],
-    ))
-
-    tools = ALL_TOOLS + [create_skill_loader_tool(skill_registry)]
+    tools = ALL_TOOLS + [_load_skill]
 
     config = AgentConfig(
         name="jd_generator",
-        description="Job Description Generator that helps hiring managers create standards-compliant JDs through an iterative, collaborative workflow.",
+        description=JD_GENERATOR_DESCRIPTION,
         llm=get_llm(),
         tools=tools,
         system_prompt=JD_GENERATOR_SYSTEM_PROMPT,
         middleware=[
-            create_summarization_middleware(),
+            create_summarization_middleware(shared=True),
             hiring_manager_personalization,
+            shared_summary_middleware,
             tool_monitor_middleware,
+            tool_projection_middleware,
         ],
         context_schema=JDGeneratorContext,
         checkpointer=checkpointer,
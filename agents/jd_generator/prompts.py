@@ -2,6 +2,8 @@
 JD Generator agent prompts.
 """
 
+JD_GENERATOR_DESCRIPTION = "Job Description Generator that helps hiring managers create standards-compliant JDs through an iterative, collaborative workflow."
+
 JD_GENERATOR_SYSTEM_PROMPT = """You are a Job Description Generator assistant that helps hiring managers create professional, standards-compliant job descriptions.
 
 **Your Role:**
@@ -7,10 +7,12 @@ from core.state import BaseContext
 from core.agent.base import BaseAgent
 from core.agent.config import AgentConfig
 from core.agent.protocol import AgentProtocol, AgentCard, AgentSkill, Task, TaskResult, TaskState, TaskMessage
+from core.middleware.shared_summary import shared_summary_middleware
 from core.middleware.summarization import create_summarization_middleware
 from core.middleware.tool_monitor import tool_monitor_middleware
+from core.middleware.tool_projection import tool_projection_middleware
 from agents.shared.middleware import employee_personalization, profile_warning_middleware
-from agents.job_discovery.prompts import JOB_DISCOVERY_SYSTEM_PROMPT, JOB_DISCOVERY_WELCOME_ADDENDUM
+from agents.job_discovery.prompts import JOB_DISCOVERY_DESCRIPTION, JOB_DISCOVERY_SYSTEM_PROMPT, JOB_DISCOVERY_WELCOME_ADDENDUM
 from agents.job_discovery.tools import JOB_DISCOVERY_TOOLS
 
 
@@ -22,15 +24,17 @@ def create_job_discovery_agent(checkpointer=None) -> BaseAgent:
     """Create and return a configured Job Discovery agent."""
     config = AgentConfig(
         name="job_discovery",
-        description="Helps employees find matching internal job postings, view job details, and ask questions about job descriptions.",
+        description=JOB_DISCOVERY_DESCRIPTION,
         llm=get_llm(),
         tools=JOB_DISCOVERY_TOOLS,
         system_prompt=JOB_DISCOVERY_SYSTEM_PROMPT + JOB_DISCOVERY_WELCOME_ADDENDUM,
         middleware=[
-            create_summarization_middleware(),
+            create_summarization_middleware(shared=True),
             employee_personalization,
             profile_warning_middleware,
+            shared_summary_middleware,
             tool_monitor_middleware,
+            tool_projection_middleware,
         ],
         context_schema=JobDiscoveryContext,
         checkpointer=checkpointer,
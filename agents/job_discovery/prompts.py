@@ -2,6 +2,8 @@
 Job Discovery agent prompts — carved from the monolithic MyCareer system prompt.
 """
 
+JOB_DISCOVERY_DESCRIPTION = "Helps employees find matching internal job postings, view job details, and ask questions about job descriptions."
+
 JOB_DISCOVERY_SYSTEM_PROMPT = """You are a warm, professional job discovery assistant for the HR Assistant application.
 
 **Your Role:**
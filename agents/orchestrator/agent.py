@@ -8,119 +8,122 @@ specialist via a factory-scoped ContextVar so there is no global state.
 
 from __future__ import annotations
 
+import asyncio
 import contextvars
 import json
 import logging
+import time
 from typing import Any
 
 from langchain_core.tools import tool
 
 from core.llm import get_llm
 from core.state import AppContext, BaseContext
-from core.agent.base import BaseAgent
+from core.agent.base import BaseAgent, extract_interrupts
 from core.agent.config import AgentConfig
 from core.agent.registry import AgentRegistry
 from core.agent.protocol import AgentProtocol, AgentCard, AgentSkill, Task, TaskResult, TaskState, TaskMessage
 from core.middleware.summarization import create_summarization_middleware
 from core.middleware.tool_monitor import tool_monitor_middleware
+from core.metrics import WORKER_CALLS, WORKER_LATENCY
+from core.tracing import traced
 from agents.orchestrator.middleware import orchestrator_personalization
 from agents.orchestrator.prompts import ORCHESTRATOR_SYSTEM_PROMPT
 
 logger = logging.getLogger("chatbot.orchestrator")
 
 
-def _create_worker_agent(agent: BaseAgent, name: str, description: str, context_var: contextvars.ContextVar):
+def _create_worker_agent(registry: AgentRegistry, name: str, description: str, context_var: contextvars.ContextVar):
     """Wrap a specialist agent as a worker agent for the orchestrator to call.
 
-    Reads the parent ``AppContext`` from *context_var*, builds a
-    namespaced ``thread_id``, and constructs the correct worker agent context
-    via ``agent.config.context_factory`` (falling back to ``BaseContext``).
+    The specialist is looked up in *registry* on each call, so it is only
+    built the first time the orchestrator routes to it (on a worker thread,
+    so compiling its graph does not block the event loop).  Reads the
+    parent ``AppContext`` from *context_var*, builds a namespaced ``thread_id``,
+    and constructs the correct worker agent context via
+    ``agent.config.context_factory`` (falling back to ``BaseContext``).
     """
 
-    @tool(name, description=description)
-    async def worker_agent(message: str) -> str:
+    # The worker span's self time (total minus the nested agent span) is the
+    # wrapper's own overhead: context building and result JSON plumbing.
+    @tool(name, description=description, response_format="content_and_artifact")
+    @traced(f"worker:{name}")
+    async def worker_agent(message: str) -> tuple[str, dict]:
         app_ctx = context_var.get()
         parent_thread_id = getattr(app_ctx, "thread_id", "") if app_ctx else ""
         namespaced_id = f"{parent_thread_id}:{name}" if parent_thread_id else ""
 
+        agent = registry.get(name) if registry.is_built(name) else await asyncio.to_thread(registry.get, name)
         if agent.config.context_factory:
             sub_ctx = agent.config.context_factory(namespaced_id)
         else:
             sub_ctx = BaseContext(thread_id=namespaced_id)
 
+        start = time.monotonic()
         try:
             result = await agent.invoke(message, context=sub_ctx)
         except Exception as e:
+            WORKER_CALLS.inc(name, "error")
+            WORKER_LATENCY.observe(time.monotonic() - start, name)
             logger.exception("Worker agent '%s' raised an error", name)
-            return json.dumps({
+            payload = {
                 "response": "Sorry, something went wrong. Please try again or rephrase your request.",
                 "tool_calls": [],
-            })
-
-        # Check for pending interrupts (human-in-the-loop)
-        try:
-            state_snapshot = await agent.get_state(namespaced_id)
-            pending_interrupts = []
-            for task in (state_snapshot.tasks or []):
-                for intr in (task.interrupts or []):
-                    pending_interrupts.append({
-                        "value": intr.value if hasattr(intr, "value") else intr,
-                        "resumable": intr.resumable if hasattr(intr, "resumable") else True,
-                        "ns": intr.ns if hasattr(intr, "ns") else None,
-                    })
-            if pending_interrupts:
-                # Extract the agent's AI response from the CURRENT TURN only.
-                # The checkpointer loads full history, so we must slice from the
-                # last HumanMessage to avoid picking up old turn responses.
-                msgs = result.get("messages", [])
-                turn_start = 0
-                for i, m in enumerate(msgs):
-                    if hasattr(m, "type") and m.type == "human":
-                        turn_start = i
-                current_turn = msgs[turn_start:]
-
-                agent_response = ""
-                for m in reversed(current_turn):
-                    if hasattr(m, "type") and m.type == "ai":
-                        content = getattr(m, "content", "")
-                        if content:
-                            agent_response = content
-                            break
-
-                if not agent_response:
-                    agent_response = (
-                        "I'd like to update your profile with the below — approve or decline on the card."
-                    )
-
-                return json.dumps({
-                    "response": agent_response,
-                    "tool_calls": [],
-                    "interrupts": pending_interrupts,
-                    "agent_name": name,
-                })
-        except Exception:
-            logger.debug("Could not check interrupts for '%s'", name, exc_info=True)
+            }
+            return json.dumps(payload), payload
+
+        # Check for pending interrupts (human-in-the-loop).  They are read
+        # from the invoke result itself, so the common no-interrupt path
+        # costs no extra checkpointer read.
+        pending_interrupts = extract_interrupts(result)
+        WORKER_CALLS.inc(name, "interrupted" if pending_interrupts else "ok")
+        WORKER_LATENCY.observe(time.monotonic() - start, name)
+        if pending_interrupts:
+            # ``agent.invoke`` returns only the current turn's messages.
+            agent_response = ""
+            for m in reversed(result.get("messages", [])):
+                if hasattr(m, "type") and m.type == "ai":
+                    content = getattr(m, "content", "")
+                    if content:
+                        agent_response = content
+                        break
+
+            if not agent_response:
+                agent_response = (
+                    "I'd like to update your profile with the below — approve or decline on the card."
+                )
+
+            payload = {
+                "response": agent_response,
+                "tool_calls": [],
+                "interrupts": pending_interrupts,
+                "agent_name": name,
+            }
+            return json.dumps(payload), payload
 
+        # Current turn only — ``agent.invoke`` slices off prior history.
         messages = result.get("messages", [])
 
-        # Slice to current turn only — the checkpointer loads the full
-        # history so we must skip tool messages from prior turns.
-        turn_start = 0
-        for i, msg in enumerate(messages):
-            if hasattr(msg, "type") and msg.type == "human":
-                turn_start = i
-        current_turn_messages = messages[turn_start:]
-
+        # The LLM sees each inner result as projected by the worker's
+        # tool_projection_middleware; the full payload (ToolMessage.artifact)
+        # is passed up as this tool's artifact for the UI adapter.
         inner_tool_calls = []
-        for msg in current_turn_messages:
+        llm_tool_calls = []
+        for msg in messages:
             if hasattr(msg, "type") and msg.type == "tool":
                 raw = msg.content
                 try:
                     parsed = json.loads(raw) if isinstance(raw, str) else raw
                 except (json.JSONDecodeError, TypeError):
                     parsed = raw
+                inner_name = getattr(msg, "name", "")
+                artifact = getattr(msg, "artifact", None)
                 inner_tool_calls.append({
-                    "name": getattr(msg, "name", ""),
+                    "name": inner_name,
+                    "content": artifact if artifact is not None else parsed,
+                })
+                llm_tool_calls.append({
+                    "name": inner_name,
                     "content": parsed,
                 })
 
@@ -129,10 +132,14 @@ def _create_worker_agent(agent: BaseAgent, name: str, description: str, context_
             last = messages[-1]
             response = getattr(last, "content", str(last))
 
-        return json.dumps({
+        content = json.dumps({
             "response": response,
-            "tool_calls": inner_tool_calls,
+            "tool_calls": llm_tool_calls,
         })
+        return content, {
+            "response": response,
+            "tool_calls": inner_tool_calls,
+        }
 
     return worker_agent
 
@@ -165,12 +172,11 @@ def create_orchestrator_agent(
 
     worker_agents = []
     for agent_name in registry.list_agents():
-        agent = registry.get(agent_name)
         worker_agents.append(
             _create_worker_agent(
-                agent,
+                registry,
                 name=agent_name,
-                description=agent.config.description,
+                description=registry.describe(agent_name),
                 context_var=context_var,
             )
         )
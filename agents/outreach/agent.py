@@ -7,10 +7,12 @@ from core.state import BaseContext
 from core.agent.base import BaseAgent
 from core.agent.config import AgentConfig
 from core.agent.protocol import AgentProtocol, AgentCard, AgentSkill, Task, TaskResult, TaskState, TaskMessage
+from core.middleware.shared_summary import shared_summary_middleware
 from core.middleware.summarization import create_summarization_middleware
 from core.middleware.tool_monitor import tool_monitor_middleware
+from core.middleware.tool_projection import tool_projection_middleware
 from agents.shared.middleware import employee_personalization
-from agents.outreach.prompts import OUTREACH_SYSTEM_PROMPT, OUTREACH_WELCOME_ADDENDUM
+from agents.outreach.prompts import OUTREACH_DESCRIPTION, OUTREACH_SYSTEM_PROMPT, OUTREACH_WELCOME_ADDENDUM
 from agents.outreach.tools import OUTREACH_TOOLS
 
 
@@ -22,14 +24,16 @@ def create_outreach_agent(checkpointer=None) -> BaseAgent:
     """Create and return a configured Outreach agent."""
     config = AgentConfig(
         name="outreach",
-        description="Helps employees draft and send messages to hiring managers.",
+        description=OUTREACH_DESCRIPTION,
         llm=get_llm(),
         tools=OUTREACH_TOOLS,
         system_prompt=OUTREACH_SYSTEM_PROMPT + OUTREACH_WELCOME_ADDENDUM,
         middleware=[
-            create_summarization_middleware(),
+            create_summarization_middleware(shared=True),
             employee_personalization,
+            shared_summary_middleware,
             tool_monitor_middleware,
+            tool_projection_middleware,
         ],
         context_schema=OutreachContext,
         checkpointer=checkpointer,
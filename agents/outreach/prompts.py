@@ -2,6 +2,8 @@
 Outreach agent prompts — carved from the monolithic MyCareer system prompt.
 """
 
+OUTREACH_DESCRIPTION = "Helps employees draft and send messages to hiring managers."
+
 OUTREACH_SYSTEM_PROMPT = """You are a warm, professional outreach assistant for the HR Assistant application.
 
 **Workflow Rule — ALWAYS draft before sending:**
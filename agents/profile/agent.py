@@ -8,10 +8,12 @@ from core.agent.base import BaseAgent
 from core.agent.config import AgentConfig
 from core.agent.protocol import AgentProtocol, AgentCard, AgentSkill, Task, TaskResult, TaskState, TaskMessage
 from langchain.agents.middleware import HumanInTheLoopMiddleware
+from core.middleware.shared_summary import shared_summary_middleware
 from core.middleware.summarization import create_summarization_middleware
 from core.middleware.tool_monitor import tool_monitor_middleware
+from core.middleware.tool_projection import tool_projection_middleware
 from agents.shared.middleware import first_touch_profile_middleware, employee_personalization
-from agents.profile.prompts import PROFILE_SYSTEM_PROMPT, PROFILE_WELCOME_ADDENDUM
+from agents.profile.prompts import PROFILE_DESCRIPTION, PROFILE_SYSTEM_PROMPT, PROFILE_WELCOME_ADDENDUM
 from agents.profile.tools import PROFILE_TOOLS
 
 
@@ -24,15 +26,17 @@ def create_profile_agent(checkpointer=None) -> BaseAgent:
     """Create and return a configured Profile agent."""
     config = AgentConfig(
         name="profile",
-        description="Helps employees analyse and improve their profile, infer skills, and manage work history and preferences.",
+        description=PROFILE_DESCRIPTION,
         llm=get_llm(),
         tools=PROFILE_TOOLS,
         system_prompt=PROFILE_SYSTEM_PROMPT + PROFILE_WELCOME_ADDENDUM,
         middleware=[
-            create_summarization_middleware(),
+            create_summarization_middleware(shared=True),
             first_touch_profile_middleware,
             employee_personalization,
+            shared_summary_middleware,
             tool_monitor_middleware,
+            tool_projection_middleware,
             HumanInTheLoopMiddleware(
                 interrupt_on={
                     "update_profile": {"allowed_decisions": ["approve", "reject"]},
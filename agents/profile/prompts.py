@@ -2,6 +2,8 @@
 Profile agent prompts — carved from the monolithic MyCareer system prompt.
 """
 
+PROFILE_DESCRIPTION = "Helps employees analyse and improve their profile, infer skills, and manage work history and preferences."
+
 PROFILE_SYSTEM_PROMPT = """You are a warm, professional profile management assistant for the HR Assistant application.
 
 **Your Role:**
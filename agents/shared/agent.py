@@ -14,6 +14,7 @@ from core.agent.protocol import AgentProtocol, AgentCard, AgentSkill, Task, Task
 from langchain.agents.middleware import HumanInTheLoopMiddleware
 from core.middleware.summarization import create_summarization_middleware
 from core.middleware.tool_monitor import tool_monitor_middleware
+from core.middleware.tool_projection import tool_projection_middleware
 from agents.shared.middleware import first_touch_profile_middleware, mycareer_personalization, profile_warning_middleware
 from agents.shared.prompts import MYCAREER_SYSTEM_PROMPT, MYCAREER_WELCOME_ADDENDUM
 from agents.shared.tools import ALL_TOOLS
@@ -38,6 +39,7 @@ def create_mycareer_agent(checkpointer=None) -> BaseAgent:
             mycareer_personalization,
             profile_warning_middleware,
             tool_monitor_middleware,
+            tool_projection_middleware,
             HumanInTheLoopMiddleware(
                 interrupt_on={
                     "update_profile": {"allowed_decisions": ["approve", "reject"]},
@@ -2,20 +2,18 @@
 Shared employee middleware — used by profile, job_discovery, and outreach agents.
 """
 
-import threading
-import time
-
 from langchain.agents.middleware import dynamic_prompt, wrap_tool_call
 from langchain_core.messages import ToolMessage
 
+from core.backend import get_backend
 from core.config import PROFILE_LOW_COMPLETION_THRESHOLD
 from core.profile import load_profile
 from core.profile_score import compute_completion_score
 from core.middleware.user_identity import get_user_identity
 
-# Thread-safe cache: maps thread_id → (score, timestamp)
-_thread_analysis: dict[str, tuple[int, float]] = {}
-_thread_analysis_lock = threading.Lock()
+# First-touch cache: thread_id → completion score, in the shared backend so a
+# conversation's turns agree whichever app worker serves them.
+_ANALYSIS_NS = "profile_analysis"
 
 # Cache TTL in seconds (5 minutes)
 _CACHE_TTL = 300
@@ -27,30 +25,20 @@ def clear_profile_cache(thread_id: str | None = None):
     If *thread_id* is given, only that entry is removed. Otherwise, the
     entire cache is flushed (used when the side panel submits).
     """
-    with _thread_analysis_lock:
-        if thread_id:
-            _thread_analysis.pop(thread_id, None)
-        else:
-            _thread_analysis.clear()
+    if thread_id:
+        get_backend().delete(_ANALYSIS_NS, thread_id)
+    else:
+        get_backend().clear(_ANALYSIS_NS)
 
 
 def _get_cached_score(thread_id: str) -> int | None:
     """Return the cached score if it exists and hasn't expired."""
-    with _thread_analysis_lock:
-        entry = _thread_analysis.get(thread_id)
-        if entry is None:
-            return None
-        score, ts = entry
-        if time.monotonic() - ts > _CACHE_TTL:
-            del _thread_analysis[thread_id]
-            return None
-        return score
+    return get_backend().get(_ANALYSIS_NS, thread_id)
 
 
 def _set_cached_score(thread_id: str, score: int):
-    """Cache a score with the current timestamp."""
-    with _thread_analysis_lock:
-        _thread_analysis[thread_id] = (score, time.monotonic())
+    """Cache a score for ``_CACHE_TTL`` seconds."""
+    get_backend().set(_ANALYSIS_NS, thread_id, score, ttl=_CACHE_TTL)
 
 
 def _get_context(request):
@@ -185,6 +173,7 @@ async def profile_warning_middleware(request, handler):
                 content = result.content if isinstance(result.content, str) else str(result.content)
                 result = ToolMessage(
                     content=content + warning,
+                    artifact=result.artifact,
                     tool_call_id=result.tool_call_id,
                     name=result.name,
                 )
@@ -1,5 +1,9 @@
 """
 Get matches tool -- Functional implementation.
+
+Jobs are ranked by profile-aware match scores that ``core.match_score``
+precomputes per (profile version, catalog version); a request only filters
+and pages the cached ranking.
 """
 
 import json
@@ -10,20 +14,46 @@ from typing import Any
 
 from langchain_core.tools import tool
 
-from core.profile import load_profile
+import core.profile
+from core.backend import get_backend
+from core.match_score import get_match_scorer
+from core.response_cache import register_replay_hook
 
 logger = logging.getLogger("chatbot.tools")
 
 DATA_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "..", "data", "matching_jobs.json")
 DEFAULT_MATCH_TOP_K = 3
 
-# Session-level tracking of seen job IDs, keyed by thread_id.
-_seen_jobs: dict[str, set[str]] = {}
+# Session-level tracking of seen job IDs, keyed by thread_id, in the shared
+# backend so every app worker agrees on what the user has already seen.
+_SEEN_JOBS_NS = "seen_jobs"
+_SEEN_JOBS_TTL = 24 * 3600
 
 
 def _reset_seen_jobs() -> None:
     """Clear all seen-job tracking (for tests)."""
-    _seen_jobs.clear()
+    get_backend().clear(_SEEN_JOBS_NS)
+
+
+def _mark_seen(job_ids: set[str], thread_id: str = "default") -> set[str]:
+    """Record *job_ids* as seen in *thread_id*; return the IDs seen before.
+
+    A single atomic backend update, so concurrent calls from different
+    workers for the same thread cannot drop each other's IDs.
+    """
+    return get_backend().add_to_set(_SEEN_JOBS_NS, thread_id, job_ids, ttl=_SEEN_JOBS_TTL)
+
+
+def _replay_matches(result: Any) -> Any:
+    """Refresh ``isNewToUser`` on a cached ``get_matches`` result and mark its jobs seen."""
+    if not isinstance(result, dict) or not result.get("matches"):
+        return result
+    seen = _mark_seen({m.get("id", "") for m in result["matches"]})
+    matches = [{**m, "isNewToUser": m.get("id", "") not in seen} for m in result["matches"]]
+    return {**result, "matches": matches}
+
+
+register_replay_hook("get_matches", _replay_matches)
 
 
 def _match_filter(job: dict, key: str, value: Any, today: datetime) -> bool:
@@ -143,7 +173,7 @@ def get_matches(
             - level: case-insensitive exact match on corporateTitleCode (AS, AO, AD, DIR, ED, MD)
             - orgLine / department: case-insensitive substring match on orgLine
             - skills: list of skill names — matches if any overlap with job's matchingSkills
-            - minScore: minimum matchScore threshold (e.g. 2.0)
+            - minScore: minimum matchScore threshold, 0-5 (e.g. 2.0)
             - postedWithin: number of days — only jobs posted within N days
         search_text: Optional natural language search. All words must appear
             (AND logic) across title, summary, yourRole, orgLine, location,
@@ -166,17 +196,14 @@ def run_get_matches(
     offset: int = 0,
     thread_id: str = "default",
 ) -> dict[str, Any]:
-    """Actual implementation -- loads profile from the configured data path."""
+    """Actual implementation -- ranks the catalog for the profile at the configured data path."""
     if not isinstance(top_k, int) or top_k < 1:
         return {"success": False, "error": "top_k must be a positive integer."}
     if not isinstance(offset, int) or offset < 0:
         offset = 0
 
-    profile = load_profile()
-
     try:
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        ranked = get_match_scorer().ranked(core.profile.PROFILE_PATH, DATA_FILE)
     except FileNotFoundError:
         logger.warning("Job data file not found: %s", DATA_FILE)
         return {
@@ -202,7 +229,7 @@ def run_get_matches(
             "averageScore": 0,
         }
 
-    jobs = data.get("jobs", [])
+    jobs = ranked.jobs
     today = datetime.now()
 
     # --- Filtering ---
@@ -217,9 +244,6 @@ def run_get_matches(
     if search_text and search_text.strip():
         jobs = [j for j in jobs if _match_search(j, search_text.strip())]
 
-    # --- Sort by matchScore descending ---
-    jobs.sort(key=lambda j: j.get("matchScore", 0), reverse=True)
-
     total_available = len(jobs)
 
     # --- Pagination ---
@@ -228,7 +252,7 @@ def run_get_matches(
     has_more = (offset + top_k) < total_available
 
     # --- Seen-job tracking ---
-    seen = _seen_jobs.setdefault(thread_id, set())
+    seen = _mark_seen({job.get("id", "") for job in paginated}, thread_id)
 
     matches = []
     for job in paginated:
@@ -254,13 +278,9 @@ def run_get_matches(
             "isNewToUser": is_new_to_user,
         })
 
-    # Record all returned job IDs as seen
-    for m in matches:
-        seen.add(m.get("id", ""))
-
     avg_score = sum(m.get("matchScore", 0) for m in matches) / len(matches) if matches else 0
 
-    profile_summary = _build_profile_summary(profile)
+    profile_summary = _build_profile_summary(ranked.profile)
 
     return {
         "success": True,
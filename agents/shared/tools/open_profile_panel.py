@@ -4,7 +4,6 @@ Open profile panel tool -- triggers the profile side panel via SSE.
 
 from typing import Any
 
-import chainlit as cl
 from langchain_core.tools import tool
 
 from core.profile_routes import push_panel_event
@@ -19,6 +18,8 @@ async def open_profile_panel() -> dict:
 
 def run_open_profile_panel() -> dict[str, Any]:
     """Actual implementation -- pushes an SSE event to open the panel."""
+    import chainlit as cl
+
     try:
         user = cl.user_session.get("user")
         if user and hasattr(user, "metadata"):
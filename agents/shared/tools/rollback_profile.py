@@ -6,7 +6,6 @@ from __future__ import annotations
 
 from typing import Any
 
-import chainlit as cl
 from langchain_core.tools import tool
 
 from core.profile_manager import ProfileManager
@@ -15,6 +14,8 @@ from core.profile_score import compute_completion_score
 
 def _get_user_context() -> tuple[str, str]:
     """Extract username and profile_path from the Chainlit session."""
+    import chainlit as cl
+
     try:
         user = cl.user_session.get("user")
         if user and hasattr(user, "metadata") and user.metadata:
@@ -9,7 +9,6 @@ from __future__ import annotations
 import copy
 from typing import Any
 
-import chainlit as cl
 from langchain_core.tools import tool
 
 from core.profile import load_profile
@@ -30,6 +29,8 @@ ALLOWED_UPDATE_SECTIONS = {"experience", "skills"}
 
 def _get_user_context() -> tuple[str, str]:
     """Extract username and profile_path from the Chainlit session."""
+    import chainlit as cl  # imported on use: it adds about a second to cold start
+
     try:
         user = cl.user_session.get("user")
         if user and hasattr(user, "metadata") and user.metadata:
@@ -6,12 +6,12 @@ import json
 import logging
 import os
 import sys
+import time
 
 import chainlit as cl
 from core.data_layer import SQLiteCompatibleDataLayer
 from chainlit.types import ThreadDict
 from dotenv import load_dotenv
-from langgraph.checkpoint.memory import InMemorySaver
 
 load_dotenv()
 
@@ -34,6 +34,20 @@ from core.profile_routes import router as profile_router, set_profile_updated, p
 from core.profile_manager import ProfileManager
 from core.jd_routes import router as jd_router
 from core.jd_manager import JDDraftManager
+from core.checkpoint import create_checkpointer
+from core.invalidation import on_invalidate, start_invalidations
+from core.metrics import TURN_LATENCY, register_cache, register_checkpointer
+from core.metrics_routes import router as metrics_router
+from core.config import (
+    PROFILE_PATH,
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTL_SECONDS,
+)
+from core.response_cache import ResponseCache, catalog_version, is_cacheable, replay_tool_calls
+from core.tracing import span, traced
+from core.versions import file_version
+from core.usage import TurnUsage, track_turn
 
 
 # ============================================================================
@@ -124,9 +138,12 @@ def _build_app_context() -> AppContext:
 # AGENT INITIALISATION
 # ============================================================================
 
-checkpointer = InMemorySaver()
+# In-memory, or the SQLite file shared by all workers when CHECKPOINT_DB_PATH
+# is set (see serve.py).
+checkpointer = create_checkpointer()
 registry = build_agent_catalog(checkpointer=checkpointer)
 orchestrator = create_orchestrator_agent(registry, checkpointer=checkpointer)
+register_checkpointer(checkpointer)
 
 # Mount profile editor API routes on Chainlit's FastAPI app.
 # We must insert our routes BEFORE Chainlit's catch-all "/{full_path:path}"
@@ -135,12 +152,34 @@ from chainlit.server import app as chainlit_app
 
 chainlit_app.include_router(profile_router)
 chainlit_app.include_router(jd_router)
+chainlit_app.include_router(metrics_router)
 
 # Move our API routes before Chainlit's catch-all by re-ordering the route list
-_ours = [r for r in chainlit_app.routes if getattr(r, "path", "").startswith(("/api/profile", "/api/jd"))]
+_ours = [r for r in chainlit_app.routes if getattr(r, "path", "").startswith(("/api/profile", "/api/jd", "/api/metrics"))]
 _rest = [r for r in chainlit_app.routes if r not in _ours]
 chainlit_app.routes[:] = _ours + _rest
 
+# Opt-in cache of repeated read-only turns (see core/response_cache.py).
+response_cache = (
+    ResponseCache(max_entries=RESPONSE_CACHE_MAX_ENTRIES, ttl_seconds=RESPONSE_CACHE_TTL_SECONDS)
+    if RESPONSE_CACHE_ENABLED
+    else None
+)
+if response_cache is not None:
+    register_cache("response", response_cache)
+
+
+@cl.on_app_startup
+def start_cache_invalidation():
+    """Drop this worker's caches when any worker announces a change."""
+    from agents.shared.middleware import clear_profile_cache
+
+    on_invalidate("profile", lambda _key: clear_profile_cache())
+    if response_cache is not None:
+        for scope in ("profile", "catalog"):
+            on_invalidate(scope, lambda _key: response_cache.clear())
+    start_invalidations()
+
 
 # ============================================================================
 # STARTERS
@@ -176,10 +215,17 @@ async def set_starters():
 # CHAT LIFECYCLE
 # ============================================================================
 
+async def _announce_session(meta: dict) -> None:
+    """Tell the side-panel JS who is logged in (it connects its SSE stream on this)."""
+    await cl.send_window_message({"type": "hr_agent_session", **meta})
+
+
 @cl.on_chat_start
 async def on_chat_start():
     """Initialize session — store the thread_id for context building."""
     cl.user_session.set("thread_id", cl.context.session.id)
+    # The next message opens the thread, so it may use the response cache.
+    cl.user_session.set("first_turn", True)
 
     # Sync persisted user metadata with auth config so the /user endpoint
     # returns up-to-date fields (e.g. profile_path).  The DB row created on
@@ -205,6 +251,7 @@ async def on_chat_start():
             "profile_path": user.metadata.get("profile_path", ""),
         }
         cl.user_session.set("profile_meta", meta)
+        await _announce_session(meta)
 
 
 @cl.on_chat_resume
@@ -212,6 +259,13 @@ async def on_chat_resume(thread: ThreadDict):
     """Resume a previous chat session."""
     cl.user_session.set("thread_id", cl.context.session.id)
 
+    user = cl.user_session.get("user")
+    if user and getattr(user, "metadata", None):
+        await _announce_session({
+            "username": user.identifier,
+            "profile_path": user.metadata.get("profile_path", ""),
+        })
+
     profile = load_profile(_profile_path_for_session())
     core = profile.get("core", {}) if profile else {}
     name_info = core.get("name", {})
@@ -381,44 +435,75 @@ async def _handle_pending_interrupt(user_text: str) -> bool | None:
 
 
 @cl.on_message
+@traced("turn")
 async def on_message(message: cl.Message):
     """Route every message through the orchestrator agent."""
+    turn_start = time.monotonic()
     # Handle pending HITL interrupts before routing to the orchestrator.
     handled = await _handle_pending_interrupt(message.content)
     if handled:
+        TURN_LATENCY.observe(time.monotonic() - turn_start, "hitl_decision")
         return
 
     app_ctx = _build_app_context()
+    first_turn = cl.user_session.get("first_turn", False)
+    cl.user_session.set("first_turn", False)
 
     response_text = ""
     all_elements: list = []
 
+    user = cl.user_session.get("user")
+    username = user.identifier if user else ""
+    profile_path = ""
+    if user and hasattr(user, "metadata") and user.metadata:
+        profile_path = user.metadata.get("profile_path", "")
+
+    # Only a thread's first turn is cached (see core/response_cache.py).
+    # The session flag skips the checkpoint read on every later message;
+    # the read confirms the new session's thread really is empty.
+    cache_key = None
+    cached = None
+    if (
+        first_turn
+        and response_cache is not None
+        and username
+        and app_ctx.thread_id
+        and not await orchestrator.has_history(app_ctx.thread_id)
+    ):
+        cache_key = ResponseCache.make_key(
+            orchestrator.config.name,
+            username,
+            message.content,
+            file_version(profile_path or PROFILE_PATH, PROFILE_PATH),
+            catalog_version(),
+        )
+        cached = response_cache.get(cache_key)
+
     async with cl.Step(name="Processing your request", type="tool") as step:
         try:
-            result = await orchestrator.invoke(
-                message.content,
-                context=app_ctx,
-            )
-
-            messages = result.get("messages", [])
+            if cached is not None:
+                # Replay a previous read-only turn without calling the LLM,
+                # recording it in the thread as if the agent had answered.
+                response_text, tool_calls = cached
+                tool_calls = replay_tool_calls(tool_calls)
+                await orchestrator.record_turn(message.content, response_text, thread_id=app_ctx.thread_id)
+                current_turn_messages = []
+                pending_interrupts = []
+            else:
+                with track_turn(username) as turn_usage:
+                    result = await orchestrator.invoke(
+                        message.content,
+                        context=app_ctx,
+                    )
 
-            # Slice to only the current turn (from the last HumanMessage onward)
-            turn_start = 0
-            for i, msg in enumerate(messages):
-                if hasattr(msg, "type") and msg.type == "human":
-                    turn_start = i
-            current_turn_messages = messages[turn_start:]
+                # ``invoke`` returns only the current turn's messages.
+                current_turn_messages = result.get("messages", [])
 
-            tool_calls = extract_tool_calls_from_messages(current_turn_messages)
-            pending_interrupts = extract_interrupts_from_messages(current_turn_messages)
+                tool_calls = extract_tool_calls_from_messages(current_turn_messages)
+                pending_interrupts = extract_interrupts_from_messages(current_turn_messages)
 
             # If the agent opened the profile panel, push the SSE event now
             # (post-orchestrator) so the browser can load data reliably.
-            user = cl.user_session.get("user")
-            username = user.identifier if user else ""
-            profile_path = ""
-            if user and hasattr(user, "metadata") and user.metadata:
-                profile_path = user.metadata.get("profile_path", "")
 
             if username:
                 for tool_name, _tool_result in tool_calls:
@@ -490,15 +575,22 @@ async def on_message(message: cl.Message):
                         "section": intr_section,
                     })
 
-            for tool_name, tool_result in tool_calls:
-                elements = await render_tool_elements(tool_name, tool_result)
-                all_elements.extend(elements)
+            with span("render_tool_elements", count=len(tool_calls)):
+                for tool_name, tool_result in tool_calls:
+                    elements = await render_tool_elements(tool_name, tool_result)
+                    all_elements.extend(elements)
+
+            if cached is not None:
+                step.output = "Served from response cache."
+            else:
+                last_msg = current_turn_messages[-1] if current_turn_messages else None
+                if last_msg:
+                    response_text = getattr(last_msg, "content", str(last_msg))
 
-            last_msg = current_turn_messages[-1] if current_turn_messages else None
-            if last_msg:
-                response_text = getattr(last_msg, "content", str(last_msg))
+                step.output = _build_debug_output(current_turn_messages, usage=turn_usage)
 
-            step.output = _build_debug_output(current_turn_messages)
+                if cache_key is not None and not pending_interrupts and is_cacheable(tool_calls):
+                    response_cache.put(cache_key, (response_text, tool_calls))
 
         except Exception as e:
             logger.exception("Error processing message")
@@ -507,11 +599,15 @@ async def on_message(message: cl.Message):
                 f"({type(e).__name__})"
             )
             all_elements = []
+            outcome = "error"
+        else:
+            outcome = "cached" if cached is not None else "ok"
 
     msg = cl.Message(content=response_text)
     if all_elements:
         msg.elements = all_elements
     await msg.send()
+    TURN_LATENCY.observe(time.monotonic() - turn_start, outcome)
 
 
 def _summarize_tool_content(content) -> str:
@@ -535,7 +631,23 @@ def _summarize_tool_content(content) -> str:
     return summary
 
 
-def _build_debug_output(messages: list) -> str:
+def _format_usage(usage: TurnUsage) -> str:
+    """Per-agent token / latency / cost lines for the debug step."""
+    lines = ["━━━ Token usage ━━━"]
+    for agent, t in usage.by_agent().items():
+        lines.append(
+            f"  {agent or 'unknown'}: {t['calls']} call(s), {t['input_tokens']:,} in / "
+            f"{t['output_tokens']:,} out, {t['latency_ms']:.0f} ms"
+            + (f", cost {t['cost']:.4f}" if t["cost"] else "")
+        )
+    lines.append(
+        f"  total: {len(usage.records)} call(s), {usage.input_tokens:,} in / {usage.output_tokens:,} out"
+        + (f", cost {usage.cost:.4f}" if usage.cost else "")
+    )
+    return "\n".join(lines)
+
+
+def _build_debug_output(messages: list, usage: TurnUsage | None = None) -> str:
     # Build a map from tool_call_id -> tool_call so we can look up args
     tool_call_map: dict[str, dict] = {}
     for msg in messages:
@@ -585,9 +697,12 @@ def _build_debug_output(messages: list) -> str:
             tool_msg = tool_messages.get(tc_id)
             result = {}
             if tool_msg is not None:
+                artifact = getattr(tool_msg, "artifact", None)
                 try:
                     raw = tool_msg.content
-                    result = json.loads(raw) if isinstance(raw, str) else raw
+                    result = artifact if artifact is not None else (
+                        json.loads(raw) if isinstance(raw, str) else raw
+                    )
                 except (json.JSONDecodeError, TypeError):
                     result = {}
                 if not isinstance(result, dict):
@@ -620,6 +735,9 @@ def _build_debug_output(messages: list) -> str:
         preview = final_text[:200] + ("…" if len(final_text) > 200 else "")
         parts.append(f"━━━ Orchestrator → User ━━━\n\"{preview}\"")
 
+    if usage is not None and usage.records:
+        parts.append(_format_usage(usage))
+
     return "\n\n".join(parts) if parts else "No worker agents called."
 
 
@@ -0,0 +1,8 @@
+"""
+Benchmarks for the chat pipeline.
+
+``bench.load`` drives concurrent simulated users end to end against the
+offline fake LLM; ``bench.compare`` diffs two result files.
+``bench.synthetic`` generates jobs, employees, profiles and JD corpora at
+1k-1M scale, and ``bench/micro`` times the tool hot paths against them.
+"""
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark result files stage by stage.
+
+Usage:
+    python -m bench.compare BASELINE.json CANDIDATE.json [--metric p95_ms]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+
+def _load(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline: dict, candidate: dict, metric: str = "p95_ms") -> list[dict]:
+    """Per-stage *metric* for both runs and the relative change (candidate vs baseline)."""
+    rows = []
+    stages = sorted(set(baseline.get("stages", {})) | set(candidate.get("stages", {})))
+    for stage in stages:
+        before = baseline.get("stages", {}).get(stage, {}).get(metric)
+        after = candidate.get("stages", {}).get(stage, {}).get(metric)
+        change = None
+        if before and after is not None:
+            change = round((after - before) / before * 100, 1)
+        rows.append({"stage": stage, "baseline": before, "candidate": after, "change_pct": change})
+    return rows
+
+
+def _fmt(value: float | None) -> str:
+    return "-" if value is None else f"{value:.2f}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--metric", default="p95_ms", help="Stage metric to compare (default: p95_ms)")
+    args = parser.parse_args()
+
+    baseline, candidate = _load(args.baseline), _load(args.candidate)
+    print(f"{baseline['meta'].get('commit')} -> {candidate['meta'].get('commit')} ({args.metric})")
+    print(f"{'stage':<32}{'baseline':>12}{'candidate':>12}{'change':>10}")
+    for row in compare(baseline, candidate, args.metric):
+        change = "n/a" if row["change_pct"] is None else f"{row['change_pct']:+.1f}%"
+        print(f"{row['stage']:<32}{_fmt(row['baseline']):>12}{_fmt(row['candidate']):>12}{change:>10}")
+    print(f"{'turns_per_second':<32}{_fmt(baseline.get('turns_per_second')):>12}"
+          f"{_fmt(candidate.get('turns_per_second')):>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
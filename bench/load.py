@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+End-to-end load benchmark for the chat pipeline.
+
+Drives N concurrent simulated users through ``OrchestratorAgent.invoke``
+(with the offline scripted LLM, see ``core/fake_llm.py``) and the profile /
+JD / SSE routes served by an in-process uvicorn server, then writes per-stage
+throughput and latency percentiles, RSS growth and event-loop lag as JSON.
+
+Usage:
+    python -m bench.load --users 20 --turns 5
+    python -m bench.load --users 50 --turns 10 --llm-latency-ms 200 --output run.json
+    python -m bench.load --users 5 --trace spans.jsonl && python -m core.tracing spans.jsonl
+    python -m bench.compare bench/results/a.json bench/results/b.json
+
+``bench.scale`` runs several of these processes against shared state
+(``--shared-state``), released together by ``--barrier``, to measure
+throughput per worker count.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from bench.metrics import LoopLagMonitor, RssSampler, StageTimer
+
+logger = logging.getLogger("bench.load")
+
+RESULTS_DIR = os.path.join(_PROJECT_ROOT, "bench", "results")
+
+# One simulated user's conversation; each message exercises a different
+# specialist through the default fake-LLM script.
+CONVERSATION = [
+    "hi",
+    "what jobs match me?",
+    "analyse my profile",
+    "find python candidates",
+    "draft a message to the hiring manager",
+]
+
+BENCH_PROFILE = {
+    "core": {
+        "name": {"businessFirstName": "Bench", "businessLastName": "User"},
+        "experience": {"experiences": [{"jobTitle": "Data Engineer", "company": "Acme"}]},
+        "qualification": {"educations": [{"institutionName": "MIT"}]},
+        "skills": {"top": [{"name": "Python"}, {"name": "SQL"}], "additional": [{"name": "Docker"}]},
+        "careerAspirationPreference": {"preferredAspirations": [{"code": "lead"}]},
+        "careerLocationPreference": {"preferredRelocationRegions": [{"code": "UK"}]},
+        "careerRolePreference": {"preferredRoles": [{"code": "data"}]},
+        "language": {"languages": [{"language": {"code": "en"}}]},
+    }
+}
+
+BENCH_JD = {
+    "job_title": "Data Engineer",
+    "sections": {"your_team": "Platform data team.", "your_role": "Build pipelines."},
+}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_PROJECT_ROOT, text=True, stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _prepare_environment(workdir: str, args: argparse.Namespace) -> str:
+    """Point profile, drafts and the LLM backend at benchmark-only locations.
+
+    Must run before any ``core`` module is imported: ``core.config`` reads
+    the environment at import time.
+    """
+    profile_path = os.path.join(workdir, "profile.json")
+    with open(profile_path, "w", encoding="utf-8") as f:
+        json.dump(BENCH_PROFILE, f)
+    os.environ["PROFILE_PATH"] = profile_path
+    os.environ["LLM_BACKEND"] = "fake"
+    os.environ["USAGE_DB_PATH"] = os.path.join(workdir, "usage.db")
+    os.environ["FAKE_LLM_LATENCY_MS"] = str(args.llm_latency_ms)
+    os.environ["FAKE_LLM_TOKENS_PER_SECOND"] = str(args.llm_tokens_per_second)
+    if args.shared_state:
+        os.environ["STATE_BACKEND"] = "local"
+        os.environ["STATE_DIR"] = args.shared_state
+        os.environ["CHECKPOINT_DB_PATH"] = os.path.join(args.shared_state, "checkpoints.db")
+    if args.trace:
+        os.environ["TRACING_ENABLED"] = "true"
+        os.environ["TRACE_EXPORT_PATH"] = os.path.abspath(args.trace)
+    return profile_path
+
+
+def _build_api_app(workdir: str):
+    """FastAPI app with the same routers app.py mounts on Chainlit."""
+    from fastapi import FastAPI
+
+    import core.jd_manager
+    import core.profile_manager
+    from core.jd_routes import router as jd_router
+    from core.profile_routes import router as profile_router
+
+    core.profile_manager.DRAFTS_BASE_DIR = os.path.join(workdir, "drafts")
+    core.jd_manager.JD_DRAFTS_BASE_DIR = os.path.join(workdir, "jd_drafts")
+
+    api = FastAPI()
+    api.include_router(profile_router)
+    api.include_router(jd_router)
+    return api
+
+
+async def _serve(api) -> tuple[object, asyncio.Task, int]:
+    import uvicorn
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(
+        api, log_level="warning", lifespan="off", timeout_graceful_shutdown=1,
+    ))
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return server, task, port
+
+
+async def _sse_listener(client, username: str, timer: StageTimer, ready: asyncio.Event) -> None:
+    """Hold an SSE connection open and record push-to-receive latency."""
+    async with client.stream("GET", "/api/profile/events", params={"username": username}, timeout=None) as resp:
+        ready.set()
+        async for line in resp.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            event = json.loads(line[len("data: "):])
+            sent_at = event.get("sent_at")
+            if sent_at is not None:
+                timer.record("sse.delivery", (time.perf_counter() - sent_at) * 1000)
+
+
+async def _simulate_user(
+    index: int,
+    turns: int,
+    orchestrator,
+    client,
+    profile_path: str,
+    timer: StageTimer,
+) -> None:
+    from core.adapters.chainlit_adapter import extract_tool_calls_from_messages
+    from core.profile_routes import push_panel_event
+    from core.state import AppContext
+
+    username = f"bench-user-{index}"
+    headers = {"X-Username": username, "X-Profile-Path": profile_path}
+    context = AppContext(thread_id=f"bench-{index}", first_name="Bench", display_name="Bench User")
+
+    async def call(method: str, path: str, **kwargs):
+        with timer.time(f"{method} {path}"):
+            resp = await client.request(method, path, headers=headers, **kwargs)
+            resp.raise_for_status()
+            return resp
+
+    for turn in range(turns):
+        message = CONVERSATION[turn % len(CONVERSATION)]
+        turn_start = time.perf_counter()
+        try:
+            with timer.time("orchestrator.invoke"):
+                result = await orchestrator.invoke(message, context=context)
+            with timer.time("adapter.extract_tool_calls"):
+                extract_tool_calls_from_messages(result.get("messages", []))
+
+            push_panel_event(username, "refresh", {"sent_at": time.perf_counter()})
+
+            await call("GET", "/api/profile/current")
+            await call("POST", "/api/profile/drafts", json={"profile_data": BENCH_PROFILE, "label": f"turn {turn}"})
+            await call("GET", "/api/profile/drafts")
+            await call("POST", "/api/jd/drafts", json={"jd_data": BENCH_JD, "label": f"turn {turn}"})
+            await call("GET", "/api/jd/latest")
+            await call("GET", "/api/jd/drafts")
+        except Exception:
+            logger.exception("User %d turn %d failed", index, turn)
+        timer.record("turn.total", (time.perf_counter() - turn_start) * 1000)
+
+
+async def _wait_at_barrier(barrier: str) -> None:
+    """Signal readiness in *barrier* and wait until ``bench.scale`` says go."""
+    open(os.path.join(barrier, f"ready-{os.getpid()}"), "w").close()
+    go = os.path.join(barrier, "go")
+    while not os.path.exists(go):
+        await asyncio.sleep(0.01)
+
+
+async def run_load(args: argparse.Namespace, workdir: str, profile_path: str) -> dict:
+    import httpx
+
+    from agents.catalog import build_agent_catalog
+    from agents.orchestrator.agent import create_orchestrator_agent
+    from core.checkpoint import create_checkpointer
+
+    checkpointer = create_checkpointer()
+    registry = build_agent_catalog(checkpointer=checkpointer)
+    registry.build_all()  # keep lazy graph builds out of the measured turns
+    orchestrator = create_orchestrator_agent(registry, checkpointer=checkpointer)
+    server, server_task, port = await _serve(_build_api_app(workdir))
+
+    timer = StageTimer()
+    rss = RssSampler(interval=args.sample_interval)
+    lag = LoopLagMonitor()
+    rss.start()
+    lag.start()
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30) as client:
+        users = range(args.user_offset, args.user_offset + args.users)
+        listeners = []
+        for i in users:
+            ready = asyncio.Event()
+            listeners.append(asyncio.create_task(_sse_listener(client, f"bench-user-{i}", timer, ready)))
+            await ready.wait()
+
+        if args.barrier:
+            await _wait_at_barrier(args.barrier)
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            _simulate_user(i, args.turns, orchestrator, client, profile_path, timer)
+            for i in users
+        ))
+        wall_seconds = time.perf_counter() - started
+
+        await asyncio.sleep(0.05)  # let the last SSE events drain
+        for task in listeners:
+            task.cancel()
+        await asyncio.gather(*listeners, return_exceptions=True)
+
+    await lag.stop()
+    await rss.stop()
+    server.should_exit = True
+    await server_task
+
+    turns = timer.samples.get("turn.total", [])
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "users": args.users,
+            "turns_per_user": args.turns,
+            "llm_latency_ms": args.llm_latency_ms,
+            "llm_tokens_per_second": args.llm_tokens_per_second,
+        },
+        "wall_seconds": round(wall_seconds, 3),
+        "turns_per_second": round(len(turns) / wall_seconds, 3) if wall_seconds else 0.0,
+        "stages": timer.report(wall_seconds),
+        "rss": rss.report(),
+        "event_loop_lag": lag.report(),
+    }
+
+
+def _print_report(report: dict) -> None:
+    print(f"\n{report['meta']['users']} users x {report['meta']['turns_per_user']} turns "
+          f"in {report['wall_seconds']}s ({report['turns_per_second']} turns/s)")
+    print(f"{'stage':<32}{'count':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'err':>5}")
+    for stage, s in report["stages"].items():
+        print(f"{stage:<32}{s['count']:>7}{s.get('throughput_per_s', 0):>9.1f}"
+              f"{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}{s['p99_ms']:>9.1f}{s['errors']:>5}")
+    rss = report["rss"]
+    print(f"RSS {rss.get('start_mb')} -> {rss.get('end_mb')} MB (peak {rss.get('peak_mb')}, growth {rss.get('growth_mb')})")
+    lag = report["event_loop_lag"]
+    print(f"Event-loop lag p50 {lag['p50_ms']} ms, p99 {lag['p99_ms']} ms, max {lag['max_ms']} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load benchmark for the chat pipeline")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent simulated users")
+    parser.add_argument("--turns", type=int, default=5, help="Turns per user")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated LLM latency per call")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=0.0, help="Simulated LLM output rate (0 = instant)")
+    parser.add_argument("--sample-interval", type=float, default=0.5, help="RSS sampling interval in seconds")
+    parser.add_argument("--trace", help="Also export per-stage spans to this JSONL file (see core/tracing.py)")
+    parser.add_argument("--output", help="Result JSON path (default: bench/results/load-<commit>-<time>.json)")
+    parser.add_argument("--user-offset", type=int, default=0, help="Index of the first simulated user")
+    parser.add_argument("--shared-state", help="Share checkpoints and the state backend through this directory")
+    parser.add_argument("--barrier", help="Directory to wait in before starting (used by bench.scale)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s %(message)s")
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        profile_path = _prepare_environment(workdir, args)
+        report = asyncio.run(run_load(args, workdir, profile_path))
+
+    output = args.output
+    if not output:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"load-{report['meta']['commit'] or 'nogit'}-{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    _print_report(report)
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
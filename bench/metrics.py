@@ -0,0 +1,149 @@
+"""
+Measurement helpers for the load benchmarks: per-stage latency percentiles,
+RSS sampling and event-loop lag.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import resource
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of *values* (``pct`` in 0-100); 0.0 when empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(values: list[float], wall_seconds: float | None = None) -> dict:
+    """Count, mean, p50/p95/p99 and max of millisecond samples."""
+    summary = {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(max(values), 3) if values else 0.0,
+    }
+    if wall_seconds:
+        summary["throughput_per_s"] = round(len(values) / wall_seconds, 3)
+    return summary
+
+
+class StageTimer:
+    """Collects latency samples (ms) per named stage."""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    def record(self, stage: str, elapsed_ms: float) -> None:
+        self.samples[stage].append(elapsed_ms)
+
+    @contextmanager
+    def time(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.errors[stage] += 1
+            raise
+        finally:
+            self.record(stage, (time.perf_counter() - start) * 1000)
+
+    def report(self, wall_seconds: float) -> dict:
+        return {
+            stage: {**summarize(values, wall_seconds), "errors": self.errors.get(stage, 0)}
+            for stage, values in sorted(self.samples.items())
+        }
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process.
+
+    Reads ``/proc/self/statm`` where available; elsewhere falls back to the
+    peak RSS reported by ``getrusage``.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RssSampler:
+    """Samples RSS every *interval* seconds while running."""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.samples: list[tuple[float, int]] = []
+        self._task: asyncio.Task | None = None
+        self._start = 0.0
+
+    async def _run(self) -> None:
+        while True:
+            self.samples.append((time.perf_counter() - self._start, rss_bytes()))
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        self._start = time.perf_counter()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.samples.append((time.perf_counter() - self._start, rss_bytes()))
+
+    def report(self) -> dict:
+        if not self.samples:
+            return {}
+        mb = [(round(t, 2), round(b / 1_048_576, 2)) for t, b in self.samples]
+        return {
+            "start_mb": mb[0][1],
+            "end_mb": mb[-1][1],
+            "peak_mb": max(m for _t, m in mb),
+            "growth_mb": round(mb[-1][1] - mb[0][1], 2),
+            "samples": mb,
+        }
+
+
+class LoopLagMonitor:
+    """Measures event-loop lag: how late a periodic ``sleep(interval)`` wakes up."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.lags_ms: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags_ms.append(max(0.0, (time.perf_counter() - start - self.interval) * 1000))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def report(self) -> dict:
+        return summarize(self.lags_ms)
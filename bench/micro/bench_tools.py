@@ -0,0 +1,90 @@
+"""
+Micro-benchmarks for tool and manager hot paths across synthetic data sizes.
+"""
+
+import json
+import os
+import sys
+
+import agents.candidate_search.tools.search_candidates  # noqa: F401
+import agents.candidate_search.tools.view_candidate  # noqa: F401
+import agents.shared.tools.get_matches  # noqa: F401
+import agents.shared.tools.update_profile  # noqa: F401
+import core.jd_manager
+import core.profile
+import core.profile_manager
+from core.jd_manager import JDDraftManager
+from core.profile_manager import ProfileManager
+from core.profile_score import compute_completion_score
+
+# The tools packages re-export the tool objects under the module names.
+search_module = sys.modules["agents.candidate_search.tools.search_candidates"]
+view_module = sys.modules["agents.candidate_search.tools.view_candidate"]
+matches_module = sys.modules["agents.shared.tools.get_matches"]
+update_module = sys.modules["agents.shared.tools.update_profile"]
+
+
+def test_get_matches(benchmark, dataset, monkeypatch, tmp_path):
+    profile_path = tmp_path / "profile.json"
+    profile_path.write_text(json.dumps(dataset.profile))
+    monkeypatch.setattr(matches_module, "DATA_FILE", dataset.jobs_path)
+    monkeypatch.setattr(core.profile, "PROFILE_PATH", str(profile_path))
+
+    result = benchmark(
+        matches_module.run_get_matches,
+        filters={"country": "united"},
+        search_text="engineer",
+        top_k=3,
+        thread_id="bench",
+    )
+    assert result["success"] is True
+
+
+def test_search_candidates(benchmark, dataset, monkeypatch):
+    monkeypatch.setattr(search_module, "_DATA_PATH", dataset.employees_path)
+    result = benchmark(
+        search_module.run_search_candidates,
+        search_text="engineer",
+        filters={"skills": ["Python", "Kubernetes"]},
+    )
+    assert result["success"] is True
+
+
+def test_view_candidate(benchmark, dataset, monkeypatch):
+    monkeypatch.setattr(view_module, "_DATA_PATH", dataset.employees_path)
+    result = benchmark(view_module.run_view_candidate, dataset.last_employee_id)
+    assert result["success"] is True
+
+
+def test_compute_completion_score(benchmark, dataset):
+    assert benchmark(compute_completion_score, dataset.profile) == 100
+
+
+def test_update_profile(benchmark, dataset, monkeypatch, tmp_path):
+    profile_path = str(tmp_path / "profile.json")
+    with open(profile_path, "w", encoding="utf-8") as f:
+        json.dump(dataset.profile, f)
+    monkeypatch.setattr(update_module, "_get_user_context", lambda: ("bench", profile_path))
+    monkeypatch.setattr(core.profile_manager, "DRAFTS_BASE_DIR", str(tmp_path / "drafts"))
+
+    # Skills merge: list sections are capped at MAX_LIST_ENTRIES, skills are not,
+    # so this path scales with the generated profile.
+    result = benchmark(
+        update_module.run_update_profile,
+        section="skills",
+        operation="merge",
+        updates={"skills": ["Bench Skill"]},
+    )
+    assert result["success"] is True
+
+
+def test_profile_list_drafts(benchmark, dataset, monkeypatch):
+    monkeypatch.setattr(core.profile_manager, "DRAFTS_BASE_DIR", dataset.drafts_root)
+    manager = ProfileManager(username="bench", profile_path=os.path.join(dataset.root, "profile.json"))
+    assert len(benchmark(manager.list_drafts)) == dataset.history
+
+
+def test_jd_load_latest(benchmark, dataset, monkeypatch):
+    monkeypatch.setattr(core.jd_manager, "JD_DRAFTS_BASE_DIR", dataset.jd_drafts_root)
+    manager = JDDraftManager(username="bench")
+    assert benchmark(manager.load_latest)["sections"]
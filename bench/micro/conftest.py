@@ -0,0 +1,111 @@
+"""
+Fixtures for the tool micro-benchmarks.
+
+Run with:
+    python -m pytest bench/micro -o python_files='bench_*.py' -q
+    BENCH_SIZES=1k,10k,100k,1m python -m pytest bench/micro -o python_files='bench_*.py' -q
+
+The suite uses pytest-benchmark's ``benchmark`` fixture when the plugin is
+installed (``--benchmark-json`` etc. then work as usual).  Otherwise a
+minimal stand-in with the same call signature times each benchmark and
+prints a summary table at the end of the session.
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import sys
+import time
+
+import pytest
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from bench.synthetic import (
+    SIZES,
+    generate_employees,
+    generate_jobs,
+    generate_profile,
+    write_jd_corpus,
+    write_json,
+    write_profile_drafts,
+)
+
+# Profile histories and draft counts scale at 1/100 of the catalog size:
+# a user has far fewer drafts and roles than the firm has jobs.
+PROFILE_SCALE = 100
+
+
+def bench_sizes() -> list[str]:
+    raw = os.getenv("BENCH_SIZES", "1k,10k")
+    return [s.strip().lower() for s in raw.split(",") if s.strip().lower() in SIZES]
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        metafunc.parametrize("size", bench_sizes(), scope="session")
+
+
+class _Dataset:
+    def __init__(self, root: str, n: int):
+        self.n = n
+        self.root = root
+        self.jobs_path = write_json(os.path.join(root, "matching_jobs.json"), "jobs", generate_jobs(n))
+        self.employees_path = write_json(
+            os.path.join(root, "employee_directory.json"), "employees", generate_employees(n)
+        )
+        self.last_employee_id = f"E{n - 1:07d}"
+        self.history = max(1, n // PROFILE_SCALE)
+        self.profile = generate_profile(self.history)
+        self.drafts_root = os.path.join(root, "drafts")
+        self.jd_drafts_root = os.path.join(root, "jd_drafts")
+        write_profile_drafts(os.path.join(self.drafts_root, "bench"), self.history)
+        write_jd_corpus(os.path.join(self.jd_drafts_root, "bench"), self.history)
+
+
+@pytest.fixture(scope="session")
+def dataset(size, tmp_path_factory):
+    """Synthetic jobs, employees, profile and draft corpora for *size*."""
+    return _Dataset(str(tmp_path_factory.mktemp(f"bench-{size}")), SIZES[size])
+
+
+# ---------------------------------------------------------------------------
+# Fallback benchmark fixture (used only without pytest-benchmark)
+# ---------------------------------------------------------------------------
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    _results: list[tuple[str, list[float]]] = []
+
+    class _Benchmark:
+        def __init__(self, name: str, rounds: int):
+            self.name = name
+            self.rounds = rounds
+
+        def __call__(self, fn, *args, **kwargs):
+            result = fn(*args, **kwargs)  # warm-up
+            timings = []
+            for _ in range(self.rounds):
+                start = time.perf_counter()
+                result = fn(*args, **kwargs)
+                timings.append((time.perf_counter() - start) * 1000)
+            _results.append((self.name, timings))
+            return result
+
+    @pytest.fixture
+    def benchmark(request):
+        return _Benchmark(request.node.nodeid.split("::")[-1], int(os.getenv("BENCH_ROUNDS", "5")))
+
+    def pytest_terminal_summary(terminalreporter):
+        if not _results:
+            return
+        terminalreporter.write_sep("-", "benchmark (ms)")
+        terminalreporter.write_line(f"{'name':<52}{'min':>10}{'median':>10}{'max':>10}")
+        for name, timings in _results:
+            terminalreporter.write_line(
+                f"{name:<52}{min(timings):>10.2f}{statistics.median(timings):>10.2f}{max(timings):>10.2f}"
+            )
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Throughput scaling across worker processes.
+
+For each worker count, starts that many ``bench.load`` processes sharing one
+state directory (SQLite checkpoints plus the ``local`` state backend, as
+``serve.py`` configures them), each driving its own ``--users-per-worker``
+simulated users.  The processes start their timed phase together, and the
+aggregate throughput is the total number of turns divided by the slowest
+process's wall time.  Scaling efficiency is the speed-up over one worker
+divided by the worker count; close to 1.0 means near-linear scaling.
+Worker counts above the number of CPU cores cannot scale and are flagged.
+
+Usage:
+    python -m bench.scale --workers 1,2,4 --users-per-worker 10 --turns 5
+    python -m bench.scale --workers 1,2 --llm-latency-ms 50 --output scale.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from bench.load import RESULTS_DIR, _git_commit
+
+# How long a worker process may take to import and warm up.
+_STARTUP_TIMEOUT_SECONDS = 120
+
+
+def run_workers(workers: int, args: argparse.Namespace) -> list[dict]:
+    """Run *workers* ``bench.load`` processes together and return their reports."""
+    with tempfile.TemporaryDirectory(prefix=f"scale-{workers}-") as tmp:
+        state_dir, barrier = os.path.join(tmp, "state"), os.path.join(tmp, "barrier")
+        os.makedirs(state_dir)
+        os.makedirs(barrier)
+        procs = []
+        for i in range(workers):
+            cmd = [
+                sys.executable, "-m", "bench.load",
+                "--users", str(args.users_per_worker),
+                "--user-offset", str(i * args.users_per_worker),
+                "--turns", str(args.turns),
+                "--llm-latency-ms", str(args.llm_latency_ms),
+                "--shared-state", state_dir,
+                "--barrier", barrier,
+                "--output", os.path.join(tmp, f"worker-{i}.json"),
+            ]
+            procs.append(subprocess.Popen(cmd, cwd=_PROJECT_ROOT, stdout=subprocess.DEVNULL))
+
+        deadline = time.monotonic() + _STARTUP_TIMEOUT_SECONDS
+        while len([f for f in os.listdir(barrier) if f.startswith("ready-")]) < workers:
+            if time.monotonic() > deadline or any(p.poll() not in (None, 0) for p in procs):
+                for p in procs:
+                    p.kill()
+                raise RuntimeError(f"{workers} worker(s) did not become ready")
+            time.sleep(0.05)
+        open(os.path.join(barrier, "go"), "w").close()
+
+        for p in procs:
+            if p.wait() != 0:
+                raise RuntimeError(f"bench.load worker exited with {p.returncode}")
+        reports = []
+        for i in range(workers):
+            with open(os.path.join(tmp, f"worker-{i}.json"), "r", encoding="utf-8") as f:
+                reports.append(json.load(f))
+        return reports
+
+
+def summarize(results: dict[int, list[dict]], cpu_count: int) -> list[dict]:
+    """One row per worker count: aggregate turns/s, speed-up and efficiency vs the smallest count."""
+    rows = []
+    for workers in sorted(results):
+        reports = results[workers]
+        turns = sum(r["meta"]["users"] * r["meta"]["turns_per_user"] for r in reports)
+        wall = max(r["wall_seconds"] for r in reports)
+        rows.append({
+            "workers": workers,
+            "turns": turns,
+            "wall_seconds": wall,
+            "turns_per_second": round(turns / wall, 3) if wall else 0.0,
+            "errors": sum(s.get("errors", 0) for r in reports for s in r["stages"].values()),
+            "oversubscribed": workers > cpu_count,
+        })
+    if rows:
+        base = rows[0]
+        for row in rows:
+            speedup = row["turns_per_second"] / base["turns_per_second"] if base["turns_per_second"] else 0.0
+            row["speedup"] = round(speedup, 2)
+            row["efficiency"] = round(speedup * base["workers"] / row["workers"], 2)
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Throughput scaling across worker processes")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--users-per-worker", type=int, default=10, help="Simulated users per worker")
+    parser.add_argument("--turns", type=int, default=5, help="Turns per user")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated LLM latency per call")
+    parser.add_argument("--output", help="Result JSON path (default: bench/results/scale-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    counts = sorted({int(w) for w in args.workers.split(",") if w.strip()})
+    cpu_count = os.cpu_count() or 1
+    results = {}
+    for workers in counts:
+        print(f"Running {workers} worker(s)...", flush=True)
+        results[workers] = run_workers(workers, args)
+    rows = summarize(results, cpu_count)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "cpu_count": cpu_count,
+            "users_per_worker": args.users_per_worker,
+            "turns_per_user": args.turns,
+            "llm_latency_ms": args.llm_latency_ms,
+        },
+        "scaling": rows,
+    }
+    output = args.output
+    if not output:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"scale-{report['meta']['commit'] or 'nogit'}-{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'workers':>8}{'turns/s':>10}{'speedup':>9}{'efficiency':>12}{'errors':>8}")
+    for row in rows:
+        flag = "  (more workers than CPUs)" if row["oversubscribed"] else ""
+        print(f"{row['workers']:>8}{row['turns_per_second']:>10.2f}{row['speedup']:>9.2f}{row['efficiency']:>12.2f}{row['errors']:>8}{flag}")
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
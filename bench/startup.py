@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Cold-start profile of the agent stack.
+
+Starts a fresh interpreter with ``python -X importtime`` that does what
+``app.py`` does at import -- create the checkpointer, the agent catalog and
+the orchestrator -- and then routes to each specialist once.  Reports:
+
+- ``startup_ms``: wall time until the orchestrator is ready;
+- ``first_use_ms``: time to build each specialist on its first
+  ``AgentRegistry.get`` (graphs are built lazily);
+- the slowest imports of the startup phase, as cumulative and self time in
+  the ``-X importtime`` format;
+- optionally (``--collect``) the wall time of ``pytest --collect-only``.
+
+Runs with ``LLM_BACKEND=fake`` so no Azure credentials are needed.
+
+Usage:
+    python -m bench.startup
+    python -m bench.startup --repeat 5 --top 15 --collect --output startup.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from bench.load import RESULTS_DIR, _git_commit
+
+# Written to stderr between the startup and first-use phases so the
+# import-time lines of each phase can be told apart.
+_PHASE_MARKER = "-- startup done --"
+
+_COLD_START = f"""
+import json, sys, time
+start = time.perf_counter()
+from core.checkpoint import create_checkpointer
+from agents.catalog import build_agent_catalog
+from agents.orchestrator.agent import create_orchestrator_agent
+checkpointer = create_checkpointer()
+registry = build_agent_catalog(checkpointer=checkpointer)
+create_orchestrator_agent(registry, checkpointer=checkpointer)
+startup_ms = (time.perf_counter() - start) * 1000
+print({_PHASE_MARKER!r}, file=sys.stderr, flush=True)
+first_use_ms = {{}}
+for name in registry.list_agents():
+    t = time.perf_counter()
+    registry.get(name)
+    first_use_ms[name] = (time.perf_counter() - t) * 1000
+print(json.dumps({{"startup_ms": startup_ms, "first_use_ms": first_use_ms}}))
+"""
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """Parse ``-X importtime`` lines into ``{module, self_us, cumulative_us, depth}`` rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        rows.append({
+            "module": stripped,
+            "self_us": int(fields[0]),
+            "cumulative_us": int(fields[1]),
+            "depth": (len(name) - len(stripped) - 1) // 2,
+        })
+    return rows
+
+
+def top_imports(rows: list[dict], top: int) -> dict[str, list[dict]]:
+    """Slowest imports by cumulative time (top-level only) and by self time."""
+    top_level = [r for r in rows if r["depth"] == 0]
+    return {
+        "cumulative": sorted(top_level, key=lambda r: r["cumulative_us"], reverse=True)[:top],
+        "self": sorted(rows, key=lambda r: r["self_us"], reverse=True)[:top],
+    }
+
+
+def run_cold_start() -> dict:
+    """Run one cold start in a fresh interpreter and return its measurements."""
+    env = {**os.environ, "LLM_BACKEND": "fake"}
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _COLD_START],
+        cwd=_PROJECT_ROOT, env=env, capture_output=True, text=True,
+    )
+    process_ms = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"cold start failed:\n{proc.stderr[-2000:]}")
+    startup_stderr = proc.stderr.split(_PHASE_MARKER, 1)[0]
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_ms"] = process_ms
+    result["imports"] = parse_importtime(startup_stderr)
+    return result
+
+
+def measure_collection() -> float:
+    """Wall time in ms of ``pytest --collect-only`` over the test suite."""
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q"],
+        cwd=_PROJECT_ROOT, capture_output=True, check=True,
+    )
+    return (time.perf_counter() - started) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Cold-start profile of the agent stack")
+    parser.add_argument("--repeat", type=int, default=3, help="Cold starts to run; medians are reported")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to report")
+    parser.add_argument("--collect", action="store_true", help="Also time pytest test collection")
+    parser.add_argument("--output", help="Result JSON path (default: bench/results/startup-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    runs = [run_cold_start() for _ in range(args.repeat)]
+    agents = runs[0]["first_use_ms"]
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "repeat": args.repeat,
+        },
+        "startup_ms": round(statistics.median(r["startup_ms"] for r in runs), 1),
+        "process_ms": round(statistics.median(r["process_ms"] for r in runs), 1),
+        "first_use_ms": {
+            name: round(statistics.median(r["first_use_ms"][name] for r in runs), 1) for name in agents
+        },
+        # Import times from the last run, when the OS file cache is warm.
+        "imports": top_imports(runs[-1]["imports"], args.top),
+    }
+    if args.collect:
+        report["collect_ms"] = round(measure_collection(), 1)
+
+    output = args.output
+    if not output:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"startup-{report['meta']['commit'] or 'nogit'}-{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"Startup (catalog + orchestrator): {report['startup_ms']:.0f} ms; process total: {report['process_ms']:.0f} ms")
+    for name, ms in report["first_use_ms"].items():
+        print(f"  first use of {name:<18}{ms:>8.0f} ms")
+    if "collect_ms" in report:
+        print(f"Test collection: {report['collect_ms']:.0f} ms")
+    print(f"\nimport time: {'self [us]':>10} | {'cumulative':>10} | top-level package")
+    for row in report["imports"]["cumulative"]:
+        print(f"import time: {row['self_us']:>10} | {row['cumulative_us']:>10} | {row['module']}")
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic data generators at benchmark scale.
+
+Records have the same shape as the checked-in data files
+(``matching_jobs.json``, ``employee_directory.json``, profile JSON, JD
+drafts) so the tools can be timed against 1k - 1M rows.  Every generator
+takes a ``seed`` and yields identical output for identical arguments, which
+keeps benchmark runs comparable across commits.
+
+Usage:
+    python -m bench.synthetic --size 100k --out /tmp/bench-data
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+SKILLS = [
+    "Python", "SQL", "Java", "Go", "Kubernetes", "Docker", "Machine Learning", "NLP",
+    "Data Engineering", "Spark", "Kafka", "React", "TypeScript", "Azure", "AWS",
+    "Team Leadership", "Stakeholder Management", "Risk Management", "Agile", "Terraform",
+]
+TITLES = [
+    "Data Engineer", "Software Engineer", "GenAI Lead", "Product Manager", "Risk Analyst",
+    "Platform Engineer", "ML Engineer", "Business Analyst", "DevOps Engineer", "Architect",
+]
+LEVELS = [
+    ("AS", "Associate"), ("AO", "Authorized Officer"), ("AD", "Associate Director"),
+    ("DIR", "Director"), ("ED", "Executive Director"), ("MD", "Managing Director"),
+]
+LOCATIONS = [
+    ("United States", "New York, New York"), ("United Kingdom", "London"),
+    ("Switzerland", "Zurich"), ("Singapore", "Singapore"), ("Poland", "Krakow"),
+]
+ORG_LINES = ["GWM COO Americas", "Group Technology", "Investment Bank", "Asset Management", "Group Risk"]
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Robin", "Avery"]
+LAST_NAMES = ["Smith", "Chen", "Garcia", "Müller", "Patel", "Kowalski", "Tan", "Rossi", "Novak", "Khan"]
+WORDS = (
+    "deliver scalable platforms partner with stakeholders across the business lead engineering "
+    "teams design data pipelines improve reliability mentor colleagues drive adoption of cloud "
+    "native tooling own the roadmap for analytics and automation"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def generate_jobs(n: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Job postings shaped like ``data/matching_jobs.json`` entries."""
+    rng = random.Random(seed)
+    today = date.today()
+    jobs = []
+    for i in range(n):
+        code, corporate_title = rng.choice(LEVELS)
+        country, location = rng.choice(LOCATIONS)
+        title = rng.choice(TITLES)
+        org_line = rng.choice(ORG_LINES)
+        jobs.append({
+            "id": f"{100000 + i}BR",
+            "title": title,
+            "corporateTitle": corporate_title,
+            "corporateTitleCode": code,
+            "hiringManager": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "orgLine": org_line,
+            "country": country,
+            "location": location,
+            "businessArea": org_line,
+            "rank": f"{code} {corporate_title}",
+            "postedDate": (today - timedelta(days=rng.randint(0, 90))).isoformat(),
+            "matchScore": round(rng.uniform(0.5, 4.0), 1),
+            "matchReason": _sentence(rng, 20),
+            "matchingSkills": rng.sample(SKILLS, 3),
+            "summary": _sentence(rng, 50),
+            "yourRole": _sentence(rng, 70),
+            "requirements": [_sentence(rng, 10) for _ in range(5)],
+        })
+    return jobs
+
+
+def generate_employees(n: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Directory records shaped like ``data/employee_directory.json`` entries."""
+    rng = random.Random(seed)
+    employees = []
+    for i in range(n):
+        code, rank_name = rng.choice(LEVELS)
+        country, location = rng.choice(LOCATIONS)
+        employees.append({
+            "employeeId": f"E{i:07d}",
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "businessTitle": rng.choice(TITLES),
+            "department": rng.choice(ORG_LINES),
+            "country": country,
+            "location": location,
+            "rank": {"code": code, "name": rank_name},
+            "skills": rng.sample(SKILLS, rng.randint(3, 8)),
+            "profileCompletionScore": rng.randint(20, 100),
+            "yearsAtFirm": rng.randint(0, 25),
+        })
+    return employees
+
+
+def generate_profile(history: int, seed: int = 0) -> dict[str, Any]:
+    """A user profile with *history* experience entries and proportional other sections."""
+    rng = random.Random(seed)
+    experiences = []
+    start = date(2000, 1, 1)
+    for i in range(history):
+        begin = start + timedelta(days=30 * i)
+        experiences.append({
+            "id": f"exp-{i}",
+            "jobTitle": rng.choice(TITLES),
+            "company": rng.choice(ORG_LINES),
+            "startDate": begin.isoformat(),
+            "endDate": (begin + timedelta(days=29)).isoformat(),
+            "description": _sentence(rng, 30),
+        })
+    skill_count = max(3, history // 10)
+    return {
+        "core": {
+            "name": {"businessFirstName": rng.choice(FIRST_NAMES), "businessLastName": rng.choice(LAST_NAMES)},
+            "experience": {"experiences": experiences},
+            "qualification": {"educations": [
+                {"id": f"edu-{i}", "institutionName": f"University {i}", "degree": "BSc"}
+                for i in range(max(1, history // 20))
+            ]},
+            "skills": {
+                "top": [{"id": f"sk-{i}", "source": "MANUAL", "name": f"{SKILLS[i % len(SKILLS)]} {i}"} for i in range(5)],
+                "additional": [
+                    {"id": f"sk-add-{i}", "source": "AI_INFERRED", "name": f"{SKILLS[i % len(SKILLS)]} {i}"}
+                    for i in range(skill_count)
+                ],
+            },
+            "careerAspirationPreference": {"preferredAspirations": [{"code": "lead"}]},
+            "careerLocationPreference": {"preferredRelocationRegions": [{"code": "UK"}]},
+            "careerRolePreference": {"preferredRoles": [{"code": "data"}]},
+            "language": {"languages": [{"language": {"code": "en"}}]},
+        }
+    }
+
+
+def generate_jd(seed: int = 0) -> dict[str, Any]:
+    """A JD draft body shaped like ``JDDraftManager`` drafts."""
+    rng = random.Random(seed)
+    return {
+        "title": rng.choice(TITLES),
+        "department": rng.choice(ORG_LINES),
+        "level": rng.choice(LEVELS)[1],
+        "sections": {
+            "your_team": _sentence(rng, 60),
+            "your_role": "\n".join(f"- {_sentence(rng, 12)}" for _ in range(6)),
+            "your_expertise": "\n".join(f"- {_sentence(rng, 10)}" for _ in range(6)),
+        },
+    }
+
+
+def write_json(path: str, key: str, records: list[dict[str, Any]]) -> str:
+    """Write ``{key: records}`` to *path* (the layout the tools read)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({key: records}, f)
+    return path
+
+
+def _write_drafts(drafts_dir: str, prefix: str, bodies, extra_meta: dict[str, Any]) -> None:
+    os.makedirs(drafts_dir, exist_ok=True)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i, body in enumerate(bodies):
+        ts = (base + timedelta(seconds=i)).strftime("%Y%m%dT%H%M%S%fZ")
+        draft_id = f"{prefix}_{ts}"
+        payload = {**body, "_meta": {"draft_id": draft_id, "timestamp": ts, "label": f"v{i}", **extra_meta}}
+        with open(os.path.join(drafts_dir, f"{draft_id}.json"), "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+
+
+def write_profile_drafts(drafts_dir: str, n: int, history: int = 10, seed: int = 0) -> None:
+    """Write *n* ``ProfileManager`` draft files into *drafts_dir*."""
+    profile = generate_profile(history, seed)
+    _write_drafts(drafts_dir, "draft", (profile for _ in range(n)), {})
+
+
+def write_jd_corpus(drafts_dir: str, n: int, seed: int = 0) -> None:
+    """Write *n* ``JDDraftManager`` draft files into *drafts_dir*."""
+    _write_drafts(drafts_dir, "jd_draft", (generate_jd(seed + i) for i in range(n)), {"finalized": False})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate synthetic benchmark datasets")
+    parser.add_argument("--size", choices=sorted(SIZES), default="1k")
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    n = SIZES[args.size]
+    write_json(os.path.join(args.out, "matching_jobs.json"), "jobs", generate_jobs(n, args.seed))
+    write_json(os.path.join(args.out, "employee_directory.json"), "employees", generate_employees(n, args.seed))
+    with open(os.path.join(args.out, "profile.json"), "w", encoding="utf-8") as f:
+        json.dump(generate_profile(max(1, n // 100), args.seed), f)
+    print(f"Wrote {n} jobs, {n} employees and a profile to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -385,6 +385,22 @@ def _simulate_update(profile: dict, section: str, updates: dict) -> dict:
 ORCHESTRATOR_TOOL_NAMES = {"profile", "job_discovery", "outreach", "candidate_search", "jd_generator"}
 
 
+def _tool_message_payload(msg) -> Any:
+    """Return the full result carried by a ToolMessage.
+
+    Projected tool results (see ``core.projection``) keep the complete
+    payload on ``artifact``; the ``content`` is only the LLM-facing subset.
+    """
+    artifact = getattr(msg, "artifact", None)
+    if isinstance(artifact, dict):
+        return artifact
+    try:
+        content = msg.content
+        return json.loads(content) if isinstance(content, str) else content
+    except (json.JSONDecodeError, TypeError):
+        return {"raw": str(msg.content)}
+
+
 def extract_tool_calls_from_messages(messages: list) -> list[tuple[str, dict]]:
     """Extract tool name and result pairs from agent response messages.
 
@@ -393,7 +409,8 @@ def extract_tool_calls_from_messages(messages: list) -> list[tuple[str, dict]]:
     ``jd_generator_agent``), the returned JSON contains a ``tool_calls``
     array with the specialist's inner tool results.  These are unwrapped so
     that ``render_tool_elements`` receives the inner tool names it expects
-    (e.g. ``get_matches``, ``profile_analyzer``).
+    (e.g. ``get_matches``, ``profile_analyzer``).  Full results are read
+    from ``ToolMessage.artifact`` when present.
     """
     tool_calls: list[tuple[str, dict]] = []
     for msg in messages:
@@ -401,11 +418,7 @@ def extract_tool_calls_from_messages(messages: list) -> list[tuple[str, dict]]:
             continue
 
         tool_name = getattr(msg, "name", "")
-        try:
-            content = msg.content
-            result = json.loads(content) if isinstance(content, str) else content
-        except (json.JSONDecodeError, TypeError):
-            result = {"raw": str(msg.content)}
+        result = _tool_message_payload(msg)
 
         if (
             tool_name in ORCHESTRATOR_TOOL_NAMES
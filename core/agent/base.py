@@ -2,13 +2,68 @@
 BaseAgent wrapping LangChain's create_agent.
 """
 
-from typing import Any, AsyncIterator
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Iterator
 
 from langchain.agents import create_agent
+from langchain_core.messages import AIMessage, HumanMessage
 from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END
 from langgraph.types import Command
 
 from core.agent.config import AgentConfig
+from core.agent.graph_cache import get_graph_cache
+from core.config import CONTEXT_BUDGET_TOKENS
+from core.metrics import SUMMARIZATIONS
+from core.middleware.context_budget import ContextBudgetMiddleware
+from core.middleware.summarization import TURN_STARTED_KEY, TokenSummarizationMiddleware
+from core.tracing import TracingCheckpointer, span, tracing_enabled
+
+logger = logging.getLogger("chatbot.agent")
+
+
+def extract_interrupts(result: dict) -> list[dict]:
+    """Return the pending HITL interrupts from an ``invoke``/``resume`` result.
+
+    LangGraph reports interrupts raised during a run under the
+    ``__interrupt__`` key of the returned state, so callers can detect them
+    without re-reading the thread from the checkpointer.
+    """
+    pending: list[dict] = []
+    for intr in result.get("__interrupt__") or []:
+        pending.append({
+            "value": intr.value if hasattr(intr, "value") else intr,
+            "resumable": intr.resumable if hasattr(intr, "resumable") else True,
+            "ns": intr.ns if hasattr(intr, "ns") else None,
+        })
+    return pending
+
+
+def _user_message(content: str, turn_id: str) -> HumanMessage:
+    """The user's message opening a turn, with the turn id and start time."""
+    return HumanMessage(content=content, id=turn_id, additional_kwargs={TURN_STARTED_KEY: time.time()})
+
+
+def slice_current_turn(messages: list, turn_id: str | None = None) -> list:
+    """Return the messages of the turn whose ``HumanMessage`` has id *turn_id*.
+
+    Scans backwards from the end, so the cost is proportional to the turn
+    rather than the accumulated history.  Without a *turn_id*, or if the
+    marker is gone (e.g. the turn's message was folded into a summary), the
+    slice starts at the last ``HumanMessage`` instead.
+    """
+    if turn_id:
+        for i in range(len(messages) - 1, -1, -1):
+            if getattr(messages[i], "id", None) == turn_id:
+                return messages[i:]
+    for i in range(len(messages) - 1, -1, -1):
+        if getattr(messages[i], "type", None) == "human":
+            return messages[i:]
+    return messages
 
 
 class BaseAgent:
@@ -17,23 +72,50 @@ class BaseAgent:
     def __init__(self, config: AgentConfig):
         self.config = config
         self.checkpointer = config.checkpointer or InMemorySaver()
+        self._summarizer = next(
+            (m for m in config.middleware or [] if isinstance(m, TokenSummarizationMiddleware) and m.background),
+            None,
+        )
+        self._active_threads: set[str] = set()
+        self._compactions: dict[str, asyncio.Task] = {}
         self._graph = self._build()
 
     def _build(self):
+        middleware = list(self.config.middleware or [])
+        for m in middleware:
+            if isinstance(m, TokenSummarizationMiddleware) and not m.agent_name:
+                m.agent_name = self.config.name
+        if self.config.system_prompt:
+            # After the dynamic prompts, so it sees what they appended.
+            budget = self.config.context_budget_tokens
+            middleware.append(ContextBudgetMiddleware(
+                self.config.name,
+                self.config.system_prompt,
+                CONTEXT_BUDGET_TOKENS if budget is None else budget,
+            ))
+        checkpointer = self.checkpointer
+        if tracing_enabled():
+            from core.middleware.tracing import TracingMiddleware, trace_middleware
+
+            middleware = [trace_middleware(m) for m in middleware] + [TracingMiddleware(self.config.name)]
+            checkpointer = TracingCheckpointer(checkpointer)
+
         kwargs: dict[str, Any] = {
             "model": self.config.llm,
             "tools": self.config.tools,
             "system_prompt": self.config.system_prompt,
             "name": self.config.name,
-            "checkpointer": self.checkpointer,
         }
-        if self.config.middleware:
-            kwargs["middleware"] = self.config.middleware
+        if middleware:
+            kwargs["middleware"] = middleware
         if self.config.state_schema:
             kwargs["state_schema"] = self.config.state_schema
         if self.config.context_schema:
             kwargs["context_schema"] = self.config.context_schema
-        return create_agent(**kwargs)
+        # Compiled once per configuration and process; this agent gets a
+        # copy bound to its own checkpointer.
+        graph = get_graph_cache().get_or_build(kwargs, lambda: create_agent(**kwargs))
+        return graph.copy(update={"checkpointer": checkpointer})
 
     @property
     def graph(self):
@@ -45,27 +127,115 @@ class BaseAgent:
         *,
         context: Any = None,
     ) -> dict:
+        """Run one turn and return the resulting state.
+
+        The user message is stored with a fresh turn id as its message id, and
+        the returned ``messages`` hold only this turn (from that message
+        onward) rather than the full checkpointed history.
+        """
         thread_id = getattr(context, "thread_id", "")
         config: dict[str, Any] = {}
         if thread_id:
             config["configurable"] = {"thread_id": thread_id}
+        turn_id = str(uuid.uuid4())
         kwargs: dict[str, Any] = {
-            "input": {"messages": [{"role": "user", "content": message}]},
+            "input": {"messages": [_user_message(message, turn_id)]},
             "config": config,
         }
         if context is not None:
             kwargs["context"] = context
-        return await self._graph.ainvoke(**kwargs)
+        with self._turn(thread_id), span(f"agent:{self.config.name}", agent=self.config.name, thread_id=thread_id):
+            result = await self._graph.ainvoke(**kwargs)
+        return {**result, "messages": slice_current_turn(result.get("messages", []), turn_id)}
 
     async def get_state(self, thread_id: str):
         """Return the current graph state snapshot for a thread."""
         config = {"configurable": {"thread_id": thread_id}}
         return await self._graph.aget_state(config)
 
+    async def has_history(self, thread_id: str) -> bool:
+        """True if *thread_id* already holds messages."""
+        snapshot = await self.get_state(thread_id)
+        return bool(snapshot.values.get("messages"))
+
+    async def record_turn(self, message: str, response: str, *, thread_id: str) -> None:
+        """Append a turn answered outside the graph (e.g. from a cache) to the thread.
+
+        The exchange is written as the model's output and the run is then
+        marked finished, so the next ``invoke`` sees it as ordinary history.
+        """
+        config = {"configurable": {"thread_id": thread_id}}
+        update = {"messages": [_user_message(message, str(uuid.uuid4())), AIMessage(content=response)]}
+        with self._turn(thread_id):
+            config = await self._graph.aupdate_state(config, update, as_node="model")
+            await self._graph.aupdate_state(config, None, as_node=END)
+
     async def resume(self, value: Any, *, thread_id: str) -> dict:
-        """Resume an interrupted graph with the given value."""
+        """Resume an interrupted graph with the given value.
+
+        Like ``invoke``, the returned ``messages`` hold only the interrupted
+        turn (from its ``HumanMessage`` onward).
+        """
+        config = {"configurable": {"thread_id": thread_id}}
+        with self._turn(thread_id), span(f"agent:{self.config.name}.resume", agent=self.config.name, thread_id=thread_id):
+            result = await self._graph.ainvoke(Command(resume=value), config=config)
+        return {**result, "messages": slice_current_turn(result.get("messages", []))}
+
+    # -- background summarization ---------------------------------------------
+
+    @contextmanager
+    def _turn(self, thread_id: str) -> Iterator[None]:
+        """Mark *thread_id* busy for the block, then schedule its compaction."""
+        if not thread_id:
+            yield
+            return
+        self._active_threads.add(thread_id)
+        try:
+            yield
+        finally:
+            self._active_threads.discard(thread_id)
+            self._schedule_compaction(thread_id)
+
+    def _schedule_compaction(self, thread_id: str) -> None:
+        if self._summarizer is None or thread_id in self._compactions:
+            return
+        task = asyncio.create_task(self._compact(thread_id))
+        self._compactions[thread_id] = task
+        task.add_done_callback(lambda _: self._compactions.pop(thread_id, None))
+
+    async def _compact(self, thread_id: str) -> None:
+        """Summarize *thread_id*'s older history and swap it into the checkpoint.
+
+        Runs after a turn, so users never wait on the summary.  The swap is
+        dropped (``stale``) if a turn started or finished on the thread while
+        the summary was being written; the end of that turn schedules a
+        fresh attempt.
+        """
+        name = self.config.name
         config = {"configurable": {"thread_id": thread_id}}
-        return await self._graph.ainvoke(Command(resume=value), config=config)
+        try:
+            snapshot = await self._graph.aget_state(config)
+            if snapshot.next:
+                return  # paused on a HITL interrupt
+            with span(f"summarize:{name}", agent=name, thread_id=thread_id):
+                compacted = await self._summarizer.acompact(snapshot.values.get("messages", []), thread_id)
+            if compacted is None:
+                return
+            update, outcome = compacted
+            latest = await self._graph.aget_state(config)
+            if thread_id in self._active_threads or latest.config != snapshot.config:
+                SUMMARIZATIONS.inc(name, "stale")
+                return
+            await self._graph.aupdate_state(snapshot.config, {"messages": update})
+            SUMMARIZATIONS.inc(name, outcome)
+        except Exception:
+            SUMMARIZATIONS.inc(name, "error")
+            logger.exception("Background summarization failed for %s thread %s", name, thread_id)
+
+    async def wait_for_compactions(self) -> None:
+        """Wait until scheduled background summarizations finish (tests, shutdown)."""
+        while self._compactions:
+            await asyncio.gather(*list(self._compactions.values()), return_exceptions=True)
 
     async def stream(
         self,
@@ -73,16 +243,25 @@ class BaseAgent:
         *,
         context: Any = None,
     ) -> AsyncIterator[dict]:
+        """Run one turn, yielding the state after each step.
+
+        The user message is marked with a turn id as in ``invoke``, and each
+        yielded state's ``messages`` hold only this turn.
+        """
         thread_id = getattr(context, "thread_id", "")
         config: dict[str, Any] = {}
         if thread_id:
             config["configurable"] = {"thread_id": thread_id}
+        turn_id = str(uuid.uuid4())
         kwargs: dict[str, Any] = {
-            "input": {"messages": [{"role": "user", "content": message}]},
+            "input": {"messages": [_user_message(message, turn_id)]},
             "config": config,
             "stream_mode": "values",
         }
         if context is not None:
             kwargs["context"] = context
-        async for chunk in self._graph.astream(**kwargs):
-            yield chunk
+        with self._turn(thread_id), span(f"agent:{self.config.name}.stream", agent=self.config.name, thread_id=thread_id):
+            async for chunk in self._graph.astream(**kwargs):
+                if "messages" in chunk:
+                    chunk = {**chunk, "messages": slice_current_turn(chunk["messages"], turn_id)}
+                yield chunk
@@ -19,3 +19,5 @@ class AgentConfig:
     context_schema: type | None = None
     checkpointer: Any = None
     context_factory: Callable[[str], Any] | None = None
+    # Token budget for per-user prompt context; None uses CONTEXT_BUDGET_TOKENS.
+    context_budget_tokens: int | None = None
@@ -0,0 +1,141 @@
+"""
+Process-wide cache of compiled agent graphs.
+
+``create_agent`` validates the tools, middleware and schemas and compiles a
+LangGraph graph on every call.  Apart from its checkpointer a compiled
+graph holds no per-conversation state, so agents whose configuration is
+the same share one compiled graph: ``BaseAgent`` takes the cached graph and
+binds its own checkpointer with ``Pregel.copy``.  Rebuilding the agent
+catalog -- per eval scenario, per test, or for an extra orchestrator -- then
+costs a dictionary lookup per agent.
+
+The cache key is a structural fingerprint of the ``create_agent`` arguments:
+
+- long strings such as system prompts by SHA-256;
+- functions by their code object plus whatever their closures capture;
+- tools and middleware by type and public attributes, so a fresh
+  ``HumanInTheLoopMiddleware`` with the same ``interrupt_on`` matches the
+  one used to build the cached graph; middleware also by the functions in
+  its class, which for decorator-built middleware wrap the user's function;
+- anything else -- chat models (``core.llm.get_llm`` shares one client per
+  setting), schemas, objects captured by closures -- by identity.  The
+  orchestrator's routing tools capture its registry and context variable,
+  so each orchestrator still compiles its own graph.
+
+Each entry keeps the arguments it was built from, so objects keyed by
+identity stay alive (and their ids unique) while the entry is cached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import types
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.tools import BaseTool
+
+from core.config import AGENT_GRAPH_CACHE_MAX_ENTRIES
+from core.invalidation import on_invalidate
+from core.metrics import register_cache
+
+# Strings longer than this are keyed by their digest.
+_HASH_STRINGS_OVER = 256
+
+
+def _fingerprint(obj: Any, active: frozenset[int] = frozenset()) -> Hashable:
+    if obj is None or isinstance(obj, (bool, int, float, bytes)):
+        return obj
+    if isinstance(obj, str):
+        if len(obj) > _HASH_STRINGS_OVER:
+            return ("sha256", hashlib.sha256(obj.encode("utf-8")).hexdigest())
+        return obj
+    if id(obj) in active:
+        return ("cycle",)
+    active = active | {id(obj)}
+    if isinstance(obj, (list, tuple)):
+        return (type(obj).__name__, *(_fingerprint(v, active) for v in obj))
+    if isinstance(obj, dict):
+        return ("dict", *sorted((repr(k), _fingerprint(v, active)) for k, v in obj.items()))
+    if isinstance(obj, types.MethodType):
+        return ("method", _fingerprint(obj.__func__, active), _fingerprint(obj.__self__, active))
+    if isinstance(obj, types.FunctionType):
+        cells = tuple(_fingerprint(c.cell_contents, active) for c in obj.__closure__ or ())
+        return ("function", id(obj.__code__), cells, _fingerprint(obj.__defaults__, active))
+    if isinstance(obj, (AgentMiddleware, BaseTool)):
+        # Private attributes hold state derived from the public settings
+        # (e.g. the summarizer's retry-wrapped model).  ``@tool`` derives
+        # a fresh args schema class from the function on every call.
+        attrs = {k: v for k, v in vars(obj).items() if not k.startswith("_")}
+        if isinstance(obj, BaseTool) and (getattr(obj, "func", None) or getattr(obj, "coroutine", None)):
+            attrs.pop("args_schema", None)
+        # ``@dynamic_prompt`` / ``@wrap_tool_call`` middleware is a class
+        # named after the decorated function, whose hooks close over it; the
+        # class's own hooks tell two same-named functions apart.
+        hooks = {k: v for k, v in vars(type(obj)).items() if isinstance(v, types.FunctionType)}
+        return (
+            "object",
+            type(obj).__module__,
+            type(obj).__qualname__,
+            _fingerprint(attrs, active),
+            _fingerprint(hooks, active),
+        )
+    # Models, schemas, registries, context vars...: only the same object matches.
+    return ("id", id(obj))
+
+
+def graph_key(**create_agent_kwargs: Any) -> Hashable:
+    """Return the cache key for a ``create_agent`` call with these arguments."""
+    return _fingerprint(create_agent_kwargs)
+
+
+class GraphCache:
+    """Bounded LRU of compiled graphs keyed by ``graph_key``."""
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[Any, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, kwargs: dict[str, Any], build: Callable[[], Any]) -> Any:
+        """Return the graph cached for *kwargs*, calling *build* on a miss."""
+        key = graph_key(**kwargs)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            graph = build()
+            self._entries[key] = (graph, kwargs)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return graph
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_graph_cache: GraphCache | None = None
+_graph_cache_lock = threading.Lock()
+
+
+def get_graph_cache() -> GraphCache:
+    """Return the process-wide graph cache used by ``BaseAgent``."""
+    global _graph_cache
+    if _graph_cache is None:
+        with _graph_cache_lock:
+            if _graph_cache is None:
+                cache = _graph_cache = GraphCache(max_entries=AGENT_GRAPH_CACHE_MAX_ENTRIES)
+                register_cache("agent_graph", cache)
+                on_invalidate("catalog", lambda _key: cache.clear())
+    return _graph_cache
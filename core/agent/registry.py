@@ -1,10 +1,16 @@
 """
 Agent registry for looking up agents by name.
+
+Agents can be registered ready-built or as a factory.  A factory-registered
+agent is built on the first ``get()`` -- so a process only pays for the
+graphs (and tool imports) of the agents it actually uses -- and reused
+afterwards.
 """
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import threading
+from typing import TYPE_CHECKING, Callable
 
 if TYPE_CHECKING:
     from core.agent.base import BaseAgent
@@ -15,15 +21,48 @@ class AgentRegistry:
 
     def __init__(self) -> None:
         self._agents: dict[str, BaseAgent] = {}
+        self._factories: dict[str, tuple[str, Callable[[], BaseAgent]]] = {}
+        self._lock = threading.Lock()
 
     def register(self, agent: BaseAgent) -> None:
         self._agents[agent.config.name] = agent
 
+    def register_factory(self, name: str, description: str, factory: Callable[[], BaseAgent]) -> None:
+        """Register *factory* to build agent *name* on first use.
+
+        *description* is what callers (the orchestrator's routing tools)
+        see before the agent exists.
+        """
+        self._factories[name] = (description, factory)
+
     def get(self, name: str) -> BaseAgent | None:
-        return self._agents.get(name)
+        agent = self._agents.get(name)
+        if agent is not None or name not in self._factories:
+            return agent
+        with self._lock:
+            agent = self._agents.get(name)
+            if agent is None:
+                agent = self._factories[name][1]()
+                self._agents[name] = agent
+        return agent
+
+    def describe(self, name: str) -> str | None:
+        """Return the description of agent *name* without building it."""
+        if name in self._factories:
+            return self._factories[name][0]
+        agent = self._agents.get(name)
+        return agent.config.description if agent is not None else None
+
+    def is_built(self, name: str) -> bool:
+        return name in self._agents
+
+    def build_all(self) -> None:
+        """Build every factory-registered agent now (e.g. to warm a worker)."""
+        for name in self.list_agents():
+            self.get(name)
 
     def list_agents(self) -> list[str]:
-        return list(self._agents.keys())
+        return list(dict.fromkeys([*self._factories, *self._agents]))
 
     def __contains__(self, name: str) -> bool:
-        return name in self._agents
+        return name in self._agents or name in self._factories
@@ -0,0 +1,377 @@
+"""
+Pluggable shared state and pub/sub.
+
+State that must be visible to every app worker -- side-panel events, the
+username → profile path map, per-thread caches -- goes through the backend
+selected by ``STATE_BACKEND``:
+
+- ``memory`` (default): dicts and direct callbacks; a single process.
+- ``local``: processes on one host.  Key/value state lives in a SQLite
+  database in ``STATE_DIR`` (WAL mode); messages are Unix datagrams sent to
+  every process's socket in ``STATE_DIR/bus``.
+- ``redis``: any number of hosts, via ``REDIS_URL`` (needs the ``redis``
+  package).
+
+Values are JSON-serializable.  ``add_to_set`` updates a set-valued key
+atomically across workers (a SQLite write transaction, Redis ``MULTI`` with
+``SADD``); such keys are only read back through ``add_to_set``.  Subscribers' callbacks run on a backend
+thread (or inline for ``memory``), so they must be thread-safe.  Every
+subscriber receives its own process's messages too, so a publisher handles
+local and remote delivery in one code path.
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable
+
+from core.config import REDIS_URL, STATE_BACKEND, STATE_DIR
+
+logger = logging.getLogger("chatbot.backend")
+
+Callback = Callable[[dict], None]
+
+
+class StateBackend:
+    """Key/value state with optional TTL, plus channel pub/sub."""
+
+    name = "base"
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        raise NotImplementedError
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float | None = None) -> None:
+        raise NotImplementedError
+
+    def delete(self, namespace: str, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self, namespace: str) -> None:
+        raise NotImplementedError
+
+    def add_to_set(self, namespace: str, key: str, members: set[str], ttl: float | None = None) -> set[str]:
+        """Atomically add *members* to the set at *key*; return the members it held before."""
+        raise NotImplementedError
+
+    def publish(self, channel: str, message: dict) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, channel: str, callback: Callback) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def _dispatch(self, subscribers: dict[str, list[Callback]], channel: str, message: dict) -> None:
+        for callback in list(subscribers.get(channel, ())):
+            try:
+                callback(message)
+            except Exception:
+                logger.exception("Subscriber for '%s' failed", channel)
+
+
+# ---------------------------------------------------------------------------
+# In-process
+# ---------------------------------------------------------------------------
+
+class MemoryBackend(StateBackend):
+    name = "memory"
+
+    def __init__(self):
+        self._data: dict[tuple[str, str], tuple[Any, float | None]] = {}
+        self._subscribers: dict[str, list[Callback]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace, key):
+        with self._lock:
+            entry = self._data.get((namespace, key))
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and time.time() >= expires:
+                del self._data[(namespace, key)]
+                return None
+            return value
+
+    def set(self, namespace, key, value, ttl=None):
+        with self._lock:
+            self._data[(namespace, key)] = (value, time.time() + ttl if ttl else None)
+
+    def delete(self, namespace, key):
+        with self._lock:
+            self._data.pop((namespace, key), None)
+
+    def clear(self, namespace):
+        with self._lock:
+            for k in [k for k in self._data if k[0] == namespace]:
+                del self._data[k]
+
+    def add_to_set(self, namespace, key, members, ttl=None):
+        with self._lock:
+            entry = self._data.get((namespace, key))
+            before = set(entry[0]) if entry and (entry[1] is None or time.time() < entry[1]) else set()
+            self._data[(namespace, key)] = (sorted(before | members), time.time() + ttl if ttl else None)
+            return before
+
+    def publish(self, channel, message):
+        self._dispatch(self._subscribers, channel, message)
+
+    def subscribe(self, channel, callback):
+        self._subscribers.setdefault(channel, []).append(callback)
+
+
+# ---------------------------------------------------------------------------
+# One host: SQLite + Unix datagram sockets
+# ---------------------------------------------------------------------------
+
+# Linux's default datagram size limit is ~208 KiB; panel events are far smaller.
+_MAX_DATAGRAM = 200 * 1024
+
+
+class LocalBackend(StateBackend):
+    name = "local"
+
+    def __init__(self, state_dir: str = STATE_DIR):
+        self.state_dir = os.path.abspath(state_dir)
+        self.bus_dir = os.path.join(self.state_dir, "bus")
+        os.makedirs(self.bus_dir, exist_ok=True)
+        self._db_path = os.path.join(self.state_dir, "state.db")
+        self._local = threading.local()
+        with self._db() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv (ns TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires REAL, PRIMARY KEY (ns, key))"
+            )
+
+        self._subscribers: dict[str, list[Callback]] = {}
+        self._sock: socket.socket | None = None
+        self._sock_path = ""
+        self._listener: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    # -- key/value --------------------------------------------------------
+
+    def _db(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets readers proceed during writes.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self._db_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def get(self, namespace, key):
+        row = self._db().execute("SELECT value, expires FROM kv WHERE ns = ? AND key = ?", (namespace, key)).fetchone()
+        if row is None:
+            return None
+        value, expires = row
+        if expires is not None and time.time() >= expires:
+            self.delete(namespace, key)
+            return None
+        return json.loads(value)
+
+    def set(self, namespace, key, value, ttl=None):
+        self._db().execute(
+            "INSERT OR REPLACE INTO kv VALUES (?, ?, ?, ?)",
+            (namespace, key, json.dumps(value), time.time() + ttl if ttl else None),
+        )
+
+    def delete(self, namespace, key):
+        self._db().execute("DELETE FROM kv WHERE ns = ? AND key = ?", (namespace, key))
+
+    def clear(self, namespace):
+        self._db().execute("DELETE FROM kv WHERE ns = ?", (namespace,))
+
+    def add_to_set(self, namespace, key, members, ttl=None):
+        conn = self._db()
+        # IMMEDIATE takes the write lock before the read, so concurrent
+        # workers serialize instead of overwriting each other's additions.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT value, expires FROM kv WHERE ns = ? AND key = ?", (namespace, key)).fetchone()
+            before = set(json.loads(row[0])) if row and (row[1] is None or time.time() < row[1]) else set()
+            conn.execute(
+                "INSERT OR REPLACE INTO kv VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(sorted(before | members)), time.time() + ttl if ttl else None),
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return before
+
+    # -- pub/sub ----------------------------------------------------------
+
+    def publish(self, channel, message):
+        payload = json.dumps({"channel": channel, "message": message}).encode()
+        if len(payload) > _MAX_DATAGRAM:
+            logger.warning("Dropping %d-byte message on '%s': too large for the local bus", len(payload), channel)
+            return
+        sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            for path in glob.glob(os.path.join(self.bus_dir, "*.sock")):
+                try:
+                    sender.sendto(payload, path)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # The process that owned it is gone.
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
+                except OSError:
+                    logger.warning("Failed to deliver message on '%s' to %s", channel, path, exc_info=True)
+        finally:
+            sender.close()
+
+    def subscribe(self, channel, callback):
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(callback)
+            if self._sock is None:
+                self._start_listener()
+
+    def _start_listener(self) -> None:
+        self._sock_path = os.path.join(self.bus_dir, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock")
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self._sock_path)
+        self._listener = threading.Thread(target=self._listen, args=(self._sock,), name="state-bus", daemon=True)
+        self._listener.start()
+
+    def _listen(self, sock: socket.socket) -> None:
+        while True:
+            try:
+                data = sock.recv(_MAX_DATAGRAM)
+            except OSError:
+                return  # closed
+            if self._sock is not sock:
+                return  # woken by close()
+            try:
+                envelope = json.loads(data)
+            except ValueError:
+                continue
+            self._dispatch(self._subscribers, envelope.get("channel", ""), envelope.get("message") or {})
+
+    def close(self) -> None:
+        with self._lock:
+            sock, listener = self._sock, self._listener
+            if sock is None:
+                return
+            self._sock = self._listener = None
+            # Unlink first so publishers stop finding us.  Closing the
+            # socket alone does not wake a thread blocked in recv (and keeps
+            # the socket alive); shutdown does.
+            try:
+                os.unlink(self._sock_path)
+            except OSError:
+                pass
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if listener is not None and listener is not threading.current_thread():
+            listener.join(timeout=2)
+        sock.close()
+
+
+# ---------------------------------------------------------------------------
+# Redis
+# ---------------------------------------------------------------------------
+
+class RedisBackend(StateBackend):
+    name = "redis"
+
+    def __init__(self, url: str = REDIS_URL):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("STATE_BACKEND=redis requires the 'redis' package (pip install redis).") from e
+        self._redis = redis.Redis.from_url(url)
+        self._pubsub = None
+        self._subscribers: dict[str, list[Callback]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(namespace: str, key: str) -> str:
+        return f"chatbot:{namespace}:{key}"
+
+    def get(self, namespace, key):
+        value = self._redis.get(self._key(namespace, key))
+        return None if value is None else json.loads(value)
+
+    def set(self, namespace, key, value, ttl=None):
+        self._redis.set(self._key(namespace, key), json.dumps(value), px=int(ttl * 1000) if ttl else None)
+
+    def delete(self, namespace, key):
+        self._redis.delete(self._key(namespace, key))
+
+    def clear(self, namespace):
+        keys = list(self._redis.scan_iter(match=self._key(namespace, "*")))
+        if keys:
+            self._redis.delete(*keys)
+
+    def add_to_set(self, namespace, key, members, ttl=None):
+        name = self._key(namespace, key)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.smembers(name)
+        if members:
+            pipe.sadd(name, *members)
+        if ttl:
+            pipe.pexpire(name, int(ttl * 1000))
+        before = pipe.execute()[0]
+        return {m.decode() if isinstance(m, bytes) else m for m in before}
+
+    def publish(self, channel, message):
+        self._redis.publish(f"chatbot:{channel}", json.dumps(message))
+
+    def subscribe(self, channel, callback):
+        with self._lock:
+            first = channel not in self._subscribers
+            self._subscribers.setdefault(channel, []).append(callback)
+            if not first:
+                return
+            if self._pubsub is None:
+                self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                self._pubsub.subscribe(**{f"chatbot:{channel}": self._on_message})
+                self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+            else:
+                self._pubsub.subscribe(**{f"chatbot:{channel}": self._on_message})
+
+    def _on_message(self, raw: dict) -> None:
+        channel = raw["channel"].decode() if isinstance(raw["channel"], bytes) else raw["channel"]
+        self._dispatch(self._subscribers, channel.removeprefix("chatbot:"), json.loads(raw["data"]))
+
+
+# ---------------------------------------------------------------------------
+# Selection
+# ---------------------------------------------------------------------------
+
+_BACKENDS = {"memory": MemoryBackend, "local": LocalBackend, "redis": RedisBackend}
+
+_backend: StateBackend | None = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(kind: str = STATE_BACKEND) -> StateBackend:
+    try:
+        cls = _BACKENDS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown STATE_BACKEND '{kind}'. Choose from: {', '.join(_BACKENDS)}") from None
+    return cls()
+
+
+def get_backend() -> StateBackend:
+    """Return the process-wide backend selected by ``STATE_BACKEND``."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend()
+                logger.info("State backend: %s", _backend.name)
+    return _backend
@@ -0,0 +1,229 @@
+"""
+Record/replay of chat-model calls ("cassettes") for offline eval runs.
+
+With ``LLM_CASSETTES`` enabled, ``core.llm.get_llm`` wraps each client in a
+``CassetteChatModel``.  While a ``Cassette`` is active in the current
+context (``use_cassette``), every model call is looked up in it by a hash
+of the normalized request -- the messages, bound tools and call options:
+
+- ``record``: always call the live model and store its responses;
+- ``replay``: answer recorded requests instantly and offline, call the
+  live model for unseen ones and record them;
+- ``strict``: answer recorded requests, raise ``CassetteMiss`` for the rest.
+
+Normalization drops what changes between otherwise identical runs: message
+ids, tool-call ids (renumbered in order of appearance), and UUIDs and ISO
+timestamps inside message text.  A cassette is one JSON file, normally one
+per eval scenario (``eval/run.py --cassette``); replayed responses keep their
+recorded token usage, so ``core.usage`` and eval perf budgets still see it.
+
+Outside ``use_cassette`` the wrapper calls the live model directly.  The
+live client is built on first use, so strict replays need no credentials.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+logger = logging.getLogger("chatbot.cassette")
+
+MODES = ("record", "replay", "strict")
+
+_CASSETTE_VERSION = 1
+
+_UUID = re.compile(r"\b[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}\b", re.IGNORECASE)
+_TIMESTAMP = re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?")
+
+
+class CassetteMiss(LookupError):
+    """A strict cassette has no recording for the request."""
+
+
+def _normalize_messages(messages: Sequence[BaseMessage]) -> list[dict[str, Any]]:
+    call_ids: dict[str, str] = {}
+
+    def call_id(raw: str | None) -> str:
+        return call_ids.setdefault(raw or "", f"call_{len(call_ids)}")
+
+    out = []
+    for m in messages:
+        entry: dict[str, Any] = {"type": m.type, "content": m.content}
+        if m.name:
+            entry["name"] = m.name
+        tool_calls = getattr(m, "tool_calls", None)
+        if tool_calls:
+            entry["tool_calls"] = [
+                {"name": c["name"], "args": c["args"], "id": call_id(c.get("id"))} for c in tool_calls
+            ]
+        if m.type == "tool":
+            entry["tool_call_id"] = call_id(getattr(m, "tool_call_id", None))
+        out.append(entry)
+    return out
+
+
+def request_key(messages: Sequence[BaseMessage], stop: list[str] | None, kwargs: dict[str, Any]) -> str:
+    """Hash of the normalized request; equal for replays of the same conversation."""
+    text = json.dumps(
+        {"messages": _normalize_messages(messages), "stop": stop, "options": kwargs},
+        sort_keys=True,
+        default=str,
+    )
+    text = _TIMESTAMP.sub("<timestamp>", _UUID.sub("<uuid>", text))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _describe(messages: Sequence[BaseMessage], kwargs: dict[str, Any]) -> dict[str, Any]:
+    """Human-readable summary of a request, stored next to its response."""
+    last = messages[-1] if messages else None
+    content = last.content if last is not None else ""
+    return {
+        "messages": len(messages),
+        "last": f"{last.type}: {content if isinstance(content, str) else json.dumps(content)}"[:200] if last else "",
+        "tools": [t.get("function", {}).get("name") for t in kwargs.get("tools") or []],
+    }
+
+
+class Cassette:
+    """Recorded model responses of one scenario, stored as a JSON file.
+
+    ``record`` mode starts empty, so re-recording drops stale entries.
+    Changes are written by ``save()``.
+    """
+
+    def __init__(self, path: str, mode: str = "replay"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.path = path
+        self.mode = mode
+        self.interactions: dict[str, dict[str, Any]] = {}
+        self.hits = 0
+        self.recorded = 0
+        self.missed: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        if mode != "record" and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.interactions = json.load(f).get("interactions", {})
+
+    def lookup(self, key: str) -> AIMessage | None:
+        with self._lock:
+            entry = self.interactions.get(key)
+            if entry is None:
+                return None
+            self.hits += 1
+        return messages_from_dict([entry["response"]])[0]
+
+    def record(self, key: str, request: dict[str, Any], response: BaseMessage) -> None:
+        with self._lock:
+            self.interactions[key] = {"request": request, "response": message_to_dict(response)}
+            self.recorded += 1
+
+    def miss(self, key: str, request: dict[str, Any]) -> CassetteMiss:
+        with self._lock:
+            self.missed.append({"key": key, **request})
+        return CassetteMiss(f"No recording in {self.path} for request {key[:12]} ({request['last']!r})")
+
+    def save(self) -> None:
+        """Write the cassette if anything was recorded."""
+        if not self.recorded:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._lock:
+            data = {"version": _CASSETTE_VERSION, "interactions": dict(sorted(self.interactions.items()))}
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "mode": self.mode,
+            "interactions": len(self.interactions),
+            "hits": self.hits,
+            "recorded": self.recorded,
+            "misses": len(self.missed),
+        }
+
+
+_current_cassette: ContextVar[Cassette | None] = ContextVar("llm_cassette", default=None)
+
+
+@contextmanager
+def use_cassette(cassette: Cassette) -> Iterator[Cassette]:
+    """Route model calls made in this context through *cassette*."""
+    token = _current_cassette.set(cassette)
+    try:
+        yield cassette
+    finally:
+        _current_cassette.reset(token)
+
+
+class CassetteChatModel(BaseChatModel):
+    """Serves calls from the active cassette and forwards the rest to the live model.
+
+    *live* builds the real client; it is called at most once, on the first
+    call that needs it.
+    """
+
+    live: Callable[[], BaseChatModel]
+    _live_model: BaseChatModel | None = PrivateAttr(default=None)
+    _live_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette"
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Any = None, **kwargs: Any):
+        if tool_choice is not None:
+            kwargs["tool_choice"] = "required" if tool_choice == "any" else tool_choice
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _live(self) -> BaseChatModel:
+        if self._live_model is None:
+            with self._live_lock:
+                if self._live_model is None:
+                    self._live_model = self.live()
+        return self._live_model
+
+    def _replay(self, messages, stop, kwargs) -> tuple[Cassette | None, str, dict, ChatResult | None]:
+        cassette = _current_cassette.get()
+        if cassette is None:
+            return None, "", {}, None
+        key, request = request_key(messages, stop, kwargs), _describe(messages, kwargs)
+        if cassette.mode != "record":
+            message = cassette.lookup(key)
+            if message is not None:
+                return cassette, key, request, ChatResult(generations=[ChatGeneration(message=message)])
+            if cassette.mode == "strict":
+                raise cassette.miss(key, request)
+        return cassette, key, request, None
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        cassette, key, request, result = self._replay(messages, stop, kwargs)
+        if result is not None:
+            return result
+        result = self._live()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        if cassette is not None:
+            cassette.record(key, request, result.generations[0].message)
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        cassette, key, request, result = self._replay(messages, stop, kwargs)
+        if result is not None:
+            return result
+        result = await self._live()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        if cassette is not None:
+            cassette.record(key, request, result.generations[0].message)
+        return result
@@ -0,0 +1,129 @@
+"""
+Checkpointer selection and a SQLite checkpointer shared by app workers.
+
+``create_checkpointer()`` returns LangGraph's ``InMemorySaver`` unless
+``CHECKPOINT_DB_PATH`` is set, in which case every worker process reads and
+writes the same SQLite file (WAL mode), so a conversation can continue on
+whichever worker serves its next turn.
+
+Storage is LangGraph's own ``SqliteSaver`` (``langgraph-checkpoint-sqlite``).
+It only implements the sync interface, and its async sibling binds to the
+event loop it was created on, so ``SQLiteCheckpointer`` adds the async
+methods by running the sync ones in the default executor; a busy database
+never blocks the event loop.  ``put_writes`` is overridden to decide per
+write, as ``InMemorySaver`` does, whether a retried task's write replaces
+the stored one (special channels such as errors and interrupts) or is
+dropped (regular channels); ``SqliteSaver`` decides once per batch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sqlite3
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from core.config import CHECKPOINT_DB_PATH
+
+
+class SQLiteCheckpointer(SqliteSaver):
+    """``SqliteSaver`` on one file shared by app workers, usable from async graphs."""
+
+    def __init__(self, path: str, *, serde=None):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # SqliteSaver serializes access to the connection with its own lock;
+        # the timeout waits out other workers' write transactions.
+        super().__init__(sqlite3.connect(path, timeout=30, check_same_thread=False), serde=serde)
+        self.path = path
+        self.setup()
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        configurable = config["configurable"]
+        ids = (str(configurable["thread_id"]), str(configurable["checkpoint_ns"]), str(configurable["checkpoint_id"]))
+        rows: dict[str, list[tuple]] = {"REPLACE": [], "IGNORE": []}
+        for idx, (channel, value) in enumerate(writes):
+            verb = "REPLACE" if channel in WRITES_IDX_MAP else "IGNORE"
+            rows[verb].append(
+                (*ids, task_id, task_path, WRITES_IDX_MAP.get(channel, idx), channel, *self.serde.dumps_typed(value))
+            )
+        with self.cursor() as cur:
+            for verb, batch in rows.items():
+                if batch:
+                    cur.executemany(
+                        f"INSERT OR {verb} INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, task_path, "
+                        "idx, channel, type, value) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        batch,
+                    )
+
+    def stats(self) -> dict[tuple, int]:
+        """Row counts in the shape of ``core.metrics.checkpointer_stats``."""
+        with self.cursor(transaction=False) as cur:
+            counts = {
+                ("threads",): cur.execute("SELECT COUNT(DISTINCT thread_id) FROM checkpoints").fetchone()[0],
+                ("checkpoints",): cur.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0],
+                ("writes",): cur.execute("SELECT COUNT(*) FROM writes").fetchone()[0],
+            }
+        return counts
+
+    # -- async ------------------------------------------------------------
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def create_checkpointer(path: str | None = None) -> BaseCheckpointSaver:
+    """The app's checkpointer: SQLite at *path* (default ``CHECKPOINT_DB_PATH``), else in-memory."""
+    path = CHECKPOINT_DB_PATH if path is None else path
+    return SQLiteCheckpointer(path) if path else InMemorySaver()
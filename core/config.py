@@ -8,6 +8,13 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _env_flag(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 def get_azure_openai_api_key() -> str:
     api_key = os.getenv("AZURE_OPENAI_API_KEY")
     if not api_key:
@@ -41,5 +48,67 @@ DEFAULT_MESSAGE_RECIPIENT_TYPE = "hiring_manager"
 DEFAULT_MESSAGE_TONE = "formal"
 DEFAULT_PROFILE_UPDATE_SECTION = "skills"
 
-MAX_MESSAGES_BEFORE_SUMMARIZATION = 10
-MESSAGES_TO_KEEP_AFTER_SUMMARIZATION = 5
+# Local tokenizer (tiktoken encoding name) used for prompt budgeting
+TOKENIZER_ENCODING = os.getenv("TOKENIZER_ENCODING", "o200k_base")
+
+# Token budget for the per-user context block that personalization
+# middleware adds to each model call (AgentConfig.context_budget_tokens overrides)
+CONTEXT_BUDGET_TOKENS = int(os.getenv("CONTEXT_BUDGET_TOKENS", "800"))
+
+# Summarize conversation history once it exceeds this many tokens, keeping
+# the most recent SUMMARIZATION_KEEP_TOKENS worth of messages verbatim
+SUMMARIZATION_TRIGGER_TOKENS = int(os.getenv("SUMMARIZATION_TRIGGER_TOKENS", "6000"))
+SUMMARIZATION_KEEP_TOKENS = int(os.getenv("SUMMARIZATION_KEEP_TOKENS", "2000"))
+# Lower trigger for worker agents, which also see the shared conversation summary
+SUMMARIZATION_WORKER_TRIGGER_TOKENS = int(os.getenv("SUMMARIZATION_WORKER_TRIGGER_TOKENS", "3000"))
+# "background": summarize after a turn, off the critical path (default);
+# "inline": summarize before the model call that crosses the trigger
+SUMMARIZATION_MODE = os.getenv("SUMMARIZATION_MODE", "background").strip().lower()
+
+# Side-panel SSE: per-connection buffer, per-user replay ring for
+# Last-Event-ID resume, heartbeat interval and open tabs per user
+SSE_BUFFER_SIZE = int(os.getenv("SSE_BUFFER_SIZE", "32"))
+SSE_REPLAY_SIZE = int(os.getenv("SSE_REPLAY_SIZE", "32"))
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+SSE_MAX_CONNECTIONS_PER_USER = int(os.getenv("SSE_MAX_CONNECTIONS_PER_USER", "8"))
+
+# Shared state and pub/sub across app workers (see core/backend.py):
+# "memory" (one process), "local" (SQLite + Unix sockets in STATE_DIR, one
+# host) or "redis" (REDIS_URL)
+STATE_BACKEND = os.getenv("STATE_BACKEND", "memory").strip().lower()
+STATE_DIR = os.getenv("STATE_DIR", "data/state")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# LangGraph checkpoints in a SQLite file shared by app workers (empty = in-memory)
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", "")
+
+# Response cache for repeated read-only turns (opt-in)
+RESPONSE_CACHE_ENABLED = _env_flag("RESPONSE_CACHE_ENABLED")
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "600"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+
+# Exact-match prompt cache for deterministic (temperature 0) LLM calls
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+LLM_CACHE_SQLITE_PATH = os.getenv("LLM_CACHE_SQLITE_PATH", "")
+
+# Compiled agent graphs shared by agents with the same configuration
+AGENT_GRAPH_CACHE_MAX_ENTRIES = int(os.getenv("AGENT_GRAPH_CACHE_MAX_ENTRIES", "64"))
+
+# Profile-aware job match scores cached per (profile version, catalog version)
+MATCH_SCORE_CACHE_MAX_ENTRIES = int(os.getenv("MATCH_SCORE_CACHE_MAX_ENTRIES", "32"))
+
+# LLM backend: "azure" (default) or "fake" for the offline scripted model
+LLM_BACKEND = os.getenv("LLM_BACKEND", "azure").strip().lower()
+FAKE_LLM_SCRIPT = os.getenv("FAKE_LLM_SCRIPT", "")
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "0"))
+FAKE_LLM_TOKENS_PER_SECOND = float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "0"))
+# Wrap LLM clients for cassette record/replay (see core/cassette.py; eval.run --cassette sets it)
+LLM_CASSETTES = _env_flag("LLM_CASSETTES")
+
+# Span tracing (see core/tracing.py); spans are appended to TRACE_EXPORT_PATH as JSONL
+TRACING_ENABLED = _env_flag("TRACING_ENABLED")
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "traces/spans.jsonl")
+
+# Per-call LLM token accounting (see core/usage.py); empty path keeps it in memory
+USAGE_DB_PATH = os.getenv("USAGE_DB_PATH", "data/usage.db")
+LLM_PRICE_INPUT_PER_1K = float(os.getenv("LLM_PRICE_INPUT_PER_1K", "0"))
+LLM_PRICE_OUTPUT_PER_1K = float(os.getenv("LLM_PRICE_OUTPUT_PER_1K", "0"))
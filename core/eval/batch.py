@@ -0,0 +1,270 @@
+"""
+Batch evaluation -- many scenarios, each repeated, run concurrently.
+
+``EvalRunner.run_scenario`` plays one scenario's turns in order; a batch
+runs whole scenarios side by side.  Every run gets a fresh agent from the
+caller's *agent_factory* (normally with its own checkpointer) and its own
+thread id, so runs share only the process-wide caches keyed by
+configuration (LLM clients, compiled graphs).  Repeating each scenario
+shows which ones are flaky.
+
+A semaphore caps how many runs are in flight.  When a turn hits a provider
+rate limit (HTTP 429), the run is abandoned, every run pauses on a shared
+``RateLimitGate`` for the ``Retry-After`` delay (or an exponential backoff
+with jitter), and the scenario starts over on a fresh thread -- a retried
+turn would otherwise see its own half-finished attempt in the history.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from core.eval.perf import baseline
+from core.eval.runner import EvalRunner, ScenarioResult
+
+logger = logging.getLogger("chatbot.eval")
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """True for HTTP 429 errors from the openai SDK, httpx or similar clients."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status == 429 or type(exc).__name__ == "RateLimitError"
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """The ``Retry-After`` delay attached to *exc*'s HTTP response, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    for name in ("retry-after-ms", "retry-after"):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            continue
+        return seconds / 1000 if name == "retry-after-ms" else seconds
+    return None
+
+
+class RateLimitGate:
+    """Shared pause that every run waits on before each turn."""
+
+    def __init__(self, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.pauses = 0
+        self._resume_at = 0.0
+
+    async def wait(self) -> None:
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """Pause all runs after the *attempt*-th rate limit of one run; returns the delay."""
+        if retry_after is None:
+            retry_after = min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+        self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+        self.pauses += 1
+        return retry_after
+
+
+class RateLimited(Exception):
+    """Raised for the remaining turns of a run that hit a rate limit."""
+
+
+class _GatedAgent:
+    """Waits on the gate before each turn and remembers the first rate limit."""
+
+    def __init__(self, agent, gate: RateLimitGate):
+        self._agent = agent
+        self._gate = gate
+        self.rate_limit: BaseException | None = None
+
+    async def invoke(self, user_input: str, thread_id: str = "eval") -> dict:
+        if self.rate_limit is not None:
+            raise RateLimited("an earlier turn of this run was rate limited")
+        await self._gate.wait()
+        try:
+            return await self._agent.invoke(user_input, thread_id=thread_id)
+        except Exception as exc:
+            if is_rate_limit_error(exc):
+                self.rate_limit = exc
+            raise
+
+
+@dataclass
+class RunRecord:
+    """One run of one scenario (the last attempt, if it was retried)."""
+    scenario: str
+    repetition: int
+    thread_id: str
+    result: ScenarioResult | None = None
+    attempts: int = 1
+    error: str = ""
+
+    @property
+    def passed(self) -> bool:
+        return self.result is not None and not self.error and self.result.passed
+
+    def to_dict(self) -> dict[str, Any]:
+        turns = self.result.turns if self.result else []
+        return {
+            "scenario": self.scenario,
+            "repetition": self.repetition,
+            "thread_id": self.thread_id,
+            "passed": self.passed,
+            "attempts": self.attempts,
+            "error": self.error,
+            "elapsed_seconds": round(self.result.total_elapsed, 3) if self.result else 0.0,
+            "turns": [
+                {
+                    "turn": t.turn,
+                    "passed": t.passed,
+                    "elapsed_seconds": round(t.elapsed_seconds, 3),
+                    "failed_checks": [c.check_name for c in t.checks if not c.passed],
+                    "perf": t.perf.to_dict() if t.perf else None,
+                }
+                for t in turns
+            ],
+        }
+
+
+@dataclass
+class BatchResult:
+    runs: list[RunRecord] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    rate_limit_pauses: int = 0
+
+    @property
+    def passed(self) -> bool:
+        return all(r.passed for r in self.runs)
+
+    def scenarios(self) -> dict[str, dict[str, Any]]:
+        """Per-scenario aggregates, in the order scenarios were given."""
+        grouped: dict[str, list[RunRecord]] = {}
+        for run in self.runs:
+            grouped.setdefault(run.scenario, []).append(run)
+        out = {}
+        for name, runs in grouped.items():
+            passed = sum(r.passed for r in runs)
+            turn_results: dict[int, list[bool]] = {}
+            failed_checks: dict[str, int] = {}
+            for r in runs:
+                for t in r.result.turns if r.result else []:
+                    turn_results.setdefault(t.turn, []).append(t.passed)
+                    for c in t.checks:
+                        if not c.passed:
+                            failed_checks[c.check_name] = failed_checks.get(c.check_name, 0) + 1
+            elapsed = [r.result.total_elapsed for r in runs if r.result]
+            out[name] = {
+                "runs": len(runs),
+                "passed": passed,
+                "pass_rate": round(passed / len(runs), 3),
+                "flaky": 0 < passed < len(runs),
+                "turn_pass_rates": {str(turn): round(sum(v) / len(v), 3) for turn, v in sorted(turn_results.items())},
+                "failed_checks": failed_checks,
+                "errors": sum(1 for r in runs if r.error),
+                "retried_runs": sum(1 for r in runs if r.attempts > 1),
+                "mean_elapsed_seconds": round(sum(elapsed) / len(elapsed), 3) if elapsed else 0.0,
+                "max_elapsed_seconds": round(max(elapsed), 3) if elapsed else 0.0,
+            }
+        return out
+
+    def perf_baseline(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Per-turn median ``TurnPerf`` metrics of the completed runs (see ``core.eval.perf``)."""
+        results: dict[str, list[ScenarioResult]] = {}
+        for run in self.runs:
+            if run.result is not None and not run.error:
+                results.setdefault(run.scenario, []).append(run.result)
+        return baseline(results)
+
+    def to_dict(self) -> dict[str, Any]:
+        scenarios = self.scenarios()
+        passed = sum(r.passed for r in self.runs)
+        return {
+            "totals": {
+                "runs": len(self.runs),
+                "passed": passed,
+                "pass_rate": round(passed / len(self.runs), 3) if self.runs else 0.0,
+                "flaky_scenarios": [name for name, s in scenarios.items() if s["flaky"]],
+                "failing_scenarios": [name for name, s in scenarios.items() if s["passed"] == 0],
+                "wall_seconds": round(self.wall_seconds, 3),
+                "rate_limit_pauses": self.rate_limit_pauses,
+            },
+            "scenarios": scenarios,
+            "perf": self.perf_baseline(),
+            "runs": [r.to_dict() for r in self.runs],
+        }
+
+    def summary(self) -> str:
+        lines = [f"{'scenario':<32}{'passed':>10}{'rate':>8}{'mean s':>9}  flags"]
+        for name, s in self.scenarios().items():
+            flags = " ".join(f for f, on in (("FLAKY", s["flaky"]), ("errors", s["errors"]), ("retried", s["retried_runs"])) if on)
+            lines.append(
+                f"{name:<32}{s['passed']:>5}/{s['runs']:<4}{s['pass_rate']:>8.0%}{s['mean_elapsed_seconds']:>9.1f}  {flags}"
+            )
+        totals = self.to_dict()["totals"]
+        lines.append(
+            f"Total: {totals['passed']}/{totals['runs']} runs passed in {self.wall_seconds:.1f}s"
+            f" ({self.rate_limit_pauses} rate-limit pauses)"
+        )
+        return "\n".join(lines)
+
+
+async def run_batch(
+    scenarios: list[dict],
+    agent_factory: Callable[[dict], Any],
+    *,
+    repeat: int = 1,
+    concurrency: int = 4,
+    max_retries: int = 3,
+    gate: RateLimitGate | None = None,
+) -> BatchResult:
+    """Run every scenario *repeat* times, at most *concurrency* at once.
+
+    *agent_factory(scenario)* returns a fresh agent exposing
+    ``invoke(user_input, thread_id=...)`` (see ``eval/run.py``).  A run that
+    hits a rate limit is started over up to *max_retries* times.
+    """
+    gate = gate or RateLimitGate()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(scenario: dict, repetition: int) -> RunRecord:
+        name = scenario.get("name", "unnamed")
+        async with semaphore:
+            for attempt in range(max_retries + 1):
+                record = RunRecord(
+                    scenario=name,
+                    repetition=repetition,
+                    thread_id=f"eval:{name}:{repetition}:{uuid.uuid4().hex[:8]}",
+                    attempts=attempt + 1,
+                )
+                try:
+                    agent = _GatedAgent(agent_factory(scenario), gate)
+                    record.result = await EvalRunner(agent=agent).run_scenario(scenario, thread_id=record.thread_id)
+                except Exception as exc:
+                    logger.exception("Scenario %s run %d failed", name, repetition)
+                    record.error = f"{type(exc).__name__}: {exc}"
+                    return record
+                if agent.rate_limit is None:
+                    return record
+                record.error = f"rate limited: {agent.rate_limit}"
+                if attempt < max_retries:
+                    delay = gate.backoff(attempt, retry_after_seconds(agent.rate_limit))
+                    logger.warning("Scenario %s run %d rate limited; retrying in %.1fs", name, repetition, delay)
+            return record
+
+    start = time.monotonic()
+    runs = await asyncio.gather(*(
+        run_one(scenario, repetition) for scenario in scenarios for repetition in range(repeat)
+    ))
+    return BatchResult(runs=list(runs), wall_seconds=time.monotonic() - start, rate_limit_pauses=gate.pauses)
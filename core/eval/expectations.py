@@ -160,11 +160,41 @@ def check_success(
     )
 
 
+# Budget expectation -> (TurnPerf attribute, unit shown in details).
+BUDGETS = {
+    "max_latency_seconds": ("latency_seconds", "s"),
+    "max_llm_calls": ("llm_calls", "LLM calls"),
+    "max_prompt_tokens": ("prompt_tokens", "prompt tokens"),
+    "max_tool_calls": ("tool_calls", "tool calls"),
+}
+
+
+def check_budget(
+    perf: Any,
+    expectation: str,
+    limit: float,
+) -> ExpectationResult:
+    """Check a measured ``TurnPerf`` value against a ``max_*`` budget."""
+    attr, unit = BUDGETS[expectation]
+    value = getattr(perf, attr)
+    shown = f"{value:.2f}" if isinstance(value, float) else str(value)
+    return ExpectationResult(
+        passed=value <= limit,
+        check_name=expectation,
+        details=f"{shown} {unit} (max {limit})",
+    )
+
+
 def evaluate_expectations(
     messages: list,
     expectations: dict[str, Any],
+    perf: Any = None,
 ) -> list[ExpectationResult]:
-    """Run all expectation checks for a turn."""
+    """Run all expectation checks for a turn.
+
+    Budget expectations (``BUDGETS``) are checked against *perf*, the
+    turn's ``core.eval.perf.TurnPerf``; they are skipped without one.
+    """
     results = []
 
     if "tool_called" in expectations:
@@ -179,4 +209,9 @@ def evaluate_expectations(
     if expectations.get("success"):
         results.append(check_success(messages))
 
+    if perf is not None:
+        for expectation in BUDGETS:
+            if expectation in expectations:
+                results.append(check_budget(perf, expectation, expectations[expectation]))
+
     return results
@@ -0,0 +1,148 @@
+"""
+Per-turn performance measurement for eval scenarios.
+
+``measure_turn()`` installs a ``PerfCallbackHandler`` for the duration of
+one turn through a LangChain configure hook, so it is attached to every
+run started in that context -- the agent graph, its model calls, its tools
+and any worker agents those tools invoke -- without threading callbacks
+through ``BaseAgent``.  Concurrent turns (batch evals) run in separate
+asyncio tasks and so measure independently.  Tasks started during the turn
+inherit the handler, but it stops counting when the block exits, so
+background work such as ``BaseAgent``'s post-turn summarization is not
+charged to the turn.
+
+The measured ``TurnPerf`` is what the ``max_*`` budget expectations check
+(``core/eval/expectations.py``) and what baselines store: ``baseline()``
+reduces a batch to per-turn medians, and ``compare_to_baseline()`` reports
+the percent change of each metric against a stored one.
+"""
+
+from __future__ import annotations
+
+import statistics
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Iterator
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+
+from core.usage import extract_usage
+
+# Metrics recorded per turn, in report order.
+METRICS = ("latency_seconds", "llm_calls", "prompt_tokens", "completion_tokens", "tool_calls")
+
+
+@dataclass
+class TurnPerf:
+    latency_seconds: float = 0.0
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    tool_calls: int = 0
+
+    def to_dict(self) -> dict[str, float]:
+        return {**asdict(self), "latency_seconds": round(self.latency_seconds, 3)}
+
+
+class PerfCallbackHandler(BaseCallbackHandler):
+    """Counts model calls, their tokens and tool runs into a ``TurnPerf``."""
+
+    run_inline = True
+
+    def __init__(self) -> None:
+        self.perf = TurnPerf()
+        self.active = True
+
+    def on_llm_end(self, response: LLMResult, *, run_id, **kwargs) -> None:
+        if not self.active:
+            return
+        self.perf.llm_calls += 1
+        for generations in response.generations:
+            for generation in generations:
+                tokens_in, tokens_out, _, _ = extract_usage(getattr(generation, "message", None))
+                self.perf.prompt_tokens += tokens_in
+                self.perf.completion_tokens += tokens_out
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs) -> None:
+        if self.active:
+            self.perf.tool_calls += 1
+
+
+_current_handler: ContextVar[PerfCallbackHandler | None] = ContextVar("eval_perf_handler", default=None)
+register_configure_hook(_current_handler, inheritable=True)
+
+
+@contextmanager
+def measure_turn() -> Iterator[TurnPerf]:
+    """Measure the model calls, tool runs and wall time of the block."""
+    handler = PerfCallbackHandler()
+    token = _current_handler.set(handler)
+    start = time.monotonic()
+    try:
+        yield handler.perf
+    finally:
+        handler.perf.latency_seconds = time.monotonic() - start
+        handler.active = False
+        _current_handler.reset(token)
+
+
+def baseline(scenario_results: dict[str, list]) -> dict[str, dict[str, dict[str, float]]]:
+    """Per scenario and turn, the median of each metric over the given runs.
+
+    *scenario_results* maps a scenario name to its ``ScenarioResult`` runs.
+    """
+    out: dict[str, dict[str, dict[str, float]]] = {}
+    for name, results in scenario_results.items():
+        per_turn: dict[str, list[TurnPerf]] = {}
+        for result in results:
+            for turn in result.turns:
+                if turn.perf is not None:
+                    per_turn.setdefault(str(turn.turn), []).append(turn.perf)
+        out[name] = {
+            turn: {m: round(statistics.median(getattr(p, m) for p in perfs), 3) for m in METRICS}
+            for turn, perfs in per_turn.items()
+        }
+    return out
+
+
+def compare_to_baseline(current: dict, stored: dict) -> list[dict[str, Any]]:
+    """Rows of ``{scenario, turn, metric, baseline, current, change_pct}`` for turns in both."""
+    rows = []
+    for name, turns in current.items():
+        for turn, metrics in turns.items():
+            before_metrics = stored.get(name, {}).get(turn)
+            if before_metrics is None:
+                continue
+            for metric in METRICS:
+                before, after = before_metrics.get(metric), metrics.get(metric)
+                change = None
+                if before and after is not None:
+                    change = round((after - before) / before * 100, 1)
+                rows.append({
+                    "scenario": name, "turn": turn, "metric": metric,
+                    "baseline": before, "current": after, "change_pct": change,
+                })
+    return rows
+
+
+def regressions(rows: list[dict[str, Any]], max_increase_pct: float) -> list[dict[str, Any]]:
+    """The comparison rows whose metric grew by more than *max_increase_pct*."""
+    return [r for r in rows if r["change_pct"] is not None and r["change_pct"] > max_increase_pct]
+
+
+def format_comparison(rows: list[dict[str, Any]]) -> str:
+    """A table of the metrics that changed against the baseline."""
+    changed = [r for r in rows if r["change_pct"]]
+    if not changed:
+        return f"No change against baseline ({len(rows)} metrics compared)"
+    lines = [f"{'scenario':<32}{'turn':>5}  {'metric':<18}{'baseline':>10}{'current':>10}{'change':>9}"]
+    for r in changed:
+        lines.append(
+            f"{r['scenario']:<32}{r['turn']:>5}  {r['metric']:<18}"
+            f"{r['baseline']:>10g}{r['current']:>10g}{r['change_pct']:>+8.1f}%"
+        )
+    return "\n".join(lines)
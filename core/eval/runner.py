@@ -11,7 +11,9 @@ import time
 from dataclasses import dataclass, field
 from typing import Any
 
+from core.agent.base import slice_current_turn
 from core.eval.expectations import evaluate_expectations, ExpectationResult
+from core.eval.perf import TurnPerf, measure_turn
 
 logger = logging.getLogger("chatbot.eval")
 
@@ -24,6 +26,7 @@ class TurnResult:
     checks: list[ExpectationResult] = field(default_factory=list)
     response_text: str = ""
     elapsed_seconds: float = 0.0
+    perf: TurnPerf | None = None
 
     @property
     def passed(self) -> bool:
@@ -56,7 +59,10 @@ class ScenarioResult:
         ]
         for t in self.turns:
             status = "PASS" if t.passed else "FAIL"
-            lines.append(f"  Turn {t.turn}: [{status}] \"{t.user_input}\" ({t.elapsed_seconds:.1f}s)")
+            cost = f"{t.elapsed_seconds:.1f}s"
+            if t.perf is not None:
+                cost += f", {t.perf.llm_calls} LLM calls, {t.perf.prompt_tokens} prompt tokens, {t.perf.tool_calls} tool calls"
+            lines.append(f"  Turn {t.turn}: [{status}] \"{t.user_input}\" ({cost})")
             for c in t.checks:
                 check_status = "ok" if c.passed else "FAIL"
                 lines.append(f"    - {c.check_name}: {check_status} -- {c.details}")
@@ -90,21 +96,29 @@ class EvalRunner:
             expectations = turn_data.get("expectations", {})
 
             logger.info("Turn %d: %s", turn_num, user_input)
-            turn_start = time.monotonic()
 
-            try:
-                agent_result = await self.agent.invoke(
-                    user_input,
-                    thread_id=thread_id,
-                )
-                messages = agent_result.get("messages", [])
-            except Exception as e:
-                logger.exception("Turn %d failed", turn_num)
-                messages = []
-
-            elapsed = time.monotonic() - turn_start
-
-            checks = evaluate_expectations(messages, expectations)
+            with measure_turn() as perf:
+                try:
+                    agent_result = await self.agent.invoke(
+                        user_input,
+                        thread_id=thread_id,
+                    )
+                    # Expectations apply to this turn only, even if the
+                    # agent returns the whole thread.
+                    messages = slice_current_turn(agent_result.get("messages", []))
+                except Exception as e:
+                    logger.exception("Turn %d failed", turn_num)
+                    messages = []
+
+            # Let post-turn summarization finish before the next turn, as
+            # idle time between user messages would; it is not measured.
+            wait_for_compactions = getattr(self.agent, "wait_for_compactions", None)
+            if wait_for_compactions is not None:
+                await wait_for_compactions()
+
+            elapsed = perf.latency_seconds
+
+            checks = evaluate_expectations(messages, expectations, perf)
 
             last_msg = messages[-1] if messages else None
             response_text = getattr(last_msg, "content", str(last_msg)) if last_msg else ""
@@ -116,6 +130,7 @@ class EvalRunner:
                 checks=checks,
                 response_text=response_text,
                 elapsed_seconds=elapsed,
+                perf=perf,
             )
             result.turns.append(turn_result)
             logger.info("Turn %d: %s", turn_num, "PASS" if turn_result.passed else "FAIL")
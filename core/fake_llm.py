@@ -0,0 +1,243 @@
+"""
+Offline, deterministic chat model for load testing the agent graph.
+
+``ScriptedChatModel`` replays scripted tool calls and responses so the
+framework's own overhead (middleware, checkpointing, JSON plumbing, adapter
+rendering) can be measured without a live LLM.  Select it with
+``LLM_BACKEND=fake``; ``core.llm.get_llm`` then returns it for every agent.
+
+A script maps agent names to ordered rules::
+
+    {
+      "orchestrator": [
+        {"match": "job|role", "steps": [[{"name": "job_discovery", "args": {"message": "{input}"}}]],
+         "response": "Here are roles that fit you."}
+      ],
+      "job_discovery": [
+        {"match": "", "steps": [[{"name": "get_matches", "args": {}}]], "response": "I found 3 matches."}
+      ]
+    }
+
+The model works out which agent is calling from the tools bound by
+``create_agent``: the script agent whose scripted tool names are all bound
+(and overlap most) wins; unbound calls such as summarization use
+``"default"``.  The first rule whose ``match`` regex matches the turn's
+human message is used.  Each model call in a turn emits the next entry of
+``steps`` (a batch of tool calls); once the steps are exhausted it answers
+with ``response``.  Because progress is derived from the AI tool-call
+messages already in the turn, human-in-the-loop interrupts and resumes
+continue the script where it stopped.  ``{input}`` in args or responses is
+replaced with the human message.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import time
+import uuid
+from typing import Any, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+DEFAULT_AGENT = "default"
+
+# Covers the common single-agent flows, including the HITL profile update.
+DEFAULT_SCRIPT: dict[str, list[dict[str, Any]]] = {
+    "orchestrator": [
+        {
+            "match": r"candidate|employee|hire",
+            "steps": [[{"name": "candidate_search", "args": {"message": "{input}"}}]],
+            "response": "Here are internal candidates that fit the role.",
+        },
+        {
+            "match": r"job description|\bjd\b",
+            "steps": [[{"name": "jd_generator", "args": {"message": "{input}"}}]],
+            "response": "I've pulled up similar job descriptions to start from.",
+        },
+        {
+            "match": r"message|reach out|apply",
+            "steps": [[{"name": "outreach", "args": {"message": "{input}"}}]],
+            "response": "I've drafted a message for you to review.",
+        },
+        {
+            "match": r"job|role|match|position",
+            "steps": [[{"name": "job_discovery", "args": {"message": "{input}"}}]],
+            "response": "Here are the roles that best match your profile.",
+        },
+        {
+            "match": r"profile|skill|score|experience",
+            "steps": [[{"name": "profile", "args": {"message": "{input}"}}]],
+            "response": "Here's an overview of your profile.",
+        },
+        {"match": "", "steps": [], "response": "Hi! I can help with your profile, jobs, outreach, candidates and job descriptions."},
+    ],
+    "profile": [
+        {
+            "match": r"add|update",
+            "steps": [[{
+                "name": "update_profile",
+                "args": {"section": "skills", "updates": {"skills": ["Kubernetes"]}, "operation": "merge"},
+            }]],
+            "response": "Your profile has been updated.",
+        },
+        {
+            "match": "",
+            "steps": [[{"name": "profile_analyzer", "args": {}}]],
+            "response": "Your profile is in good shape; adding recent projects would raise your score.",
+        },
+    ],
+    "job_discovery": [
+        {
+            "match": "",
+            "steps": [[{"name": "get_matches", "args": {"top_k": 3}}]],
+            "response": "I found 3 roles that match your skills.",
+        },
+    ],
+    "outreach": [
+        {
+            "match": "",
+            "steps": [[{"name": "draft_message", "args": {"purpose": "{input}"}}]],
+            "response": "Here's a draft message to the hiring manager.",
+        },
+    ],
+    "candidate_search": [
+        {
+            "match": "",
+            "steps": [[{"name": "search_candidates", "args": {"search_text": "python"}}]],
+            "response": "These employees match the skills you asked for.",
+        },
+    ],
+    "jd_generator": [
+        {
+            "match": "",
+            "steps": [[{"name": "jd_search", "args": {"job_title": "Data Engineer"}}]],
+            "response": "I found similar job descriptions to use as a starting point.",
+        },
+    ],
+    DEFAULT_AGENT: [
+        {"match": "", "steps": [], "response": "Summary: the user asked about their profile and matching roles."},
+    ],
+}
+
+
+def load_script(path: str | None) -> dict[str, list[dict[str, Any]]]:
+    """Load a script from a JSON file, or return ``DEFAULT_SCRIPT`` when *path* is empty."""
+    if not path:
+        return DEFAULT_SCRIPT
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return json.dumps(content, ensure_ascii=False, default=str)
+
+
+def _fill(value: Any, user_input: str) -> Any:
+    if isinstance(value, str):
+        return value.replace("{input}", user_input)
+    if isinstance(value, dict):
+        return {k: _fill(v, user_input) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fill(v, user_input) for v in value]
+    return value
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model that replays a per-agent script with simulated latency.
+
+    ``latency_ms`` is added to every call (time to first token) and
+    ``tokens_per_second`` throttles output like a streaming model; ``0``
+    disables the throttle.
+    """
+
+    script: dict[str, list[dict[str, Any]]] = DEFAULT_SCRIPT
+    latency_ms: float = 0.0
+    tokens_per_second: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"latency_ms": self.latency_ms, "tokens_per_second": self.tokens_per_second}
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Any = None, **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    # ------------------------------------------------------------------
+    # Script resolution
+    # ------------------------------------------------------------------
+
+    def _resolve_agent(self, bound_tools: set[str]) -> str:
+        best, best_overlap = DEFAULT_AGENT, 0
+        for agent, rules in self.script.items():
+            names = {call["name"] for rule in rules for batch in rule.get("steps", []) for call in batch}
+            if names and names <= bound_tools and len(names) > best_overlap:
+                best, best_overlap = agent, len(names)
+        return best
+
+    def _next_message(self, messages: list[BaseMessage], tools: list[dict]) -> AIMessage:
+        bound = {t["function"]["name"] for t in tools}
+        rules = self.script.get(self._resolve_agent(bound)) or self.script.get(DEFAULT_AGENT, [])
+
+        turn_start = 0
+        for i in range(len(messages) - 1, -1, -1):
+            if messages[i].type == "human":
+                turn_start = i
+                break
+        user_input = _text(messages[turn_start]) if messages else ""
+        step = sum(1 for m in messages[turn_start:] if m.type == "ai" and getattr(m, "tool_calls", None))
+
+        rule = next(
+            (r for r in rules if re.search(r.get("match", ""), user_input, re.IGNORECASE)),
+            {"steps": [], "response": ""},
+        )
+        steps = rule.get("steps", [])
+        if step < len(steps):
+            tool_calls = [
+                {"name": call["name"], "args": _fill(call.get("args", {}), user_input), "id": f"call_{uuid.uuid4().hex[:12]}"}
+                for call in steps[step]
+                if call["name"] in bound
+            ]
+            if tool_calls:
+                return AIMessage(content="", tool_calls=tool_calls)
+        return AIMessage(content=_fill(rule.get("response", ""), user_input))
+
+    def _build(self, messages: list[BaseMessage], kwargs: dict) -> tuple[ChatResult, float]:
+        message = self._next_message(messages, kwargs.get("tools") or [])
+        input_tokens = sum(_estimate_tokens(_text(m)) for m in messages)
+        output_tokens = _estimate_tokens(message.content + json.dumps(message.tool_calls, default=str))
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+        delay = self.latency_ms / 1000
+        if self.tokens_per_second > 0:
+            delay += output_tokens / self.tokens_per_second
+        return ChatResult(generations=[ChatGeneration(message=message)]), delay
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        result, delay = self._build(messages, kwargs)
+        if delay:
+            time.sleep(delay)
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        result, delay = self._build(messages, kwargs)
+        if delay:
+            await asyncio.sleep(delay)
+        return result
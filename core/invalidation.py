@@ -0,0 +1,130 @@
+"""
+Cross-worker cache invalidation.
+
+Several caches are per process: the response cache, the match-score cache
+and compiled agent graphs.  Most are keyed on file versions, so a change
+made by one app worker is picked up by the others on their next lookup, but entries built from the old data linger until they are evicted
+and the version stamps cannot see everything (an agent-configuration
+redeploy, a profile rewritten within the same mtime tick).
+``publish_invalidation`` announces a change on the backend bus
+(``core/backend.py``) so every worker drops what it built from the old data:
+
+- ``profile``: a user's profile was written (``ProfileManager.submit`` /
+  ``rollback``); *key* is the profile path.
+- ``catalog``: the job / employee / requisition data or the agent
+  configuration was refreshed (``python -m core.invalidation catalog``).
+
+Handlers registered with ``on_invalidate`` run synchronously in the
+publishing worker, so its own next request already sees the change, and on
+the backend's subscriber thread in every other worker.  They must be
+thread-safe and cheap -- clearing a cache, not rebuilding it.
+
+Registering a handler only records it.  The app subscribes to the channel
+from its startup hook (``start_invalidations``), so importing a module that
+registers one -- or building the agent catalog -- opens no backend
+connection, socket or thread.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import threading
+import uuid
+from typing import Callable
+
+from core.backend import StateBackend, get_backend
+
+logger = logging.getLogger("chatbot.invalidation")
+
+# Backend pub/sub channel carrying invalidations between app workers.
+INVALIDATIONS_CHANNEL = "invalidations"
+
+SCOPES = ("profile", "catalog")
+
+Handler = Callable[[str], None]
+
+
+class Invalidator:
+    """Runs the handlers registered for a scope whenever any worker invalidates it."""
+
+    def __init__(self, backend: StateBackend | None = None):
+        self._backend = backend
+        self._origin = uuid.uuid4().hex
+        self._handlers: dict[str, list[Handler]] = {scope: [] for scope in SCOPES}
+        self._subscribed = False
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self) -> StateBackend:
+        return self._backend or get_backend()
+
+    def on_invalidate(self, scope: str, handler: Handler) -> None:
+        """Call *handler(key)* whenever *scope* is invalidated (by other workers once started)."""
+        if scope not in self._handlers:
+            raise ValueError(f"Unknown invalidation scope '{scope}'. Choose from: {', '.join(SCOPES)}")
+        with self._lock:
+            self._handlers[scope].append(handler)
+
+    def start(self) -> None:
+        """Subscribe to other workers' invalidations; idempotent."""
+        with self._lock:
+            if not self._subscribed:
+                self.backend.subscribe(INVALIDATIONS_CHANNEL, self._on_message)
+                self._subscribed = True
+
+    def publish(self, scope: str, key: str = "") -> None:
+        """Invalidate *scope* here and in every other worker."""
+        if scope not in self._handlers:
+            raise ValueError(f"Unknown invalidation scope '{scope}'. Choose from: {', '.join(SCOPES)}")
+        self._run(scope, key)
+        self.backend.publish(INVALIDATIONS_CHANNEL, {"scope": scope, "key": key, "origin": self._origin})
+
+    def _on_message(self, message: dict) -> None:
+        if message.get("origin") == self._origin:
+            return  # already handled when published
+        self._run(message.get("scope", ""), message.get("key", ""))
+
+    def _run(self, scope: str, key: str) -> None:
+        for handler in list(self._handlers.get(scope, ())):
+            try:
+                handler(key)
+            except Exception:
+                logger.exception("Invalidation handler for '%s' failed", scope)
+
+
+_invalidator = Invalidator()
+
+
+def get_invalidator() -> Invalidator:
+    """Return the process-wide invalidator on the ``STATE_BACKEND`` bus."""
+    return _invalidator
+
+
+def on_invalidate(scope: str, handler: Handler) -> None:
+    get_invalidator().on_invalidate(scope, handler)
+
+
+def publish_invalidation(scope: str, key: str = "") -> None:
+    get_invalidator().publish(scope, key)
+
+
+def start_invalidations() -> None:
+    """Start receiving other workers' invalidations (app startup)."""
+    get_invalidator().start()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Tell every app worker to drop caches built from old data")
+    parser.add_argument("scope", choices=SCOPES)
+    parser.add_argument("key", nargs="?", default="", help="Profile path for the 'profile' scope")
+    args = parser.parse_args()
+    publish_invalidation(args.scope, args.key)
+    get_invalidator().backend.close()
+    print(f"Published {args.scope} invalidation via the {get_invalidator().backend.name} backend.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
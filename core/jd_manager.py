@@ -10,6 +10,8 @@ import logging
 import os
 from datetime import datetime, timezone
 
+from core.metrics import JD_WRITES
+
 logger = logging.getLogger("chatbot.jd_manager")
 
 JD_DRAFTS_BASE_DIR = "data/jd_drafts"
@@ -40,6 +42,7 @@ class JDDraftManager:
         with open(draft_path, "w", encoding="utf-8") as f:
             json.dump(payload, f, indent=2)
 
+        JD_WRITES.inc("draft")
         logger.info("JD draft saved: %s", draft_path)
         return draft_id
 
@@ -128,5 +131,6 @@ class JDDraftManager:
         with open(draft_path, "w", encoding="utf-8") as f:
             json.dump(latest, f, indent=2)
 
+        JD_WRITES.inc("finalize")
         logger.info("JD draft finalized: %s", draft_path)
         return draft_id
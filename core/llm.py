@@ -1,10 +1,29 @@
 """
-Azure OpenAI LLM factory -- thread-safe singleton.
+Azure OpenAI LLM factory -- thread-safe, one client per configuration.
+
+Clients are shared per (deployment, temperature, cached) so every agent
+reuses the same ``AzureChatOpenAI`` instance -- and with it langchain-openai's
+process-wide httpx connection pool -- instead of building a new client on
+each call.  Identical requests that are in flight at the same time are
+collapsed into a single API call (single-flight), and deterministic callers
+can opt into the exact-match prompt cache from ``core.llm_cache``.  Every
+client reports per-call token usage to ``core.usage``.
+
+With ``LLM_BACKEND=fake`` the factory returns the offline
+``core.fake_llm.ScriptedChatModel`` instead, so the agent graph can be load
+tested without Azure credentials.  With ``LLM_CASSETTES`` each client is
+wrapped for record/replay (``core.cassette``); the wrapper then reports
+usage and bypasses the prompt cache.
 """
 
+import asyncio
+import functools
+import json
 import threading
+from typing import Any
 
-from langchain_openai import AzureChatOpenAI
+from langchain_core.language_models import BaseChatModel
+from langchain_core.outputs import ChatResult
 
 from core.config import (
     get_azure_openai_api_key,
@@ -12,41 +31,182 @@ from core.config import (
     get_azure_openai_deployment,
     get_azure_openai_api_version,
     DEFAULT_TEMPERATURE,
+    FAKE_LLM_LATENCY_MS,
+    FAKE_LLM_SCRIPT,
+    FAKE_LLM_TOKENS_PER_SECOND,
+    LLM_BACKEND,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_SQLITE_PATH,
+    LLM_CASSETTES,
 )
+from core.llm_cache import PromptCache
+from core.metrics import LLM_SHARED_RESPONSES, register_cache
+from core.usage import SHARED_RESPONSE_KEY, get_usage_handler
 
-_llm_instance: AzureChatOpenAI | None = None
+_clients: dict[tuple, BaseChatModel] = {}
 _llm_lock = threading.Lock()
 
+_prompt_cache: PromptCache | None = None
+
+# Requests currently awaiting a response, keyed by _request_key().
+_inflight: dict[str, asyncio.Future] = {}
+
+
+def _request_key(client_id: int, messages, stop, kwargs: dict) -> str:
+    return json.dumps(
+        [client_id, [m.model_dump() for m in messages], stop, kwargs],
+        sort_keys=True,
+        default=str,
+    )
+
+
+def _shared_copy(result: ChatResult) -> ChatResult:
+    """Copy of *result* for a single-flight waiter, marked as not a separate API call."""
+    result = result.model_copy(deep=True)
+    for generation in result.generations:
+        message = getattr(generation, "message", None)
+        if message is not None:
+            message.response_metadata[SHARED_RESPONSE_KEY] = True
+    return result
 
-def get_llm(temperature: float | None = None) -> AzureChatOpenAI:
-    """Return a shared AzureChatOpenAI instance.
 
-    When ``temperature`` is ``None`` (the default), a cached singleton is
-    returned.  When a custom temperature is provided, a fresh un-cached
-    instance is created each time so the caller gets the exact setting
-    requested without mutating the shared singleton.
+@functools.cache
+def _single_flight_client_class() -> type[BaseChatModel]:
+    """Return ``SingleFlightAzureChatOpenAI``, defining it on first use.
+
+    langchain-openai pulls in the openai SDK, close to a second of import
+    time, so it is only imported once a real Azure client is needed.
     """
-    global _llm_instance
+    from langchain_openai import AzureChatOpenAI
+
+    class SingleFlightAzureChatOpenAI(AzureChatOpenAI):
+        """AzureChatOpenAI that collapses identical concurrent requests into one call.
+
+        The first caller for a given (client, messages, stop, kwargs) performs the
+        request; callers arriving while it is in flight await its result and get
+        their own copy of it, flagged so ``core.usage`` counts the call once.
+        Errors propagate to every waiter.  If the leading caller is cancelled,
+        its waiters retry and the first of them leads a new request.
+        """
+
+        async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+            key = _request_key(id(self), messages, stop, kwargs)
+            loop = asyncio.get_running_loop()
+
+            while (pending := _inflight.get(key)) is not None and pending.get_loop() is loop:
+                try:
+                    result = await asyncio.shield(pending)
+                except asyncio.CancelledError:
+                    if pending.cancelled() and not asyncio.current_task().cancelling():
+                        continue  # the leader was cancelled, not us
+                    raise
+                LLM_SHARED_RESPONSES.inc()
+                return _shared_copy(result)
+
+            future = loop.create_future()
+            _inflight[key] = future
+            try:
+                result = await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as exc:
+                future.set_exception(exc)
+                future.exception()  # mark retrieved when nobody else was waiting
+                raise
+            else:
+                future.set_result(result)
+                return result
+            finally:
+                if _inflight.get(key) is future:
+                    del _inflight[key]
+
+    return SingleFlightAzureChatOpenAI
 
-    if temperature is not None:
-        return AzureChatOpenAI(
-            azure_endpoint=get_azure_openai_endpoint(),
-            api_key=get_azure_openai_api_key(),
-            azure_deployment=get_azure_openai_deployment(),
-            api_version=get_azure_openai_api_version(),
-            temperature=temperature,
-        )
 
-    if _llm_instance is not None:
-        return _llm_instance
+def __getattr__(name: str) -> Any:
+    if name == "SingleFlightAzureChatOpenAI":
+        return _single_flight_client_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
+
+def get_prompt_cache() -> PromptCache:
+    """Return the process-wide prompt cache used by ``get_llm(cache=True)``."""
+    global _prompt_cache
+    if _prompt_cache is None:
+        with _llm_lock:
+            if _prompt_cache is None:
+                _prompt_cache = PromptCache(
+                    max_entries=LLM_CACHE_MAX_ENTRIES,
+                    sqlite_path=LLM_CACHE_SQLITE_PATH or None,
+                )
+                register_cache("llm_prompt", _prompt_cache)
+    return _prompt_cache
+
+
+def _create_fake_llm(prompt_cache: PromptCache | None) -> BaseChatModel:
+    from core.fake_llm import ScriptedChatModel, load_script
+
+    return ScriptedChatModel(
+        script=load_script(FAKE_LLM_SCRIPT),
+        latency_ms=FAKE_LLM_LATENCY_MS,
+        tokens_per_second=FAKE_LLM_TOKENS_PER_SECOND,
+        cache=prompt_cache,
+        callbacks=[get_usage_handler()],
+    )
+
+
+def get_llm(temperature: float | None = None, cache: bool = False) -> BaseChatModel:
+    """Return the shared chat model client for the requested settings.
+
+    ``temperature`` defaults to ``DEFAULT_TEMPERATURE``.  Each distinct
+    (deployment, temperature, cache) combination gets one client that is
+    created on first use and reused afterwards.  Pass ``cache=True`` only
+    for deterministic calls (``temperature=0``) such as summarization --
+    repeated prompts are then answered from the prompt cache.  With
+    ``LLM_BACKEND=fake`` the offline scripted model is returned instead.
+    """
+    if temperature is None:
+        temperature = DEFAULT_TEMPERATURE
+    fake = LLM_BACKEND == "fake"
+    deployment = "fake" if fake else get_azure_openai_deployment()
+    key = (deployment, temperature, cache)
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    prompt_cache = get_prompt_cache() if cache else None
     with _llm_lock:
-        if _llm_instance is None:
-            _llm_instance = AzureChatOpenAI(
-                azure_endpoint=get_azure_openai_endpoint(),
-                api_key=get_azure_openai_api_key(),
-                azure_deployment=get_azure_openai_deployment(),
-                api_version=get_azure_openai_api_version(),
-                temperature=DEFAULT_TEMPERATURE,
-            )
-        return _llm_instance
+        client = _clients.get(key)
+        if client is None:
+            if LLM_CASSETTES:
+                from core.cassette import CassetteChatModel
+
+                client = CassetteChatModel(
+                    live=functools.partial(_create_client, fake, deployment, temperature, prompt_cache),
+                    callbacks=[get_usage_handler()],
+                )
+            else:
+                client = _create_client(fake, deployment, temperature, prompt_cache)
+            _clients[key] = client
+        return client
+
+
+def _create_client(
+    fake: bool,
+    deployment: str,
+    temperature: float,
+    prompt_cache: PromptCache | None,
+) -> BaseChatModel:
+    if fake:
+        return _create_fake_llm(prompt_cache)
+    return _single_flight_client_class()(
+        azure_endpoint=get_azure_openai_endpoint(),
+        api_key=get_azure_openai_api_key(),
+        azure_deployment=deployment,
+        api_version=get_azure_openai_api_version(),
+        temperature=temperature,
+        cache=prompt_cache,
+        callbacks=[get_usage_handler()],
+    )
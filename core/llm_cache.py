@@ -0,0 +1,114 @@
+"""
+Exact-match prompt cache for deterministic LLM calls.
+
+``PromptCache`` implements LangChain's ``BaseCache`` so it can be attached to
+any chat model via ``cache=``.  Lookups hit an in-memory LRU first and fall
+back to an optional SQLite file, which lets summarization results survive
+restarts.  Only attach it to deterministic (temperature 0) clients — see
+``core.llm.get_llm(cache=True)``.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+
+logger = logging.getLogger("chatbot.llm_cache")
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    prompt TEXT NOT NULL,
+    llm_string TEXT NOT NULL,
+    return_val TEXT NOT NULL,
+    PRIMARY KEY (prompt, llm_string)
+)
+"""
+
+
+class PromptCache(BaseCache):
+    """In-memory LRU prompt cache with an optional SQLite second tier."""
+
+    def __init__(self, max_entries: int = 1024, sqlite_path: str | None = None):
+        self.max_entries = max_entries
+        self.sqlite_path = sqlite_path or None
+        self._entries: OrderedDict[tuple[str, str], Sequence[Generation]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if self.sqlite_path:
+            with self._connect() as conn:
+                conn.execute(_CREATE_TABLE)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.sqlite_path, timeout=5)
+
+    def _remember(self, key: tuple[str, str], value: Sequence[Generation]) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def lookup(self, prompt: str, llm_string: str) -> Sequence[Generation] | None:
+        key = (prompt, llm_string)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        if self.sqlite_path:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute(
+                        "SELECT return_val FROM llm_cache WHERE prompt = ? AND llm_string = ?",
+                        key,
+                    ).fetchone()
+            except sqlite3.Error:
+                logger.warning("LLM cache read failed", exc_info=True)
+                row = None
+            if row is not None:
+                try:
+                    value = loads(row[0], allowed_objects="core")
+                except Exception:
+                    logger.warning("Discarding unreadable LLM cache entry", exc_info=True)
+                else:
+                    self._remember(key, value)
+                    with self._lock:
+                        self.hits += 1
+                    return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        key = (prompt, llm_string)
+        self._remember(key, return_val)
+        if self.sqlite_path:
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO llm_cache (prompt, llm_string, return_val) VALUES (?, ?, ?)",
+                        (prompt, llm_string, dumps(list(return_val))),
+                    )
+            except sqlite3.Error:
+                logger.warning("LLM cache write failed", exc_info=True)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.sqlite_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM llm_cache")
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,382 @@
+"""
+Profile-aware job match scores, precomputed per (profile, catalog) version.
+
+``matching_jobs.json`` ships a static ``matchScore`` per job.  ``MatchScorer``
+replaces it with a score computed from the user's profile:
+
+- skills: share of the job's skills (its ``matchingSkills`` plus any
+  profile skill named in its title, summary, role or requirements) that
+  the profile lists;
+- experience: profile years of experience against the job's "N+ years";
+- role: share of the job title's words found in the profile's job titles,
+  business title and preferred roles;
+- level: distance between the profile's rank and the job's corporate title;
+- location: whether the job is in a preferred relocation region.
+
+Each feature has a weight in ``WEIGHTS``; features the profile gives no
+signal for are left out and the remaining weights rescaled, and a profile
+with no signal at all keeps the catalog's ``matchScore``.  Scores use the
+catalog's 0 - ``MAX_SCORE`` scale, so ``minScore`` filters keep working.
+The catalog's ``matchingSkills`` are left as they are (the ``skills``
+filter reads them); the profile skills a job asks for go in
+``profileMatchingSkills``.
+
+Skill overlap is computed on bitmasks: every skill term gets a bit in a
+vocabulary shared by the catalog index, each job holds the mask of its
+terms, and a profile's overlap with a job is one ``&`` and a popcount.
+
+The ranked catalog is cached per (profile version, catalog version), the
+versions being the files' mtime and size (``core.versions.file_version``), so
+a request only stats two files; the files are read and parsed outside the
+scorer's lock.  When either changes, work is redone
+incrementally: a changed catalog re-indexes only the jobs that differ, new
+profile skills are scanned into the vocabulary once, and scores of
+unchanged jobs are carried over when only the catalog changed.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any
+
+from core.config import MATCH_SCORE_CACHE_MAX_ENTRIES
+from core.invalidation import on_invalidate
+from core.metrics import register_cache
+from core.profile import load_profile
+from core.profile_score import normalize_profile
+from core.versions import file_version
+
+MAX_SCORE = 5.0
+
+WEIGHTS = {
+    "skills": 0.45,
+    "experience": 0.2,
+    "level": 0.15,
+    "role": 0.1,
+    "location": 0.1,
+}
+
+# Corporate title codes, junior to senior.
+LEVELS = ("AS", "AO", "AD", "DIR", "ED", "MD")
+
+# Level fit by (job level - profile level): a step up is a promotion.
+_LEVEL_FIT = {0: 1.0, 1: 0.8, -1: 0.5, 2: 0.3}
+
+# Relocation region codes used in profiles -> country names in the catalog.
+_REGION_COUNTRIES = {
+    "US": "united states", "USA": "united states", "UK": "united kingdom", "GB": "united kingdom",
+    "CH": "switzerland", "SG": "singapore", "HK": "hong kong", "IN": "india", "JP": "japan",
+    "DE": "germany", "PL": "poland",
+}
+
+_YEARS_RE = re.compile(r"(\d+)\s*\+?\s*(?:years|yrs)", re.IGNORECASE)
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset({"and", "the", "for", "of", "in", "to", "with", "senior", "junior", "lead"})
+
+
+def _terms(text: str) -> frozenset[str]:
+    return frozenset(w for w in _WORD_RE.findall(text.lower()) if len(w) > 2 and w not in _STOPWORDS)
+
+
+def _names(items: Any, key: str = "name") -> list[str]:
+    names = []
+    for item in items or []:
+        value = item.get(key) or item.get("description") if isinstance(item, dict) else item
+        if value:
+            names.append(str(value))
+    return names
+
+
+def _parse_date(value: str) -> date | None:
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class ProfileFeatures:
+    skills: dict[str, str]  # lower-cased -> as written
+    years: float | None
+    title_terms: frozenset[str]
+    level: int | None
+    regions: frozenset[str]
+
+    @property
+    def has_signal(self) -> bool:
+        return bool(self.skills or self.years or self.title_terms or self.level is not None or self.regions)
+
+
+def profile_features(profile: dict[str, Any], today: date | None = None) -> ProfileFeatures:
+    """Extract the scoring features from a profile (either layout, see ``normalize_profile``)."""
+    profile = {**profile, "core": dict(profile.get("core") or {})}
+    normalize_profile(profile)
+    core = profile.get("core", {})
+    today = today or date.today()
+
+    skills_data = core.get("skills") or {}
+    raw_skills = (
+        _names(skills_data.get("top")) + _names(skills_data.get("additional"))
+        if isinstance(skills_data, dict) else _names(skills_data)
+    )
+    skills = {s.strip().lower(): s.strip() for s in raw_skills if s.strip()}
+
+    experiences = (core.get("experience") or {}).get("experiences") or []
+    days = 0
+    titles = [str(core.get("businessTitle") or profile.get("businessTitle") or "")]
+    for exp in experiences:
+        titles.append(str(exp.get("jobTitle") or ""))
+        start = _parse_date(exp.get("startDate") or "")
+        if start is None:
+            continue
+        end = _parse_date(exp.get("endDate") or "") or today
+        days += max(0, (end - start).days)
+    titles += _names((core.get("careerRolePreference") or {}).get("preferredRoles"), key="description")
+
+    rank = core.get("rank") or profile.get("rank")
+    code = (rank.get("code") if isinstance(rank, dict) else rank) or ""
+    code = str(code).split()[0].upper() if str(code).strip() else ""
+
+    regions = set()
+    for region in (core.get("careerLocationPreference") or {}).get("preferredRelocationRegions") or []:
+        if not isinstance(region, dict):
+            region = {"description": region}
+        if region.get("description"):
+            regions.add(str(region["description"]).lower())
+        if region.get("code"):
+            regions.add(_REGION_COUNTRIES.get(str(region["code"]).upper(), str(region["code"]).lower()))
+
+    return ProfileFeatures(
+        skills=skills,
+        years=days / 365.25 if days else None,
+        title_terms=_terms(" ".join(titles)),
+        level=LEVELS.index(code) if code in LEVELS else None,
+        regions=frozenset(regions),
+    )
+
+
+@dataclass
+class _JobEntry:
+    """Profile-independent features of one catalog job."""
+    job: dict[str, Any]
+    text: str
+    title_terms: frozenset[str]
+    level: int | None
+    place: str
+    required_years: int | None
+    catalog_mask: int = 0  # bits of the job's own matchingSkills
+    text_mask: int = 0  # bits of vocabulary terms named in its text
+
+
+class CatalogIndex:
+    """Per-job features plus the shared skill vocabulary, updated in place."""
+
+    def __init__(self) -> None:
+        self.entries: list[_JobEntry] = []
+        self.vocabulary: dict[str, int] = {}
+        self._patterns: dict[str, re.Pattern] = {}
+
+    def _entry(self, job: dict[str, Any]) -> _JobEntry:
+        reqs = job.get("requirements") or []
+        text = " ".join([
+            job.get("title", ""), job.get("summary", ""), job.get("yourRole", ""),
+            *(reqs if isinstance(reqs, list) else [str(reqs)]),
+        ]).lower()
+        years = [int(n) for n in _YEARS_RE.findall(" ".join(reqs) if isinstance(reqs, list) else str(reqs))]
+        code = str(job.get("corporateTitleCode", "")).upper()
+        return _JobEntry(
+            job=job,
+            text=text,
+            title_terms=_terms(job.get("title", "")),
+            level=LEVELS.index(code) if code in LEVELS else None,
+            place=f"{job.get('country', '')} {job.get('location', '')}".lower(),
+            required_years=max(years) if years else None,
+        )
+
+    def _bit(self, term: str) -> int:
+        """The vocabulary bit of *term*; a new term is looked up in every job's text once."""
+        bit = self.vocabulary.get(term)
+        if bit is not None:
+            return bit
+        bit = self.vocabulary[term] = len(self.vocabulary)
+        pattern = self._patterns[term] = re.compile(rf"(?<!\w){re.escape(term)}(?!\w)")
+        for entry in self.entries:
+            if pattern.search(entry.text):
+                entry.text_mask |= 1 << bit
+        return bit
+
+    def mask(self, terms) -> int:
+        mask = 0
+        for term in terms:
+            mask |= 1 << self._bit(term)
+        return mask
+
+    def update(self, jobs: list[dict[str, Any]]) -> int:
+        """Re-index *jobs*, reusing entries of jobs that did not change; returns how many changed."""
+        previous = {entry.job.get("id"): entry for entry in self.entries}
+        entries, added = [], []
+        for job in jobs:
+            entry = previous.get(job.get("id"))
+            if entry is None or entry.job != job:
+                entry = self._entry(job)
+                added.append(entry)
+            entries.append(entry)
+        self.entries = entries
+        # Terms already known are matched against the new jobs here; terms
+        # first seen below are matched against every job by ``_bit``.
+        known = list(self.vocabulary.items())
+        for entry in added:
+            for term, bit in known:
+                if self._patterns[term].search(entry.text):
+                    entry.text_mask |= 1 << bit
+        for entry in added:
+            entry.catalog_mask = self.mask(str(skill).lower() for skill in entry.job.get("matchingSkills") or [])
+        return len(added)
+
+
+def _score(entry: _JobEntry, features: ProfileFeatures, profile_mask: int) -> tuple[float, dict[str, float], int]:
+    """Weighted score of one job for a profile, its per-feature values and the overlapping skill bits."""
+    values: dict[str, float] = {}
+    overlap = 0
+    if features.skills:
+        job_mask = entry.catalog_mask | entry.text_mask
+        overlap = job_mask & profile_mask
+        required = entry.catalog_mask | overlap
+        values["skills"] = overlap.bit_count() / required.bit_count() if required else 0.0
+    if features.years is not None:
+        values["experience"] = min(1.0, features.years / entry.required_years) if entry.required_years else 1.0
+    if features.level is not None and entry.level is not None:
+        values["level"] = _LEVEL_FIT.get(entry.level - features.level, 0.0)
+    if features.title_terms and entry.title_terms:
+        values["role"] = len(entry.title_terms & features.title_terms) / len(entry.title_terms)
+    if features.regions:
+        values["location"] = 1.0 if any(region in entry.place for region in features.regions) else 0.0
+    weight = sum(WEIGHTS[name] for name in values)
+    score = sum(WEIGHTS[name] * value for name, value in values.items()) / weight if weight else 0.0
+    return round(score * MAX_SCORE, 1), {name: round(v, 2) for name, v in values.items()}, overlap
+
+
+@dataclass
+class RankedCatalog:
+    """The catalog ranked for one profile: scored job copies, best first."""
+    profile: dict[str, Any]
+    jobs: list[dict[str, Any]] = field(default_factory=list)
+    personalized: bool = False
+    # Score results by job entry, for reuse when only the catalog changes.
+    scores: dict[int, dict[str, Any]] = field(default_factory=dict, repr=False)
+
+
+class MatchScorer:
+    """Caches ranked catalogs per (profile version, catalog version)."""
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._ranked: OrderedDict[tuple, RankedCatalog] = OrderedDict()
+        self._latest_by_profile: dict[tuple, RankedCatalog] = {}
+        self._index = CatalogIndex()
+        self._catalog_key: tuple | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def ranked(self, profile_path: str, catalog_path: str) -> RankedCatalog:
+        """Return the catalog at *catalog_path* ranked for the profile at *profile_path*.
+
+        Raises ``FileNotFoundError`` / ``json.JSONDecodeError`` for an
+        unreadable catalog; a missing profile ranks by the static scores.
+        """
+        profile_key = (profile_path, file_version(profile_path))
+        catalog_key = (catalog_path, file_version(catalog_path))
+        key = (profile_key, catalog_key)
+        with self._lock:
+            ranked = self._ranked.get(key)
+            if ranked is not None:
+                self._ranked.move_to_end(key)
+                self.hits += 1
+                return ranked
+            catalog_changed = catalog_key != self._catalog_key
+
+        # File I/O and parsing happen outside the lock, so other requests'
+        # cache hits never wait on a disk read.
+        jobs = None
+        if catalog_changed:
+            with open(catalog_path, "r", encoding="utf-8") as f:
+                jobs = json.load(f).get("jobs", [])
+        profile = load_profile(profile_path)
+
+        with self._lock:
+            ranked = self._ranked.get(key)
+            if ranked is not None:  # ranked by another request meanwhile
+                self._ranked.move_to_end(key)
+                self.hits += 1
+                return ranked
+            self.misses += 1
+            if catalog_key != self._catalog_key:
+                if jobs is None:  # another request indexed a different version meanwhile
+                    with open(catalog_path, "r", encoding="utf-8") as f:
+                        jobs = json.load(f).get("jobs", [])
+                self._index.update(jobs)
+                self._catalog_key = catalog_key
+            ranked = self._rank(profile, self._latest_by_profile.get(profile_key))
+            self._ranked[key] = ranked
+            self._latest_by_profile[profile_key] = ranked
+            while len(self._ranked) > self.max_entries:
+                (old_profile, _), old = self._ranked.popitem(last=False)
+                if self._latest_by_profile.get(old_profile) is old:
+                    del self._latest_by_profile[old_profile]
+            return ranked
+
+    def _rank(self, profile: dict[str, Any], previous: RankedCatalog | None) -> RankedCatalog:
+        features = profile_features(profile)
+        ranked = RankedCatalog(profile=profile, personalized=features.has_signal)
+        if not ranked.personalized:
+            jobs = [entry.job for entry in self._index.entries]
+            ranked.jobs = sorted(jobs, key=lambda j: j.get("matchScore", 0), reverse=True)
+            return ranked
+
+        profile_mask = self._index.mask(features.skills)
+        names = {self._index.vocabulary[term]: name for term, name in features.skills.items()}
+        reusable = previous.scores if previous is not None else {}
+        for entry in self._index.entries:
+            scored = reusable.get(id(entry))
+            if scored is None or scored["entry"] is not entry:
+                score, breakdown, overlap = _score(entry, features, profile_mask)
+                skills = [names[bit] for bit in sorted(names) if overlap >> bit & 1]
+                scored = {
+                    "entry": entry,
+                    "job": {**entry.job, "matchScore": score, "profileMatchingSkills": skills, "scoreBreakdown": breakdown},
+                }
+            ranked.scores[id(entry)] = scored
+            ranked.jobs.append(scored["job"])
+        ranked.jobs.sort(key=lambda j: j["matchScore"], reverse=True)
+        return ranked
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ranked.clear()
+            self._latest_by_profile.clear()
+
+    def __len__(self) -> int:
+        return len(self._ranked)
+
+
+_match_scorer: MatchScorer | None = None
+_match_scorer_lock = threading.Lock()
+
+
+def get_match_scorer() -> MatchScorer:
+    """Return the process-wide scorer used by ``get_matches``."""
+    global _match_scorer
+    if _match_scorer is None:
+        with _match_scorer_lock:
+            if _match_scorer is None:
+                scorer = _match_scorer = MatchScorer(max_entries=MATCH_SCORE_CACHE_MAX_ENTRIES)
+                register_cache("match_scores", scorer)
+                for scope in ("profile", "catalog"):
+                    on_invalidate(scope, lambda _key: scorer.clear())
+    return _match_scorer
@@ -0,0 +1,393 @@
+"""
+In-process metrics registry rendered in the Prometheus text format.
+
+Counters and histograms are written without locks: every thread updates its
+own shard (a plain dict reached through ``threading.local``), so an
+increment is a dict lookup and an add with no contention between the event
+loop and worker threads.  Shards are only summed when ``/api/metrics`` is
+scraped.  Gauges that describe current state (SSE connections, checkpointer
+size, cache hit counts) are computed at scrape time by callbacks, so the hot
+path pays nothing for them.
+
+Metric objects are module-level constants; record with positional label
+values in ``labelnames`` order::
+
+    TOOL_CALLS.inc("get_matches", "ok")
+    TOOL_LATENCY.observe(0.12, "get_matches")
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Iterable
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Sample = tuple[str, dict[str, str], float]
+
+
+class Registry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: dict[str, "_Metric"] = {}
+
+    def register(self, metric: "_Metric") -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered.")
+        self._metrics[metric.name] = metric
+
+    def unregister(self, name: str) -> None:
+        self._metrics.pop(name, None)
+
+    def get(self, name: str) -> "_Metric | None":
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, labels, value in metric.collect():
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        registry: Registry | None = REGISTRY,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        if registry is not None:
+            registry.register(self)
+
+    def _labels(self, key: tuple) -> dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def collect(self) -> list[Sample]:
+        raise NotImplementedError
+
+
+class _ShardedMetric(_Metric):
+    """Base for metrics updated through per-thread shards."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._local = threading.local()
+        self._shards: list[dict] = []
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            self._shards.append(shard)  # list.append is atomic
+            return shard
+
+    def _snapshots(self) -> list[dict]:
+        # dict.copy() runs without releasing the GIL, so a writer thread
+        # can never be caught mid-resize.
+        return [shard.copy() for shard in list(self._shards)]
+
+    def reset(self) -> None:
+        """Zero every series (tests)."""
+        for shard in list(self._shards):
+            shard.clear()
+
+
+class Counter(_ShardedMetric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        shard = self._shard()
+        shard[labelvalues] = shard.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return sum(s.get(labelvalues, 0.0) for s in self._snapshots())
+
+    def collect(self) -> list[Sample]:
+        totals: dict[tuple, float] = {}
+        for shard in self._snapshots():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0.0) + value
+        return [("", self._labels(key), value) for key, value in sorted(totals.items())]
+
+
+class Histogram(_ShardedMetric):
+    """Distribution of observations over fixed upper bounds (seconds by default)."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS, registry: Registry | None = REGISTRY):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        shard = self._shard()
+        series = shard.get(labelvalues)
+        if series is None:
+            # [per-bucket counts (+Inf last), sum]
+            series = shard[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, *labelvalues: str) -> int:
+        return sum(sum(s[labelvalues][0]) for s in self._snapshots() if labelvalues in s)
+
+    def collect(self) -> list[Sample]:
+        merged: dict[tuple, list] = {}
+        for shard in self._snapshots():
+            for key, (counts, total) in shard.items():
+                acc = merged.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0])
+                for i, c in enumerate(counts):
+                    acc[0][i] += c
+                acc[1] += total
+
+        samples: list[Sample] = []
+        for key, (counts, total) in sorted(merged.items()):
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, c in zip((*self.buckets, float("inf")), counts):
+                cumulative += c
+                samples.append(("_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append(("_sum", labels, total))
+            samples.append(("_count", labels, cumulative))
+        return samples
+
+
+class CallbackMetric(_Metric):
+    """Metric whose samples are computed at scrape time.
+
+    *callback* returns either a single number or a mapping of label-value
+    tuples to numbers.  Errors are swallowed so one broken source cannot
+    fail the whole scrape.
+    """
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], Any],
+                 labelnames: Iterable[str] = (), kind: str = "gauge", registry: Registry | None = REGISTRY):
+        self.kind = kind
+        self.callback = callback
+        super().__init__(name, documentation, labelnames, registry)
+
+    def collect(self) -> list[Sample]:
+        try:
+            result = self.callback()
+        except Exception:
+            return []
+        if isinstance(result, dict):
+            return [("", self._labels(key), float(v)) for key, v in sorted(result.items())]
+        return [("", {}, float(result))]
+
+
+# ---------------------------------------------------------------------------
+# Application metrics
+# ---------------------------------------------------------------------------
+
+TURN_LATENCY = Histogram(
+    "chatbot_turn_duration_seconds",
+    "End-to-end latency of a chat turn.",
+    ("outcome",),
+)
+LLM_CALLS = Counter(
+    "chatbot_llm_calls_total",
+    "Model responses per agent.",
+    ("agent",),
+)
+LLM_TOKENS = Counter(
+    "chatbot_llm_tokens_total",
+    "LLM tokens per agent and direction (input/output).",
+    ("agent", "direction"),
+)
+PROMPT_TOKENS = Counter(
+    "chatbot_prompt_tokens_total",
+    "Prompt tokens sent per agent and component (system/tools/history/context).",
+    ("agent", "component"),
+)
+CONTEXT_TRIMMED_TOKENS = Counter(
+    "chatbot_context_trimmed_tokens_total",
+    "Per-user context tokens dropped to stay within the agent's budget.",
+    ("agent",),
+)
+SUMMARIZATIONS = Counter(
+    "chatbot_summarizations_total",
+    "History compactions by agent and outcome (inline/background/reused/stale/error).",
+    ("agent", "outcome"),
+)
+LLM_SHARED_RESPONSES = Counter(
+    "chatbot_llm_singleflight_shared_total",
+    "LLM requests answered by an identical in-flight request.",
+)
+TOOL_CALLS = Counter(
+    "chatbot_tool_calls_total",
+    "Tool calls by tool and status (ok/error).",
+    ("tool", "status"),
+)
+TOOL_LATENCY = Histogram(
+    "chatbot_tool_duration_seconds",
+    "Tool call latency.",
+    ("tool",),
+)
+WORKER_CALLS = Counter(
+    "chatbot_worker_calls_total",
+    "Specialist agent invocations by outcome (ok/interrupted/error).",
+    ("agent", "outcome"),
+)
+WORKER_LATENCY = Histogram(
+    "chatbot_worker_duration_seconds",
+    "Specialist agent invocation latency.",
+    ("agent",),
+)
+PROFILE_WRITES = Counter(
+    "chatbot_profile_writes_total",
+    "Profile writes by operation.",
+    ("operation",),
+)
+JD_WRITES = Counter(
+    "chatbot_jd_writes_total",
+    "JD draft writes by operation.",
+    ("operation",),
+)
+SSE_EVENTS = Counter(
+    "chatbot_sse_events_total",
+    "Side-panel events published to SSE channels.",
+    ("type",),
+)
+SSE_COALESCED = Counter(
+    "chatbot_sse_coalesced_total",
+    "Pending SSE events replaced by a newer event of the same type.",
+    ("type",),
+)
+SSE_DROPPED = Counter(
+    "chatbot_sse_dropped_total",
+    "SSE events dropped from a full subscriber buffer (slow consumer).",
+    ("type",),
+)
+
+
+# ---------------------------------------------------------------------------
+# Scrape-time sources
+# ---------------------------------------------------------------------------
+
+_caches: dict[str, Any] = {}
+
+
+def register_cache(name: str, cache: Any) -> None:
+    """Expose hits / misses / size of *cache* (any object with ``hits``,
+    ``misses`` and ``__len__``) under ``cache=<name>``."""
+    _caches[name] = cache
+
+
+def _cache_stat(attr: str) -> Callable[[], dict]:
+    def collect() -> dict:
+        return {(name,): getattr(cache, attr, 0) for name, cache in list(_caches.items())}
+
+    return collect
+
+
+CallbackMetric("chatbot_cache_hits_total", "Cache hits.", _cache_stat("hits"), ("cache",), kind="counter")
+CallbackMetric("chatbot_cache_misses_total", "Cache misses.", _cache_stat("misses"), ("cache",), kind="counter")
+CallbackMetric(
+    "chatbot_cache_entries",
+    "Entries currently held in memory per cache.",
+    lambda: {(name,): len(cache) for name, cache in list(_caches.items())},
+    ("cache",),
+)
+
+
+def _projection_tokens() -> dict[tuple, int]:
+    from core.projection import get_projection_stats
+
+    return {
+        (tool, kind): entry[f"{kind}_tokens"]
+        for tool, entry in get_projection_stats().items()
+        for kind in ("full", "projected", "saved")
+    }
+
+
+def _projection_calls() -> dict[tuple, int]:
+    from core.projection import get_projection_stats
+
+    return {(tool,): entry["calls"] for tool, entry in get_projection_stats().items()}
+
+
+CallbackMetric(
+    "chatbot_tool_projections_total",
+    "Tool results projected before reaching the LLM.",
+    _projection_calls,
+    ("tool",),
+    kind="counter",
+)
+CallbackMetric(
+    "chatbot_tool_projection_tokens_total",
+    "Estimated tool-result tokens by kind (full/projected/saved).",
+    _projection_tokens,
+    ("tool", "kind"),
+    kind="counter",
+)
+
+
+def checkpointer_stats(checkpointer: Any) -> dict[tuple, int]:
+    """Thread / checkpoint / write counts of an in-memory or SQLite checkpointer."""
+    if hasattr(checkpointer, "stats"):
+        return checkpointer.stats()
+    storage = getattr(checkpointer, "storage", None)
+    if storage is None:
+        return {}
+    threads = list(storage.values())
+    return {
+        ("threads",): len(threads),
+        ("checkpoints",): sum(len(cps) for ns in threads for cps in list(ns.values())),
+        ("writes",): sum(len(w) for w in list(getattr(checkpointer, "writes", {}).values())),
+        ("blobs",): len(getattr(checkpointer, "blobs", {})),
+    }
+
+
+def register_checkpointer(checkpointer: Any) -> None:
+    """Expose the size of *checkpointer* as ``chatbot_checkpointer_items``."""
+    REGISTRY.unregister("chatbot_checkpointer_items")
+    CallbackMetric(
+        "chatbot_checkpointer_items",
+        "Items held by the checkpointer by kind.",
+        lambda: checkpointer_stats(checkpointer),
+        ("kind",),
+    )
@@ -0,0 +1,18 @@
+"""
+FastAPI route exposing ``core.metrics`` for Prometheus.
+
+Mounted on Chainlit's app as ``/api/metrics``.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from core.metrics import CONTENT_TYPE, REGISTRY
+
+router = APIRouter(prefix="/api")
+
+
+@router.get("/metrics")
+async def metrics():
+    """Return all registered metrics in the Prometheus text format."""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
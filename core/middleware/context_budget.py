@@ -0,0 +1,163 @@
+"""
+Context budget middleware.
+
+The personalization middleware (``employee_personalization``,
+``first_touch_profile_middleware``, ``hiring_manager_personalization``,
+``orchestrator_personalization``) append per-user context to the system
+prompt.  Anything in front of that volatile text is a cacheable prefix for
+provider-side prompt caching, but the system prompt comes *first* -- so
+per-user text in it changes the prefix for the tool schemas and the whole
+conversation history on every user and every first-touch call.
+
+``ContextBudgetMiddleware`` runs innermost (after the dynamic prompts) and:
+
+- restores the system message to the agent's static prompt, byte for byte,
+  so the system + tools + history prefix is identical across calls and users;
+- moves the per-user text into a context message after the latest messages;
+- trims that context to the agent's token budget by ``--- name ---``
+  section: the shared conversation summary first, then the other sections
+  from the last to the first, never the first-touch profile instructions;
+- records prompt tokens per component (system / tools / history / context).
+
+``BaseAgent`` appends it to every agent with a system prompt.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+
+from langchain.agents.middleware import AgentMiddleware
+from langchain_core.messages import SystemMessage
+
+from core.metrics import CONTEXT_TRIMMED_TOKENS, PROMPT_TOKENS
+from core.tokens import count_messages_tokens, count_static_tokens, count_tokens, count_tool_tokens
+
+logger = logging.getLogger("chatbot.context_budget")
+
+CONTEXT_HEADER = "--- Current User Context ---"
+
+
+# Sections that carry instructions for this turn (the first-touch profile
+# analysis from ``agents/shared/middleware.py``); never trimmed.
+PROTECTED_SECTIONS = frozenset({"Profile Analysis (First Touch)"})
+
+# Background sections trimmed before any other (``core.middleware.shared_summary``).
+LOW_PRIORITY_SECTIONS = frozenset({"Conversation Summary"})
+
+_SECTION_HEADER_RE = re.compile(r"^--- (.+) ---$")
+
+
+def _split_sections(text: str) -> list[tuple[str, list[str]]]:
+    """Split *text* into ``(name, lines)`` at ``--- name ---`` headers.
+
+    Lines before the first header form a section named ``""``.
+    """
+    sections: list[tuple[str, list[str]]] = [("", [])]
+    for line in text.splitlines():
+        match = _SECTION_HEADER_RE.match(line.strip())
+        if match:
+            sections.append((match.group(1), [line]))
+        else:
+            sections[-1][1].append(line)
+    return sections
+
+
+def _join_sections(sections: list[tuple[str, list[str]]]) -> str:
+    return "\n".join(line for _, lines in sections for line in lines).strip()
+
+
+def fit_to_budget(text: str, budget_tokens: int) -> tuple[str, int]:
+    """Trim *text* section by section until it fits *budget_tokens*.
+
+    Low-priority sections are trimmed first, then the others from the last
+    to the first, each by its trailing lines; a section whose content is all
+    gone loses its header too.  ``PROTECTED_SECTIONS`` are kept whole, even
+    if they alone exceed the budget.  Returns the kept text and its token
+    count.
+    """
+    tokens = count_tokens(text)
+    if tokens <= budget_tokens:
+        return text, tokens
+    sections = _split_sections(text)
+    order = sorted(
+        (i for i, (name, _) in enumerate(sections) if name not in PROTECTED_SECTIONS),
+        key=lambda i: (sections[i][0] not in LOW_PRIORITY_SECTIONS, -i),
+    )
+    # Each line is tokenized once; dropping it subtracts its count (plus its
+    # newline).  The joined text is recounted exactly once per section, and
+    # trimming resumes if the per-line estimate was short.
+    line_tokens: dict[str, int] = {}
+
+    def drop(lines: list[str]) -> int:
+        line = lines.pop()
+        if line not in line_tokens:
+            line_tokens[line] = count_tokens(line) + 1
+        return line_tokens[line]
+
+    position = 0
+    while position < len(order):
+        name, lines = sections[order[position]]
+        header = 1 if name else 0
+        # Blank lines separating this section from the next stay with it.
+        spacing = []
+        while len(lines) > header and not lines[-1].strip():
+            spacing.append(lines.pop())
+        while tokens > budget_tokens and len(lines) > header:
+            tokens -= drop(lines)
+            while len(lines) > header and not lines[-1].strip():
+                tokens -= drop(lines)
+            if len(lines) == header:
+                lines.clear()
+        if lines:
+            lines.extend(spacing)
+        text = _join_sections(sections)
+        tokens = count_tokens(text)
+        if tokens <= budget_tokens:
+            break
+        if len(lines) <= header:
+            position += 1
+    return text, tokens
+
+
+class ContextBudgetMiddleware(AgentMiddleware):
+    """Keeps the system prompt static and moves budgeted per-user context last."""
+
+    def __init__(self, agent_name: str, static_prompt: str, budget_tokens: int):
+        super().__init__()
+        self.agent_name = agent_name
+        self.static_prompt = static_prompt
+        self.budget_tokens = budget_tokens
+
+    def _apply(self, request):
+        system = request.system_message
+        text = system.content if system is not None and isinstance(system.content, str) else None
+        PROMPT_TOKENS.inc(self.agent_name, "system", amount=count_static_tokens(self.static_prompt))
+        PROMPT_TOKENS.inc(self.agent_name, "tools", amount=count_tool_tokens(request.tools))
+        PROMPT_TOKENS.inc(self.agent_name, "history", amount=count_messages_tokens(request.messages))
+
+        if text is None or text == self.static_prompt or not text.startswith(self.static_prompt):
+            # Nothing appended, or a prompt we do not recognise: leave as is.
+            return request
+
+        context = text[len(self.static_prompt):].strip()
+        original_tokens = count_tokens(context)
+        context, tokens = fit_to_budget(context, self.budget_tokens)
+        if tokens < original_tokens:
+            CONTEXT_TRIMMED_TOKENS.inc(self.agent_name, amount=original_tokens - tokens)
+            logger.info(
+                "Trimmed %s context from %d to %d tokens (budget %d)",
+                self.agent_name, original_tokens, tokens, self.budget_tokens,
+            )
+        PROMPT_TOKENS.inc(self.agent_name, "context", amount=tokens)
+
+        messages = list(request.messages)
+        if context:
+            messages.append(SystemMessage(content=f"{CONTEXT_HEADER}\n{context}"))
+        return request.override(system_message=SystemMessage(content=self.static_prompt), messages=messages)
+
+    def wrap_model_call(self, request, handler):
+        return handler(self._apply(request))
+
+    async def awrap_model_call(self, request, handler):
+        return await handler(self._apply(request))
@@ -0,0 +1,26 @@
+"""
+Shared conversation summary middleware.
+
+Appends the other agents' summaries of the current conversation (from
+``core.summary_store``) to a worker's system prompt, so the worker knows what
+was discussed elsewhere without carrying that history itself.  Like the
+personalization middleware, the text is moved after the messages and
+budgeted by ``ContextBudgetMiddleware``.
+"""
+
+from langchain.agents.middleware import dynamic_prompt
+
+from core.summary_store import get_summary_store
+
+SHARED_SUMMARY_HEADER = "--- Conversation Summary ---"
+
+
+@dynamic_prompt
+def shared_summary_middleware(request):
+    context = getattr(getattr(request, "runtime", None), "context", None)
+    thread_id = getattr(context, "thread_id", "") if context else ""
+    base = request.system_prompt or ""
+    shared = get_summary_store().context_for(thread_id) if thread_id else ""
+    if not shared:
+        return base
+    return f"{base}\n\n{SHARED_SUMMARY_HEADER}\n{shared}"
@@ -1,39 +1,192 @@
 """
 Conversation summarization middleware factory.
+
+In ``background`` mode (``SUMMARIZATION_MODE``, the default) summaries are
+produced off the critical path: after a turn, ``BaseAgent`` asks the
+middleware to ``acompact`` the thread's history and swaps the result into the
+checkpoint before the next turn.  The inline check before each model call
+stays as a safety net at twice the trigger, for histories that grow past it
+within a single turn.  ``inline`` mode summarizes before the model call, as
+LangChain's middleware does.
+
+Every summary is published to the shared ``SummaryStore`` under the
+conversation's parent thread.  Worker agents use ``shared=True``: they
+summarize at the lower ``SUMMARIZATION_WORKER_TRIGGER_TOKENS``, see the
+other agents' summaries through ``shared_summary_middleware``, and -- once the
+orchestrator's summary covers the turns they would compact -- compact by
+dropping their older messages instead of paying for a summary of their own.
+
+Coverage is tracked by turn start times: ``BaseAgent`` stamps each user
+message with ``TURN_STARTED_KEY``, and a summary records ``covers_until``,
+the start of the first turn it did not summarize in full.  A worker turn
+runs inside an orchestrator turn, so the parent summary covers a worker's
+older messages when ``covers_until`` is later than the start of the last
+worker turn being dropped.  Otherwise the worker summarizes them itself.
 """
 
+from __future__ import annotations
+
+import time
 from typing import Any
 
+from langchain.agents.middleware import SummarizationMiddleware
+from langchain_core.messages import RemoveMessage
+from langgraph.config import get_config
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
 from core.config import (
-    MAX_MESSAGES_BEFORE_SUMMARIZATION,
-    MESSAGES_TO_KEEP_AFTER_SUMMARIZATION,
+    SUMMARIZATION_KEEP_TOKENS,
+    SUMMARIZATION_MODE,
+    SUMMARIZATION_TRIGGER_TOKENS,
+    SUMMARIZATION_WORKER_TRIGGER_TOKENS,
 )
+from core.metrics import SUMMARIZATIONS
+from core.summary_store import get_summary_store, publish_summary
+from core.tokens import count_messages_tokens
+
+# Inline safety net in background mode, as a multiple of the trigger.
+_INLINE_LIMIT_FACTOR = 2
+
+# ``additional_kwargs`` key holding a user message's turn start time.
+TURN_STARTED_KEY = "turn_started"
+
+
+def _turn_start(messages: list, index: int) -> float | None:
+    """Start time of the turn holding ``messages[index]``, if stamped."""
+    for m in reversed(messages[: index + 1]):
+        started = (getattr(m, "additional_kwargs", None) or {}).get(TURN_STARTED_KEY)
+        if started is not None:
+            return started
+    return None
+
+
+def _covered_until(messages: list, cutoff_index: int) -> float:
+    """``covers_until`` of a summary of ``messages[:cutoff_index]``."""
+    if cutoff_index >= len(messages):
+        return time.time()
+    return _turn_start(messages, cutoff_index) or 0.0
+
 
-# Approximate tokens per message for message-based trigger.
-_TOKENS_PER_MESSAGE = 500
+class TokenSummarizationMiddleware(SummarizationMiddleware):
+    """``SummarizationMiddleware`` that can also compact history after a turn."""
+
+    def __init__(
+        self,
+        model: Any,
+        *,
+        agent_name: str = "",
+        trigger_tokens: int,
+        keep_tokens: int,
+        background: bool,
+        shared: bool = False,
+    ):
+        inline_tokens = trigger_tokens * _INLINE_LIMIT_FACTOR if background else trigger_tokens
+        super().__init__(
+            model=model,
+            trigger=("tokens", inline_tokens),
+            keep=("tokens", keep_tokens),
+            token_counter=count_messages_tokens,
+        )
+        self.agent_name = agent_name
+        self.trigger_tokens = trigger_tokens
+        self.background = background
+        self.shared = shared
+
+    @staticmethod
+    def _is_summary(message: Any) -> bool:
+        return (getattr(message, "additional_kwargs", None) or {}).get("lc_source") == "summarization"
+
+    def _publish(self, messages: list, thread_id: str, covers_until: float) -> None:
+        if not thread_id:
+            return
+        for m in messages:
+            if self._is_summary(m):
+                publish_summary(thread_id, self.agent_name, m.content.split("\n\n", 1)[-1], covers_until)
+
+    def _after_inline(self, update: dict | None, state) -> dict | None:
+        if update is not None:
+            SUMMARIZATIONS.inc(self.agent_name, "inline")
+            try:
+                thread_id = get_config().get("configurable", {}).get("thread_id", "")
+            except RuntimeError:  # called outside a graph run
+                thread_id = ""
+            messages = state["messages"]
+            preserved = [m for m in update["messages"][1:] if not self._is_summary(m)]
+            covers_until = _covered_until(messages, len(messages) - len(preserved))
+            self._publish(update["messages"], str(thread_id or ""), covers_until)
+        return update
+
+    def before_model(self, state, runtime):
+        return self._after_inline(super().before_model(state, runtime), state)
+
+    async def abefore_model(self, state, runtime):
+        return self._after_inline(await super().abefore_model(state, runtime), state)
+
+    async def acompact(self, messages: list, thread_id: str = "") -> tuple[list, str] | None:
+        """Return a ``messages`` update compacting older history, and how.
+
+        The outcome is ``"background"`` when older messages were replaced by
+        a new summary, or ``"reused"`` when a shared worker dropped them
+        because the orchestrator's summary of the conversation covers their
+        turns.
+        ``None`` when the history is within ``trigger_tokens`` or there is
+        nothing old enough to compact.
+        """
+        if count_messages_tokens(messages) <= self.trigger_tokens:
+            return None
+        messages = list(messages)
+        self._ensure_message_ids(messages)
+        cutoff_index = self._determine_cutoff_index(messages)
+        if cutoff_index <= 0:
+            return None
+        to_summarize, preserved = self._partition_messages(messages, cutoff_index)
+
+        parent = get_summary_store().parent_summary(thread_id) if self.shared and thread_id else None
+        if parent is not None and parent.thread_id != thread_id:
+            last_dropped_turn = _turn_start(messages, cutoff_index - 1)
+            if last_dropped_turn is not None and parent.covers_until > last_dropped_turn:
+                return [RemoveMessage(id=REMOVE_ALL_MESSAGES), *preserved], "reused"
+
+        new_messages = self._build_new_messages(await self._acreate_summary(to_summarize))
+        self._publish(new_messages, thread_id, _covered_until(messages, cutoff_index))
+        return [RemoveMessage(id=REMOVE_ALL_MESSAGES), *new_messages, *preserved], "background"
 
 
 def create_summarization_middleware(
     model: str | Any = None,
-    max_messages: int = MAX_MESSAGES_BEFORE_SUMMARIZATION,
-    keep_messages: int = MESSAGES_TO_KEEP_AFTER_SUMMARIZATION,
+    trigger_tokens: int | None = None,
+    keep_tokens: int = SUMMARIZATION_KEEP_TOKENS,
+    background: bool | None = None,
+    shared: bool = False,
 ):
     """
     Returns a SummarizationMiddleware instance.
 
     Uses LangChain's built-in SummarizationMiddleware to compress
-    conversation history when token count exceeds an approximate
-    threshold derived from max_messages.
+    conversation history once it exceeds *trigger_tokens*, keeping the most
+    recent *keep_tokens* worth of messages verbatim.  Tokens are counted
+    with the local tokenizer (``core.tokens.count_messages_tokens``), which
+    memoizes each message's count by content, so the check before every
+    model call only tokenizes messages added since the last one.
+    *background* defaults to ``SUMMARIZATION_MODE == "background"``.
+    *shared* marks a worker agent (see the module docstring); its
+    *trigger_tokens* defaults to ``SUMMARIZATION_WORKER_TRIGGER_TOKENS``
+    instead of ``SUMMARIZATION_TRIGGER_TOKENS``.
+    The default model is the deterministic, prompt-cached client so
+    identical histories are summarized once.
     """
-    from langchain.agents.middleware import SummarizationMiddleware
-
     from core.llm import get_llm
 
     if model is None:
-        model = get_llm()
-    max_tokens_before_summary = max_messages * _TOKENS_PER_MESSAGE
-    return SummarizationMiddleware(
-        model=model,
-        max_tokens_before_summary=max_tokens_before_summary,
-        messages_to_keep=keep_messages,
+        model = get_llm(temperature=0, cache=True)
+    if background is None:
+        background = SUMMARIZATION_MODE == "background"
+    if trigger_tokens is None:
+        trigger_tokens = SUMMARIZATION_WORKER_TRIGGER_TOKENS if shared else SUMMARIZATION_TRIGGER_TOKENS
+    return TokenSummarizationMiddleware(
+        model,
+        trigger_tokens=trigger_tokens,
+        keep_tokens=keep_tokens,
+        background=background,
+        shared=shared,
     )
@@ -7,12 +7,14 @@ import time
 
 from langchain.agents.middleware import wrap_tool_call
 
+from core.metrics import TOOL_CALLS, TOOL_LATENCY
+
 logger = logging.getLogger("chatbot.tools")
 
 
 @wrap_tool_call
 async def tool_monitor_middleware(request, handler):
-    """Logs tool calls with timing information."""
+    """Logs tool calls with timing information and records tool metrics."""
     tool_name = request.tool_call.get("name", "unknown")
     logger.info("Tool call started: %s", tool_name)
     start = time.monotonic()
@@ -20,8 +22,13 @@ async def tool_monitor_middleware(request, handler):
         result = await handler(request)
         elapsed = time.monotonic() - start
         logger.info("Tool call completed: %s (%.2fs)", tool_name, elapsed)
+        # Handled tool errors come back as a ToolMessage with status="error".
+        TOOL_CALLS.inc(tool_name, "error" if getattr(result, "status", None) == "error" else "ok")
+        TOOL_LATENCY.observe(elapsed, tool_name)
         return result
     except Exception:
         elapsed = time.monotonic() - start
         logger.exception("Tool call failed: %s (%.2fs)", tool_name, elapsed)
+        TOOL_CALLS.inc(tool_name, "error")
+        TOOL_LATENCY.observe(elapsed, tool_name)
         raise
@@ -0,0 +1,45 @@
+"""
+Tool result projection middleware.
+
+Replaces large tool results in the LLM-visible ``ToolMessage`` content with
+the subset declared in ``core.projection.TOOL_PROJECTIONS``.  The full result
+is kept on ``ToolMessage.artifact`` so the UI adapter can still render cards
+and side panels from it.
+"""
+
+import json
+
+from langchain.agents.middleware import wrap_tool_call
+from langchain_core.messages import ToolMessage
+
+from core.projection import get_projection, record_projection
+
+
+@wrap_tool_call
+async def tool_projection_middleware(request, handler):
+    """Projects tool results to their LLM-facing subset, keeping the full payload as artifact."""
+    result = await handler(request)
+    if not isinstance(result, ToolMessage) or result.artifact is not None:
+        return result
+
+    tool_name = request.tool_call.get("name", "")
+    projection = get_projection(tool_name)
+    if projection is None or not isinstance(result.content, str):
+        return result
+
+    try:
+        payload = json.loads(result.content)
+    except (json.JSONDecodeError, TypeError):
+        return result
+    if not isinstance(payload, dict):
+        return result
+
+    projected = json.dumps(projection.apply(payload), ensure_ascii=False)
+    record_projection(tool_name, result.content, projected)
+    return ToolMessage(
+        content=projected,
+        artifact=payload,
+        tool_call_id=result.tool_call_id,
+        name=result.name,
+        status=result.status,
+    )
@@ -0,0 +1,112 @@
+"""
+Tracing middleware.
+
+``trace_middleware`` wraps every hook a middleware implements (node hooks
+such as ``before_model`` and wrap hooks such as ``awrap_tool_call``) in a
+``middleware:<name>.<hook>`` span.  ``TracingMiddleware`` is appended as the
+innermost middleware so the model call itself becomes an ``llm:<agent>``
+span (with token usage) and each tool execution a ``tool:<name>`` span.
+
+``BaseAgent`` applies both when ``TRACING_ENABLED`` is set.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+
+from langchain.agents.middleware import AgentMiddleware
+
+from core.tracing import span
+
+_HOOKS = (
+    "before_agent",
+    "before_model",
+    "after_model",
+    "after_agent",
+    "wrap_model_call",
+    "wrap_tool_call",
+)
+
+
+def _wrap_hook(fn, span_name: str):
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            with span(span_name):
+                return await fn(*args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with span(span_name):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def trace_middleware(middleware: AgentMiddleware) -> AgentMiddleware:
+    """Wrap the hooks *middleware* overrides in spans (idempotent, in place).
+
+    Wrapping happens on the instance, so module-level middleware shared by
+    several agents is wrapped once.  ``functools.wraps`` keeps the hook
+    signatures visible to LangGraph, which inspects them to inject
+    ``runtime``.
+    """
+    if getattr(middleware, "_traced", False):
+        return middleware
+    cls = type(middleware)
+    for hook in _HOOKS:
+        for attr in (hook, f"a{hook}"):
+            if getattr(cls, attr) is getattr(AgentMiddleware, attr):
+                continue
+            setattr(middleware, attr, _wrap_hook(getattr(middleware, attr), f"middleware:{middleware.name}.{hook}"))
+    middleware._traced = True
+    return middleware
+
+
+def _record_usage(s, response) -> None:
+    messages = getattr(response, "result", None) or [response]
+    for msg in messages:
+        usage = getattr(msg, "usage_metadata", None)
+        if usage:
+            s.set(
+                input_tokens=usage.get("input_tokens", 0),
+                output_tokens=usage.get("output_tokens", 0),
+            )
+        tool_calls = getattr(msg, "tool_calls", None)
+        if tool_calls:
+            s.set(tool_calls=[tc.get("name") for tc in tool_calls])
+
+
+class TracingMiddleware(AgentMiddleware):
+    """Innermost middleware timing the raw model call and each tool execution."""
+
+    def __init__(self, agent_name: str):
+        super().__init__()
+        self.agent_name = agent_name
+
+    def wrap_model_call(self, request, handler):
+        with span(f"llm:{self.agent_name}", agent=self.agent_name, messages=len(request.messages)) as s:
+            response = handler(request)
+            if s is not None:
+                _record_usage(s, response)
+            return response
+
+    async def awrap_model_call(self, request, handler):
+        with span(f"llm:{self.agent_name}", agent=self.agent_name, messages=len(request.messages)) as s:
+            response = await handler(request)
+            if s is not None:
+                _record_usage(s, response)
+            return response
+
+    def wrap_tool_call(self, request, handler):
+        tool_name = request.tool_call.get("name", "unknown")
+        with span(f"tool:{tool_name}", agent=self.agent_name):
+            return handler(request)
+
+    async def awrap_tool_call(self, request, handler):
+        tool_name = request.tool_call.get("name", "unknown")
+        with span(f"tool:{tool_name}", agent=self.agent_name):
+            return await handler(request)
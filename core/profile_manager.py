@@ -13,6 +13,9 @@ import os
 import shutil
 from datetime import datetime, timezone
 
+from core.invalidation import publish_invalidation
+from core.metrics import PROFILE_WRITES
+
 logger = logging.getLogger("chatbot.profile_manager")
 
 DRAFTS_BASE_DIR = "data/drafts"
@@ -56,6 +59,7 @@ class ProfileManager:
         with open(draft_path, "w", encoding="utf-8") as f:
             json.dump(payload, f, indent=2)
 
+        PROFILE_WRITES.inc("draft")
         logger.info("Draft saved: %s", draft_path)
         return draft_id
 
@@ -181,6 +185,8 @@ class ProfileManager:
             finally:
                 fcntl.flock(f.fileno(), fcntl.LOCK_UN)
 
+        PROFILE_WRITES.inc("submit")
+        publish_invalidation("profile", self.profile_path)
         logger.info("Profile submitted: %s", self.profile_path)
         return True
 
@@ -216,5 +222,7 @@ class ProfileManager:
             finally:
                 fcntl.flock(f.fileno(), fcntl.LOCK_UN)
 
+        PROFILE_WRITES.inc("rollback")
+        publish_invalidation("profile", self.profile_path)
         logger.info("Profile rolled back from %s", backup_path)
         return backup_data
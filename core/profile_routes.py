@@ -4,7 +4,6 @@ FastAPI routes for the profile editor side panel.
 Mounted on Chainlit's app as ``/api/profile/*``.
 """
 
-import asyncio
 import json
 import logging
 from typing import Any
@@ -13,19 +12,14 @@ from fastapi import APIRouter, Header, Query, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from core.backend import get_backend
 from core.profile_manager import ProfileManager
+from core.sse_hub import broadcast, get_sse_hub
 
 logger = logging.getLogger("chatbot.profile_routes")
 
 router = APIRouter(prefix="/api/profile")
 
-# Tracks whether the profile was updated by the chat agent so the panel can poll.
-# Maps username -> bool
-_profile_updated_flags: dict[str, bool] = {}
-
-# SSE queues — one per connected username
-_sse_queues: dict[str, list[asyncio.Queue]] = {}
-
 
 def _manager(username: str, profile_path: str) -> ProfileManager:
     return ProfileManager(username=username, profile_path=profile_path)
@@ -121,13 +115,6 @@ async def rollback_profile(
     return {"success": True, "message": "Profile restored from backup."}
 
 
-@router.get("/poll-update")
-async def poll_update(x_username: str = Header(...)):
-    """Check if the chat agent updated the profile. Clears flag on read."""
-    updated = _profile_updated_flags.pop(x_username, False)
-    return {"updated": updated}
-
-
 # ---------------------------------------------------------------------------
 # JD detail endpoint — serves full job data for the JD side panel
 # ---------------------------------------------------------------------------
@@ -156,31 +143,35 @@ async def get_jd_detail(job_id: str = Query(...)):
 # SSE endpoint — pushes panel events to the browser
 # ---------------------------------------------------------------------------
 
+def build_snapshot(username: str, profile_path: str) -> dict[str, Any] | None:
+    """Initial panel state sent on connect: the committed profile and drafts."""
+    profile_path = (get_user_metadata(username) or {}).get("profile_path") or profile_path
+    if not profile_path:
+        return None
+    mgr = _manager(username, profile_path)
+    return {"type": "snapshot", "profile": mgr.load_current(), "drafts": mgr.list_drafts()}
+
+
 @router.get("/events")
-async def profile_events(username: str = Query(...)):
+async def profile_events(
+    username: str = Query(...),
+    profile_path: str = Query(""),
+    last_event_id: str | None = Header(None),
+):
     """SSE stream that pushes panel open/refresh events to the browser.
 
-    Uses a query parameter (not a header) so the browser-native EventSource
-    API can connect without custom headers.
+    This is the panel's only update channel.  Uses query parameters (not
+    headers) so the browser-native EventSource API can connect without
+    custom headers.  Every connection starts with a ``snapshot`` of the
+    profile and drafts; on reconnect the browser sends ``Last-Event-ID``
+    and missed events are replayed (see ``core/sse_hub.py``).
     """
-    queue: asyncio.Queue = asyncio.Queue()
-    _sse_queues.setdefault(username, []).append(queue)
-
-    async def _generator():
-        try:
-            yield ": connected\n\n"
-            while True:
-                event = await queue.get()
-                yield f"data: {json.dumps(event)}\n\n"
-        except asyncio.CancelledError:
-            pass
-        finally:
-            queues = _sse_queues.get(username, [])
-            if queue in queues:
-                queues.remove(queue)
+    hub = get_sse_hub()
+    subscriber = hub.subscribe(username, last_event_id)
+    snapshot = build_snapshot(username, profile_path)
 
     return StreamingResponse(
-        _generator(),
+        hub.stream(subscriber, initial=[snapshot] if snapshot else None),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -193,19 +184,25 @@ async def profile_events(username: str = Query(...)):
 # /whoami — returns username + profile_path for the logged-in user
 # ---------------------------------------------------------------------------
 
-# Populated by app.py on login so we can look up user metadata here.
-_user_metadata: dict[str, dict[str, str]] = {}
+# Populated by app.py on login so we can look up user metadata here.  Kept in
+# the shared backend: the login and the panel's requests may hit different
+# app workers.
+_USER_METADATA_NS = "user_metadata"
 
 
 def register_user_metadata(username: str, profile_path: str):
     """Called from app.py to store the mapping for /whoami lookups."""
-    _user_metadata[username] = {"username": username, "profile_path": profile_path}
+    get_backend().set(_USER_METADATA_NS, username, {"username": username, "profile_path": profile_path})
+
+
+def get_user_metadata(username: str) -> dict[str, str] | None:
+    return get_backend().get(_USER_METADATA_NS, username)
 
 
 @router.get("/whoami")
 async def whoami(x_username: str = Header(...)):
     """Return user context needed by the side panel JS."""
-    meta = _user_metadata.get(x_username, {})
+    meta = get_user_metadata(x_username)
     return meta or {"username": x_username, "profile_path": ""}
 
 
@@ -214,20 +211,13 @@ async def whoami(x_username: str = Header(...)):
 # ---------------------------------------------------------------------------
 
 def push_panel_event(username: str, event_type: str = "open_panel", data: dict | None = None):
-    """Push an SSE event to all connected clients for this user."""
-    queues = _sse_queues.get(username, [])
-    logger.debug("push_panel_event: username=%s event=%s queues=%d",
-                 username, event_type, len(queues))
-    event_payload: dict[str, Any] = {"type": event_type}
-    if data:
-        event_payload.update(data)
-    for q in queues:
-        q.put_nowait(event_payload)
+    """Push an SSE event to all connected clients for this user, on any worker."""
+    broadcast(username, event_type, data)
+    logger.debug("push_panel_event: username=%s event=%s", username, event_type)
 
 
 def set_profile_updated(username: str):
     """Signal that the profile was updated (called after approve action)."""
-    _profile_updated_flags[username] = True
     push_panel_event(username, "refresh")
 
 
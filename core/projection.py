@@ -0,0 +1,154 @@
+"""
+Tool result projection — single source of truth for what the LLM sees of a tool result.
+
+Large tools (``get_matches``, ``search_candidates``, ``view_job``) return full
+records that the UI needs for cards and side panels, but the model only needs
+a handful of identifying fields to reason about them.  Each entry in
+``TOOL_PROJECTIONS`` declares the subset of a tool's result that is serialized
+into the ``ToolMessage`` content; the full payload travels on
+``ToolMessage.artifact`` for the adapter.
+
+Per-tool token savings are accumulated in-process, returned by
+``get_projection_stats()`` and exported on ``/api/metrics`` as
+``chatbot_tool_projection_*`` (see ``core.metrics``).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any
+
+logger = logging.getLogger("chatbot.projection")
+
+
+class ToolProjection:
+    """Declares which fields of a tool result are shown to the LLM.
+
+    ``fields`` are copied as-is from the top level of the result.  ``nested``
+    maps a top-level key to the sub-fields kept from it — applied to each
+    element when the value is a list of dicts, or directly when it is a dict.
+    """
+
+    __slots__ = ("fields", "nested")
+
+    def __init__(
+        self,
+        fields: tuple[str, ...],
+        nested: dict[str, tuple[str, ...]] | None = None,
+    ):
+        self.fields = fields
+        self.nested = nested or {}
+
+    def apply(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Return the projected view of *payload* (never mutates it)."""
+        projected = {k: payload[k] for k in self.fields if k in payload}
+        for key, sub_fields in self.nested.items():
+            if key not in payload:
+                continue
+            value = payload[key]
+            if isinstance(value, list):
+                projected[key] = [
+                    _pick(item, sub_fields) if isinstance(item, dict) else item
+                    for item in value
+                ]
+            elif isinstance(value, dict):
+                projected[key] = _pick(value, sub_fields)
+            else:
+                projected[key] = value
+        return projected
+
+
+def _pick(data: dict[str, Any], keys: tuple[str, ...]) -> dict[str, Any]:
+    return {k: data[k] for k in keys if k in data}
+
+
+# Canonical registry — tool name → LLM-facing projection.
+# Tools not listed here are passed through unchanged.
+TOOL_PROJECTIONS: dict[str, ToolProjection] = {
+    "get_matches": ToolProjection(
+        fields=(
+            "success", "error", "count", "total_available", "offset",
+            "has_more", "averageScore", "filters_applied", "search_text_used",
+        ),
+        nested={
+            "matches": (
+                "id", "title", "corporateTitleCode", "orgLine", "location",
+                "matchScore", "matchingSkills", "profileMatchingSkills", "daysAgo", "isNew", "isNewToUser",
+            ),
+            "profile_summary": ("name", "topSkills", "completionScore"),
+        },
+    ),
+    "search_candidates": ToolProjection(
+        fields=(
+            "success", "error", "count", "total_available", "has_more",
+            "filters_applied", "search_text_used",
+        ),
+        nested={
+            "candidates": (
+                "employeeId", "name", "businessTitle", "department",
+                "location", "rank", "matchScore",
+            ),
+        },
+    ),
+    "view_job": ToolProjection(
+        fields=("success", "error", "job_id"),
+        nested={
+            "job": ("id", "title", "corporateTitle", "hiringManager", "orgLine", "location"),
+        },
+    ),
+}
+
+
+def get_projection(tool_name: str) -> ToolProjection | None:
+    """Return the projection declared for *tool_name*, or ``None``."""
+    return TOOL_PROJECTIONS.get(tool_name)
+
+
+# ---------------------------------------------------------------------------
+# Token accounting
+# ---------------------------------------------------------------------------
+
+# Approximate characters per token for the chat models in use.
+_CHARS_PER_TOKEN = 4
+
+# Maps tool_name → {"calls", "full_tokens", "projected_tokens"}
+_projection_stats: dict[str, dict[str, int]] = {}
+_projection_stats_lock = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for projection accounting."""
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def record_projection(tool_name: str, full_text: str, projected_text: str) -> None:
+    """Accumulate the token savings of one projected tool result."""
+    full_tokens = estimate_tokens(full_text)
+    projected_tokens = estimate_tokens(projected_text)
+    with _projection_stats_lock:
+        entry = _projection_stats.setdefault(
+            tool_name, {"calls": 0, "full_tokens": 0, "projected_tokens": 0}
+        )
+        entry["calls"] += 1
+        entry["full_tokens"] += full_tokens
+        entry["projected_tokens"] += projected_tokens
+    logger.debug(
+        "Projected %s result: %d -> %d tokens", tool_name, full_tokens, projected_tokens
+    )
+
+
+def get_projection_stats() -> dict[str, dict[str, int]]:
+    """Return per-tool projection counters, including ``saved_tokens``."""
+    with _projection_stats_lock:
+        return {
+            name: {**entry, "saved_tokens": entry["full_tokens"] - entry["projected_tokens"]}
+            for name, entry in _projection_stats.items()
+        }
+
+
+def reset_projection_stats() -> None:
+    """Clear all projection counters (for tests)."""
+    with _projection_stats_lock:
+        _projection_stats.clear()
+
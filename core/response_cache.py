@@ -0,0 +1,159 @@
+"""
+Response cache for repeated read-only turns.
+
+Many turns are the same read-only question asked again ("show my profile
+score", "what jobs match me").  ``ResponseCache`` stores the final response
+text and the inner tool results of such turns so a repeat can skip the LLM
+pipeline entirely; the adapter re-renders the custom elements from the
+stored tool results.
+
+Entries are keyed on (agent, user, normalized message, profile version,
+catalog version).  Versions are derived from the backing files' mtime and
+size, so any profile write or catalog refresh naturally misses the cache.
+Only turns whose inner tool calls are all in ``READ_ONLY_TOOLS`` are stored.
+
+Only the first turn of a thread is looked up or stored.  Later turns depend
+on the conversation so far ("show more", "tell me about the first one"), so
+a correct key would have to include the whole history, and two
+conversations almost never share one: follow-up entries would nearly never
+hit, yet every message would pay for the lookup and fill the cache.  The
+adapter therefore consults the cache only on a session's first message,
+tracked with a session flag, and reads the checkpoint once to confirm the
+thread is empty.  A hit never reaches the agent, so the adapter
+writes the replayed exchange into the thread's checkpoint itself
+(``BaseAgent.record_turn``) and passes the stored tool results through
+``replay_tool_calls``, where tools with per-session side effects (e.g. the
+seen-jobs tracking of ``get_matches``) re-apply them.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from core.versions import file_version
+
+# Tools that never change persistent state and whose results depend only on
+# the user's profile and the data catalog.
+READ_ONLY_TOOLS = frozenset({
+    "profile_analyzer",
+    "list_profile_entries",
+    "get_matches",
+    "view_job",
+    "ask_jd_qa",
+    "search_candidates",
+    "view_candidate",
+    "get_requisition",
+})
+
+_DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "data"))
+
+# Files whose contents make up the "catalog" that read-only tools query.
+CATALOG_FILES = (
+    os.path.join(_DATA_DIR, "matching_jobs.json"),
+    os.path.join(_DATA_DIR, "employee_directory.json"),
+    os.path.join(_DATA_DIR, "job_requisitions.json"),
+)
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_message(text: str) -> str:
+    """Lower-case, strip punctuation and collapse whitespace."""
+    text = _PUNCTUATION_RE.sub(" ", text.lower())
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def catalog_version() -> str:
+    """Version stamp of the job / employee / requisition data files."""
+    return file_version(*CATALOG_FILES)
+
+
+def is_cacheable(tool_calls: list[tuple[str, Any]]) -> bool:
+    """True if the turn called at least one tool and every call was read-only.
+
+    Turns without tool calls are not cached — their answers usually depend
+    on the conversation so far (e.g. "yes", "show more").
+    """
+    if not tool_calls:
+        return False
+    return all(name in READ_ONLY_TOOLS for name, _result in tool_calls)
+
+
+_replay_hooks: dict[str, Callable[[Any], Any]] = {}
+
+
+def register_replay_hook(tool_name: str, hook: Callable[[Any], Any]) -> None:
+    """Have cache replays pass *tool_name*'s stored result through *hook*.
+
+    The hook receives the stored result and returns the one to render; it
+    must not modify the stored value in place.
+    """
+    _replay_hooks[tool_name] = hook
+
+
+def replay_tool_calls(tool_calls: list[tuple[str, Any]]) -> list[tuple[str, Any]]:
+    """Return the tool results of a cached turn as they should be re-rendered now."""
+    replayed = []
+    for name, result in tool_calls:
+        hook = _replay_hooks.get(name)
+        replayed.append((name, hook(result) if hook is not None else result))
+    return replayed
+
+
+class ResponseCache:
+    """Thread-safe LRU cache with per-entry TTL."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        agent: str,
+        user: str,
+        message: str,
+        profile_version: str,
+        catalog_version: str,
+    ) -> tuple:
+        return (agent, user, normalize_message(message), profile_version, catalog_version)
+
+    def get(self, key: tuple) -> Any | None:
+        """Return the cached value for *key*, or ``None`` on miss / expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple, value: Any) -> None:
+        """Store *value*, evicting the least recently used entries past the size bound."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,304 @@
+"""
+Fan-out hub for the side-panel Server-Sent Events stream.
+
+Each user has a channel holding a short replay ring of recent events (for
+``Last-Event-ID`` resume) and up to ``max_subscribers`` subscribers, one per
+open browser tab.  Every subscriber owns a bounded buffer:
+
+- state-refresh events (``COALESCED_TYPES``) replace a pending event of the
+  same type instead of queueing behind it;
+- when the buffer is full the oldest event is dropped and the subscriber is
+  told to ``resync`` (reload its state) before the next delivered event.
+
+So a tab that stops reading costs at most ``buffer_size`` events, never an
+unbounded queue.  Idle streams get a heartbeat comment every
+``heartbeat_seconds`` so proxies keep them open.
+
+``publish`` delivers to this process's subscribers and may be called from
+any thread (tools run in executor threads); subscribers are woken on their
+own event loop.  ``broadcast`` sends an event through the shared backend
+(``core/backend.py``) to every app worker's hub, so it reaches the browser
+whichever worker holds its stream.  Event ids are ``<epoch>-<seq>`` with a
+per-hub epoch: a browser that reconnects to a different worker (or after a
+restart) presents a foreign id and gets a ``resync`` instead of a replay.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+from core.config import (
+    SSE_BUFFER_SIZE,
+    SSE_HEARTBEAT_SECONDS,
+    SSE_MAX_CONNECTIONS_PER_USER,
+    SSE_REPLAY_SIZE,
+)
+from core.backend import get_backend
+from core.metrics import SSE_COALESCED, SSE_DROPPED, SSE_EVENTS, CallbackMetric
+
+# Events that only tell the panel to reload state: newer replaces older.
+COALESCED_TYPES = frozenset({"refresh", "refresh_jd_editor"})
+
+# Sent in place of events a subscriber missed (overflow or replay gap).
+RESYNC_EVENT = "resync"
+
+# Backend pub/sub channel carrying panel events between app workers.
+PANEL_EVENTS_CHANNEL = "panel_events"
+
+
+@dataclass
+class Event:
+    epoch: str
+    seq: int
+    type: str
+    data: dict[str, Any]
+
+    @property
+    def id(self) -> str:
+        return f"{self.epoch}-{self.seq}"
+
+    def encode(self) -> str:
+        return f"id: {self.id}\ndata: {json.dumps({'type': self.type, **self.data})}\n\n"
+
+
+class Subscriber:
+    """One open SSE connection."""
+
+    def __init__(self, username: str, buffer_size: int):
+        self.username = username
+        self.buffer_size = buffer_size
+        self.buffer: deque[Event] = deque()
+        self.needs_resync = False
+        self.closed = False
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+
+    def offer(self, event: Event) -> None:
+        """Buffer *event*, coalescing or dropping per the hub policy (hub lock held)."""
+        if event.type in COALESCED_TYPES:
+            for i, pending in enumerate(self.buffer):
+                if pending.type == event.type:
+                    del self.buffer[i]
+                    SSE_COALESCED.inc(event.type)
+                    break
+        if len(self.buffer) >= self.buffer_size:
+            dropped = self.buffer.popleft()
+            SSE_DROPPED.inc(dropped.type)
+            self.needs_resync = True
+        self.buffer.append(event)
+        self._notify()
+
+    def close(self) -> None:
+        self.closed = True
+        self._notify()
+
+    def _notify(self) -> None:
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._wakeup.set()
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait for new events; False on timeout."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._wakeup.clear()
+        return True
+
+
+class _Channel:
+    def __init__(self, replay_size: int):
+        self.next_seq = 1
+        self.replay: deque[Event] = deque(maxlen=replay_size)
+        self.subscribers: list[Subscriber] = []
+
+
+class SSEHub:
+    """Per-user event channels with bounded subscribers (see module docstring)."""
+
+    def __init__(
+        self,
+        buffer_size: int = SSE_BUFFER_SIZE,
+        replay_size: int = SSE_REPLAY_SIZE,
+        heartbeat_seconds: float = SSE_HEARTBEAT_SECONDS,
+        max_subscribers: int = SSE_MAX_CONNECTIONS_PER_USER,
+        max_idle_channels: int = 1024,
+    ):
+        self.buffer_size = buffer_size
+        self.replay_size = replay_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_subscribers = max_subscribers
+        self.max_idle_channels = max_idle_channels
+        self.epoch = uuid.uuid4().hex[:8]
+        self._channels: OrderedDict[str, _Channel] = OrderedDict()
+        self._lock = threading.Lock()
+
+    # -- publishing -------------------------------------------------------
+
+    def publish(self, username: str, event_type: str, data: dict | None = None) -> int:
+        """Send an event to this process's subscribers of *username*.
+
+        Returns the subscriber count.  Events for users who have never
+        connected here are discarded.
+        """
+        with self._lock:
+            channel = self._channels.get(username)
+            if channel is None:
+                return 0
+            event = Event(self.epoch, channel.next_seq, event_type, dict(data or {}))
+            channel.next_seq += 1
+            channel.replay.append(event)
+            for sub in channel.subscribers:
+                sub.offer(event)
+            return len(channel.subscribers)
+
+    def _on_message(self, message: dict) -> None:
+        self.publish(message.get("username", ""), message.get("type", ""), message.get("data"))
+
+    # -- subscribing ------------------------------------------------------
+
+    def subscribe(self, username: str, last_event_id: str | None = None) -> Subscriber:
+        """Register a subscriber, pre-filled with events after *last_event_id*.
+
+        If those events are no longer in the replay ring, or the id is from
+        another hub, the subscriber starts with a ``resync``.  The user's oldest connection is closed
+        when ``max_subscribers`` is exceeded.
+        """
+        sub = Subscriber(username, self.buffer_size)
+        with self._lock:
+            channel = self._channels.get(username)
+            if channel is None:
+                channel = self._channels[username] = _Channel(self.replay_size)
+            self._channels.move_to_end(username)
+            if last_event_id:
+                last_seq = self._own_seq(last_event_id)
+                if last_seq is None:
+                    sub.needs_resync = True
+                elif last_seq < channel.next_seq:
+                    oldest = channel.replay[0].seq if channel.replay else channel.next_seq
+                    if last_seq + 1 < oldest:
+                        sub.needs_resync = True
+                    for event in channel.replay:
+                        if event.seq > last_seq:
+                            sub.offer(event)
+            channel.subscribers.append(sub)
+            while len(channel.subscribers) > self.max_subscribers:
+                channel.subscribers.pop(0).close()
+            self._evict_idle()
+        return sub
+
+    def _own_seq(self, event_id: str) -> int | None:
+        """The sequence number of *event_id* if this hub issued it."""
+        epoch, _, seq = event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        with self._lock:
+            channel = self._channels.get(sub.username)
+            if channel is not None and sub in channel.subscribers:
+                channel.subscribers.remove(sub)
+            self._evict_idle()
+
+    def _evict_idle(self) -> None:
+        # Channels without subscribers are kept (for resume) up to a bound.
+        if len(self._channels) <= self.max_idle_channels:
+            return
+        idle = [name for name, ch in self._channels.items() if not ch.subscribers]
+        for name in idle[: max(0, len(idle) - self.max_idle_channels)]:
+            del self._channels[name]
+
+    # -- streaming --------------------------------------------------------
+
+    async def stream(self, sub: Subscriber, initial: list[dict] | None = None) -> AsyncIterator[str]:
+        """Yield SSE frames for *sub* until it is closed or the client leaves.
+
+        *initial* payloads (e.g. a state snapshot) are sent first, without
+        event ids, so they are neither replayed nor change ``Last-Event-ID``.
+        """
+        try:
+            yield "retry: 3000\n: connected\n\n"
+            for payload in initial or ():
+                yield f"data: {json.dumps(payload)}\n\n"
+            while not sub.closed:
+                with self._lock:
+                    resync, sub.needs_resync = sub.needs_resync, False
+                    pending = list(sub.buffer)
+                    sub.buffer.clear()
+                if resync:
+                    # No ``id:`` -- the client's Last-Event-ID stays on real events.
+                    yield f"data: {json.dumps({'type': RESYNC_EVENT})}\n\n"
+                for event in pending:
+                    yield event.encode()
+                if not await sub.wait(self.heartbeat_seconds) and not sub.closed:
+                    yield ": ping\n\n"
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.unsubscribe(sub)
+
+    # -- introspection ----------------------------------------------------
+
+    def connection_count(self) -> int:
+        with self._lock:
+            return sum(len(ch.subscribers) for ch in self._channels.values())
+
+    def buffered_events(self) -> int:
+        with self._lock:
+            return sum(len(s.buffer) for ch in self._channels.values() for s in ch.subscribers)
+
+    def slow_consumers(self) -> int:
+        """Subscribers whose buffer is at least half full."""
+        with self._lock:
+            return sum(
+                1 for ch in self._channels.values() for s in ch.subscribers
+                if len(s.buffer) * 2 >= self.buffer_size
+            )
+
+
+_hub = SSEHub()
+_hub_attached = False
+_attach_lock = threading.Lock()
+
+
+def get_sse_hub() -> SSEHub:
+    """Return the process-wide SSE hub, subscribed to the backend's panel events."""
+    global _hub_attached
+    if not _hub_attached:
+        with _attach_lock:
+            if not _hub_attached:
+                get_backend().subscribe(PANEL_EVENTS_CHANNEL, _hub._on_message)
+                _hub_attached = True
+    return _hub
+
+
+def broadcast(username: str, event_type: str, data: dict | None = None) -> None:
+    """Send a panel event to *username*'s subscribers on every app worker."""
+    get_sse_hub()  # make sure this worker receives its own events too
+    get_backend().publish(
+        PANEL_EVENTS_CHANNEL,
+        {"username": username, "type": event_type, "data": dict(data or {})},
+    )
+    SSE_EVENTS.inc(event_type)
+
+
+CallbackMetric("chatbot_sse_connections", "Open side-panel SSE connections.", lambda: _hub.connection_count())
+CallbackMetric("chatbot_sse_buffered_events", "Events waiting in SSE subscriber buffers.", lambda: _hub.buffered_events())
+CallbackMetric(
+    "chatbot_sse_slow_consumers",
+    "SSE subscribers whose buffer is at least half full.",
+    lambda: _hub.slow_consumers(),
+)
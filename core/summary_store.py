@@ -0,0 +1,128 @@
+"""
+Conversation summaries shared across the orchestrator and its workers.
+
+The orchestrator runs on the user's thread and each worker on
+``"<parent>:<worker>"`` (see ``agents/orchestrator/agent.py``).  Every
+summary an agent produces is published here under the *parent* thread, so a
+worker can read the condensed conversation -- the orchestrator's summary and
+the other workers' -- instead of carrying a long private history of its own.
+
+Each app worker keeps its own bounded store (the least recently used
+conversations are evicted past ``max_threads``).  ``publish_summary`` sends a
+new summary through the shared backend (``core/backend.py``) to every
+worker's store, so a conversation whose next turn lands on another worker
+still sees it.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from core.backend import get_backend
+
+# Backend pub/sub channel carrying new summaries between app workers.
+SUMMARIES_CHANNEL = "summaries"
+
+
+def parent_thread(thread_id: str) -> str:
+    """The conversation (orchestrator) thread that *thread_id* belongs to."""
+    return thread_id.split(":", 1)[0]
+
+
+@dataclass
+class SharedSummary:
+    """Latest summary one agent produced for a conversation.
+
+    *covers_until* is the start time of the first turn the summary does not
+    cover in full (see ``core/middleware/summarization.py``).
+    """
+
+    agent: str
+    thread_id: str
+    text: str
+    updated: float
+    covers_until: float
+
+    @property
+    def is_parent(self) -> bool:
+        """True for the summary of the parent (orchestrator) thread itself."""
+        return self.thread_id == parent_thread(self.thread_id)
+
+
+class SummaryStore:
+    """Thread-safe LRU of per-conversation, per-agent summaries."""
+
+    def __init__(self, max_threads: int = 1024):
+        self.max_threads = max_threads
+        self._entries: OrderedDict[str, dict[str, SharedSummary]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, thread_id: str, agent: str, text: str, covers_until: float | None = None) -> None:
+        """Publish *agent*'s summary of *thread_id* under its parent thread.
+
+        *covers_until* defaults to now, i.e. the whole conversation so far.
+        """
+        parent = parent_thread(thread_id)
+        now = time.time()
+        with self._lock:
+            summaries = self._entries.setdefault(parent, {})
+            summaries[agent] = SharedSummary(agent, thread_id, text, now, now if covers_until is None else covers_until)
+            self._entries.move_to_end(parent)
+            while len(self._entries) > self.max_threads:
+                self._entries.popitem(last=False)
+
+    def get(self, thread_id: str) -> list[SharedSummary]:
+        """Summaries of *thread_id*'s conversation, the parent's first."""
+        with self._lock:
+            summaries = list(self._entries.get(parent_thread(thread_id), {}).values())
+        return sorted(summaries, key=lambda s: (not s.is_parent, s.updated))
+
+    def parent_summary(self, thread_id: str) -> SharedSummary | None:
+        """The parent thread's own summary of *thread_id*'s conversation, if any."""
+        return next((s for s in self.get(thread_id) if s.is_parent), None)
+
+    def context_for(self, thread_id: str) -> str:
+        """The other agents' summaries of *thread_id*'s conversation, as prompt text."""
+        return "\n\n".join(f"[{s.agent}] {s.text}" for s in self.get(thread_id) if s.thread_id != thread_id)
+
+    def clear(self, thread_id: str | None = None) -> None:
+        with self._lock:
+            if thread_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(parent_thread(thread_id), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_store = SummaryStore()
+_store_attached = False
+_attach_lock = threading.Lock()
+
+
+def _on_message(message: dict) -> None:
+    _store.put(
+        message.get("thread_id", ""), message.get("agent", ""), message.get("text", ""), message.get("covers_until"),
+    )
+
+
+def get_summary_store() -> SummaryStore:
+    """Return the process-wide summary store, subscribed to other workers' summaries."""
+    global _store_attached
+    if not _store_attached:
+        with _attach_lock:
+            if not _store_attached:
+                get_backend().subscribe(SUMMARIES_CHANNEL, _on_message)
+                _store_attached = True
+    return _store
+
+
+def publish_summary(thread_id: str, agent: str, text: str, covers_until: float | None = None) -> None:
+    """Record *agent*'s summary of *thread_id* in every app worker's store."""
+    get_summary_store()  # this worker receives its own summaries too
+    message = {"thread_id": thread_id, "agent": agent, "text": text, "covers_until": covers_until}
+    get_backend().publish(SUMMARIES_CHANNEL, message)
@@ -0,0 +1,218 @@
+"""
+Local token counting.
+
+Uses ``tiktoken`` with ``TOKENIZER_ENCODING`` (``o200k_base``, the GPT-4o
+family encoding, by default).  If the encoding cannot be loaded -- tiktoken
+downloads encoding files on first use, so offline hosts need
+``TIKTOKEN_CACHE_DIR`` pre-populated -- counts fall back to a
+characters-per-token estimate and a warning is logged once.  An empty
+``TOKENIZER_ENCODING`` always uses the estimate.
+
+Tool schema and message counts are memoized in bounded LRUs keyed on the
+tokenizer and a hash of what is counted, so a history the checkpointer
+hands back as fresh message objects every turn is only counted once.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import threading
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any
+
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from core.config import TOKENIZER_ENCODING
+
+logger = logging.getLogger("chatbot.tokens")
+
+# Rough English average for GPT tokenizers; only used without tiktoken.
+_CHARS_PER_TOKEN = 4
+
+_encoding_lock = threading.Lock()
+_encoding_loaded = False
+_encoding: Any = None
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded and not TOKENIZER_ENCODING:
+                _encoding_loaded = True
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+
+                    _encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+                except Exception as e:
+                    # Logged once per process: the result is cached below.
+                    logger.warning(
+                        "Tokenizer '%s' unavailable (%s); estimating %d characters per token. "
+                        "On offline hosts, pre-populate TIKTOKEN_CACHE_DIR.",
+                        TOKENIZER_ENCODING, type(e).__name__, _CHARS_PER_TOKEN,
+                    )
+                    _encoding = None
+                _encoding_loaded = True
+    return _encoding
+
+
+def using_tokenizer() -> bool:
+    """True when counts come from tiktoken rather than the estimate."""
+    return _get_encoding() is not None
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in *text*."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return math.ceil(len(text) / _CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+@lru_cache(maxsize=256)
+def _count_text_cached(text: str) -> int:
+    return count_tokens(text)
+
+
+def count_static_tokens(text: str) -> int:
+    """``count_tokens`` memoized for text that repeats verbatim (system prompts)."""
+    return _count_text_cached(text)
+
+
+# Schema JSON per live tool object (dropped when the tool is collected),
+# and schema token counts by (tokenizer, tool name, schema hash).
+_tool_schemas: dict[int, tuple[weakref.ref, str]] = {}
+_TOOL_MEMO_MAX_ENTRIES = 512
+_tool_counts: OrderedDict[tuple, int] = OrderedDict()
+_tool_counts_lock = threading.Lock()
+
+
+def _tool_schema(tool: Any) -> str:
+    if isinstance(tool, dict):
+        return json.dumps(tool, separators=(",", ":"), sort_keys=True)
+    entry = _tool_schemas.get(id(tool))
+    if entry is not None and entry[0]() is tool:
+        return entry[1]
+    text = json.dumps(convert_to_openai_tool(tool), separators=(",", ":"), sort_keys=True)
+    try:
+        _tool_schemas[id(tool)] = (weakref.ref(tool), text)
+        weakref.finalize(tool, _tool_schemas.pop, id(tool), None)
+    except TypeError:  # not weak-referenceable; convert again next time
+        pass
+    return text
+
+
+def count_tool_tokens(tools: list) -> int:
+    """Tokens in the JSON schemas of *tools*, memoized per tool schema."""
+    total = 0
+    for t in tools:
+        try:
+            schema = _tool_schema(t)
+        except Exception:
+            continue
+        key = (_counter_id(), getattr(t, "name", None), len(schema), hash(schema))
+        with _tool_counts_lock:
+            tokens = _tool_counts.get(key)
+            if tokens is not None:
+                _tool_counts.move_to_end(key)
+        if tokens is None:
+            tokens = count_tokens(schema)
+            with _tool_counts_lock:
+                _tool_counts[key] = tokens
+                while len(_tool_counts) > _TOOL_MEMO_MAX_ENTRIES:
+                    _tool_counts.popitem(last=False)
+        total += tokens
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Chat messages
+# ---------------------------------------------------------------------------
+
+# OpenAI chat format: every message is wrapped in ~3 tokens of role markup,
+# and the reply is primed with 3 more.
+_TOKENS_PER_MESSAGE = 3
+_TOKENS_REPLY_PRIMING = 3
+# Low-detail image cost; images are rare here and only need to be counted.
+_TOKENS_PER_IMAGE = 85
+
+# Message counts by (counter, content fingerprint).  Messages belong to the
+# checkpointer, which returns new objects every turn, so the memo is keyed on
+# what the message says rather than on the object.
+_MESSAGE_MEMO_MAX_ENTRIES = 4096
+_message_counts: OrderedDict[tuple, int] = OrderedDict()
+_message_counts_lock = threading.Lock()
+
+
+def _counter_id() -> str:
+    return TOKENIZER_ENCODING if using_tokenizer() else f"~{_CHARS_PER_TOKEN}cpt"
+
+
+def _content_tokens(content: Any) -> int:
+    if isinstance(content, str):
+        return count_tokens(content)
+    total = 0
+    for block in content or []:
+        if isinstance(block, str):
+            total += count_tokens(block)
+        elif isinstance(block, dict) and block.get("type") == "text":
+            total += count_tokens(block.get("text", ""))
+        elif isinstance(block, dict) and block.get("type") in ("image", "image_url"):
+            total += _TOKENS_PER_IMAGE
+        else:
+            total += count_tokens(json.dumps(block, default=str))
+    return total
+
+
+def _fingerprint(message: Any, content: Any) -> tuple:
+    text = content if isinstance(content, str) else json.dumps(content, default=str, sort_keys=True)
+    tool_calls = getattr(message, "tool_calls", None)
+    calls = json.dumps([[tc.get("name"), tc.get("args")] for tc in tool_calls], default=str) if tool_calls else ""
+    return (_counter_id(), getattr(message, "type", None), len(text), hash(text), getattr(message, "name", None), hash(calls))
+
+
+def count_message_tokens(message: Any) -> int:
+    """Tokens *message* contributes to a prompt, memoized per message.
+
+    The memo is a bounded LRU keyed on the tokenizer id and a hash of the
+    message's content, name and tool calls -- not on the object, so the
+    copies the checkpointer returns each turn hit it, an edited message is
+    recounted, and the message itself is never modified.
+    """
+    content = getattr(message, "content", "")
+    key = _fingerprint(message, content)
+    with _message_counts_lock:
+        tokens = _message_counts.get(key)
+        if tokens is not None:
+            _message_counts.move_to_end(key)
+            return tokens
+
+    tokens = _TOKENS_PER_MESSAGE + _content_tokens(content)
+    name = getattr(message, "name", None)
+    if name:
+        tokens += count_tokens(name)
+    for tc in getattr(message, "tool_calls", None) or []:
+        tokens += count_tokens(tc.get("name", "")) + count_tokens(json.dumps(tc.get("args", {}), separators=(",", ":")))
+
+    with _message_counts_lock:
+        _message_counts[key] = tokens
+        while len(_message_counts) > _MESSAGE_MEMO_MAX_ENTRIES:
+            _message_counts.popitem(last=False)
+    return tokens
+
+
+def count_messages_tokens(messages) -> int:
+    """Prompt tokens of a message list (the summarization ``token_counter``)."""
+    from langchain_core.messages import BaseMessage, convert_to_messages
+
+    messages = list(messages)
+    if not all(isinstance(m, BaseMessage) for m in messages):
+        messages = convert_to_messages(messages)
+    return sum(count_message_tokens(m) for m in messages) + _TOKENS_REPLY_PRIMING
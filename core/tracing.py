@@ -0,0 +1,288 @@
+"""
+Lightweight span tracing with JSONL export.
+
+Spans nest through a ``ContextVar``, so a span opened inside another --
+including across ``await`` and into tasks LangGraph spawns for tools --
+becomes its child.  Finished spans are appended to ``TRACE_EXPORT_PATH`` as
+one JSON object per line using OTLP field names (``traceId``, ``spanId``,
+``parentSpanId``, ``startTimeUnixNano`` ...), so the file can be loaded into
+OTLP tooling or read with ``python -m core.tracing``.
+
+Tracing is off unless ``TRACING_ENABLED`` is set; ``span()`` is then a
+no-op context manager and nothing is wrapped.
+
+Span names use ``kind:detail`` -- ``turn``, ``agent:<name>``,
+``worker:<name>``, ``middleware:<name>.<hook>``, ``llm:<agent>``,
+``tool:<name>``, ``checkpoint:<op>``, ``render_tool_elements``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import logging
+import os
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.errors import GraphBubbleUp
+
+from core.config import TRACE_EXPORT_PATH, TRACING_ENABLED
+
+logger = logging.getLogger("chatbot.tracing")
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "status")
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, attributes: dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+        self.status = "OK"
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "durationMs": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": {"code": self.status},
+        }
+
+
+class JsonlExporter:
+    """Appends finished spans to a JSONL file; flushes when a root span ends."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str, ensure_ascii=False)
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            if span.parent_id is None:
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_enabled = TRACING_ENABLED
+_exporter: JsonlExporter | None = JsonlExporter(TRACE_EXPORT_PATH) if TRACING_ENABLED else None
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def tracing_enabled() -> bool:
+    return _enabled
+
+
+def configure(enabled: bool, path: str | None = None) -> None:
+    """Turn tracing on or off at runtime (benchmarks, tests)."""
+    global _enabled, _exporter
+    if _exporter is not None:
+        _exporter.close()
+    _enabled = enabled
+    _exporter = JsonlExporter(path or TRACE_EXPORT_PATH) if enabled else None
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Time the enclosed block as a child of the current span."""
+    if not _enabled:
+        yield None
+        return
+
+    parent = _current_span.get()
+    s = Span(
+        name,
+        trace_id=parent.trace_id if parent else secrets.token_hex(16),
+        parent_id=parent.span_id if parent else None,
+        attributes=attributes,
+    )
+    token = _current_span.set(s)
+    try:
+        yield s
+    except GraphBubbleUp:
+        # Interrupts are control flow, not failures.
+        s.attributes["interrupted"] = True
+        raise
+    except BaseException as e:
+        s.status = "ERROR"
+        s.attributes["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        s.end_ns = time.time_ns()
+        _current_span.reset(token)
+        if _exporter is not None:
+            try:
+                _exporter.export(s)
+            except Exception:
+                logger.debug("Failed to export span %s", name, exc_info=True)
+
+
+def traced(name: str):
+    """Decorator running an async function inside ``span(name)``."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Checkpointer wrapper
+# ---------------------------------------------------------------------------
+
+def _thread_id(config: dict | None) -> str:
+    return ((config or {}).get("configurable") or {}).get("thread_id", "")
+
+
+class TracingCheckpointer(BaseCheckpointSaver):
+    """Delegating checkpointer that records a span per read / write."""
+
+    def __init__(self, inner: BaseCheckpointSaver):
+        super().__init__(serde=inner.serde)
+        self.inner = inner
+
+    @property
+    def config_specs(self):
+        return self.inner.config_specs
+
+    def get_tuple(self, config):
+        with span("checkpoint:get_tuple", thread_id=_thread_id(config)):
+            return self.inner.get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with span("checkpoint:put", thread_id=_thread_id(config)):
+            return self.inner.put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        with span("checkpoint:put_writes", thread_id=_thread_id(config), writes=len(writes)):
+            return self.inner.put_writes(config, writes, task_id, task_path)
+
+    async def aget_tuple(self, config):
+        with span("checkpoint:aget_tuple", thread_id=_thread_id(config)):
+            return await self.inner.aget_tuple(config)
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        with span("checkpoint:aput", thread_id=_thread_id(config)):
+            return await self.inner.aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        with span("checkpoint:aput_writes", thread_id=_thread_id(config), writes=len(writes)):
+            return await self.inner.aput_writes(config, writes, task_id, task_path)
+
+    # Listing and maintenance calls are passed through untraced.
+    def list(self, config, **kwargs):
+        return self.inner.list(config, **kwargs)
+
+    def alist(self, config, **kwargs):
+        return self.inner.alist(config, **kwargs)
+
+    def delete_thread(self, thread_id):
+        return self.inner.delete_thread(thread_id)
+
+    async def adelete_thread(self, thread_id):
+        return await self.inner.adelete_thread(thread_id)
+
+    def get_next_version(self, current, channel):
+        return self.inner.get_next_version(current, channel)
+
+
+# ---------------------------------------------------------------------------
+# Trace file reader
+# ---------------------------------------------------------------------------
+
+def load_traces(path: str) -> dict[str, list[dict]]:
+    """Group the spans in a JSONL export by trace id."""
+    traces: dict[str, list[dict]] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                traces.setdefault(record["traceId"], []).append(record)
+    return traces
+
+
+def format_trace(spans: list[dict]) -> str:
+    """Render one trace as an indented tree with total and self time."""
+    children: dict[str, list[dict]] = {}
+    for s in spans:
+        children.setdefault(s["parentSpanId"], []).append(s)
+    lines: list[str] = []
+
+    def walk(node: dict, depth: int) -> None:
+        kids = sorted(children.get(node["spanId"], []), key=lambda s: s["startTimeUnixNano"])
+        self_ms = node["durationMs"] - sum(k["durationMs"] for k in kids)
+        flag = " !" if node["status"]["code"] != "OK" else ""
+        lines.append(f"{'  ' * depth}{node['name']:<{60 - 2 * depth}} {node['durationMs']:>10.2f} ms  (self {max(self_ms, 0):.2f}){flag}")
+        for kid in kids:
+            walk(kid, depth + 1)
+
+    for root in sorted(children.get("", []), key=lambda s: s["startTimeUnixNano"]):
+        walk(root, 0)
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Print the slowest traces from a span export")
+    parser.add_argument("path", nargs="?", default=TRACE_EXPORT_PATH)
+    parser.add_argument("--slowest", type=int, default=1, help="Number of traces to print")
+    args = parser.parse_args()
+
+    traces = load_traces(args.path)
+
+    def root_ms(spans: list[dict]) -> float:
+        return max((s["durationMs"] for s in spans if not s["parentSpanId"]), default=0.0)
+
+    for spans in sorted(traces.values(), key=root_ms, reverse=True)[: args.slowest]:
+        print(format_trace(spans))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
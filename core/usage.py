@@ -0,0 +1,353 @@
+"""
+Per-call LLM token and cost accounting.
+
+``UsageCallbackHandler`` is attached to every client ``get_llm`` returns, so
+each model call -- agent turns, HITL resumes and summarization alike -- is
+recorded with the agent (``lc_agent_name``), graph node, thread, user,
+model, token counts and latency.  Token counts come from the AIMessage's
+``usage_metadata``, falling back to ``response_metadata["token_usage"]``.
+Responses served from the prompt cache are flagged ``cached`` and cost
+nothing.  Copies of a response shared by single-flight dedup (marked with
+``SHARED_RESPONSE_KEY`` in their ``response_metadata``) are not recorded:
+the API call is counted once, by the caller that made it.
+
+Records are buffered and written to a compact SQLite table
+(``USAGE_DB_PATH``; an in-memory database when empty) at the end of each
+turn.  ``track_turn(user)`` scopes a turn: calls made inside it are also
+collected on the yielded ``TurnUsage`` for the debug step in ``app.py``.
+
+Usage:
+    python -m core.usage --by agent
+    python -m core.usage --by node --db data/usage.db
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import astuple, dataclass, fields
+from typing import Any, Iterator
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from core.config import LLM_PRICE_INPUT_PER_1K, LLM_PRICE_OUTPUT_PER_1K, USAGE_DB_PATH
+from core.metrics import LLM_CALLS, LLM_TOKENS
+
+logger = logging.getLogger("chatbot.usage")
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS llm_usage (
+    ts REAL NOT NULL,
+    user TEXT NOT NULL,
+    thread_id TEXT NOT NULL,
+    agent TEXT NOT NULL,
+    node TEXT NOT NULL,
+    model TEXT NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    cache_read_tokens INTEGER NOT NULL,
+    cached INTEGER NOT NULL,
+    latency_ms REAL NOT NULL
+)
+"""
+
+GROUP_COLUMNS = ("agent", "user", "thread_id", "node", "model")
+
+SHARED_RESPONSE_KEY = "single_flight_shared"
+
+
+def estimate_cost(input_tokens: int, output_tokens: int) -> float:
+    """Cost at the configured per-1K-token prices (0 when unset)."""
+    return input_tokens / 1000 * LLM_PRICE_INPUT_PER_1K + output_tokens / 1000 * LLM_PRICE_OUTPUT_PER_1K
+
+
+@dataclass
+class UsageRecord:
+    """One model call."""
+
+    ts: float
+    user: str
+    thread_id: str
+    agent: str
+    node: str
+    model: str
+    input_tokens: int
+    output_tokens: int
+    cache_read_tokens: int
+    cached: bool
+    latency_ms: float
+
+    @property
+    def cost(self) -> float:
+        return 0.0 if self.cached else estimate_cost(self.input_tokens, self.output_tokens)
+
+
+class TurnUsage:
+    """The model calls made during one chat turn."""
+
+    def __init__(self, user: str = ""):
+        self.user = user
+        self.records: list[UsageRecord] = []
+
+    def by_agent(self) -> dict[str, dict[str, float]]:
+        """Totals per agent, in order of first call."""
+        totals: dict[str, dict[str, float]] = {}
+        for r in self.records:
+            t = totals.setdefault(r.agent, {"calls": 0, "input_tokens": 0, "output_tokens": 0, "latency_ms": 0.0, "cost": 0.0})
+            t["calls"] += 1
+            t["input_tokens"] += r.input_tokens
+            t["output_tokens"] += r.output_tokens
+            t["latency_ms"] += r.latency_ms
+            t["cost"] += r.cost
+        return totals
+
+    @property
+    def input_tokens(self) -> int:
+        return sum(r.input_tokens for r in self.records)
+
+    @property
+    def output_tokens(self) -> int:
+        return sum(r.output_tokens for r in self.records)
+
+    @property
+    def cost(self) -> float:
+        return sum(r.cost for r in self.records)
+
+
+_current_user: ContextVar[str] = ContextVar("usage_user", default="")
+_current_turn: ContextVar[TurnUsage | None] = ContextVar("usage_turn", default=None)
+
+
+class UsageStore:
+    """Buffered writer / reader for the ``llm_usage`` table."""
+
+    def __init__(self, path: str | None = None, flush_every: int = 64):
+        self.path = path or None
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._pending: list[UsageRecord] = []
+        self._conn: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened on first write so importing / configuring creates no file.
+        if self._conn is None:
+            if self.path:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path or ":memory:", timeout=5, check_same_thread=False)
+            self._conn.execute(_CREATE_TABLE)
+            self._conn.commit()
+        return self._conn
+
+    def add(self, record: UsageRecord) -> None:
+        with self._lock:
+            self._pending.append(record)
+            full = len(self._pending) >= self.flush_every
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered records in one transaction."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            placeholders = ", ".join("?" for _ in fields(UsageRecord))
+            try:
+                conn = self._connection()
+                conn.executemany(
+                    f"INSERT INTO llm_usage VALUES ({placeholders})",
+                    [astuple(r) for r in pending],
+                )
+                conn.commit()
+            except sqlite3.Error:
+                logger.warning("Failed to write %d usage records", len(pending), exc_info=True)
+
+    def summary(self, by: str = "agent", since: float | None = None) -> list[dict[str, Any]]:
+        """Aggregate calls, tokens, latency and cost grouped by *by*, most tokens first."""
+        if by not in GROUP_COLUMNS:
+            raise ValueError(f"Cannot group usage by '{by}'. Choose from: {', '.join(GROUP_COLUMNS)}")
+        self.flush()
+        query = (
+            f"SELECT {by}, COUNT(*), SUM(input_tokens), SUM(output_tokens), SUM(cache_read_tokens), "
+            "SUM(cached), SUM(latency_ms), "
+            "SUM(CASE WHEN cached THEN 0 ELSE input_tokens END), "
+            "SUM(CASE WHEN cached THEN 0 ELSE output_tokens END) "
+            "FROM llm_usage WHERE ts >= ? "
+            f"GROUP BY {by} ORDER BY SUM(input_tokens) + SUM(output_tokens) DESC"
+        )
+        with self._lock:
+            rows = self._connection().execute(query, (since or 0,)).fetchall()
+        return [
+            {
+                by: key,
+                "calls": calls,
+                "input_tokens": tokens_in,
+                "output_tokens": tokens_out,
+                "cache_read_tokens": cache_read,
+                "cached_calls": cached,
+                "latency_ms": round(latency, 1),
+                "cost": round(estimate_cost(billed_in, billed_out), 6),
+            }
+            for key, calls, tokens_in, tokens_out, cache_read, cached, latency, billed_in, billed_out in rows
+        ]
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def extract_usage(message: Any) -> tuple[int, int, int, bool]:
+    """Return ``(input, output, cache_read, cached)`` token counts of an AIMessage."""
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        details = usage.get("input_token_details") or {}
+        return (
+            usage.get("input_tokens", 0),
+            usage.get("output_tokens", 0),
+            details.get("cache_read", 0) or 0,
+            # langchain-core zeroes ``total_cost`` on prompt-cache hits.
+            usage.get("total_cost") == 0,
+        )
+    token_usage = (getattr(message, "response_metadata", None) or {}).get("token_usage") or {}
+    cached_details = token_usage.get("prompt_tokens_details") or {}
+    return (
+        token_usage.get("prompt_tokens", 0),
+        token_usage.get("completion_tokens", 0),
+        cached_details.get("cached_tokens", 0) or 0,
+        False,
+    )
+
+
+class UsageCallbackHandler(BaseCallbackHandler):
+    """Records a ``UsageRecord`` for every chat model call."""
+
+    # Recording is a few appends; run inline instead of in an executor.
+    run_inline = True
+
+    def __init__(self, store: UsageStore):
+        self.store = store
+        self._starts: dict[UUID, tuple[float, str, str, str, str]] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs) -> None:
+        metadata = metadata or {}
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or params.get("azure_deployment") or params.get("_type", "")
+        self._starts[run_id] = (
+            time.perf_counter(),
+            metadata.get("lc_agent_name", ""),
+            metadata.get("langgraph_node", ""),
+            str(metadata.get("thread_id", "")),
+            str(model),
+        )
+
+    def on_llm_end(self, response: LLMResult, *, run_id, **kwargs) -> None:
+        start = self._starts.pop(run_id, None)
+        if start is None:
+            return
+        started, agent, node, thread_id, model = start
+        latency_ms = (time.perf_counter() - started) * 1000
+        turn = _current_turn.get()
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                if (getattr(message, "response_metadata", None) or {}).get(SHARED_RESPONSE_KEY):
+                    continue
+                tokens_in, tokens_out, cache_read, cached = extract_usage(message)
+                record = UsageRecord(
+                    ts=time.time(),
+                    user=_current_user.get(),
+                    thread_id=thread_id,
+                    agent=agent,
+                    node=node,
+                    model=(getattr(message, "response_metadata", None) or {}).get("model_name") or model,
+                    input_tokens=tokens_in,
+                    output_tokens=tokens_out,
+                    cache_read_tokens=cache_read,
+                    cached=cached,
+                    latency_ms=round(latency_ms, 3),
+                )
+                self.store.add(record)
+                if turn is not None:
+                    turn.records.append(record)
+                LLM_CALLS.inc(agent)
+                LLM_TOKENS.inc(agent, "input", amount=tokens_in)
+                LLM_TOKENS.inc(agent, "output", amount=tokens_out)
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        self._starts.pop(run_id, None)
+
+
+_store: UsageStore | None = None
+_handler: UsageCallbackHandler | None = None
+_init_lock = threading.Lock()
+
+
+def get_usage_store() -> UsageStore:
+    """Return the process-wide usage store."""
+    global _store
+    if _store is None:
+        with _init_lock:
+            if _store is None:
+                _store = UsageStore(USAGE_DB_PATH)
+    return _store
+
+
+def get_usage_handler() -> UsageCallbackHandler:
+    """Return the callback handler ``get_llm`` attaches to every client."""
+    global _handler
+    if _handler is None:
+        store = get_usage_store()
+        with _init_lock:
+            if _handler is None:
+                _handler = UsageCallbackHandler(store)
+    return _handler
+
+
+@contextmanager
+def track_turn(user: str) -> Iterator[TurnUsage]:
+    """Attribute the model calls made inside the block to *user* and collect them."""
+    turn = TurnUsage(user)
+    user_token = _current_user.set(user)
+    turn_token = _current_turn.set(turn)
+    try:
+        yield turn
+    finally:
+        _current_turn.reset(turn_token)
+        _current_user.reset(user_token)
+        get_usage_store().flush()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Summarize recorded LLM token usage")
+    parser.add_argument("--by", choices=GROUP_COLUMNS, default="agent")
+    parser.add_argument("--db", default=USAGE_DB_PATH, help="Usage database (default: USAGE_DB_PATH)")
+    parser.add_argument("--hours", type=float, help="Only include the last N hours")
+    args = parser.parse_args()
+
+    if not args.db or not os.path.exists(args.db):
+        print(f"No usage database at '{args.db}'.")
+        return 1
+    since = time.time() - args.hours * 3600 if args.hours else None
+    rows = UsageStore(args.db).summary(by=args.by, since=since)
+
+    print(f"{args.by:<28}{'calls':>7}{'input':>12}{'output':>10}{'cached':>8}{'latency ms':>13}{'cost':>10}")
+    for row in rows:
+        print(f"{str(row[args.by]) or '-':<28}{row['calls']:>7}{row['input_tokens']:>12}{row['output_tokens']:>10}"
+              f"{row['cached_calls']:>8}{row['latency_ms']:>13.1f}{row['cost']:>10.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+"""
+Cheap version stamps of data files.
+
+Caches built from files -- the response cache (``core.response_cache``) and
+the ranked catalogs of ``core.match_score`` -- key their entries on these
+stamps, so a lookup stats the files instead of reading them.
+"""
+
+from __future__ import annotations
+
+import os
+
+
+def file_version(*paths: str) -> str:
+    """Return a cheap version stamp for *paths* from their mtime and size.
+
+    Missing files contribute ``"-"`` so their later creation changes the stamp.
+    """
+    parts = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            parts.append("-")
+            continue
+        parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+    return "|".join(parts)
@@ -2,9 +2,32 @@
 """
 Run evaluation scenarios against agents.
 
+Several scenario files (or directories of them) run as a batch: each
+scenario is repeated ``--repeat`` times to expose flaky ones, up to
+``--concurrency`` runs execute at once, each with its own thread id and
+checkpointer, and an aggregated JSON report is written (see
+``core/eval/batch.py``).
+
+Every turn's latency, LLM calls, tokens and tool calls are measured
+(``core/eval/perf.py``); scenarios can budget them with ``max_*``
+expectations.  ``--save-baseline`` stores the per-turn medians of a run and
+``--baseline`` reports the percent change of each metric against them,
+failing with ``--max-regression`` when one grows by more than that.
+
+``--cassette record`` stores every model request and response of each
+scenario in ``eval/cassettes/<scenario>.json``; ``--cassette replay`` then
+answers recorded requests offline at zero latency (recording unseen ones),
+and ``--cassette strict`` fails the run on any unseen request.  Replayed
+runs measure only the framework's own overhead (``core/cassette.py``).
+
 Usage:
-    python -m eval.run [SCENARIO_PATH]
+    python -m eval.run [SCENARIO_PATH ...]
     python -m eval.run eval/scenarios/mycareer_happy_flow.json
+    python -m eval.run eval/scenarios --repeat 5 --concurrency 8 --output report.json
+    python -m eval.run eval/scenarios --repeat 5 --save-baseline eval/baseline.json
+    python -m eval.run eval/scenarios --repeat 5 --baseline eval/baseline.json --max-regression 20
+    python -m eval.run eval/scenarios --cassette record
+    python -m eval.run eval/scenarios --cassette strict --repeat 20
 
 Requirements:
     - AZURE_OPENAI_API_KEY, AZURE_OPENAI_ENDPOINT (or your LLM env vars)
@@ -20,6 +43,7 @@ import json
 import logging
 import os
 import sys
+from datetime import datetime, timezone
 
 # Add project root before importing app modules
 _PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -51,9 +75,10 @@ def _apply_scenario_profile(scenario: dict) -> None:
 class EvalAgentAdapter:
     """Wraps an agent so EvalRunner's invoke(user_input, thread_id=...) works."""
 
-    def __init__(self, agent, context_factory=None):
+    def __init__(self, agent, context_factory=None, cassette=None):
         self._agent = agent
         self._context_factory = context_factory or self._default_context
+        self._cassette = cassette
 
     def _default_context(self, thread_id: str):
         from core.state import BaseContext
@@ -61,11 +86,20 @@ class EvalAgentAdapter:
 
     async def invoke(self, user_input: str, thread_id: str = "eval") -> dict:
         ctx = self._context_factory(thread_id)
-        return await self._agent.invoke(user_input, context=ctx)
+        if self._cassette is None:
+            return await self._agent.invoke(user_input, context=ctx)
+        from core.cassette import use_cassette
+
+        with use_cassette(self._cassette):
+            return await self._agent.invoke(user_input, context=ctx)
 
 
 def _get_agent_for_scenario(scenario: dict, checkpointer=None):
-    """Build the agent specified by the scenario."""
+    """Build the agent specified by the scenario.
+
+    The catalog is rebuilt per scenario so each run gets its own
+    checkpointer; the compiled graphs themselves come from the graph cache.
+    """
     agent_name = scenario.get("agent", "profile")
     catalog = __import__("agents.catalog", fromlist=["build_agent_catalog"]).build_agent_catalog
     registry = catalog(checkpointer=checkpointer)
@@ -75,44 +109,160 @@ def _get_agent_for_scenario(scenario: dict, checkpointer=None):
     return agent
 
 
+def _scenario_paths(args: list[str]) -> list[str]:
+    """Resolve scenario files and directories (all ``*.json`` inside) to file paths."""
+    paths = []
+    for arg in args:
+        path = arg if os.path.isabs(arg) else os.path.join(_PROJECT_ROOT, arg)
+        if os.path.isdir(path):
+            paths.extend(sorted(os.path.join(path, f) for f in os.listdir(path) if f.endswith(".json")))
+        else:
+            paths.append(path)
+    return paths
+
+
+def _adapter_for_scenario(scenario: dict, cassette=None) -> EvalAgentAdapter:
+    """A fresh agent with its own checkpointer, wrapped for ``EvalRunner``."""
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    agent = _get_agent_for_scenario(scenario, checkpointer=InMemorySaver())
+    # Use scenario's context_factory if agent has one (e.g. MyCareerContext)
+    context_factory = getattr(agent.config, "context_factory", None)
+    return EvalAgentAdapter(agent, context_factory=context_factory, cassette=cassette)
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Run evaluation scenarios")
     parser.add_argument(
-        "scenario",
-        nargs="?",
-        default=os.path.join(_PROJECT_ROOT, "eval", "scenarios", "mycareer_happy_flow.json"),
-        help="Path to scenario JSON file",
+        "scenarios",
+        nargs="*",
+        default=[os.path.join(_PROJECT_ROOT, "eval", "scenarios", "mycareer_happy_flow.json")],
+        help="Scenario JSON files or directories of them",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scenario (to detect flakiness)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Runs in flight at once")
+    parser.add_argument("--max-retries", type=int, default=3, help="Restarts of a run after a rate limit")
+    parser.add_argument("--output", help="Aggregated JSON report (default for batches: eval/results/<time>.json)")
+    parser.add_argument("--baseline", help="Compare per-turn perf metrics against this stored baseline")
+    parser.add_argument("--save-baseline", help="Write this run's per-turn perf medians as a baseline")
+    parser.add_argument(
+        "--max-regression", type=float,
+        help="With --baseline, fail if any metric grew by more than this percentage",
+    )
+    parser.add_argument(
+        "--cassette", choices=["record", "replay", "strict"],
+        help="Record model calls per scenario, or replay them offline (strict: fail on unseen requests)",
+    )
+    parser.add_argument(
+        "--cassette-dir", default=os.path.join(_PROJECT_ROOT, "eval", "cassettes"),
+        help="Directory of per-scenario cassettes",
     )
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
     args = parser.parse_args()
 
-    scenario_path = args.scenario
-    if not os.path.isabs(scenario_path):
-        scenario_path = os.path.join(_PROJECT_ROOT, scenario_path)
-    if not os.path.exists(scenario_path):
-        logger.error("Scenario file not found: %s", scenario_path)
+    paths = _scenario_paths(args.scenarios)
+    missing = [p for p in paths if not os.path.exists(p)]
+    if missing or not paths:
+        logger.error("Scenario file not found: %s", ", ".join(missing) or args.scenarios)
         return 1
+    scenarios = [_load_scenario(p) for p in paths]
 
-    scenario = _load_scenario(scenario_path)
-    _apply_scenario_profile(scenario)
+    # PROFILE_PATH is read once per process, so a batch needs a single profile.
+    profiles = {s.get("profile_path") for s in scenarios if s.get("profile_path")}
+    if len(profiles) > 1:
+        logger.error("Scenarios use different profiles (%s); run them in separate batches", ", ".join(sorted(profiles)))
+        return 1
+    _apply_scenario_profile(scenarios[0] if profiles else {})
 
-    from langgraph.checkpoint.memory import InMemorySaver
-    from core.eval.runner import EvalRunner
+    # Read by core.config on first import, like PROFILE_PATH above.
+    if args.cassette:
+        os.environ["LLM_CASSETTES"] = "true"
 
-    checkpointer = InMemorySaver()
-    agent = _get_agent_for_scenario(scenario, checkpointer=checkpointer)
+    from core.eval.batch import run_batch
 
-    # Use scenario's context_factory if agent has one (e.g. MyCareerContext)
-    context_factory = getattr(agent.config, "context_factory", None)
-    adapter = EvalAgentAdapter(agent, context_factory=context_factory)
-    runner = EvalRunner(agent=adapter)
+    cassettes = {}
+    if args.cassette:
+        from core.cassette import Cassette
+
+        for scenario in scenarios:
+            name = scenario.get("name", "unnamed")
+            cassettes[name] = Cassette(os.path.join(args.cassette_dir, f"{name}.json"), mode=args.cassette)
+
+    def agent_factory(scenario: dict) -> EvalAgentAdapter:
+        return _adapter_for_scenario(scenario, cassettes.get(scenario.get("name", "unnamed")))
+
+    batch = asyncio.run(run_batch(
+        scenarios,
+        agent_factory,
+        repeat=args.repeat,
+        concurrency=args.concurrency,
+        max_retries=args.max_retries,
+    ))
+
+    if len(batch.runs) == 1 or args.verbose:
+        for run in batch.runs:
+            if run.result is not None:
+                print(run.result.summary())
+            if run.error:
+                print(f"Error: {run.error}")
+            print()
+    cassette_misses = 0
+    for cassette in cassettes.values():
+        cassette.save()
+        stats = cassette.stats()
+        cassette_misses += stats["misses"]
+        print(
+            f"Cassette {os.path.relpath(stats['path'], _PROJECT_ROOT)}: {stats['hits']} replayed,"
+            f" {stats['recorded']} recorded, {stats['misses']} unseen"
+        )
+        for miss in cassette.missed:
+            print(f"  UNSEEN {miss['key'][:12]} after {miss['messages']} messages: {miss['last']}")
+
+    from core.eval.perf import compare_to_baseline, format_comparison, regressions
 
-    async def run():
-        return await runner.run_scenario_file(scenario_path)
+    perf = batch.perf_baseline()
+    comparison = None
+    regressed = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            comparison = compare_to_baseline(perf, json.load(f))
+        print(format_comparison(comparison))
+        if args.max_regression is not None:
+            regressed = regressions(comparison, args.max_regression)
+            for r in regressed:
+                print(f"REGRESSION: {r['scenario']} turn {r['turn']} {r['metric']} {r['change_pct']:+.1f}%")
+        print()
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(perf, f, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
 
-    result = asyncio.run(run())
-    print(result.summary())
-    return 0 if result.passed else 1
+    output = args.output
+    if len(batch.runs) > 1:
+        print(batch.summary())
+        if not output:
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+            output = os.path.join(_PROJECT_ROOT, "eval", "results", f"batch-{stamp}.json")
+    if output:
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "scenarios": [os.path.relpath(p, _PROJECT_ROOT) for p in paths],
+                "repeat": args.repeat,
+                "concurrency": args.concurrency,
+            },
+            **batch.to_dict(),
+        }
+        if comparison is not None:
+            report["baseline_comparison"] = comparison
+        if cassettes:
+            report["cassettes"] = {name: c.stats() for name, c in cassettes.items()}
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {output}")
+    return 0 if batch.passed and not regressed and not cassette_misses else 1
 
 
 if __name__ == "__main__":
@@ -12,7 +12,6 @@
   // Config & state
   // ---------------------------------------------------------------------------
   const PANEL_WIDTH = 400;
-  const POLL_INTERVAL_MS = 5000;
 
   let _username = "";
   let _profilePath = "";
@@ -21,42 +20,35 @@
   let _drafts = [];
   let _draftIndex = -1;
   let _panelEl = null;
-  let _pollTimer = null;
   let _panelOpen = false;
   let _eventSource = null;
   var _eventsAttached = false;
 
   // ---------------------------------------------------------------------------
-  // Bootstrap — polls /user until authenticated, then initialises panel + SSE.
-  // This handles the case where custom.js loads on the login page before the
-  // user has logged in.  After login Chainlit does a client-side navigation so
-  // the IIFE doesn't re-run; the interval below keeps checking.
+  // Bootstrap — push-only.  Every chat session start / resume, the server
+  // announces the logged-in user with a window message (cl.send_window_message
+  // → "hr_agent_session"); that also covers custom.js loading on the login
+  // page, since Chainlit's post-login navigation doesn't re-run this IIFE.
+  // Everything after that arrives over the SSE stream.
   // ---------------------------------------------------------------------------
   var _bootstrapped = false;
 
-  function tryBootstrap() {
-    if (_bootstrapped) return;
+  function bootstrap(username, profilePath) {
+    if (!username || !profilePath) return;
+    if (_bootstrapped && username === _username) return;
 
-    fetch("/user", { credentials: "include" })
-      .then(function (r) { return r.ok ? r.json() : null; })
-      .then(function (data) {
-        if (!data) return;
-        _username = data.identifier || data.username || "";
-        _profilePath = (data.metadata || {}).profile_path || "";
-        if (!_username || !_profilePath) return;
-
-        _bootstrapped = true;
-        clearInterval(_bootstrapTimer);
-        createPanel();
-        connectSSE();
-        startPolling();
-      })
-      .catch(function () {});
+    _username = username;
+    _profilePath = profilePath;
+    if (!_bootstrapped) createPanel();
+    _bootstrapped = true;
+    connectSSE();
   }
 
-  // Try immediately, then every 2 seconds until logged in
-  var _bootstrapTimer = setInterval(tryBootstrap, 2000);
-  tryBootstrap();
+  window.addEventListener("message", function (e) {
+    var data = e.data;
+    if (e.source !== window || !data || data.type !== "hr_agent_session") return;
+    bootstrap(data.username, data.profile_path);
+  });
 
   // ---------------------------------------------------------------------------
   // Panel creation — appended to body, position:fixed, off-screen by default
@@ -99,7 +91,8 @@
     if (!_username) return;
     if (_eventSource) _eventSource.close();
 
-    var url = "/api/profile/events?username=" + encodeURIComponent(_username);
+    var url = "/api/profile/events?username=" + encodeURIComponent(_username) +
+      "&profile_path=" + encodeURIComponent(_profilePath);
     _eventSource = new EventSource(url);
 
     _eventSource.onmessage = function (e) {
@@ -115,7 +108,10 @@
   }
 
   function handleSSEEvent(event) {
-    if (event.type === "open_panel") {
+    if (event.type === "snapshot") {
+      // Initial state on (re)connect — no fetch needed to open the panel.
+      applySnapshot(event);
+    } else if (event.type === "open_panel") {
       closeJdPanel();
       closeJdEditorPanel();
       closeCandidatePanel();
@@ -147,6 +143,10 @@
       openJdEditorPanel();
     } else if (event.type === "refresh_jd_editor") {
       refreshJdEditorFromServer();
+    } else if (event.type === "resync") {
+      // Events were dropped or missed while disconnected: reload open panels.
+      if (_panelOpen) loadProfile();
+      if (_jdEditorPanelEl && _jdEditorPanelEl.classList.contains("open")) refreshJdEditorFromServer();
     } else if (event.type === "open_candidate_panel") {
       closePanel();
       closeJdPanel();
@@ -249,18 +249,17 @@
       });
   }
 
-  // ---------------------------------------------------------------------------
-  // Polling for agent-initiated updates
-  // ---------------------------------------------------------------------------
-  function startPolling() {
-    _pollTimer = setInterval(function () {
-      fetch("/api/profile/poll-update", { headers: apiHeaders(), credentials: "include" })
-        .then(function (r) { return r.json(); })
-        .then(function (data) {
-          if (data && data.updated) loadProfile();
-        })
-        .catch(function () {});
-    }, POLL_INTERVAL_MS);
+  function applySnapshot(event) {
+    var data = event.profile || {};
+    // Keep unsaved edits in an open panel; the snapshot only seeds state.
+    if (_panelOpen && _currentProfile &&
+        JSON.stringify(_currentProfile) !== JSON.stringify(_originalProfile)) return;
+    normalizeProfile(data);
+    _originalProfile = JSON.parse(JSON.stringify(data));
+    _currentProfile = JSON.parse(JSON.stringify(data));
+    _drafts = event.drafts || [];
+    _draftIndex = -1;
+    if (_panelOpen) renderPanel();
   }
 
   // ---------------------------------------------------------------------------
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Run the Chainlit app with several worker processes on one port.
+
+``chainlit run app.py`` serves from a single process.  This launcher binds
+the listening socket once and starts ``--workers`` processes that each load
+``app.py`` and accept connections from that socket, so the kernel spreads
+new connections across cores.
+
+Multi-worker mode needs state that every worker can see; unless already
+configured, the launcher sets:
+
+- ``STATE_BACKEND=local``: panel events, user metadata, per-thread caches,
+  conversation summaries and cache invalidations go through
+  ``core/backend.py``;
+- ``CHECKPOINT_DB_PATH=<STATE_DIR>/checkpoints.db``: LangGraph checkpoints
+  are shared, so any worker can continue any conversation.
+
+Session affinity comes from the socket.io transport: workers only offer
+websockets, so a chat session stays on the worker that accepted its
+connection.  A reconnect that lands on another worker resumes the thread
+from the shared checkpoints and Chainlit data layer.  ``CHAINLIT_AUTH_SECRET``
+must be set so every worker accepts the same login tokens.
+
+Usage:
+    python serve.py --workers 4
+    python serve.py --workers 4 --port 8080 app.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger("chatbot.serve")
+
+# A worker that dies sooner than this after starting is not restarted
+# straight away, so a crash at import time does not spin.
+_MIN_UPTIME_SECONDS = 5.0
+
+
+def _shared_state_env(workers: int) -> dict[str, str]:
+    """Environment for the workers, with shared state configured when needed."""
+    env = dict(os.environ)
+    if workers <= 1:
+        return env
+    backend = env.setdefault("STATE_BACKEND", "local")
+    if backend == "memory":
+        raise SystemExit("STATE_BACKEND=memory cannot be shared between workers; use 'local' or 'redis'.")
+    if not env.get("CHECKPOINT_DB_PATH"):
+        env["CHECKPOINT_DB_PATH"] = os.path.join(env.get("STATE_DIR", "data/state"), "checkpoints.db")
+    if not env.get("CHAINLIT_AUTH_SECRET"):
+        logger.warning("CHAINLIT_AUTH_SECRET is not set; workers will not accept each other's login tokens.")
+    return env
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _spawn(index: int, sock: socket.socket, args: argparse.Namespace, env: dict[str, str]) -> subprocess.Popen:
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker-fd", str(sock.fileno()),
+           "--host", args.host, "--port", str(args.port), args.target]
+    return subprocess.Popen(cmd, pass_fds=(sock.fileno(),), env={**env, "SERVE_WORKER_INDEX": str(index)})
+
+
+def supervise(args: argparse.Namespace) -> int:
+    """Start the workers and restart any that exit until interrupted."""
+    env = _shared_state_env(args.workers)
+    sock = _bind(args.host, args.port)
+    logger.info("Serving %s on %s:%d with %d workers", args.target, args.host, args.port, args.workers)
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    workers = {i: (_spawn(i, sock, args, env), time.monotonic()) for i in range(args.workers)}
+    while not stopping:
+        time.sleep(0.5)
+        for i, (proc, started) in list(workers.items()):
+            if proc.poll() is None:
+                continue
+            if proc.returncode == 0:  # shut down on a signal sent to the whole group
+                del workers[i]
+                continue
+            if time.monotonic() - started < _MIN_UPTIME_SECONDS:
+                logger.error("Worker %d exited with %s during startup; not restarting", i, proc.returncode)
+                del workers[i]
+                continue
+            logger.warning("Worker %d exited with %s; restarting", i, proc.returncode)
+            workers[i] = (_spawn(i, sock, args, env), time.monotonic())
+        if not workers:
+            return 0 if stopping else 1
+
+    for proc, _ in workers.values():
+        proc.terminate()
+    for proc, _ in workers.values():
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    return 0
+
+
+def run_worker(fd: int, target: str, host: str, port: int) -> None:
+    """Load *target* the way ``chainlit run`` does and serve from the inherited socket."""
+    import asyncio
+
+    import uvicorn
+    from chainlit.auth import ensure_jwt_secret
+    from chainlit.cache import init_lc_cache
+    from chainlit.cli import assert_app
+    from chainlit.config import config, load_module
+    from chainlit.markdown import init_markdown
+
+    config.run.host = host
+    config.run.port = port
+    # Websocket only: the long-polling fallback would spread one session's
+    # requests across workers.
+    config.project.transports = ["websocket"]
+
+    from chainlit.server import app
+
+    config.run.module_name = target
+    load_module(target)
+    ensure_jwt_secret()
+    assert_app()
+    init_markdown(config.root)
+    init_lc_cache()
+
+    server = uvicorn.Server(uvicorn.Config(
+        app,
+        ws=os.environ.get("UVICORN_WS_PROTOCOL", "auto"),
+        log_level="debug" if config.run.debug else "error",
+    ))
+    asyncio.run(server.serve(sockets=[socket.socket(fileno=fd)]))
+
+
+def main() -> int:
+    load_dotenv()  # so .env settings win over the multi-worker defaults
+    parser = argparse.ArgumentParser(description="Run the app with several worker processes")
+    parser.add_argument("target", nargs="?", default="app.py", help="Chainlit app module (default: app.py)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: CPU count)")
+    parser.add_argument("--host", default=os.environ.get("CHAINLIT_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("CHAINLIT_PORT", "8000")))
+    parser.add_argument("--worker-fd", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(name)s - %(message)s")
+
+    if args.worker_fd is not None:
+        run_worker(args.worker_fd, args.target, args.host, args.port)
+        return 0
+    return supervise(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Tests for the shared state / pub-sub backends.
+"""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from core.backend import LocalBackend, MemoryBackend, create_backend
+from core.invalidation import SCOPES, Invalidator
+
+
+@pytest.fixture(params=["memory", "local"])
+def backend(request, tmp_path):
+    b = MemoryBackend() if request.param == "memory" else LocalBackend(str(tmp_path))
+    yield b
+    b.close()
+
+
+def _receiver(backend, channel):
+    received, arrived = [], threading.Event()
+
+    def on_message(message):
+        received.append(message)
+        arrived.set()
+
+    backend.subscribe(channel, on_message)
+    return received, arrived
+
+
+class TestKeyValue:
+    def test_round_trip_json_values(self, backend):
+        backend.set("ns", "k", {"ids": ["a", "b"], "n": 1})
+        assert backend.get("ns", "k") == {"ids": ["a", "b"], "n": 1}
+        assert backend.get("ns", "missing") is None
+        assert backend.get("other", "k") is None
+
+    def test_ttl_expires(self, backend):
+        backend.set("ns", "k", 1, ttl=0.05)
+        assert backend.get("ns", "k") == 1
+        time.sleep(0.1)
+        assert backend.get("ns", "k") is None
+
+    def test_delete_and_clear_namespace(self, backend):
+        backend.set("ns", "a", 1)
+        backend.set("ns", "b", 2)
+        backend.set("keep", "a", 3)
+        backend.delete("ns", "a")
+        assert backend.get("ns", "a") is None
+        backend.clear("ns")
+        assert backend.get("ns", "b") is None
+        assert backend.get("keep", "a") == 3
+
+    def test_add_to_set_returns_previous_members(self, backend):
+        assert backend.add_to_set("ns", "k", {"a", "b"}) == set()
+        assert backend.add_to_set("ns", "k", {"b", "c"}) == {"a", "b"}
+        assert backend.add_to_set("ns", "k", set()) == {"a", "b", "c"}
+
+    def test_add_to_set_ttl_expires(self, backend):
+        backend.add_to_set("ns", "k", {"a"}, ttl=0.05)
+        time.sleep(0.1)
+        assert backend.add_to_set("ns", "k", {"b"}) == set()
+
+
+class TestPubSub:
+    def test_subscriber_receives_own_process_messages(self, backend):
+        received, arrived = _receiver(backend, "events")
+        backend.publish("events", {"type": "refresh"})
+        backend.publish("unrelated", {"type": "ignored"})
+        assert arrived.wait(2)
+        time.sleep(0.05)
+        assert received == [{"type": "refresh"}]
+
+    def test_failing_subscriber_does_not_block_others(self, backend):
+        backend.subscribe("events", lambda m: 1 / 0)
+        received, arrived = _receiver(backend, "events")
+        backend.publish("events", {"n": 1})
+        assert arrived.wait(2)
+        assert received == [{"n": 1}]
+
+
+class TestLocalBackendAcrossWorkers:
+    """Two instances sharing a state dir stand in for two app workers."""
+
+    def test_state_is_shared(self, tmp_path):
+        a, b = LocalBackend(str(tmp_path)), LocalBackend(str(tmp_path))
+        a.set("user_metadata", "rob", {"profile_path": "data/rob.json"})
+        assert b.get("user_metadata", "rob") == {"profile_path": "data/rob.json"}
+
+    def test_concurrent_set_additions_are_not_lost(self, tmp_path):
+        workers = [LocalBackend(str(tmp_path)) for _ in range(4)]
+
+        def add(i, backend):
+            for n in range(25):
+                backend.add_to_set("seen_jobs", "t1", {f"{i}-{n}"})
+
+        threads = [threading.Thread(target=add, args=(i, b)) for i, b in enumerate(workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(workers[0].add_to_set("seen_jobs", "t1", set())) == 100
+
+    def test_messages_reach_every_worker(self, tmp_path):
+        a, b = LocalBackend(str(tmp_path)), LocalBackend(str(tmp_path))
+        try:
+            got_a, arrived_a = _receiver(a, "panel_events")
+            got_b, arrived_b = _receiver(b, "panel_events")
+            a.publish("panel_events", {"username": "rob", "type": "refresh"})
+            assert arrived_a.wait(2) and arrived_b.wait(2)
+            assert got_a == got_b == [{"username": "rob", "type": "refresh"}]
+        finally:
+            a.close()
+            b.close()
+
+    def test_close_stops_listener_and_removes_socket(self, tmp_path):
+        b = LocalBackend(str(tmp_path))
+        _receiver(b, "events")
+        listener = b._listener
+        b.close()
+        assert not listener.is_alive()
+        assert not list((tmp_path / "bus").glob("*.sock"))
+
+    def test_dead_worker_socket_is_cleaned_up(self, tmp_path):
+        a = LocalBackend(str(tmp_path))
+        # A worker that died without unlinking leaves a socket file nobody reads.
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        stale.bind(str(tmp_path / "bus" / "dead.sock"))
+        stale.close()
+        a.publish("events", {})
+        assert not list((tmp_path / "bus").glob("*.sock"))
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="STATE_BACKEND"):
+        create_backend("etcd")
+
+
+class TestInvalidation:
+    def _wait_for(self, condition, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return condition()
+
+    def test_invalidation_clears_other_workers_caches(self, tmp_path):
+        from core.match_score import MatchScorer
+        from core.response_cache import ResponseCache
+
+        a, b = LocalBackend(str(tmp_path)), LocalBackend(str(tmp_path))
+        try:
+            worker_a, worker_b = Invalidator(a), Invalidator(b)
+            responses, scores = ResponseCache(), MatchScorer()
+            responses.put(("orchestrator", "rob", "what jobs match me", "p1", "c1"), ("text", []))
+            scores._ranked[("p", "c")] = object()
+            for scope in SCOPES:
+                worker_b.on_invalidate(scope, lambda _key: responses.clear())
+            worker_b.on_invalidate("catalog", lambda _key: scores.clear())
+            assert b._listener is None  # registering alone opens nothing
+            worker_b.start()
+
+            worker_a.publish("profile", "data/rob.json")
+            assert self._wait_for(lambda: len(responses) == 0)
+            assert len(scores) == 1
+            worker_a.publish("catalog")
+            assert self._wait_for(lambda: len(scores) == 0)
+        finally:
+            a.close()
+            b.close()
+
+    def test_publisher_runs_its_handlers_once_and_immediately(self, tmp_path):
+        backend = LocalBackend(str(tmp_path))
+        try:
+            invalidator = Invalidator(backend)
+            keys = []
+            invalidator.on_invalidate("profile", keys.append)
+            invalidator.start()
+            invalidator.publish("profile", "data/rob.json")
+            assert keys == ["data/rob.json"]
+            time.sleep(0.1)
+            assert keys == ["data/rob.json"]
+        finally:
+            backend.close()
+
+    def test_profile_write_publishes_invalidation(self, tmp_path, monkeypatch):
+        import core.invalidation
+        from core.profile_manager import ProfileManager
+
+        invalidator = Invalidator(MemoryBackend())
+        monkeypatch.setattr(core.invalidation, "_invalidator", invalidator)
+        keys = []
+        invalidator.on_invalidate("profile", keys.append)
+        path = str(tmp_path / "profile.json")
+        ProfileManager("rob", path).submit({"core": {}})
+        assert keys == [path]
+
+    def test_unknown_scope_is_rejected(self):
+        with pytest.raises(ValueError):
+            Invalidator(MemoryBackend()).publish("everything")
@@ -0,0 +1,119 @@
+"""
+Tests for the benchmark measurement helpers, result comparison and
+synthetic data generators.
+"""
+
+import asyncio
+
+from bench.compare import compare
+from bench.metrics import LoopLagMonitor, StageTimer, percentile, rss_bytes, summarize
+from bench.scale import summarize as summarize_scaling
+from bench.startup import parse_importtime, top_imports
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile(values, 100) == 100
+
+    def test_empty(self):
+        assert percentile([], 95) == 0.0
+
+    def test_summarize_throughput(self):
+        summary = summarize([10.0, 20.0, 30.0, 40.0], wall_seconds=2.0)
+        assert summary["count"] == 4
+        assert summary["p50_ms"] == 20.0
+        assert summary["throughput_per_s"] == 2.0
+
+
+class TestStageTimer:
+    def test_records_errors_and_samples(self):
+        timer = StageTimer()
+        with timer.time("ok"):
+            pass
+        try:
+            with timer.time("boom"):
+                raise ValueError
+        except ValueError:
+            pass
+        report = timer.report(wall_seconds=1.0)
+        assert report["ok"]["count"] == 1
+        assert report["boom"]["errors"] == 1
+
+
+class TestProcessMetrics:
+    def test_rss_positive(self):
+        assert rss_bytes() > 0
+
+    def test_loop_lag_sees_blocking_call(self):
+        import time
+
+        async def run():
+            monitor = LoopLagMonitor(interval=0.01)
+            monitor.start()
+            await asyncio.sleep(0.02)
+            time.sleep(0.05)
+            await asyncio.sleep(0.02)
+            await monitor.stop()
+            return monitor.report()
+
+        assert asyncio.run(run())["max_ms"] >= 30
+
+
+class TestCompare:
+    def test_relative_change(self):
+        baseline = {"stages": {"orchestrator.invoke": {"p95_ms": 100.0}}}
+        candidate = {"stages": {"orchestrator.invoke": {"p95_ms": 80.0}, "new": {"p95_ms": 5.0}}}
+        rows = {r["stage"]: r for r in compare(baseline, candidate)}
+        assert rows["orchestrator.invoke"]["change_pct"] == -20.0
+        assert rows["new"]["baseline"] is None
+
+
+class TestScaling:
+    def test_speedup_and_efficiency(self):
+        def report(users, wall):
+            return {"meta": {"users": users, "turns_per_user": 5}, "wall_seconds": wall, "stages": {"t": {"errors": 0}}}
+
+        rows = summarize_scaling({1: [report(10, 5.0)], 2: [report(10, 5.5), report(10, 6.25)]}, cpu_count=2)
+        assert [r["turns_per_second"] for r in rows] == [10.0, 16.0]
+        assert rows[1]["speedup"] == 1.6
+        assert rows[1]["efficiency"] == 0.8
+        assert not rows[1]["oversubscribed"]
+
+
+class TestStartupProfile:
+    def test_parse_importtime(self):
+        stderr = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     json.decoder",
+            "import time:       300 |        420 |   json",
+            "import time:        50 |        470 | core.config",
+            "import time:       900 |        900 | langchain_core",
+            "-- unrelated log line --",
+        ])
+        rows = parse_importtime(stderr)
+        assert [(r["module"], r["depth"]) for r in rows] == [
+            ("json.decoder", 2), ("json", 1), ("core.config", 0), ("langchain_core", 0),
+        ]
+        top = top_imports(rows, 1)
+        assert top["cumulative"][0]["module"] == "langchain_core"
+        assert top["self"][0]["self_us"] == 900
+
+
+class TestSyntheticGenerators:
+    def test_deterministic_for_seed(self):
+        from bench.synthetic import generate_employees, generate_jobs
+
+        assert generate_jobs(5, seed=1) == generate_jobs(5, seed=1)
+        assert generate_jobs(5, seed=1) != generate_jobs(5, seed=2)
+        assert [e["employeeId"] for e in generate_employees(3)] == ["E0000000", "E0000001", "E0000002"]
+
+    def test_profile_history_scores_complete(self):
+        from bench.synthetic import generate_profile
+        from core.profile_score import compute_completion_score
+
+        profile = generate_profile(200)
+        assert len(profile["core"]["experience"]["experiences"]) == 200
+        assert compute_completion_score(profile) == 100
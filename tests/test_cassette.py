@@ -0,0 +1,118 @@
+"""
+Tests for cassette record/replay of chat-model calls.
+"""
+
+import asyncio
+
+import pytest
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import tool
+
+import core.llm as llm_module
+from core.cassette import Cassette, CassetteChatModel, CassetteMiss, request_key, use_cassette
+from core.fake_llm import ScriptedChatModel
+
+SCRIPT = {
+    "default": [
+        {"match": "weather", "steps": [[{"name": "weather", "args": {"city": "Paris"}}]], "response": "It is sunny."},
+    ],
+}
+
+
+@tool
+def weather(city: str) -> dict:
+    """Returns the weather for a city."""
+    return {"city": city, "forecast": "sunny"}
+
+
+class CountingModel(ScriptedChatModel):
+    calls: int = 0
+
+    def _build(self, messages, kwargs):
+        self.calls += 1
+        return super()._build(messages, kwargs)
+
+
+def _run(model, cassette, text="weather in Paris?"):
+    agent = create_agent(model=model, tools=[weather])
+
+    async def turn():
+        with use_cassette(cassette):
+            return await agent.ainvoke({"messages": [HumanMessage(content=text)]})
+
+    return asyncio.run(turn())["messages"]
+
+
+class TestCassette:
+    def test_record_then_replay_offline(self, tmp_path):
+        path = str(tmp_path / "scenario.json")
+        live = CountingModel(script=SCRIPT)
+        recorder = Cassette(path, mode="record")
+        recorded = _run(CassetteChatModel(live=lambda: live), recorder)
+        recorder.save()
+        assert live.calls == 2 and recorder.recorded == 2
+
+        def no_live():
+            raise AssertionError("strict replay must not build the live model")
+
+        replayer = Cassette(path, mode="strict")
+        replayed = _run(CassetteChatModel(live=no_live), replayer)
+        assert replayer.hits == 2 and replayer.stats()["misses"] == 0
+        assert [m.content for m in replayed] == [m.content for m in recorded]
+        assert replayed[-1].usage_metadata == recorded[-1].usage_metadata
+
+    def test_strict_fails_on_unseen_request(self, tmp_path):
+        cassette = Cassette(str(tmp_path / "empty.json"), mode="strict")
+        model = CassetteChatModel(live=lambda: ScriptedChatModel(script=SCRIPT))
+        with use_cassette(cassette), pytest.raises(CassetteMiss):
+            model.invoke([HumanMessage(content="weather?")])
+        assert cassette.missed[0]["last"] == "human: weather?"
+
+    def test_replay_records_unseen_requests(self, tmp_path):
+        live = CountingModel(script=SCRIPT)
+        cassette = Cassette(str(tmp_path / "c.json"), mode="replay")
+        model = CassetteChatModel(live=lambda: live)
+        with use_cassette(cassette):
+            model.invoke([HumanMessage(content="hi")])
+            model.invoke([HumanMessage(content="hi")])
+        assert (live.calls, cassette.recorded, cassette.hits) == (1, 1, 1)
+
+    def test_without_active_cassette_calls_live_model(self):
+        live = CountingModel(script=SCRIPT)
+        CassetteChatModel(live=lambda: live).invoke([HumanMessage(content="hi")])
+        assert live.calls == 1
+
+    def test_unknown_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            Cassette(str(tmp_path / "c.json"), mode="rewind")
+
+
+class TestRequestKey:
+    def _history(self, call_id, stamp):
+        return [
+            HumanMessage(content=f"weather? (sent {stamp})", id=call_id),
+            AIMessage(content="", tool_calls=[{"name": "weather", "args": {"city": "Paris"}, "id": call_id}]),
+            ToolMessage(content='{"forecast": "sunny"}', tool_call_id=call_id),
+        ]
+
+    def test_ignores_ids_and_timestamps(self):
+        first = self._history("call_abc123", "2026-01-02T10:00:00Z")
+        second = self._history("call_zzz999", "2026-03-04T11:30:15.123+00:00")
+        assert request_key(first, None, {}) == request_key(second, None, {})
+
+    def test_depends_on_content_and_tools(self):
+        history = self._history("call_1", "today")
+        tools = [{"type": "function", "function": {"name": "weather"}}]
+        assert request_key(history, None, {}) != request_key(history, None, {"tools": tools})
+        assert request_key(history[:1], None, {}) != request_key(history, None, {})
+
+
+class TestCassetteBackend:
+    def test_get_llm_wraps_clients(self, monkeypatch):
+        monkeypatch.setattr(llm_module, "LLM_BACKEND", "fake")
+        monkeypatch.setattr(llm_module, "LLM_CASSETTES", True)
+        monkeypatch.setattr(llm_module, "_clients", {})
+        model = llm_module.get_llm()
+        assert isinstance(model, CassetteChatModel)
+        assert isinstance(model._live(), ScriptedChatModel)
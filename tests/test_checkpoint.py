@@ -0,0 +1,123 @@
+"""
+Tests for the SQLite checkpointer shared by app workers.
+"""
+
+import asyncio
+
+from langgraph.checkpoint.base import WRITES_IDX_MAP, empty_checkpoint
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.graph import END, START, MessagesState, StateGraph
+from langgraph.types import Command, interrupt
+
+from core.agent.base import BaseAgent
+from core.agent.config import AgentConfig
+from core.checkpoint import SQLiteCheckpointer, create_checkpointer
+from core.fake_llm import ScriptedChatModel
+from core.metrics import checkpointer_stats
+from core.state import BaseContext
+
+
+def _agent(checkpointer):
+    model = ScriptedChatModel(script={"default": [{"match": "", "steps": [], "response": "noted"}]})
+    return BaseAgent(AgentConfig(name="echo", description="", llm=model, checkpointer=checkpointer))
+
+
+def _texts(state):
+    return [m.content for m in state["messages"]]
+
+
+class TestSQLiteCheckpointer:
+    def test_conversation_continues_on_another_worker(self, tmp_path):
+        path = str(tmp_path / "checkpoints.db")
+        ctx = BaseContext(thread_id="t1")
+
+        async def scenario():
+            await _agent(SQLiteCheckpointer(path)).invoke("first question", context=ctx)
+            other_worker = _agent(SQLiteCheckpointer(path))
+            await other_worker.invoke("second question", context=ctx)
+            return (await other_worker.get_state("t1")).values
+
+        assert _texts(asyncio.run(scenario())) == ["first question", "noted", "second question", "noted"]
+
+    def test_matches_in_memory_saver(self, tmp_path):
+        async def run(checkpointer):
+            agent = _agent(checkpointer)
+            for i in range(3):
+                await agent.invoke(f"turn {i}", context=BaseContext(thread_id="t"))
+            state = (await agent.get_state("t")).values
+            history = [c async for c in checkpointer.alist({"configurable": {"thread_id": "t"}})]
+            return _texts(state), len(history)
+
+        sqlite = asyncio.run(run(SQLiteCheckpointer(str(tmp_path / "c.db"))))
+        assert sqlite == asyncio.run(run(InMemorySaver()))
+
+    def test_interrupt_resumes_on_another_worker(self, tmp_path):
+        path = str(tmp_path / "c.db")
+
+        def approve(state):
+            decision = interrupt({"question": "apply the update?"})
+            return {"messages": [("ai", f"decision: {decision}")]}
+
+        def graph():
+            builder = StateGraph(MessagesState)
+            builder.add_node("approve", approve)
+            builder.add_edge(START, "approve")
+            builder.add_edge("approve", END)
+            return builder.compile(checkpointer=SQLiteCheckpointer(path))
+
+        config = {"configurable": {"thread_id": "hitl"}}
+
+        async def scenario():
+            first = await graph().ainvoke({"messages": [("user", "update my title")]}, config)
+            assert first["__interrupt__"][0].value == {"question": "apply the update?"}
+            return await graph().ainvoke(Command(resume="approve"), config)
+
+        assert _texts(asyncio.run(scenario()))[-1] == "decision: approve"
+
+    def test_list_filters_and_limits(self, tmp_path):
+        saver = SQLiteCheckpointer(str(tmp_path / "c.db"))
+
+        async def scenario():
+            agent = _agent(saver)
+            await agent.invoke("a", context=BaseContext(thread_id="t1"))
+            await agent.invoke("b", context=BaseContext(thread_id="t2"))
+
+        asyncio.run(scenario())
+        t1 = list(saver.list({"configurable": {"thread_id": "t1"}}))
+        assert t1 and all(c.config["configurable"]["thread_id"] == "t1" for c in t1)
+        assert [c.config for c in t1] == sorted((c.config for c in t1), key=lambda c: c["configurable"]["checkpoint_id"], reverse=True)
+        assert len(list(saver.list(None, limit=2))) == 2
+        inputs = list(saver.list(None, filter={"source": "input"}))
+        assert {c.config["configurable"]["thread_id"] for c in inputs} == {"t1", "t2"}
+        before = list(saver.list({"configurable": {"thread_id": "t1"}}, before=t1[0].config))
+        assert len(before) == len(t1) - 1
+
+    def test_delete_thread_and_stats(self, tmp_path):
+        saver = SQLiteCheckpointer(str(tmp_path / "c.db"))
+        asyncio.run(_agent(saver).invoke("hello", context=BaseContext(thread_id="t1")))
+        stats = checkpointer_stats(saver)
+        assert stats[("threads",)] == 1 and stats[("checkpoints",)] > 0 and stats[("writes",)] > 0
+        saver.delete_thread("t1")
+        assert saver.get_tuple({"configurable": {"thread_id": "t1"}}) is None
+        assert checkpointer_stats(saver)[("checkpoints",)] == 0
+
+    def test_retried_writes_match_in_memory_saver(self, tmp_path):
+        """A retried task keeps its first regular writes but replaces special ones."""
+        ERROR = "__error__"
+        assert ERROR in WRITES_IDX_MAP
+        def pending(saver):
+            config = {"configurable": {"thread_id": "t", "checkpoint_ns": ""}}
+            checkpoint = empty_checkpoint()
+            config = saver.put(config, checkpoint, {}, {})
+            saver.put_writes(config, [("messages", "first"), (ERROR, "boom")], "task-1")
+            saver.put_writes(config, [("messages", "retry"), (ERROR, "boom again")], "task-1")
+            return sorted(saver.get_tuple(config).pending_writes)
+
+        expected = pending(InMemorySaver())
+        assert expected == [("task-1", "__error__", "boom again"), ("task-1", "messages", "first")]
+        assert pending(SQLiteCheckpointer(str(tmp_path / "c.db"))) == expected
+
+
+def test_create_checkpointer_defaults_to_memory(tmp_path):
+    assert isinstance(create_checkpointer(""), InMemorySaver)
+    assert isinstance(create_checkpointer(str(tmp_path / "c.db")), SQLiteCheckpointer)
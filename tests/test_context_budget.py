@@ -0,0 +1,153 @@
+"""
+Tests for the context budget middleware and local token counting.
+"""
+
+import asyncio
+
+from langchain.agents import create_agent
+from langchain.agents.middleware import dynamic_prompt
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.tools import tool
+
+from core.agent.base import BaseAgent
+from core.agent.config import AgentConfig
+from core.fake_llm import ScriptedChatModel
+from core.state import BaseContext
+from core.metrics import CONTEXT_TRIMMED_TOKENS
+from core.middleware.context_budget import CONTEXT_HEADER, ContextBudgetMiddleware, fit_to_budget
+import core.tokens as tokens_module
+from core.tokens import count_tokens, count_tool_tokens
+
+STATIC = "You are a helpful assistant.\nFollow the rules."
+
+
+class RecordingModel(ScriptedChatModel):
+    """Scripted model that keeps the messages of every call."""
+
+    calls: list = []
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls.append(list(messages))
+        return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+def _personalization(user: str):
+    @dynamic_prompt
+    async def personalization(request):
+        return request.system_prompt + f"\n\n--- User Context ---\nName: {user}\nSkills: " + "Python, " * 40
+
+    return personalization
+
+
+def _run(middleware, message="hi"):
+    model = RecordingModel(script={"default": [{"match": "", "steps": [], "response": "ok"}]}, calls=[])
+    agent = create_agent(model=model, tools=[], system_prompt=STATIC, middleware=middleware)
+    asyncio.run(agent.ainvoke({"messages": [HumanMessage(content=message)]}))
+    return model.calls[0]
+
+
+class TestContextBudgetMiddleware:
+    def test_system_prompt_is_byte_stable_across_users(self):
+        budget = lambda: ContextBudgetMiddleware("test", STATIC, 1000)
+        alice = _run([_personalization("Alice"), budget()])
+        bob = _run([_personalization("Bob"), budget()])
+
+        assert alice[0].content == bob[0].content == STATIC
+        assert isinstance(alice[-1], SystemMessage)
+        assert alice[-1].content.startswith(CONTEXT_HEADER)
+        assert "Name: Alice" in alice[-1].content
+        assert "Name: Bob" in bob[-1].content
+        # The user's message stays ahead of the volatile context.
+        assert alice[1].content == "hi"
+
+    def test_context_trimmed_to_budget(self):
+        before = CONTEXT_TRIMMED_TOKENS.value("tiny")
+        messages = _run([_personalization("Alice"), ContextBudgetMiddleware("tiny", STATIC, 20)])
+        context = messages[-1].content[len(CONTEXT_HEADER) + 1:]
+        assert count_tokens(context) <= 20
+        assert "Name: Alice" in context
+        assert CONTEXT_TRIMMED_TOKENS.value("tiny") > before
+
+    def test_passthrough_without_dynamic_context(self):
+        messages = _run([ContextBudgetMiddleware("test", STATIC, 100)])
+        assert messages[0].content == STATIC
+        assert len(messages) == 2
+
+    def test_base_agent_appends_budget_middleware(self):
+        model = RecordingModel(script={"default": [{"match": "", "steps": [], "response": "ok"}]}, calls=[])
+        agent = BaseAgent(AgentConfig(
+            name="budgeted", description="", llm=model, system_prompt=STATIC,
+            middleware=[_personalization("Alice")], context_budget_tokens=20,
+        ))
+        asyncio.run(agent.invoke("hi", context=BaseContext(thread_id="t1")))
+        messages = model.calls[0]
+        assert messages[0].content == STATIC
+        assert count_tokens(messages[-1].content[len(CONTEXT_HEADER) + 1:]) <= 20
+
+
+class TestFitToBudget:
+    def test_drops_dangling_headers(self):
+        text = "--- A ---\nline one\n--- B ---\n" + "word " * 200
+        kept, tokens = fit_to_budget(text, count_tokens("--- A ---\nline one") + 1)
+        assert kept == "--- A ---\nline one"
+        assert tokens == count_tokens(kept)
+
+    def test_trims_by_section_and_protects_instructions(self):
+        first_touch = "--- Profile Analysis (First Touch) ---\nCompletion Score: 40%\nMissing sections: skills"
+        user = "--- User Context ---\nName: Alice\nTop Skills: " + "Python, " * 60
+        summary = "--- Conversation Summary ---\n[profile] " + "discussed roles " * 60
+        text = f"{user}\n\n{first_touch}\n\n{summary}"
+        budget = count_tokens(f"--- User Context ---\nName: Alice\n\n{first_touch}") + 2
+
+        kept, tokens = fit_to_budget(text, budget)
+        # The summary goes first, then the user context's trailing lines;
+        # the first-touch instructions stay even though they come last.
+        assert kept == f"--- User Context ---\nName: Alice\n\n{first_touch}"
+        assert tokens <= budget
+
+    def test_protected_section_kept_over_budget(self):
+        text = "--- Profile Analysis (First Touch) ---\nCompletion Score: 40%\n--- User Context ---\nName: Alice"
+        kept, _ = fit_to_budget(text, 1)
+        assert kept == "--- Profile Analysis (First Touch) ---\nCompletion Score: 40%"
+
+    def test_each_line_tokenized_once(self, monkeypatch):
+        import core.middleware.context_budget as budget_module
+
+        counted = []
+
+        def counting(text):
+            counted.append(text)
+            return count_tokens(text)
+
+        monkeypatch.setattr(budget_module, "count_tokens", counting)
+        lines = ["--- User Context ---"] + [f"fact {i}: " + "detail " * 5 for i in range(200)]
+        kept, tokens = fit_to_budget("\n".join(lines), 50)
+        assert tokens <= 50 and kept.startswith("--- User Context ---\nfact 0")
+        # One count per dropped line plus a few of the joined text, not one per drop.
+        assert len(counted) < len(lines) + 5
+        assert sum(len(t) > 1000 for t in counted) <= 2
+
+    def test_within_budget_unchanged(self):
+        assert fit_to_budget("short", 100) == ("short", count_tokens("short"))
+
+
+@tool
+def lookup(query: str) -> str:
+    """Look something up."""
+    return query
+
+
+def test_tool_token_count_is_memoized():
+    first = count_tool_tokens([lookup])
+    assert first > 0
+    memo_size = len(tokens_module._tool_counts)
+
+    # A rebuilt tool with the same schema (a new agent catalog) hits the memo.
+    @tool
+    def lookup_again(query: str) -> str:
+        """Look something up."""
+        return query
+
+    lookup_again.name = "lookup"
+    assert count_tool_tokens([lookup]) == count_tool_tokens([lookup_again]) == first
+    assert len(tokens_module._tool_counts) == memo_size
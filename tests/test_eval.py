@@ -2,15 +2,19 @@
 Tests for the evaluation harness.
 """
 
+import asyncio
 import os
 import pytest
 
+from core.eval.perf import TurnPerf, compare_to_baseline, measure_turn, regressions
+from core.eval.batch import RateLimitGate, is_rate_limit_error, retry_after_seconds, run_batch
 from core.eval.runner import load_scenario, EvalRunner, ScenarioResult
 from core.eval.expectations import (
     check_tool_called,
     check_tool_not_called,
     check_response_contains,
     check_success,
+    check_budget,
     evaluate_expectations,
     ExpectationResult,
 )
@@ -181,3 +185,204 @@ class TestScenarioResult:
         summary = result.summary()
         assert "test_scenario" in summary
         assert "PASS" in summary
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = type("Response", (), {"status_code": status_code, "headers": headers or {}})()
+
+
+class ScriptedAgent:
+    """Calls the tool named in each user message; ``flaky`` answers fail on odd runs."""
+
+    active = 0
+    peak = 0
+
+    def __init__(self, run_index, fail_first=None):
+        self.run_index = run_index
+        self.fail_first = fail_first
+        self.thread_ids = set()
+
+    async def invoke(self, user_input, thread_id="eval"):
+        ScriptedAgent.active += 1
+        ScriptedAgent.peak = max(ScriptedAgent.peak, ScriptedAgent.active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            ScriptedAgent.active -= 1
+        self.thread_ids.add(thread_id)
+        if self.fail_first is not None:
+            error, self.fail_first = self.fail_first, None
+            raise error
+        tool = "other" if user_input == "flaky" and self.run_index % 2 else user_input
+        return {"messages": [
+            MockMessage(msg_type="ai", tool_calls=[{"name": tool}]),
+            MockMessage(content='{"success": true}', msg_type="tool", name=tool),
+        ]}
+
+
+def _scenario(name, *tools):
+    return {"name": name, "turns": [
+        {"turn": i + 1, "user": t, "expectations": {"tool_called": t}} for i, t in enumerate(tools)
+    ]}
+
+
+class TestBatch:
+    def test_runs_repeat_concurrently_with_isolated_threads(self):
+        agents = []
+
+        def factory(scenario):
+            agents.append(ScriptedAgent(len(agents)))
+            return agents[-1]
+
+        ScriptedAgent.peak = 0
+        scenarios = [_scenario("steady", "get_matches", "view_job"), _scenario("wobbly", "flaky")]
+        batch = asyncio.run(run_batch(scenarios, factory, repeat=4, concurrency=3))
+
+        assert len(batch.runs) == len(agents) == 8
+        assert len({r.thread_id for r in batch.runs}) == 8
+        assert all(len(a.thread_ids) == 1 for a in agents)
+        assert 1 < ScriptedAgent.peak <= 3
+        report = batch.to_dict()
+        assert report["scenarios"]["steady"]["pass_rate"] == 1.0
+        assert report["scenarios"]["wobbly"]["flaky"] is True
+        assert report["totals"]["flaky_scenarios"] == ["wobbly"]
+        assert report["scenarios"]["wobbly"]["failed_checks"] == {"tool_called": 2}
+        assert "FLAKY" in batch.summary()
+
+    def test_rate_limited_run_backs_off_and_restarts(self):
+        created = []
+
+        def factory(scenario):
+            error = _HTTPError(429, {"retry-after-ms": "20"}) if not created else None
+            created.append(ScriptedAgent(0, fail_first=error))
+            return created[-1]
+
+        batch = asyncio.run(run_batch([_scenario("s", "get_matches", "view_job")], factory, gate=RateLimitGate()))
+        run = batch.runs[0]
+        assert run.passed and run.attempts == 2 and run.error == ""
+        assert batch.rate_limit_pauses == 1
+        assert len(created) == 2 and created[0].thread_ids.isdisjoint(created[1].thread_ids)
+
+    def test_gives_up_after_max_retries(self):
+        def factory(scenario):
+            return ScriptedAgent(0, fail_first=_HTTPError(429))
+
+        gate = RateLimitGate(base_delay=0.001)
+        batch = asyncio.run(run_batch([_scenario("s", "get_matches")], factory, max_retries=2, gate=gate))
+        assert batch.runs[0].attempts == 3 and not batch.passed
+        assert batch.runs[0].error.startswith("rate limited")
+
+    def test_rate_limit_detection(self):
+        assert is_rate_limit_error(_HTTPError(429))
+        assert not is_rate_limit_error(_HTTPError(500))
+        assert retry_after_seconds(_HTTPError(429, {"retry-after": "2"})) == 2.0
+        assert retry_after_seconds(_HTTPError(429, {"retry-after-ms": "250"})) == 0.25
+        assert retry_after_seconds(_HTTPError(429, {"retry-after": "soon"})) is None
+
+
+class TestPerf:
+    def test_measure_turn_counts_model_calls_tokens_and_tools(self):
+        from langchain.agents import create_agent
+        from langchain_core.tools import tool
+        from core.fake_llm import ScriptedChatModel
+
+        @tool
+        def lookup(query: str) -> str:
+            """Look something up."""
+            return query
+
+        model = ScriptedChatModel(script={"default": [
+            {"match": "", "steps": [[{"name": "lookup", "args": {"query": "x"}}]], "response": "done"},
+        ]})
+        agent = create_agent(model=model, tools=[lookup])
+        with measure_turn() as perf:
+            asyncio.run(agent.ainvoke({"messages": [("user", "find x")]}))
+        with measure_turn() as idle:
+            pass
+
+        assert (perf.llm_calls, perf.tool_calls) == (2, 1)
+        assert perf.prompt_tokens > 0 and perf.completion_tokens > 0
+        assert perf.latency_seconds > 0
+        assert (idle.llm_calls, idle.tool_calls) == (0, 0)
+
+    def test_background_work_after_turn_is_not_measured(self):
+        from core.fake_llm import ScriptedChatModel
+
+        model = ScriptedChatModel(script={"default": [{"match": "", "steps": [], "response": "summary"}]})
+
+        async def scenario():
+            started = asyncio.Event()
+
+            async def compaction():
+                await started.wait()
+                await model.ainvoke("summarize")
+
+            with measure_turn() as perf:
+                await model.ainvoke("hi")
+                task = asyncio.create_task(compaction())
+            started.set()
+            await task
+            return perf
+
+        assert asyncio.run(scenario()).llm_calls == 1
+
+    def test_budget_expectations(self):
+        perf = TurnPerf(latency_seconds=1.5, llm_calls=3, prompt_tokens=900, tool_calls=2)
+        expectations = {"max_llm_calls": 3, "max_prompt_tokens": 800, "max_latency_seconds": 2}
+        results = {r.check_name: r for r in evaluate_expectations([], expectations, perf)}
+        assert results["max_llm_calls"].passed and results["max_latency_seconds"].passed
+        assert not results["max_prompt_tokens"].passed
+        assert results["max_prompt_tokens"].details == "900 prompt tokens (max 800)"
+        assert check_budget(perf, "max_tool_calls", 1).details == "2 tool calls (max 1)"
+        assert evaluate_expectations([], expectations) == []
+
+    def test_runner_records_perf_per_turn(self):
+        scenario = _scenario("s", "get_matches")
+        scenario["turns"][0]["expectations"]["max_llm_calls"] = 1
+        result = asyncio.run(EvalRunner(agent=ScriptedAgent(0)).run_scenario(scenario))
+        turn = result.turns[0]
+        assert turn.perf is not None and turn.elapsed_seconds == turn.perf.latency_seconds
+        assert [c.check_name for c in turn.checks] == ["tool_called", "max_llm_calls"]
+
+    def test_baseline_comparison(self):
+        batch = asyncio.run(run_batch([_scenario("s", "get_matches")], lambda s: ScriptedAgent(0), repeat=3))
+        current = batch.perf_baseline()
+        assert set(current["s"]["1"]) == {"latency_seconds", "llm_calls", "prompt_tokens", "completion_tokens", "tool_calls"}
+
+        current = {"s": {"1": {"llm_calls": 3, "prompt_tokens": 1000}, "2": {"llm_calls": 1}}}
+        stored = {"s": {"1": {"llm_calls": 2, "prompt_tokens": 1000}}}
+        rows = {r["metric"]: r for r in compare_to_baseline(current, stored)}
+        assert rows["llm_calls"]["change_pct"] == 50.0
+        assert rows["prompt_tokens"]["change_pct"] == 0.0
+        assert rows["tool_calls"]["change_pct"] is None
+        assert [r["metric"] for r in regressions(list(rows.values()), 20)] == ["llm_calls"]
+
+
+class TestRunnerTurnScope:
+    def test_expectations_see_only_current_turn(self):
+        from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+        class HistoryAgent:
+            """Returns the whole thread, like an agent without turn slicing."""
+
+            def __init__(self):
+                self.history = []
+
+            async def invoke(self, user_input, thread_id="eval"):
+                self.history.append(HumanMessage(content=user_input))
+                if user_input == "get_matches":
+                    self.history += [
+                        AIMessage(content="", tool_calls=[{"name": "get_matches", "args": {}, "id": "c1"}]),
+                        ToolMessage(content='{"success": true}', name="get_matches", tool_call_id="c1"),
+                    ]
+                self.history.append(AIMessage(content="done"))
+                return {"messages": list(self.history)}
+
+        scenario = {"name": "s", "turns": [
+            {"turn": 1, "user": "get_matches", "expectations": {"tool_called": "get_matches"}},
+            {"turn": 2, "user": "thanks", "expectations": {"tool_not_called": "get_matches"}},
+        ]}
+        result = asyncio.run(EvalRunner(agent=HistoryAgent()).run_scenario(scenario))
+        assert [t.passed for t in result.turns] == [True, True]
@@ -0,0 +1,125 @@
+"""
+Tests for the offline scripted chat model used for load testing.
+"""
+
+import asyncio
+import time
+
+from langchain.agents import create_agent
+from langchain.agents.middleware import HumanInTheLoopMiddleware
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.tools import tool
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.types import Command
+
+import core.llm as llm_module
+from core.agent.base import extract_interrupts
+from core.fake_llm import DEFAULT_AGENT, ScriptedChatModel
+
+SCRIPT = {
+    "router": [
+        {"match": "weather", "steps": [[{"name": "weather", "args": {"city": "{input}"}}]], "response": "It is sunny."},
+        {"match": "", "steps": [], "response": "Hello!"},
+    ],
+    DEFAULT_AGENT: [{"match": "", "steps": [], "response": "summary"}],
+}
+
+
+@tool
+def weather(city: str) -> dict:
+    """Returns the weather for a city."""
+    return {"city": city, "forecast": "sunny"}
+
+
+def _tools():
+    return [{"type": "function", "function": {"name": "weather"}}]
+
+
+class TestScriptedChatModel:
+    def test_first_step_emits_tool_call(self):
+        model = ScriptedChatModel(script=SCRIPT)
+        msg = model._next_message([HumanMessage(content="weather in Paris")], _tools())
+        assert msg.tool_calls[0]["name"] == "weather"
+        assert msg.tool_calls[0]["args"] == {"city": "weather in Paris"}
+
+    def test_response_after_steps_exhausted(self):
+        model = ScriptedChatModel(script=SCRIPT)
+        history = [
+            HumanMessage(content="weather in Paris"),
+            AIMessage(content="", tool_calls=[{"name": "weather", "args": {}, "id": "c1"}]),
+            ToolMessage(content="{}", tool_call_id="c1"),
+        ]
+        assert model._next_message(history, _tools()).content == "It is sunny."
+
+    def test_step_counts_only_current_turn(self):
+        model = ScriptedChatModel(script=SCRIPT)
+        history = [
+            HumanMessage(content="weather in Paris"),
+            AIMessage(content="", tool_calls=[{"name": "weather", "args": {}, "id": "c1"}]),
+            ToolMessage(content="{}", tool_call_id="c1"),
+            AIMessage(content="It is sunny."),
+            HumanMessage(content="weather in Rome"),
+        ]
+        assert model._next_message(history, _tools()).tool_calls
+
+    def test_unbound_tools_fall_back_to_default_agent(self):
+        model = ScriptedChatModel(script=SCRIPT)
+        msg = model._next_message([SystemMessage(content="summarize"), HumanMessage(content="weather")], [])
+        assert msg.content == "summary"
+
+    def test_usage_metadata_and_latency(self):
+        model = ScriptedChatModel(script=SCRIPT, latency_ms=20)
+        start = time.perf_counter()
+        result = model.invoke([HumanMessage(content="hi")])
+        assert time.perf_counter() - start >= 0.02
+        assert result.usage_metadata["output_tokens"] > 0
+
+
+class TestCreateAgentIntegration:
+    def test_tool_calling_flow(self):
+        agent = create_agent(model=ScriptedChatModel(script=SCRIPT), tools=[weather])
+        result = asyncio.run(agent.ainvoke({"messages": [HumanMessage(content="weather in Oslo")]}))
+        types = [m.type for m in result["messages"]]
+        assert types == ["human", "ai", "tool", "ai"]
+        assert result["messages"][-1].content == "It is sunny."
+
+    def test_human_in_the_loop_approval(self):
+        saved = []
+
+        @tool
+        def save(note: str) -> str:
+            """Saves a note."""
+            saved.append(note)
+            return "saved"
+
+        script = {"router": [{"match": "save", "steps": [[{"name": "save", "args": {"note": "{input}"}}]], "response": "Saved."}]}
+        agent = create_agent(
+            model=ScriptedChatModel(script=script),
+            tools=[save],
+            middleware=[HumanInTheLoopMiddleware(interrupt_on={"save": True})],
+            checkpointer=InMemorySaver(),
+        )
+        config = {"configurable": {"thread_id": "hitl"}}
+
+        async def scenario():
+            paused = await agent.ainvoke({"messages": [HumanMessage(content="save this")]}, config=config)
+            assert not saved
+            resumed = await agent.ainvoke(Command(resume={"decisions": [{"type": "approve"}]}), config=config)
+            return paused, resumed
+
+        paused, resumed = asyncio.run(scenario())
+        pending = extract_interrupts(paused)
+        assert pending and pending[0]["value"]["action_requests"][0]["name"] == "save"
+        assert saved == ["save this"]
+        assert [m.type for m in resumed["messages"]] == ["human", "ai", "tool", "ai"]
+        assert resumed["messages"][-1].content == "Saved."
+
+
+class TestFakeBackendSelection:
+    def test_get_llm_returns_scripted_model(self, monkeypatch):
+        monkeypatch.setattr(llm_module, "LLM_BACKEND", "fake")
+        monkeypatch.setattr(llm_module, "_clients", {})
+        monkeypatch.delenv("AZURE_OPENAI_API_KEY", raising=False)
+        model = llm_module.get_llm()
+        assert isinstance(model, ScriptedChatModel)
+        assert llm_module.get_llm() is model
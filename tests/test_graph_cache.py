@@ -0,0 +1,134 @@
+"""
+Tests for the compiled agent graph cache.
+"""
+
+import asyncio
+
+import pytest
+from langchain.agents.middleware import HumanInTheLoopMiddleware
+from langchain_core.tools import tool
+from langgraph.checkpoint.memory import InMemorySaver
+
+import core.agent.graph_cache as graph_cache
+from core.agent.base import BaseAgent
+from core.agent.config import AgentConfig
+from core.agent.graph_cache import GraphCache, graph_key
+from core.fake_llm import ScriptedChatModel
+from core.state import BaseContext
+
+MODEL = ScriptedChatModel(script={"default": [{"match": "", "steps": [], "response": "noted"}]})
+
+
+@tool
+def lookup(query: str) -> str:
+    """Look something up."""
+    return query
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fresh = GraphCache()
+    monkeypatch.setattr(graph_cache, "_graph_cache", fresh)
+    return fresh
+
+
+def _agent(checkpointer=None, prompt="You help.", tools=(lookup,)):
+    return BaseAgent(AgentConfig(
+        name="echo", description="", llm=MODEL, tools=list(tools),
+        system_prompt=prompt, checkpointer=checkpointer,
+    ))
+
+
+class TestGraphCache:
+    def test_same_config_compiles_once(self, cache):
+        a, b = _agent(InMemorySaver()), _agent(InMemorySaver())
+        assert (cache.misses, cache.hits, len(cache)) == (1, 1, 1)
+        assert a.graph is not b.graph and a.graph.builder is b.graph.builder
+        assert a.graph.checkpointer is a.checkpointer and b.graph.checkpointer is b.checkpointer
+
+    def test_shared_graph_keeps_threads_per_checkpointer(self, cache):
+        a, b = _agent(InMemorySaver()), _agent(InMemorySaver())
+
+        async def scenario():
+            await a.invoke("hello", context=BaseContext(thread_id="t1"))
+            return (await a.get_state("t1")).values, (await b.get_state("t1")).values
+
+        seen_by_a, seen_by_b = asyncio.run(scenario())
+        assert [m.content for m in seen_by_a["messages"]] == ["hello", "noted"]
+        assert seen_by_b == {}
+
+    def test_different_prompt_or_tools_compile_separately(self, cache):
+        _agent()
+        _agent(prompt="You help differently.")
+        _agent(tools=[])
+        assert (cache.misses, cache.hits) == (3, 0)
+
+    def test_lru_eviction(self):
+        cache = GraphCache(max_entries=2)
+        for name in ("a", "b", "a", "c"):
+            cache.get_or_build({"name": name}, lambda: object())
+        assert (cache.misses, cache.hits, len(cache)) == (3, 1, 2)
+        cache.get_or_build({"name": "b"}, lambda: object())
+        assert cache.misses == 4
+
+
+class TestGraphKey:
+    def test_middleware_matches_by_settings(self):
+        def key(interrupt_on):
+            return graph_key(model=MODEL, middleware=[HumanInTheLoopMiddleware(interrupt_on=interrupt_on)])
+
+        approve = {"lookup": {"allowed_decisions": ["approve", "reject"]}}
+        assert key(approve) == key(dict(approve))
+        assert key(approve) != key({"lookup": {"allowed_decisions": ["approve"]}})
+
+    def test_models_and_closures_match_by_identity(self):
+        def make_tool(target):
+            @tool
+            def fetch(query: str) -> str:
+                """Fetch something."""
+                return str(target)
+
+            return fetch
+
+        shared = object()
+        assert graph_key(tools=[make_tool(shared)]) == graph_key(tools=[make_tool(shared)])
+        assert graph_key(tools=[make_tool(shared)]) != graph_key(tools=[make_tool(object())])
+        other_model = ScriptedChatModel(script=MODEL.script)
+        assert graph_key(model=MODEL) != graph_key(model=other_model)
+
+    def test_functional_middleware_with_same_name_does_not_collide(self):
+        from langchain.agents.middleware import dynamic_prompt
+
+        def make(greeting):
+            @dynamic_prompt
+            def personalize(request):
+                return greeting
+
+            return personalize
+
+        def make_other():
+            @dynamic_prompt
+            def personalize(request):
+                return "fixed"
+
+            return personalize
+
+        assert graph_key(middleware=[make("hi")]) == graph_key(middleware=[make("hi")])
+        assert graph_key(middleware=[make("hi")]) != graph_key(middleware=[make("bye")])
+        assert graph_key(middleware=[make("hi")]) != graph_key(middleware=[make_other()])
+
+    def test_catalog_rebuild_reuses_worker_graphs(self, cache, monkeypatch):
+        import core.llm as llm_module
+        from agents.catalog import build_agent_catalog
+        from agents.orchestrator.agent import create_orchestrator_agent
+
+        monkeypatch.setattr(llm_module, "LLM_BACKEND", "fake")
+        monkeypatch.setattr(llm_module, "_clients", {})
+        for _ in range(2):
+            registry = build_agent_catalog(checkpointer=InMemorySaver())
+            registry.build_all()
+            create_orchestrator_agent(registry, checkpointer=InMemorySaver())
+        workers = len(registry.list_agents())
+        # Each orchestrator's routing tools capture its own registry, so
+        # only the specialists are shared.
+        assert (cache.hits, cache.misses) == (workers, workers + 2)
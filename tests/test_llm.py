@@ -0,0 +1,173 @@
+"""
+Tests for the LLM factory: client reuse, prompt cache and single-flight dedup.
+"""
+
+import asyncio
+import subprocess
+import sys
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+import core.llm as llm_module
+from core.llm_cache import PromptCache
+
+
+@pytest.fixture
+def azure_env(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com/")
+    monkeypatch.setenv("AZURE_OPENAI_DEPLOYMENT_NAME", "test-deployment")
+    monkeypatch.setenv("AZURE_OPENAI_API_VERSION", "2024-12-01-preview")
+    monkeypatch.setattr(llm_module, "_clients", {})
+    monkeypatch.setattr(llm_module, "_prompt_cache", None)
+
+
+def _generations(text):
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+class TestPromptCache:
+    def test_lookup_after_update(self):
+        cache = PromptCache()
+        cache.update("prompt", "llm", _generations("hi"))
+        assert cache.lookup("prompt", "llm")[0].message.content == "hi"
+        assert cache.lookup("prompt", "other-llm") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_lru_eviction(self):
+        cache = PromptCache(max_entries=2)
+        cache.update("a", "llm", _generations("a"))
+        cache.update("b", "llm", _generations("b"))
+        cache.lookup("a", "llm")
+        cache.update("c", "llm", _generations("c"))
+        assert cache.lookup("b", "llm") is None
+        assert cache.lookup("a", "llm") is not None
+
+    def test_sqlite_survives_new_instance(self, tmp_path):
+        path = str(tmp_path / "llm_cache.sqlite")
+        PromptCache(sqlite_path=path).update("prompt", "llm", _generations("persisted"))
+        fresh = PromptCache(sqlite_path=path)
+        assert fresh.lookup("prompt", "llm")[0].message.content == "persisted"
+        assert len(fresh) == 1
+
+
+class TestGetLlm:
+    def test_same_settings_share_client(self, azure_env):
+        assert llm_module.get_llm() is llm_module.get_llm()
+        assert llm_module.get_llm(temperature=0) is llm_module.get_llm(temperature=0)
+
+    def test_distinct_settings_get_distinct_clients(self, azure_env):
+        assert llm_module.get_llm() is not llm_module.get_llm(temperature=0)
+        assert llm_module.get_llm(temperature=0) is not llm_module.get_llm(temperature=0, cache=True)
+
+    def test_cache_flag_attaches_prompt_cache(self, azure_env):
+        assert llm_module.get_llm(temperature=0, cache=True).cache is llm_module.get_prompt_cache()
+        assert llm_module.get_llm().cache is None
+
+
+    def test_azure_sdk_not_imported_until_needed(self):
+        code = "import sys, core.llm; print('langchain_openai' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == "False"
+
+
+class TestSingleFlight:
+    def test_identical_concurrent_requests_share_one_call(self, azure_env, monkeypatch):
+        calls = []
+
+        async def fake_agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+            calls.append(messages)
+            await asyncio.sleep(0.01)
+            return ChatResult(generations=_generations(f"answer to {messages[0].content}"))
+
+        from langchain_openai import AzureChatOpenAI
+
+        monkeypatch.setattr(AzureChatOpenAI, "_agenerate", fake_agenerate)
+        client = llm_module.get_llm(temperature=0)
+
+        async def run():
+            same = [client._agenerate([HumanMessage(content="hello")]) for _ in range(3)]
+            other = client._agenerate([HumanMessage(content="bye")])
+            return await asyncio.gather(*same, other)
+
+        results = asyncio.run(run())
+        assert len(calls) == 2
+        assert [r.generations[0].message.content for r in results] == ["answer to hello"] * 3 + ["answer to bye"]
+        assert results[0] is not results[1]
+        assert llm_module._inflight == {}
+
+    def test_error_propagates_to_waiters(self, azure_env, monkeypatch):
+        async def failing_agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("rate limited")
+
+        from langchain_openai import AzureChatOpenAI
+
+        monkeypatch.setattr(AzureChatOpenAI, "_agenerate", failing_agenerate)
+        client = llm_module.get_llm(temperature=0)
+
+        async def run():
+            return await asyncio.gather(
+                *(client._agenerate([HumanMessage(content="hello")]) for _ in range(2)),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert llm_module._inflight == {}
+
+    def test_waiters_take_over_when_leader_is_cancelled(self, azure_env, monkeypatch):
+        calls = []
+
+        async def slow_agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+            calls.append(messages)
+            await asyncio.sleep(0.05)
+            return ChatResult(generations=_generations("answer"))
+
+        from langchain_openai import AzureChatOpenAI
+
+        monkeypatch.setattr(AzureChatOpenAI, "_agenerate", slow_agenerate)
+        client = llm_module.get_llm(temperature=0)
+
+        async def run():
+            leader = asyncio.create_task(client._agenerate([HumanMessage(content="hello")]))
+            await asyncio.sleep(0)
+            waiters = [asyncio.create_task(client._agenerate([HumanMessage(content="hello")])) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await asyncio.gather(leader, *waiters, return_exceptions=True)
+
+        leader, *waiters = asyncio.run(run())
+        assert isinstance(leader, asyncio.CancelledError)
+        assert [w.generations[0].message.content for w in waiters] == ["answer", "answer"]
+        # The first waiter led a second request; the other shared it.
+        assert len(calls) == 2
+        assert llm_module._inflight == {}
+
+    def test_shared_response_counted_once_in_usage(self, azure_env, monkeypatch):
+        from langchain_core.messages import AIMessage
+        from langchain_openai import AzureChatOpenAI
+
+        from core.usage import TurnUsage, _current_turn
+
+        async def fake_agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+            await asyncio.sleep(0.01)
+            usage = {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15}
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(content="hi", usage_metadata=usage))])
+
+        monkeypatch.setattr(AzureChatOpenAI, "_agenerate", fake_agenerate)
+        client = llm_module.get_llm(temperature=0)
+        turn = TurnUsage("alice")
+
+        async def run():
+            token = _current_turn.set(turn)
+            try:
+                await asyncio.gather(*(client.ainvoke([HumanMessage(content="hello")]) for _ in range(3)))
+            finally:
+                _current_turn.reset(token)
+
+        asyncio.run(run())
+        assert len(turn.records) == 1
+        assert turn.input_tokens == 10
@@ -0,0 +1,174 @@
+"""
+Tests for profile-aware job match scoring.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+import core.profile
+from core.match_score import CatalogIndex, MatchScorer, profile_features
+
+JOBS = [
+    {
+        "id": "ml", "title": "Machine Learning Engineer", "corporateTitleCode": "DIR",
+        "country": "United Kingdom", "location": "London", "matchScore": 1.0,
+        "matchingSkills": ["Python", "Machine Learning"],
+        "requirements": ["5+ years of experience in ML", "Hands-on PyTorch"],
+    },
+    {
+        "id": "fe", "title": "Frontend Developer", "corporateTitleCode": "AS",
+        "country": "Japan", "location": "Tokyo", "matchScore": 4.0,
+        "matchingSkills": ["React", "CSS"],
+        "requirements": ["3+ years of React"],
+    },
+    {
+        "id": "data", "title": "Data Engineer", "corporateTitleCode": "ED",
+        "country": "United States", "location": "New York", "matchScore": 2.5,
+        "matchingSkills": ["SQL", "Python"],
+        "requirements": ["10+ years building pipelines"],
+    },
+]
+
+PROFILE = {
+    "core": {
+        "rank": {"code": "DIR"},
+        "skills": {"top": [{"name": "Python"}, {"name": "Machine Learning"}], "additional": [{"name": "PyTorch"}]},
+        "experience": {"experiences": [{"jobTitle": "ML Engineer", "startDate": "2015-01-01", "endDate": "2021-01-01"}]},
+        "careerLocationPreference": {"preferredRelocationRegions": [{"code": "UK"}]},
+    }
+}
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+def _touch(path, data):
+    """Rewrite *path* with a different mtime, as a profile save or catalog refresh would."""
+    stat = os.stat(path)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def files(tmp_path):
+    return _write(tmp_path / "profile.json", PROFILE), _write(tmp_path / "jobs.json", {"jobs": JOBS})
+
+
+class TestMatchScorer:
+    def test_ranks_by_profile(self, files):
+        ranked = MatchScorer().ranked(*files)
+        assert ranked.personalized
+        assert [j["id"] for j in ranked.jobs] == ["ml", "data", "fe"]
+        best = ranked.jobs[0]
+        assert best["matchingSkills"] == ["Python", "Machine Learning"]
+        assert best["profileMatchingSkills"] == ["Python", "Machine Learning", "PyTorch"]
+        assert best["scoreBreakdown"] == {"skills": 1.0, "experience": 1.0, "level": 1.0, "role": 0.33, "location": 1.0}
+        assert best["matchScore"] == 4.7
+
+    def test_profile_without_signal_keeps_catalog_scores(self, tmp_path):
+        profile = _write(tmp_path / "p.json", {"core": {"name": {"businessFirstName": "A"}}})
+        ranked = MatchScorer().ranked(profile, _write(tmp_path / "jobs.json", {"jobs": JOBS}))
+        assert not ranked.personalized
+        assert [j["matchScore"] for j in ranked.jobs] == [4.0, 2.5, 1.0]
+
+    def test_cached_per_profile_and_catalog_version(self, files):
+        scorer = MatchScorer()
+        first = scorer.ranked(*files)
+        assert scorer.ranked(*files) is first
+        assert (scorer.hits, scorer.misses) == (1, 1)
+
+        profile_path, catalog_path = files
+        _touch(profile_path, {"core": {"skills": {"top": [{"name": "React"}]}}})
+        assert scorer.ranked(*files).jobs[0]["id"] == "fe"
+        assert scorer.misses == 2
+
+    def test_catalog_change_reindexes_and_rescores_only_changed_jobs(self, files):
+        scorer = MatchScorer()
+        before = {j["id"]: j for j in scorer.ranked(*files).jobs}
+        _touch(files[1], {"jobs": [JOBS[0], JOBS[1], {**JOBS[2], "country": "United Kingdom"}]})
+        after = {j["id"]: j for j in scorer.ranked(*files).jobs}
+        assert after["ml"] is before["ml"] and after["fe"] is before["fe"]
+        assert after["data"]["scoreBreakdown"]["location"] == 1.0
+
+    def test_files_read_outside_lock(self, files, monkeypatch):
+        import core.match_score
+
+        scorer = MatchScorer()
+        held = []
+        real_load = core.match_score.load_profile
+        real_open = open
+
+        def load_profile(path):
+            held.append(scorer._lock.locked())
+            return real_load(path)
+
+        def tracking_open(path, *args, **kwargs):
+            held.append(scorer._lock.locked())
+            return real_open(path, *args, **kwargs)
+
+        monkeypatch.setattr(core.match_score, "load_profile", load_profile)
+        monkeypatch.setattr("builtins.open", tracking_open)
+        scorer.ranked(*files)
+        assert held and not any(held)
+
+    def test_get_matches_uses_personalized_scores(self, files, monkeypatch):
+        import agents.shared.tools.get_matches  # noqa: F401
+        matches_module = sys.modules["agents.shared.tools.get_matches"]
+        matches_module._reset_seen_jobs()
+        monkeypatch.setattr(matches_module, "DATA_FILE", files[1])
+        monkeypatch.setattr(core.profile, "PROFILE_PATH", files[0])
+        monkeypatch.setattr("core.match_score._match_scorer", MatchScorer())
+
+        result = matches_module.run_get_matches(filters={"minScore": 3.0}, top_k=5)
+        assert [m["id"] for m in result["matches"]] == ["ml"]
+        assert result["averageScore"] == 4.7
+
+    def test_skills_filter_reads_catalog_skills_of_ranked_jobs(self, files, monkeypatch):
+        import agents.shared.tools.get_matches  # noqa: F401
+        matches_module = sys.modules["agents.shared.tools.get_matches"]
+        monkeypatch.setattr(matches_module, "DATA_FILE", files[1])
+        monkeypatch.setattr(core.profile, "PROFILE_PATH", files[0])
+        monkeypatch.setattr("core.match_score._match_scorer", MatchScorer())
+
+        def ids(skill):
+            matches_module._reset_seen_jobs()
+            return sorted(m["id"] for m in matches_module.run_get_matches(filters={"skills": [skill]}, top_k=5)["matches"])
+
+        # SQL is not a profile skill; PyTorch is, but only named in job text.
+        assert ids("SQL") == ["data"]
+        assert ids("Python") == ["data", "ml"]
+        assert ids("PyTorch") == []
+
+
+class TestCatalogIndex:
+    def test_new_skill_terms_are_found_in_job_text(self):
+        index = CatalogIndex()
+        assert index.update(JOBS) == 3
+        mask = index.mask(["pytorch"])
+        assert [bool(e.text_mask & mask) for e in index.entries] == [True, False, False]
+        assert index.update(JOBS) == 0
+
+    def test_catalog_skills_seen_later_match_earlier_jobs_text(self):
+        index = CatalogIndex()
+        index.update([{"id": "a", "title": "Engineer", "requirements": ["Strong SQL"]}])
+        index.update([index.entries[0].job, {"id": "b", "title": "Analyst", "matchingSkills": ["SQL"]}])
+        sql = index.vocabulary["sql"]
+        assert index.entries[0].text_mask >> sql & 1
+
+
+class TestProfileFeatures:
+    def test_extracts_features_from_root_layout(self):
+        features = profile_features({
+            "skills": {"top": ["Go"]},
+            "rank": "ED Executive Director",
+            "careerLocationPreference": {"preferredRelocationRegions": [{"description": "Singapore"}]},
+        })
+        assert features.skills == {"go": "Go"}
+        assert features.level == 4 and features.regions == {"singapore"}
+        assert features.years is None
@@ -0,0 +1,111 @@
+"""
+Tests for the metrics registry, its Prometheus rendering and the /api/metrics route.
+"""
+
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from langgraph.checkpoint.memory import InMemorySaver
+
+from core.metrics import (
+    CallbackMetric,
+    Counter,
+    Histogram,
+    PROFILE_WRITES,
+    REGISTRY,
+    Registry,
+    checkpointer_stats,
+)
+from core.metrics_routes import router
+
+
+class TestCounter:
+    def test_sums_shards_across_threads(self):
+        counter = Counter("c_total", "test", ("kind",), registry=None)
+
+        def work():
+            for _ in range(1000):
+                counter.inc("a")
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        counter.inc("b", amount=2.5)
+
+        assert counter.value("a") == 8000
+        assert counter.collect() == [("", {"kind": "a"}, 8000.0), ("", {"kind": "b"}, 2.5)]
+
+    def test_reset(self):
+        counter = Counter("c_total", "test", registry=None)
+        counter.inc()
+        counter.reset()
+        assert counter.value() == 0
+
+
+class TestHistogram:
+    def test_cumulative_buckets(self):
+        hist = Histogram("h_seconds", "test", ("tool",), buckets=(0.1, 1.0), registry=None)
+        for value in (0.05, 0.1, 0.5, 3.0):
+            hist.observe(value, "t")
+        samples = {(suffix, labels.get("le")): value for suffix, labels, value in hist.collect()}
+        assert samples[("_bucket", "0.1")] == 2  # le is inclusive
+        assert samples[("_bucket", "1")] == 3
+        assert samples[("_bucket", "+Inf")] == 4
+        assert samples[("_count", None)] == 4
+        assert samples[("_sum", None)] == 3.65
+        assert hist.count("t") == 4
+
+
+class TestRegistry:
+    def test_render_format_and_escaping(self):
+        registry = Registry()
+        counter = Counter("req_total", "Requests\nserved.", ("path",), registry=registry)
+        counter.inc('a"b\\c')
+        CallbackMetric("up", "Up.", lambda: 1, registry=registry)
+        CallbackMetric("broken", "Raises.", lambda: 1 / 0, registry=registry)
+
+        text = registry.render()
+        assert "# HELP req_total Requests\\nserved.\n" in text
+        assert "# TYPE req_total counter\n" in text
+        assert 'req_total{path="a\\"b\\\\c"} 1\n' in text
+        assert "# TYPE up gauge\nup 1\n" in text
+        assert "# TYPE broken gauge\n" in text
+        assert text.endswith("\n")
+
+    def test_duplicate_name_rejected(self):
+        registry = Registry()
+        Counter("x_total", "x", registry=registry)
+        with pytest.raises(ValueError):
+            Counter("x_total", "x", registry=registry)
+
+
+class TestSources:
+    def test_checkpointer_stats(self):
+        saver = InMemorySaver()
+        assert checkpointer_stats(saver)[("threads",)] == 0
+        assert checkpointer_stats(object()) == {}
+
+    def test_profile_manager_counts_writes(self, tmp_path, monkeypatch):
+        import core.profile_manager
+        from core.profile_manager import ProfileManager
+
+        monkeypatch.setattr(core.profile_manager, "DRAFTS_BASE_DIR", str(tmp_path / "drafts"))
+        profile = tmp_path / "profile.json"
+        profile.write_text("{}")
+        before = PROFILE_WRITES.value("draft")
+        ProfileManager("u", str(profile)).save_draft({"core": {}})
+        assert PROFILE_WRITES.value("draft") - before == 1
+
+
+def test_metrics_route():
+    app = FastAPI()
+    app.include_router(router)
+    resp = TestClient(app).get("/api/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE chatbot_tool_calls_total counter" in resp.text
+    assert REGISTRY.get("chatbot_turn_duration_seconds") is not None
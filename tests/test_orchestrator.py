@@ -5,6 +5,10 @@ All imports done inside test methods to avoid langchain_openai/numpy segfault at
 
 import asyncio
 import os
+import subprocess
+import sys
+import threading
+
 import pytest
 
 
@@ -65,6 +69,61 @@ class TestAgentRegistry:
         registry = AgentRegistry()
         assert registry.get("nonexistent") is None
 
+    def test_factory_builds_once_on_first_get(self):
+        from core.agent.registry import AgentRegistry
+        registry = AgentRegistry()
+        built = []
+        registry.register_factory("lazy", "A lazy agent", lambda: built.append(1) or f"agent_{len(built)}")
+
+        assert "lazy" in registry and registry.list_agents() == ["lazy"]
+        assert registry.describe("lazy") == "A lazy agent"
+        assert not registry.is_built("lazy") and built == []
+        assert registry.get("lazy") == "agent_1"
+        assert registry.get("lazy") == "agent_1"
+        assert built == [1] and registry.is_built("lazy")
+
+
+class TestLazyCatalog:
+    def test_orchestrator_builds_workers_on_first_route(self, monkeypatch):
+        import core.llm as llm_module
+        from agents.catalog import AGENTS, build_agent_catalog
+        from agents.orchestrator.agent import create_orchestrator_agent
+        from core.state import AppContext
+
+        monkeypatch.setattr(llm_module, "LLM_BACKEND", "fake")
+        monkeypatch.setattr(llm_module, "_clients", {})
+        registry = build_agent_catalog()
+        description, factory = registry._factories["outreach"]
+        build_threads = []
+        registry.register_factory("outreach", description, lambda: build_threads.append(threading.get_ident()) or factory())
+        orchestrator = create_orchestrator_agent(registry)
+        assert registry.list_agents() == [name for name, _, _ in AGENTS]
+        assert not any(registry.is_built(name) for name in registry.list_agents())
+
+        tools = {t.name: t for t in orchestrator.config.tools}
+        assert tools["outreach"].description == registry.describe("outreach")
+        token = orchestrator._context_var.set(AppContext(thread_id="t1"))
+        try:
+            asyncio.run(tools["outreach"].ainvoke({"message": "hello"}))
+        finally:
+            orchestrator._context_var.reset(token)
+        assert [name for name in registry.list_agents() if registry.is_built(name)] == ["outreach"]
+        # Built off the event loop's thread, so the loop kept serving other turns.
+        assert len(build_threads) == 1 and build_threads[0] != threading.get_ident()
+
+    def test_cold_start_opens_no_backend_subscription(self, tmp_path):
+        """Importing the catalog and building the orchestrator, as app.py does."""
+        code = (
+            "import threading, agents.catalog, core.backend\n"
+            "from agents.orchestrator.agent import create_orchestrator_agent\n"
+            "create_orchestrator_agent(agents.catalog.build_agent_catalog())\n"
+            "print(core.backend._backend is None, [t.name for t in threading.enumerate()])"
+        )
+        env = {**os.environ, "STATE_BACKEND": "local", "STATE_DIR": str(tmp_path), "LLM_BACKEND": "fake"}
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+        assert out.stdout.strip() == "True ['MainThread']"
+        assert not list(tmp_path.glob("bus/*.sock"))
+
 
 class TestAgentProtocol:
     def test_agent_card(self):
@@ -205,3 +264,97 @@ class TestSkillContent:
         skill = Skill(name="test", description="test", path="/nonexistent/path.md")
         content = skill.load_content()
         assert "not found" in content
+
+
+class TestExtractInterrupts:
+    def test_no_interrupts(self):
+        from core.agent.base import extract_interrupts
+        assert extract_interrupts({"messages": []}) == []
+
+    def test_interrupts_from_result(self):
+        from langgraph.types import Interrupt
+        from core.agent.base import extract_interrupts
+        value = {"action_requests": [{"name": "update_profile", "args": {"section": "skills"}}]}
+        pending = extract_interrupts({"messages": [], "__interrupt__": [Interrupt(value=value)]})
+        assert len(pending) == 1
+        assert pending[0]["value"] == value
+        assert pending[0]["resumable"] is True
+
+
+class TestSliceCurrentTurn:
+    def _msg(self, msg_type, msg_id=None):
+        from types import SimpleNamespace
+        return SimpleNamespace(type=msg_type, id=msg_id, content="")
+
+    def test_slices_from_turn_marker(self):
+        from core.agent.base import slice_current_turn
+        history = [self._msg("human", "t1"), self._msg("ai"), self._msg("human", "t2"), self._msg("ai"), self._msg("tool"), self._msg("ai")]
+        turn = slice_current_turn(history, "t2")
+        assert turn == history[2:]
+
+    def test_falls_back_to_last_human(self):
+        from core.agent.base import slice_current_turn
+        history = [self._msg("human", "summary"), self._msg("ai"), self._msg("human", "other"), self._msg("ai")]
+        assert slice_current_turn(history, "missing") == history[2:]
+
+    def test_no_human_returns_all(self):
+        from core.agent.base import slice_current_turn
+        history = [self._msg("ai"), self._msg("ai")]
+        assert slice_current_turn(history, "missing") == history
+
+
+class TestTurnScopedResults:
+    def _agent(self, script, tools=(), middleware=()):
+        from core.agent.base import BaseAgent
+        from core.agent.config import AgentConfig
+        from core.fake_llm import ScriptedChatModel
+        return BaseAgent(AgentConfig(
+            name="scoped", description="", llm=ScriptedChatModel(script={"default": script}),
+            tools=list(tools), middleware=list(middleware),
+        ))
+
+    def test_stream_yields_only_current_turn(self):
+        from core.state import BaseContext
+        agent = self._agent([{"match": "", "steps": [], "response": "ok"}])
+        ctx = BaseContext(thread_id="stream-1")
+
+        async def scenario():
+            await agent.invoke("first", context=ctx)
+            return [chunk async for chunk in agent.stream("second", context=ctx)]
+
+        chunks = asyncio.run(scenario())
+        assert [m.content for m in chunks[-1]["messages"]] == ["second", "ok"]
+        assert all(c["messages"][0].content == "second" for c in chunks)
+        assert chunks[0]["messages"][0].id
+
+    def test_resume_returns_only_interrupted_turn(self):
+        from langchain.agents.middleware import HumanInTheLoopMiddleware
+        from langchain_core.tools import tool
+        from core.agent.base import extract_interrupts
+        from core.state import BaseContext
+
+        @tool
+        def save(text: str) -> str:
+            """Save text."""
+            return "saved"
+
+        agent = self._agent(
+            [
+                {"match": "save", "steps": [[{"name": "save", "args": {"text": "x"}}]], "response": "Saved."},
+                {"match": "", "steps": [], "response": "Hello."},
+            ],
+            tools=[save],
+            middleware=[HumanInTheLoopMiddleware(interrupt_on={"save": True})],
+        )
+        ctx = BaseContext(thread_id="resume-1")
+
+        async def scenario():
+            await agent.invoke("hi", context=ctx)
+            paused = await agent.invoke("please save", context=ctx)
+            resumed = await agent.resume({"decisions": [{"type": "approve"}]}, thread_id="resume-1")
+            return paused, resumed
+
+        paused, resumed = asyncio.run(scenario())
+        assert extract_interrupts(paused)
+        assert resumed["messages"][0].content == "please save"
+        assert resumed["messages"][-1].content == "Saved."
@@ -2,6 +2,7 @@
 Tests for profile API routes using FastAPI TestClient.
 """
 
+import asyncio
 import json
 import os
 import sys
@@ -14,7 +15,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from core.profile_routes import router, _profile_updated_flags
+from core.profile_routes import profile_events, router, set_profile_updated
+from core.sse_hub import get_sse_hub
 
 SAMPLE_PROFILE = {
     "core": {
@@ -106,16 +108,33 @@ class TestSubmit:
         assert data["core"]["name"]["businessFirstName"] == "Submitted"
 
 
-class TestPollUpdate:
-    def test_poll_no_update(self, client, headers):
+class TestPushUpdates:
+    def test_poll_endpoint_removed(self, client, headers):
         resp = client.get("/api/profile/poll-update", headers=headers)
-        assert resp.status_code == 200
-        assert resp.json()["updated"] is False
-
-    def test_poll_with_update(self, client, headers):
-        _profile_updated_flags["testuser"] = True
-        resp = client.get("/api/profile/poll-update", headers=headers)
-        assert resp.json()["updated"] is True
-        # Flag should be cleared
-        resp = client.get("/api/profile/poll-update", headers=headers)
-        assert resp.json()["updated"] is False
+        assert resp.status_code == 404
+
+    def test_profile_update_pushes_refresh(self):
+        async def scenario():
+            sub = get_sse_hub().subscribe("push-user")
+            set_profile_updated("push-user")
+            events = [e.type for e in sub.buffer]
+            get_sse_hub().unsubscribe(sub)
+            return events
+
+        assert asyncio.run(scenario()) == ["refresh"]
+
+    def test_stream_starts_with_snapshot(self, app, tmp_path):
+        async def scenario():
+            resp = await profile_events(username="snap-user", profile_path=str(tmp_path / "profile.json"), last_event_id=None)
+            body = resp.body_iterator
+            preamble = await body.__anext__()
+            snapshot = await body.__anext__()
+            await body.aclose()
+            return preamble, snapshot
+
+        preamble, snapshot = asyncio.run(scenario())
+        assert ": connected" in preamble
+        event = json.loads(snapshot.split("data: ", 1)[1])
+        assert event["type"] == "snapshot"
+        assert event["profile"]["core"]["name"]["businessFirstName"] == "Test"
+        assert event["drafts"] == []
@@ -0,0 +1,130 @@
+"""
+Tests for tool result projection (LLM-facing subset + artifact passthrough).
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from core.projection import (
+    ToolProjection,
+    get_projection,
+    get_projection_stats,
+    record_projection,
+    reset_projection_stats,
+)
+
+FULL_MATCHES = {
+    "success": True,
+    "count": 1,
+    "has_more": False,
+    "matches": [{
+        "id": "J1",
+        "title": "GenAI Lead",
+        "matchScore": 3.4,
+        "summary": "A very long summary " * 20,
+        "yourRole": "A very long role description " * 20,
+        "requirements": ["req"] * 10,
+    }],
+    "profile_summary": {"name": "Test User", "topSkills": ["Python"], "completionScore": 80},
+}
+
+
+@pytest.fixture(autouse=True)
+def _clean_stats():
+    reset_projection_stats()
+    yield
+    reset_projection_stats()
+
+
+class TestToolProjection:
+    def test_apply_keeps_declared_fields(self):
+        projection = ToolProjection(fields=("success",), nested={"matches": ("id",)})
+        projected = projection.apply(FULL_MATCHES)
+        assert projected == {"success": True, "matches": [{"id": "J1"}]}
+
+    def test_apply_nested_dict(self):
+        projection = ToolProjection(fields=(), nested={"profile_summary": ("topSkills",)})
+        assert projection.apply(FULL_MATCHES) == {"profile_summary": {"topSkills": ["Python"]}}
+
+    def test_apply_does_not_mutate(self):
+        projection = ToolProjection(fields=("success",), nested={"matches": ("id",)})
+        projection.apply(FULL_MATCHES)
+        assert "summary" in FULL_MATCHES["matches"][0]
+
+    def test_get_matches_drops_long_text(self):
+        projected = get_projection("get_matches").apply(FULL_MATCHES)
+        job = projected["matches"][0]
+        assert job["id"] == "J1"
+        assert "summary" not in job
+        assert "yourRole" not in job
+        assert "requirements" not in job
+        assert projected["profile_summary"] == {"name": "Test User", "topSkills": ["Python"], "completionScore": 80}
+
+    def test_unknown_tool_has_no_projection(self):
+        assert get_projection("infer_skills") is None
+
+
+class TestProjectionStats:
+    def test_record_accumulates_savings(self):
+        record_projection("get_matches", "x" * 400, "x" * 40)
+        record_projection("get_matches", "x" * 400, "x" * 40)
+        stats = get_projection_stats()["get_matches"]
+        assert stats["calls"] == 2
+        assert stats["full_tokens"] == 200
+        assert stats["projected_tokens"] == 20
+        assert stats["saved_tokens"] == 180
+
+    def test_exported_on_metrics(self):
+        from core.metrics import REGISTRY
+
+        record_projection("get_matches", "x" * 400, "x" * 40)
+        text = REGISTRY.render()
+        assert 'chatbot_tool_projections_total{tool="get_matches"} 1' in text
+        assert 'chatbot_tool_projection_tokens_total{tool="get_matches",kind="saved"} 90' in text
+
+
+class TestProjectionMiddleware:
+    def _run(self, tool_name, content):
+        from langchain_core.messages import ToolMessage
+        from core.middleware.tool_projection import tool_projection_middleware
+
+        request = SimpleNamespace(tool_call={"name": tool_name, "id": "c1", "args": {}})
+
+        async def handler(_request):
+            return ToolMessage(content=content, tool_call_id="c1", name=tool_name)
+
+        return asyncio.run(tool_projection_middleware.awrap_tool_call(request, handler))
+
+    def test_content_projected_and_artifact_full(self):
+        result = self._run("get_matches", json.dumps(FULL_MATCHES))
+        assert result.artifact == FULL_MATCHES
+        assert "summary" not in json.loads(result.content)["matches"][0]
+        assert get_projection_stats()["get_matches"]["saved_tokens"] > 0
+
+    def test_unprojected_tool_untouched(self):
+        result = self._run("infer_skills", json.dumps({"success": True}))
+        assert result.artifact is None
+        assert json.loads(result.content) == {"success": True}
+
+    def test_non_json_content_untouched(self):
+        result = self._run("get_matches", "not json")
+        assert result.content == "not json"
+        assert result.artifact is None
+
+
+class TestAdapterReadsArtifact:
+    def test_extract_prefers_artifact(self):
+        from core.adapters.chainlit_adapter import extract_tool_calls_from_messages
+
+        projected = get_projection("get_matches").apply(FULL_MATCHES)
+        msg = SimpleNamespace(
+            type="tool",
+            name="job_discovery",
+            content=json.dumps({"response": "ok", "tool_calls": [{"name": "get_matches", "content": projected}]}),
+            artifact={"response": "ok", "tool_calls": [{"name": "get_matches", "content": FULL_MATCHES}]},
+        )
+        calls = extract_tool_calls_from_messages([msg])
+        assert calls == [("get_matches", FULL_MATCHES)]
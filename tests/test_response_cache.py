@@ -0,0 +1,122 @@
+"""
+Tests for the read-only turn response cache.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+from core.response_cache import (
+    ResponseCache,
+    is_cacheable,
+    normalize_message,
+    replay_tool_calls,
+)
+
+
+class TestNormalizeMessage:
+    def test_case_punctuation_whitespace(self):
+        assert normalize_message("  Show my   Profile score!! ") == "show my profile score"
+
+    def test_equivalent_phrasings_match(self):
+        assert normalize_message("What jobs match me?") == normalize_message("what jobs match me")
+
+
+class TestIsCacheable:
+    def test_all_read_only(self):
+        assert is_cacheable([("get_matches", {}), ("view_job", {})]) is True
+
+    def test_write_tool_not_cacheable(self):
+        assert is_cacheable([("get_matches", {}), ("update_profile", {})]) is False
+
+    def test_no_tool_calls_not_cacheable(self):
+        assert is_cacheable([]) is False
+
+
+class TestResponseCache:
+    def _key(self, message="show my profile score", profile_version="p1"):
+        return ResponseCache.make_key("orchestrator", "alice", message, profile_version, "c1")
+
+    def test_hit_after_put(self):
+        cache = ResponseCache()
+        cache.put(self._key(), ("text", []))
+        assert cache.get(self._key("Show my profile score?")) == ("text", [])
+        assert cache.hits == 1
+
+    def test_profile_version_misses(self):
+        cache = ResponseCache()
+        cache.put(self._key(profile_version="p1"), ("text", []))
+        assert cache.get(self._key(profile_version="p2")) is None
+        assert cache.misses == 1
+
+    def test_ttl_expiry(self):
+        cache = ResponseCache(ttl_seconds=0)
+        cache.put(self._key(), ("text", []))
+        time.sleep(0.01)
+        assert cache.get(self._key()) is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put(self._key("a"), 1)
+        cache.put(self._key("b"), 2)
+        cache.get(self._key("a"))
+        cache.put(self._key("c"), 3)
+        assert cache.get(self._key("b")) is None
+        assert cache.get(self._key("a")) == 1
+        assert cache.get(self._key("c")) == 3
+
+
+class TestCachedTurnReplay:
+    def _agent(self):
+        from core.agent.base import BaseAgent
+        from core.agent.config import AgentConfig
+        from core.fake_llm import ScriptedChatModel
+
+        model = ScriptedChatModel(script={"default": [{"match": "", "steps": [], "response": "Live answer."}]})
+        return BaseAgent(AgentConfig(name="cached", description="", llm=model, system_prompt="You help."))
+
+    def test_follow_up_turn_has_history(self):
+        from core.state import BaseContext
+
+        agent = self._agent()
+
+        async def scenario():
+            first = await agent.has_history("t1")
+            await agent.invoke("what jobs match me", context=BaseContext(thread_id="t1"))
+            return first, await agent.has_history("t1"), await agent.has_history("t2")
+
+        # Only the first turn of a thread may use the cache.
+        assert asyncio.run(scenario()) == (False, True, False)
+
+    def test_cache_hit_is_recorded_in_thread_history(self):
+        from core.state import BaseContext
+
+        agent = self._agent()
+
+        async def scenario():
+            await agent.record_turn("what jobs match me", "Cached answer.", thread_id="t1")
+            result = await agent.invoke("show more", context=BaseContext(thread_id="t1"))
+            state = await agent.get_state("t1")
+            return result, state
+
+        result, state = asyncio.run(scenario())
+        assert [m.content for m in state.values["messages"]] == [
+            "what jobs match me", "Cached answer.", "show more", "Live answer.",
+        ]
+        assert state.next == ()
+        assert [m.content for m in result["messages"]] == ["show more", "Live answer."]
+
+    def test_replayed_matches_refresh_seen_flags(self):
+        import agents.shared.tools.get_matches  # noqa: F401
+        matches_module = sys.modules["agents.shared.tools.get_matches"]
+        matches_module._reset_seen_jobs()
+        stored = [("get_matches", {"matches": [{"id": "j1", "isNewToUser": True}]}), ("view_job", {"job_id": "j1"})]
+
+        first = replay_tool_calls(stored)
+        second = replay_tool_calls(stored)
+        assert first[0][1]["matches"][0]["isNewToUser"] is True
+        assert second[0][1]["matches"][0]["isNewToUser"] is False
+        assert second[1] == stored[1]
+        assert stored[0][1]["matches"][0]["isNewToUser"] is True
@@ -0,0 +1,159 @@
+"""
+Tests for the side-panel SSE hub.
+"""
+
+import asyncio
+import json
+import threading
+
+from core.metrics import SSE_DROPPED
+from core.sse_hub import RESYNC_EVENT, SSEHub, broadcast, get_sse_hub
+
+
+def _frames(hub, sub, count, timeout=1.0):
+    """Collect *count* SSE frames (after the connect preamble) from *sub*."""
+    async def collect():
+        frames = []
+        gen = hub.stream(sub)
+        await gen.__anext__()  # retry + ": connected"
+        while len(frames) < count:
+            frames.append(await asyncio.wait_for(gen.__anext__(), timeout))
+        await gen.aclose()
+        return frames
+
+    return collect()
+
+
+def _types(frames):
+    return [json.loads(f.split("data: ", 1)[1])["type"] for f in frames if "data: " in f]
+
+
+def test_publish_fans_out_with_ids():
+    async def scenario():
+        hub = SSEHub()
+        a, b = hub.subscribe("u"), hub.subscribe("u")
+        assert hub.publish("u", "open_panel") == 2
+        fa, fb = await _frames(hub, a, 1), await _frames(hub, b, 1)
+        assert fa == fb
+        assert fa[0].startswith(f"id: {hub.epoch}-1\n")
+        assert hub.connection_count() == 0  # both streams closed
+
+    asyncio.run(scenario())
+
+
+def test_events_for_unknown_user_are_discarded():
+    assert SSEHub().publish("nobody", "refresh") == 0
+
+
+def test_repeated_refresh_is_coalesced():
+    async def scenario():
+        hub = SSEHub()
+        sub = hub.subscribe("u")
+        hub.publish("u", "refresh")
+        hub.publish("u", "open_panel")
+        hub.publish("u", "refresh")
+        hub.publish("u", "refresh")
+        assert [e.type for e in sub.buffer] == ["open_panel", "refresh"]
+        return await _frames(hub, sub, 2)
+
+    frames = asyncio.run(scenario())
+    assert _types(frames) == ["open_panel", "refresh"]
+
+
+def test_slow_consumer_buffer_is_bounded_and_resyncs():
+    async def scenario():
+        hub = SSEHub(buffer_size=4)
+        sub = hub.subscribe("u")
+        before = SSE_DROPPED.value("open_jd_panel")
+        for i in range(100):
+            hub.publish("u", "open_jd_panel", {"job_id": i})
+        assert len(sub.buffer) == 4
+        assert hub.slow_consumers() == 1
+        assert SSE_DROPPED.value("open_jd_panel") - before == 96
+        return await _frames(hub, sub, 5)
+
+    frames = asyncio.run(scenario())
+    assert _types(frames)[0] == RESYNC_EVENT
+    assert [json.loads(f.split("data: ", 1)[1])["job_id"] for f in frames[1:]] == [96, 97, 98, 99]
+
+
+def test_last_event_id_replays_missed_events():
+    async def scenario():
+        hub = SSEHub(replay_size=8)
+        first = hub.subscribe("u")
+        hub.publish("u", "open_panel")
+        hub.unsubscribe(first)
+        hub.publish("u", "refresh")
+        hub.publish("u", "open_jd_panel")
+        resumed = hub.subscribe("u", last_event_id=f"{hub.epoch}-1")
+        return hub, await _frames(hub, resumed, 2)
+
+    hub, frames = asyncio.run(scenario())
+    assert _types(frames) == ["refresh", "open_jd_panel"]
+    assert frames[0].startswith(f"id: {hub.epoch}-2\n")
+
+
+def test_last_event_id_past_replay_ring_resyncs():
+    async def scenario():
+        hub = SSEHub(replay_size=2)
+        hub.unsubscribe(hub.subscribe("u"))
+        for _ in range(5):
+            hub.publish("u", "open_panel")
+        resumed = hub.subscribe("u", last_event_id=f"{hub.epoch}-1")
+        return await _frames(hub, resumed, 3)
+
+    assert _types(asyncio.run(scenario())) == [RESYNC_EVENT, "open_panel", "open_panel"]
+
+
+def test_last_event_id_from_another_worker_resyncs():
+    async def scenario():
+        other, hub = SSEHub(), SSEHub()
+        hub.unsubscribe(hub.subscribe("u"))
+        hub.publish("u", "open_panel")
+        resumed = hub.subscribe("u", last_event_id=f"{other.epoch}-1")
+        return await _frames(hub, resumed, 1)
+
+    assert _types(asyncio.run(scenario())) == [RESYNC_EVENT]
+
+
+def test_broadcast_reaches_hub_through_backend():
+    async def scenario():
+        hub = get_sse_hub()
+        sub = hub.subscribe("broadcast-user")
+        broadcast("broadcast-user", "open_jd_panel", {"job_id": "J1"})
+        return await _frames(hub, sub, 1)
+
+    frames = asyncio.run(scenario())
+    assert json.loads(frames[0].split("data: ", 1)[1]) == {"type": "open_jd_panel", "job_id": "J1"}
+
+
+def test_heartbeat_on_idle_stream():
+    async def scenario():
+        hub = SSEHub(heartbeat_seconds=0.01)
+        return await _frames(hub, hub.subscribe("u"), 1)
+
+    assert asyncio.run(scenario()) == [": ping\n\n"]
+
+
+def test_publish_from_another_thread_wakes_subscriber():
+    async def scenario():
+        hub = SSEHub(heartbeat_seconds=5)
+        sub = hub.subscribe("u")
+        collect = asyncio.ensure_future(_frames(hub, sub, 1))
+        await asyncio.sleep(0.01)
+        threading.Thread(target=hub.publish, args=("u", "refresh")).start()
+        return await collect
+
+    assert _types(asyncio.run(scenario())) == ["refresh"]
+
+
+def test_oldest_connection_closed_past_limit():
+    async def scenario():
+        hub = SSEHub(max_subscribers=2)
+        oldest = hub.subscribe("u")
+        hub.subscribe("u")
+        hub.subscribe("u")
+        assert oldest.closed
+        assert hub.connection_count() == 2
+
+    asyncio.run(scenario())
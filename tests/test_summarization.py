@@ -0,0 +1,251 @@
+"""
+Tests for message token counting and the token-driven summarization trigger.
+"""
+
+import asyncio
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, ToolMessage
+
+from core.agent.base import BaseAgent
+from core.agent.config import AgentConfig
+from core.fake_llm import ScriptedChatModel
+from core.metrics import SUMMARIZATIONS
+from core.middleware.shared_summary import SHARED_SUMMARY_HEADER, shared_summary_middleware
+from core.middleware.summarization import create_summarization_middleware
+from core.state import BaseContext
+from core.backend import get_backend
+from core.summary_store import SUMMARIES_CHANNEL, SummaryStore, get_summary_store
+import core.tokens as tokens_module
+from core.tokens import count_message_tokens, count_messages_tokens, count_tokens
+
+
+def _summarizer():
+    return ScriptedChatModel(script={"default": [{"match": "", "steps": [], "response": "Earlier: user asked about jobs."}]})
+
+
+class TestCountMessageTokens:
+    def test_count_is_memoized_beside_the_message(self):
+        msg = HumanMessage(content="find me a data engineering role in London")
+        tokens = count_message_tokens(msg)
+        assert tokens > count_tokens(msg.content)
+        assert msg.response_metadata == {}
+        assert count_message_tokens(msg) == tokens
+
+        # The checkpointer's copy of the message hits the memo.
+        memo_size = len(tokens_module._message_counts)
+        assert count_message_tokens(HumanMessage(content=msg.content)) == tokens
+        assert len(tokens_module._message_counts) == memo_size
+
+        # Editing the content (even keeping its length) is a memo miss.
+        memo_size = len(tokens_module._message_counts)
+        msg.content = "find me a data engineering role in Berlin"
+        count_message_tokens(msg)
+        assert len(tokens_module._message_counts) == memo_size + 1
+
+    def test_offline_fallback_warns_once(self, monkeypatch, caplog):
+        monkeypatch.setattr(tokens_module, "TOKENIZER_ENCODING", "no_such_encoding")
+        monkeypatch.setattr(tokens_module, "_encoding_loaded", False)
+        monkeypatch.setattr(tokens_module, "_encoding", None)
+        with caplog.at_level("WARNING", logger="chatbot.tokens"):
+            counts = [count_tokens("twelve chars") for _ in range(3)]
+        assert counts == [3, 3, 3]
+        assert [r.levelname for r in caplog.records] == ["WARNING"]
+        assert "no_such_encoding" in caplog.records[0].getMessage()
+
+    def test_tool_calls_are_counted(self):
+        plain = AIMessage(content="")
+        calling = AIMessage(content="", tool_calls=[{"name": "get_matches", "args": {"top_k": 3}, "id": "c1"}])
+        assert count_message_tokens(calling) > count_message_tokens(plain)
+
+    def test_large_tool_result_dominates(self):
+        short = [HumanMessage(content="hi"), AIMessage(content="hello")]
+        big = short + [ToolMessage(content="job " * 2000, tool_call_id="c1")]
+        assert count_messages_tokens(big) - count_messages_tokens(short) >= count_tokens("job " * 2000)
+
+    def test_accepts_message_dicts(self):
+        assert count_messages_tokens([{"role": "user", "content": "hi"}]) == count_messages_tokens([HumanMessage("hi")])
+
+
+class CountingModel(ScriptedChatModel):
+    """Scripted model that counts its calls."""
+
+    calls: int = 0
+    prompts: list = []
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        self.prompts.append(list(messages))
+        return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+def _agent(name, summarizer, background=True, shared=False):
+    model = CountingModel(script={"default": [{"match": "", "steps": [], "response": "noted " * 50}]}, prompts=[])
+    middleware = [create_summarization_middleware(
+        model=summarizer, trigger_tokens=300, keep_tokens=80, background=background, shared=shared,
+    )]
+    if shared:
+        middleware.append(shared_summary_middleware)
+    return model, BaseAgent(AgentConfig(
+        name=name, description="", llm=model, system_prompt="You help." if shared else None, middleware=middleware,
+    ))
+
+
+class TestSummarizationTrigger:
+    def test_many_short_messages_do_not_trigger(self):
+        mw = create_summarization_middleware(model=_summarizer(), trigger_tokens=500, keep_tokens=100)
+        messages = [HumanMessage(content=f"message {i}") if i % 2 == 0 else AIMessage(content="ok") for i in range(30)]
+        assert count_messages_tokens(messages) < 500
+        assert mw.before_model({"messages": messages}, None) is None
+
+    def test_one_big_tool_result_triggers(self):
+        mw = create_summarization_middleware(model=_summarizer(), trigger_tokens=500, keep_tokens=100)
+        messages = [
+            HumanMessage(content="what jobs match me?"),
+            AIMessage(content="", tool_calls=[{"name": "get_matches", "args": {}, "id": "c1"}]),
+            ToolMessage(content="job " * 1000, tool_call_id="c1"),
+            AIMessage(content="Here are your matches."),
+            HumanMessage(content="thanks"),
+        ]
+        update = asyncio.run(mw.abefore_model({"messages": messages}, None))
+
+        assert update is not None
+        new = update["messages"]
+        assert isinstance(new[0], RemoveMessage)
+        assert "Earlier: user asked about jobs." in new[1].content
+        assert new[-1].content == "thanks"
+        assert count_messages_tokens(new[1:]) < 500
+
+
+class TestBackgroundSummarization:
+    def test_history_compacted_after_turn(self):
+        summarizer = CountingModel(script={"default": [{"match": "", "steps": [], "response": "Earlier: long chat."}]})
+        model, agent = _agent("bg", summarizer)
+        ctx = BaseContext(thread_id="bg-1")
+
+        async def scenario():
+            for i in range(3):
+                await agent.invoke(f"turn {i} " + "detail " * 60, context=ctx)
+            # Turns never waited on a summary: the summarizer only ran afterwards.
+            await agent.wait_for_compactions()
+            return await agent.get_state("bg-1")
+
+        state = asyncio.run(scenario())
+        messages = state.values["messages"]
+        assert summarizer.calls >= 1
+        assert "Earlier: long chat." in messages[0].content
+        assert count_messages_tokens(messages) < 300
+        assert SUMMARIZATIONS.value("bg", "background") >= 1
+
+    def test_swap_dropped_when_a_turn_is_running(self):
+        summarizer = CountingModel(script={"default": [{"match": "", "steps": [], "response": "Earlier."}]})
+        _, agent = _agent("bg-stale", summarizer)
+        ctx = BaseContext(thread_id="bg-2")
+
+        async def scenario():
+            for i in range(2):
+                await agent.invoke(f"turn {i} " + "detail " * 60, context=ctx)
+            await agent.wait_for_compactions()
+            await agent.invoke("next " + "detail " * 300, context=ctx)
+            agent._active_threads.add("bg-2")  # another turn starts before the swap
+            await agent.wait_for_compactions()
+            agent._active_threads.discard("bg-2")
+            return (await agent.get_state("bg-2")).values["messages"]
+
+        after = asyncio.run(scenario())
+        assert SUMMARIZATIONS.value("bg-stale", "stale") == 1
+        assert after[-2].content.startswith("next")
+
+    def test_inline_mode_never_schedules(self):
+        summarizer = CountingModel(script={"default": [{"match": "", "steps": [], "response": "Earlier."}]})
+        _, agent = _agent("inline", summarizer, background=False)
+        ctx = BaseContext(thread_id="in-1")
+
+        async def scenario():
+            for i in range(3):
+                await agent.invoke(f"turn {i} " + "detail " * 60, context=ctx)
+            assert not agent._compactions
+
+        asyncio.run(scenario())
+        assert SUMMARIZATIONS.value("inline", "inline") >= 1
+
+
+class TestSharedSummaries:
+    def test_store_orders_parent_first_and_excludes_own_thread(self):
+        store = SummaryStore()
+        store.put("conv:profile", "profile", "Edited skills.")
+        store.put("conv", "orchestrator", "User wants a data role.")
+        store.put("conv:outreach", "outreach", "Drafted a message.")
+
+        assert [s.agent for s in store.get("conv:profile")] == ["orchestrator", "profile", "outreach"]
+        assert store.parent_summary("conv:outreach").text == "User wants a data role."
+        context = store.context_for("conv:profile")
+        assert "[orchestrator] User wants a data role." in context
+        assert "Edited skills." not in context
+
+    def test_store_evicts_least_recent_conversation(self):
+        store = SummaryStore(max_threads=2)
+        for conv in ("a", "b", "c"):
+            store.put(conv, "orchestrator", conv)
+        assert store.get("a") == []
+        assert len(store) == 2
+
+    def test_summary_from_another_worker_reaches_store(self):
+        get_summary_store()
+        get_backend().publish(
+            SUMMARIES_CHANNEL, {"thread_id": "remote", "agent": "orchestrator", "text": "Summarized elsewhere."},
+        )
+        assert get_summary_store().parent_summary("remote:profile").text == "Summarized elsewhere."
+
+    def test_background_summary_is_published(self):
+        summarizer = CountingModel(script={"default": [{"match": "", "steps": [], "response": "Parent summary."}]})
+        _, agent = _agent("orchestrator", summarizer)
+
+        async def scenario():
+            for i in range(3):
+                await agent.invoke(f"turn {i} " + "detail " * 60, context=BaseContext(thread_id="pub"))
+            await agent.wait_for_compactions()
+
+        asyncio.run(scenario())
+        assert get_summary_store().parent_summary("pub:profile").text == "Parent summary."
+
+    def test_worker_reuses_parent_summary_and_sees_it(self):
+        # Summarized after the orchestrator turns that ran the worker turns below.
+        get_summary_store().put(
+            "conv-w", "orchestrator", "User is a data engineer looking to move.", covers_until=time.time() + 3600,
+        )
+        summarizer = CountingModel(script={"default": [{"match": "", "steps": [], "response": "unused"}]})
+        model, agent = _agent("worker", summarizer, shared=True)
+        ctx = BaseContext(thread_id="conv-w:worker")
+
+        async def scenario():
+            for i in range(3):
+                await agent.invoke(f"turn {i} " + "detail " * 60, context=ctx)
+            await agent.wait_for_compactions()
+            return (await agent.get_state("conv-w:worker")).values["messages"]
+
+        messages = asyncio.run(scenario())
+        assert summarizer.calls == 0
+        assert SUMMARIZATIONS.value("worker", "reused") >= 1
+        assert count_messages_tokens(messages) < 300
+        assert not any("summary of the conversation" in str(m.content) for m in messages)
+        context = model.prompts[-1][-1]
+        assert SHARED_SUMMARY_HEADER in context.content
+        assert "[orchestrator] User is a data engineer" in context.content
+
+    def test_worker_summarizes_turns_newer_than_parent_summary(self):
+        get_summary_store().put("conv-old", "orchestrator", "User said hello.")
+        summarizer = CountingModel(script={"default": [{"match": "", "steps": [], "response": "Worker details."}]})
+        _, agent = _agent("worker-old", summarizer, shared=True)
+        ctx = BaseContext(thread_id="conv-old:worker")
+
+        async def scenario():
+            for i in range(3):
+                await agent.invoke(f"turn {i} " + "detail " * 60, context=ctx)
+            await agent.wait_for_compactions()
+            return (await agent.get_state("conv-old:worker")).values["messages"]
+
+        messages = asyncio.run(scenario())
+        assert summarizer.calls >= 1
+        assert SUMMARIZATIONS.value("worker-old", "reused") == 0
+        assert any("Worker details." in str(m.content) for m in messages)
@@ -0,0 +1,138 @@
+"""
+Tests for span tracing, the tracing middleware and the checkpointer wrapper.
+"""
+
+import asyncio
+import inspect
+import json
+
+import pytest
+from langchain.agents import create_agent
+from langchain_core.messages import HumanMessage
+from langchain_core.tools import tool
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.errors import GraphInterrupt
+
+import core.tracing as tracing
+from core.fake_llm import ScriptedChatModel
+from core.middleware.tracing import TracingMiddleware, trace_middleware
+
+
+@pytest.fixture
+def spans_file(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    tracing.configure(True, str(path))
+    yield path
+    tracing.configure(False)
+
+
+def _read(path):
+    tracing.configure(True, str(path))  # closes (flushes) the current exporter
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestSpan:
+    def test_disabled_is_noop(self, tmp_path):
+        tracing.configure(False)
+        with tracing.span("x") as s:
+            assert s is None
+
+    def test_nesting_and_export(self, spans_file):
+        with tracing.span("outer", user="alice"):
+            with tracing.span("inner"):
+                pass
+        records = {r["name"]: r for r in _read(spans_file)}
+        assert records["inner"]["parentSpanId"] == records["outer"]["spanId"]
+        assert records["inner"]["traceId"] == records["outer"]["traceId"]
+        assert records["outer"]["parentSpanId"] == ""
+        assert records["outer"]["attributes"] == {"user": "alice"}
+
+    def test_error_and_interrupt_status(self, spans_file):
+        with pytest.raises(ValueError):
+            with tracing.span("fails"):
+                raise ValueError("boom")
+        with pytest.raises(GraphInterrupt):
+            with tracing.span("pauses"):
+                raise GraphInterrupt(())
+        records = {r["name"]: r for r in _read(spans_file)}
+        assert records["fails"]["status"]["code"] == "ERROR"
+        assert records["pauses"]["status"]["code"] == "OK"
+        assert records["pauses"]["attributes"]["interrupted"] is True
+
+    def test_async_children(self, spans_file):
+        @tracing.traced("parent")
+        async def run():
+            await asyncio.gather(*(asyncio.create_task(child(i)) for i in range(2)))
+
+        async def child(i):
+            with tracing.span(f"child{i}"):
+                await asyncio.sleep(0)
+
+        asyncio.run(run())
+        records = {r["name"]: r for r in _read(spans_file)}
+        assert records["child0"]["parentSpanId"] == records["parent"]["spanId"]
+        assert records["child1"]["parentSpanId"] == records["parent"]["spanId"]
+
+
+@tool
+def lookup(query: str) -> dict:
+    """Looks something up."""
+    return {"query": query}
+
+
+SCRIPT = {"agent": [{"match": "", "steps": [[{"name": "lookup", "args": {"query": "{input}"}}]], "response": "done"}]}
+
+
+class TestTracingMiddleware:
+    def test_trace_middleware_preserves_signature_and_is_idempotent(self):
+        from core.middleware.tool_projection import tool_projection_middleware
+
+        before = inspect.signature(tool_projection_middleware.awrap_tool_call)
+        trace_middleware(tool_projection_middleware)
+        wrapped = tool_projection_middleware.awrap_tool_call
+        trace_middleware(tool_projection_middleware)
+        assert tool_projection_middleware.awrap_tool_call is wrapped
+        assert inspect.signature(wrapped) == before
+
+    def test_agent_run_produces_llm_tool_and_checkpoint_spans(self, spans_file):
+        from core.middleware.tool_monitor import tool_monitor_middleware
+
+        agent = create_agent(
+            model=ScriptedChatModel(script=SCRIPT),
+            tools=[lookup],
+            middleware=[trace_middleware(tool_monitor_middleware), TracingMiddleware("agent")],
+            checkpointer=tracing.TracingCheckpointer(InMemorySaver()),
+        )
+
+        async def run():
+            with tracing.span("turn"):
+                await agent.ainvoke(
+                    {"messages": [HumanMessage(content="q")]},
+                    config={"configurable": {"thread_id": "t"}},
+                )
+
+        asyncio.run(run())
+        records = _read(spans_file)
+        names = [r["name"] for r in records]
+        assert names.count("llm:agent") == 2
+        assert "tool:lookup" in names
+        assert "middleware:tool_monitor_middleware.wrap_tool_call" in names
+        assert any(n.startswith("checkpoint:") for n in names)
+        by_id = {r["spanId"]: r for r in records}
+        tool_span = next(r for r in records if r["name"] == "tool:lookup")
+        assert by_id[tool_span["parentSpanId"]]["name"] == "middleware:tool_monitor_middleware.wrap_tool_call"
+        assert next(r for r in records if r["name"] == "llm:agent")["attributes"]["output_tokens"] > 0
+        assert len({r["traceId"] for r in records}) == 1
+
+
+class TestFormatTrace:
+    def test_tree_with_self_time(self):
+        spans = [
+            {"traceId": "t", "spanId": "a", "parentSpanId": "", "name": "turn", "startTimeUnixNano": 0,
+             "durationMs": 10.0, "status": {"code": "OK"}},
+            {"traceId": "t", "spanId": "b", "parentSpanId": "a", "name": "llm:x", "startTimeUnixNano": 1,
+             "durationMs": 7.0, "status": {"code": "OK"}},
+        ]
+        lines = tracing.format_trace(spans).splitlines()
+        assert lines[0].startswith("turn") and "(self 3.00)" in lines[0]
+        assert lines[1].startswith("  llm:x")
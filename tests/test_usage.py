@@ -0,0 +1,119 @@
+"""
+Tests for per-call LLM token accounting.
+"""
+
+import asyncio
+
+import pytest
+from langchain.agents import create_agent
+from langchain_core.messages import AIMessage, HumanMessage
+
+import core.usage as usage
+from core.fake_llm import ScriptedChatModel
+from core.usage import TurnUsage, UsageCallbackHandler, UsageRecord, UsageStore, extract_usage, track_turn
+
+
+def _record(**overrides) -> UsageRecord:
+    values = dict(
+        ts=1000.0, user="alice", thread_id="t1", agent="orchestrator", node="model", model="gpt",
+        input_tokens=100, output_tokens=20, cache_read_tokens=0, cached=False, latency_ms=5.0,
+    )
+    values.update(overrides)
+    return UsageRecord(**values)
+
+
+class TestExtractUsage:
+    def test_usage_metadata(self):
+        msg = AIMessage(content="x", usage_metadata={
+            "input_tokens": 10, "output_tokens": 2, "total_tokens": 12,
+            "input_token_details": {"cache_read": 4},
+        })
+        assert extract_usage(msg) == (10, 2, 4, False)
+
+    def test_prompt_cache_hit_is_flagged(self):
+        msg = AIMessage(content="x", usage_metadata={
+            "input_tokens": 10, "output_tokens": 2, "total_tokens": 12, "total_cost": 0,
+        })
+        assert extract_usage(msg)[3] is True
+
+    def test_response_metadata_fallback(self):
+        msg = AIMessage(content="x", response_metadata={"token_usage": {
+            "prompt_tokens": 7, "completion_tokens": 3, "prompt_tokens_details": {"cached_tokens": 5},
+        }})
+        assert extract_usage(msg) == (7, 3, 5, False)
+
+    def test_no_usage(self):
+        assert extract_usage(AIMessage(content="x")) == (0, 0, 0, False)
+
+
+class TestUsageStore:
+    def test_summary_groups_and_excludes_cached_cost(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(usage, "LLM_PRICE_INPUT_PER_1K", 1.0)
+        monkeypatch.setattr(usage, "LLM_PRICE_OUTPUT_PER_1K", 2.0)
+        store = UsageStore(str(tmp_path / "usage.db"))
+        store.add(_record())
+        store.add(_record(agent="profile", input_tokens=1000, output_tokens=500))
+        store.add(_record(agent="profile", cached=True))
+
+        rows = {row["agent"]: row for row in store.summary(by="agent")}
+        assert list(rows) == ["profile", "orchestrator"]
+        assert rows["profile"]["calls"] == 2
+        assert rows["profile"]["input_tokens"] == 1100
+        assert rows["profile"]["cached_calls"] == 1
+        assert rows["profile"]["cost"] == pytest.approx(2.0)
+
+        by_user = store.summary(by="user")
+        assert by_user[0]["user"] == "alice" and by_user[0]["calls"] == 3
+        store.close()
+
+        # Persisted across instances.
+        assert UsageStore(str(tmp_path / "usage.db")).summary()[0]["calls"] == 2
+
+    def test_rejects_unknown_grouping(self):
+        with pytest.raises(ValueError):
+            UsageStore().summary(by="prompt; DROP TABLE llm_usage")
+
+    def test_no_file_until_first_flush(self, tmp_path):
+        path = tmp_path / "usage.db"
+        store = UsageStore(str(path))
+        assert not path.exists()
+        store.add(_record())
+        store.flush()
+        assert path.exists()
+
+
+SCRIPT = {"agent": [{"match": "", "steps": [], "response": "hello there"}]}
+
+
+class TestUsageCallbackHandler:
+    def test_records_calls_per_agent_within_turn(self):
+        store = UsageStore()
+        handler = UsageCallbackHandler(store)
+        agent = create_agent(
+            model=ScriptedChatModel(script=SCRIPT, callbacks=[handler]),
+            tools=[],
+            name="greeter",
+        )
+
+        async def run():
+            with track_turn("bob") as turn:
+                await agent.ainvoke(
+                    {"messages": [HumanMessage(content="hi")]},
+                    config={"configurable": {"thread_id": "t9"}},
+                )
+            return turn
+
+        turn = asyncio.run(run())
+        assert len(turn.records) == 1
+        record = turn.records[0]
+        assert (record.user, record.agent, record.node, record.thread_id) == ("bob", "greeter", "model", "t9")
+        assert record.output_tokens > 0
+        assert turn.by_agent()["greeter"]["calls"] == 1
+        assert store.summary(by="user")[0]["user"] == "bob"
+
+    def test_turn_usage_totals(self):
+        turn = TurnUsage("u")
+        turn.records += [_record(), _record(agent="profile", input_tokens=50, output_tokens=5)]
+        assert turn.input_tokens == 150
+        assert turn.output_tokens == 25
+        assert list(turn.by_agent()) == ["orchestrator", "profile"]
@@ -0,0 +1,20 @@
+"""
+Tests for the data file version stamps.
+"""
+
+import time
+
+from core.versions import file_version
+
+
+class TestFileVersion:
+    def test_changes_on_write(self, tmp_path):
+        path = tmp_path / "profile.json"
+        path.write_text("{}")
+        before = file_version(str(path))
+        time.sleep(0.01)
+        path.write_text('{"core": {}}')
+        assert file_version(str(path)) != before
+
+    def test_missing_file(self, tmp_path):
+        assert file_version(str(tmp_path / "missing.json")) == "-"